@@ -0,0 +1,18 @@
+"""Performance benchmarks (not part of the unit-test run).
+
+Each suite writes a machine-readable results file (see results.py); the
+compare command diffs two such files and exits non-zero on regressions:
+
+    python -m benchmarks.engine --output outputs/bench/engine.json
+    python -m benchmarks.memory --output outputs/bench/memory.json
+    python -m benchmarks.parsing --output outputs/bench/parsing.json
+    python -m benchmarks.compare baseline.json outputs/bench/engine.json
+
+Rules:
+- Benchmarks never touch the network: LLM seats use a zero-latency
+  FakeProvider default result or scripted agents.
+- Timing metrics are medians over repeated games so one slow run does
+  not flag a regression; count metrics (bytes, events) are exact.
+- Results carry the code commit and runtime so a baseline is only
+  compared against runs on comparable hardware and Python.
+"""
@@ -0,0 +1,65 @@
+"""Compare a benchmark run against a stored baseline.
+
+Usage:
+    python -m benchmarks.compare BASELINE CURRENT [--tolerance 0.10] [--all]
+
+Prints regressions (and improvements) beyond the tolerance and exits 1
+if any metric regressed, so it can gate CI. Runs from different code on
+different machines are compared as given; the header shows both runtimes.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+from benchmarks.results import DEFAULT_TOLERANCE, compare_results, load_results
+
+
+def _fmt_change(change) -> str:
+    return "n/a" if change is None else f"{change:+.1%}"
+
+
+def _describe(results: dict) -> str:
+    runtime = results.get("runtime") or {}
+    python = runtime.get("python") or "?"
+    return f"{results.get('code_commit') or '?'} (python {python})"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Relative change allowed before a metric is "
+                             f"flagged (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--all", action="store_true",
+                        help="Print every compared metric, not just flagged ones")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    changes = compare_results(baseline, current, args.tolerance)
+    print(f"baseline: {_describe(baseline)}")
+    print(f"current:  {_describe(current)}")
+    missing = sorted(set(baseline["cases"]) - set(current["cases"]))
+    if missing:
+        print(f"cases missing from current run: {', '.join(missing)}")
+
+    regressions = [c for c in changes if c.regression]
+    for change in changes:
+        if not (args.all or change.regression or change.improvement):
+            continue
+        label = "REGRESSION" if change.regression else (
+            "improved" if change.improvement else "")
+        print(
+            f"  {change.case:<18} {change.metric:<28} "
+            f"{change.baseline:12.3f} -> {change.current:12.3f} "
+            f"{_fmt_change(change.change):>8}  {label}"
+        )
+    print(f"{len(regressions)} regression(s) across {len(changes)} metric(s), "
+          f"tolerance {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""Engine throughput benchmark.
+
+Runs complete games through GameEngine across player counts and
+discussion cycles, with every seat either on a zero-latency FakeProvider
+default result ("fake": exercises prompting, parsing, validation, retries
+and llm_call logging) or on scripted agents ("scripted": engine only).
+
+Every seed is played once untimed (warm-up) and then --repeats times;
+timings keep each seed's fastest repeat, as timeit does, because noise
+only ever adds time. Per case it reports:
+- games_per_sec, game_ms, setup_ms: wall clock, means over the seeds
+- phase_ms: time per game spent in each phase, measured between
+  phase_boundary bus messages (a phase's time includes the checkpoint
+  taken at the start of the next one)
+- alloc_peak_kb, alloc_retained_kb: tracemalloc over one extra game, run
+  separately so tracing does not distort the timings
+- log_bytes_per_game, events_per_game, llm_calls_per_game: means
+
+Usage:
+    python -m benchmarks.engine [--players 7 15 30] [--cycles 1 2 3 4 5]
+        [--agents fake scripted] [--games 5] [--repeats 3] [--output PATH]
+        [--quick]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+from benchmarks.results import new_results, write_results
+from werewolf.agents.scripted import DEFAULT_POLICIES
+from werewolf.engine.bus import Subscriber
+from werewolf.engine.game import GameEngine
+from werewolf.llm.fake_provider import FakeProvider, success_result
+
+SUITE = "engine"
+
+PLAYER_COUNTS = (7, 15, 30)
+DISCUSSION_CYCLES = (1, 2, 3, 4, 5)
+AGENT_MODES = ("fake", "scripted")
+DEFAULT_GAMES = 5
+DEFAULT_REPEATS = 3
+DEFAULT_SEED = 1000
+DEFAULT_OUTPUT = "outputs/bench/engine.json"
+
+QUICK = {"players": (7,), "cycles": (1, 2), "agents": AGENT_MODES, "games": 3}
+
+
+def wolves_for(n_players: int) -> int:
+    """About one wolf per five players, as in the default 7-player game."""
+    return max(1, round(n_players / 5))
+
+
+def case_id(agents: str, n_players: int, cycles: int) -> str:
+    return f"{agents}/p{n_players}/c{cycles}"
+
+
+def fake_response(n_players: int) -> dict:
+    """One static answer for every action: valid for most seats, so the
+    rest exercise the retry and fallback paths deterministically."""
+    target = n_players - 1
+    probabilities = {str(pid): 0.5 for pid in range(n_players)}
+    return {
+        "thought": "benchmark",
+        "say": None,
+        "action": {
+            "kill_target": target, "divine_target": target, "vote_target": target,
+        },
+        "beliefs": {
+            "wolf_probabilities": probabilities,
+            "intended_vote": target,
+            "vote_confidence": 0.5,
+            "most_influential_recent_speaker": None,
+            "estimated_suspicion_of_me": probabilities,
+        },
+    }
+
+
+class PhaseTimer:
+    """Bus subscriber attributing wall time to the phase that spent it."""
+
+    def __init__(self):
+        self.totals: dict[str, float] = defaultdict(float)
+        self._phase = None
+        self._started = None
+
+    def __call__(self, topic: str, payload: dict) -> None:
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.totals[self._phase] += (now - self._started) * 1000
+        self._phase = payload.get("phase") if topic == "phase_boundary" else None
+        self._started = now
+
+
+def play(agents: str, n_players: int, cycles: int, seed: int, output_dir: str):
+    """Run one game; returns (engine, setup_ms, game_ms, phase totals)."""
+    timer = PhaseTimer()
+    if agents == "fake":
+        seats = {"api_key": "", "provider": FakeProvider(
+            default=success_result(fake_response(n_players), latency_ms=0),
+        )}
+    else:
+        seats = {"role_agents": DEFAULT_POLICIES}
+    started = time.perf_counter()
+    engine = GameEngine(
+        n_players=n_players, n_wolves=wolves_for(n_players), n_seers=1,
+        seed=seed, output_dir=output_dir, discussion_cycles=cycles,
+        transcript_enabled=False, show_all_channels=False,
+        subscribers=[Subscriber(
+            timer, topics=frozenset({"phase_boundary", "outcome"}),
+            name="bench_phase_timer",
+        )],
+        **seats,
+    )
+    ready = time.perf_counter()
+    engine.run()
+    finished = time.perf_counter()
+    return engine, (ready - started) * 1000, (finished - ready) * 1000, timer.totals
+
+
+def measure_allocations(agents: str, n_players: int, cycles: int, seed: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            engine = play(agents, n_players, cycles, seed, tmpdir)[0]
+            _, peak = tracemalloc.get_traced_memory()
+            del engine
+            gc.collect()
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"alloc_peak_kb": peak / 1024, "alloc_retained_kb": retained / 1024}
+
+
+def run_case(
+    agents: str, n_players: int, cycles: int, games: int, seed: int,
+    repeats: int = DEFAULT_REPEATS,
+) -> dict:
+    setup_ms, game_ms, log_bytes, events, calls = [], [], [], [], []
+    phase_ms: dict[str, list[float]] = defaultdict(list)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for offset in range(games):
+            engine = play(agents, n_players, cycles, seed + offset, tmpdir)[0]
+            log_bytes.append(os.path.getsize(engine.logger.filepath))
+            events.append(len(engine.state.events))
+            calls.append(engine.ledger.count())
+            runs = [
+                play(agents, n_players, cycles, seed + offset, tmpdir)[1:]
+                for _ in range(repeats)
+            ]
+            setup_ms.append(min(run[0] for run in runs))
+            game_ms.append(min(run[1] for run in runs))
+            for phase in GameEngine.PHASE_ORDER:
+                phase_ms[phase].append(min(run[2].get(phase, 0.0) for run in runs))
+    game_mean = statistics.mean(game_ms)
+    return {
+        "params": {
+            "agents": agents, "n_players": n_players,
+            "n_wolves": wolves_for(n_players), "discussion_cycles": cycles,
+            "games": games, "repeats": repeats, "seed_start": seed,
+        },
+        "metrics": {
+            "games_per_sec": 1000 / game_mean if game_mean else None,
+            "game_ms": game_mean,
+            "setup_ms": statistics.mean(setup_ms),
+            "phase_ms": {
+                phase: statistics.mean(values) for phase, values in phase_ms.items()
+            },
+            **measure_allocations(agents, n_players, cycles, seed),
+            "log_bytes_per_game": statistics.mean(log_bytes),
+            "events_per_game": statistics.mean(events),
+            "llm_calls_per_game": statistics.mean(calls),
+        },
+    }
+
+
+def run_suite(players, cycles, agents, games: int, seed: int = DEFAULT_SEED,
+              repeats: int = DEFAULT_REPEATS, progress=None) -> dict:
+    results = new_results(SUITE, {
+        "players": list(players), "cycles": list(cycles), "agents": list(agents),
+        "games": games, "repeats": repeats, "seed_start": seed,
+    })
+    for mode in agents:
+        for n_players in players:
+            for n_cycles in cycles:
+                case = run_case(mode, n_players, n_cycles, games, seed, repeats)
+                results["cases"][case_id(mode, n_players, n_cycles)] = case
+                if progress:
+                    progress(case_id(mode, n_players, n_cycles), case["metrics"])
+    return results
+
+
+def _print_case(name: str, metrics: dict) -> None:
+    print(
+        f"  {name:<18} {metrics['games_per_sec']:8.1f} games/s  "
+        f"{metrics['game_ms']:8.1f} ms/game  "
+        f"{metrics['alloc_peak_kb'] / 1024:6.1f} MiB peak  "
+        f"{metrics['log_bytes_per_game'] / 1024:8.1f} KiB log"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Engine throughput benchmark")
+    parser.add_argument("--players", type=int, nargs="+", default=list(PLAYER_COUNTS))
+    parser.add_argument("--cycles", type=int, nargs="+", default=list(DISCUSSION_CYCLES))
+    parser.add_argument("--agents", nargs="+", choices=AGENT_MODES,
+                        default=list(AGENT_MODES))
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES,
+                        help=f"Timed games per case (default: {DEFAULT_GAMES})")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help="Timed runs per seed; the fastest counts "
+                             f"(default: {DEFAULT_REPEATS})")
+    parser.add_argument("--seed-start", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--quick", action="store_true",
+                        help="Small grid for a fast smoke run")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.players, args.cycles = QUICK["players"], QUICK["cycles"]
+        args.agents, args.games = QUICK["agents"], QUICK["games"]
+    if args.games < 1 or args.repeats < 1:
+        raise SystemExit("Error: --games and --repeats must be >= 1")
+
+    # Fake seats fail validation on purpose; their warnings are noise here.
+    logging.getLogger("werewolf").setLevel(logging.ERROR)
+    results = run_suite(
+        args.players, args.cycles, args.agents, args.games, args.seed_start,
+        args.repeats, progress=_print_case,
+    )
+    write_results(args.output, results)
+    print(f"Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Memory growth benchmark: many consecutive games in one process.
+
+Batch runs create engines back to back and the web app replaces its
+engine on every new game, so memory a finished game leaves behind
+accumulates for the life of the process. This suite plays --games games
+per case in one process after --warmup games that fill caches and
+allocator arenas. After every game it drops the engine, collects garbage
+and samples:
+- traced_kb: Python heap still allocated (tracemalloc), the precise
+  signal for a leak in Python objects
+- rss_kb: resident set size from /proc (Linux; None elsewhere), which
+  also sees C-level leaks but moves in allocator-sized steps
+
+Per case it reports alloc_growth_kb (last sample minus first),
+alloc_growth_kb_per_game (least-squares slope of traced_kb) and
+rss_growth_kb (highest RSS in the second half of the run minus the
+highest in the first half). Tracing runs through the warm-up games too,
+so tracemalloc's own bookkeeping is already in the first sample.
+The command exits 1 when a case grows by more than --max-growth-kb of
+traced heap or --max-rss-growth-kb of RSS.
+
+Usage:
+    python -m benchmarks.memory [--players 7 15] [--agents fake scripted]
+        [--games 30] [--warmup 3] [--output PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import statistics
+import tempfile
+import tracemalloc
+from typing import Optional
+
+from benchmarks.engine import AGENT_MODES, DEFAULT_SEED, case_id, play
+from benchmarks.results import new_results, write_results
+
+SUITE = "memory"
+
+PLAYER_COUNTS = (7, 15)
+DEFAULT_CYCLES = 2
+DEFAULT_GAMES = 30
+DEFAULT_WARMUP = 3
+DEFAULT_OUTPUT = "outputs/bench/memory.json"
+# Budgets for the whole run of --games games, not per game.
+DEFAULT_MAX_GROWTH_KB = 256.0
+DEFAULT_MAX_RSS_GROWTH_KB = 4096.0
+
+
+def rss_kb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024
+
+
+def _slope(values: list[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    xs = range(len(values))
+    x_mean, y_mean = statistics.mean(xs), statistics.mean(values)
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, values))
+    return numerator / sum((x - x_mean) ** 2 for x in xs)
+
+
+def run_case(agents: str, n_players: int, games: int, warmup: int,
+             seed: int = DEFAULT_SEED, cycles: int = DEFAULT_CYCLES) -> dict:
+    traced, resident = [], []
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for offset in range(warmup + games):
+                # The engine is dropped before sampling: whatever is still
+                # allocated belongs to no live game.
+                play(agents, n_players, cycles, seed + offset, tmpdir)
+                gc.collect()
+                if offset >= warmup:
+                    traced.append(tracemalloc.get_traced_memory()[0] / 1024)
+                    resident.append(rss_kb())
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    rss_growth = None
+    if None not in resident:
+        # RSS moves in allocator-sized steps; compare the high-water marks
+        # of the two halves so one early step is not read as growth.
+        half = len(resident) // 2
+        rss_growth = max(resident[half:]) - max(resident[:half])
+    return {
+        "params": {
+            "agents": agents, "n_players": n_players, "discussion_cycles": cycles,
+            "games": games, "warmup": warmup, "seed_start": seed,
+        },
+        "metrics": {
+            "alloc_growth_kb": traced[-1] - traced[0],
+            "alloc_growth_kb_per_game": _slope(traced),
+            "rss_growth_kb": rss_growth,
+            "rss_kb": resident[-1],
+            "alloc_traced_kb": traced[-1],
+        },
+        "samples": {"traced_kb": traced, "rss_kb": resident},
+    }
+
+
+def run_suite(players, agents, games: int = DEFAULT_GAMES,
+              warmup: int = DEFAULT_WARMUP, seed: int = DEFAULT_SEED,
+              progress=None) -> dict:
+    results = new_results(SUITE, {
+        "players": list(players), "agents": list(agents), "games": games,
+        "warmup": warmup, "seed_start": seed, "discussion_cycles": DEFAULT_CYCLES,
+    })
+    for mode in agents:
+        for n_players in players:
+            name = case_id(mode, n_players, DEFAULT_CYCLES)
+            results["cases"][name] = run_case(mode, n_players, games, warmup, seed)
+            if progress:
+                progress(name, results["cases"][name]["metrics"])
+    return results
+
+
+def over_budget(results: dict, max_growth_kb: float,
+                max_rss_growth_kb: float) -> list[str]:
+    failures = []
+    for name, case in sorted(results["cases"].items()):
+        metrics = case["metrics"]
+        if metrics["alloc_growth_kb"] > max_growth_kb:
+            failures.append(
+                f"{name}: traced heap grew {metrics['alloc_growth_kb']:.0f} KB "
+                f"(budget {max_growth_kb:.0f} KB)"
+            )
+        rss_growth = metrics["rss_growth_kb"]
+        if rss_growth is not None and rss_growth > max_rss_growth_kb:
+            failures.append(
+                f"{name}: RSS grew {rss_growth:.0f} KB "
+                f"(budget {max_rss_growth_kb:.0f} KB)"
+            )
+    return failures
+
+
+def _print_case(name: str, metrics: dict) -> None:
+    rss = metrics["rss_growth_kb"]
+    print(
+        f"  {name:<18} heap {metrics['alloc_growth_kb']:+8.1f} KB "
+        f"({metrics['alloc_growth_kb_per_game']:+6.2f} KB/game)  "
+        f"RSS {'n/a' if rss is None else f'{rss:+.0f} KB'}"
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Memory growth benchmark")
+    parser.add_argument("--players", type=int, nargs="+", default=list(PLAYER_COUNTS))
+    parser.add_argument("--agents", nargs="+", choices=AGENT_MODES,
+                        default=list(AGENT_MODES))
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES,
+                        help=f"Measured games per case (default: {DEFAULT_GAMES})")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--seed-start", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--max-growth-kb", type=float, default=DEFAULT_MAX_GROWTH_KB)
+    parser.add_argument("--max-rss-growth-kb", type=float,
+                        default=DEFAULT_MAX_RSS_GROWTH_KB)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+    if args.games < 2:
+        raise SystemExit("Error: --games must be >= 2")
+
+    logging.getLogger("werewolf").setLevel(logging.ERROR)
+    results = run_suite(
+        args.players, args.agents, args.games, args.warmup, args.seed_start,
+        progress=_print_case,
+    )
+    write_results(args.output, results)
+    print(f"Results: {args.output}")
+    failures = over_budget(results, args.max_growth_kb, args.max_rss_growth_kb)
+    for failure in failures:
+        print(f"  GROWTH {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
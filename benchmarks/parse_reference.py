@@ -0,0 +1,155 @@
+"""Frozen copy of the response parser as it was before the linear
+rewrite in werewolf/agents/response_parser.py.
+
+It is the oracle for tests/test_response_parser.py (identical output on
+the fuzz corpus) and the baseline for benchmarks/parsing.py (scaling).
+Do not fix bugs here: it must keep behaving like the old code.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Optional
+
+
+def repair_json(text: str) -> Optional[str]:
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    chars = []
+    i = start
+    in_string = False
+    brace_depth = 0
+    bracket_depth = 0
+
+    while i < len(text):
+        c = text[i]
+
+        if in_string:
+            if c == "\\" and i + 1 < len(text):
+                next_c = text[i + 1]
+                if next_c in '"\\bfnrtu/':
+                    chars.append(c)
+                    chars.append(next_c)
+                else:
+                    chars.append("\\\\")
+                    chars.append(next_c)
+                i += 2
+                continue
+            if c == '"':
+                rest = text[i + 1:].lstrip()
+                if not rest or rest[0] in ":,}]":
+                    in_string = False
+                    chars.append(c)
+                else:
+                    chars.append('\\"')
+                i += 1
+                continue
+            if c in "\n\r":
+                chars.append("\\n")
+                i += 1
+                continue
+            if c == "\t":
+                chars.append("\\t")
+                i += 1
+                continue
+            chars.append(c)
+            i += 1
+            continue
+
+        if c == '"':
+            in_string = True
+        elif c == "{":
+            brace_depth += 1
+        elif c == "}":
+            brace_depth -= 1
+        elif c == "[":
+            bracket_depth += 1
+        elif c == "]":
+            bracket_depth -= 1
+
+        chars.append(c)
+        i += 1
+
+        if brace_depth == 0 and bracket_depth <= 0:
+            break
+
+    if in_string:
+        chars.append('"')
+
+    joined = "".join(chars).rstrip()
+    if joined.endswith(":"):
+        last_quote = joined.rfind('"', 0, len(joined) - 1)
+        if last_quote != -1:
+            second_last = joined.rfind('"', 0, last_quote)
+            if second_last != -1:
+                joined = joined[:second_last].rstrip().rstrip(",")
+        else:
+            joined = joined[:-1].rstrip().rstrip(",")
+    elif joined.endswith(","):
+        joined = joined[:-1]
+
+    while bracket_depth > 0:
+        joined += "]"
+        bracket_depth -= 1
+    while brace_depth > 0:
+        joined += "}"
+        brace_depth -= 1
+
+    try:
+        json.loads(joined)
+        return joined
+    except json.JSONDecodeError:
+        return None
+
+def regex_extract(text: str) -> Optional[dict]:
+    result = {}
+    action = {}
+
+    for key in ("vote_target", "kill_target", "divine_target"):
+        m = re.search(rf'"{key}"\s*:\s*"?(\w+)"?', text)
+        if m:
+            action[key] = m.group(1)
+
+    for channel in ("public", "werewolf"):
+        m = re.search(
+            rf'"{channel}"\s*:\s*"((?:[^"\\]|\\.)*)"',
+            text,
+        )
+        if m:
+            result.setdefault("say", {})[channel] = m.group(1)
+
+    if not action and "say" not in result:
+        return None
+
+    if action:
+        result["action"] = action
+    else:
+        result["action"] = None
+    result.setdefault("say", None)
+    result["thought"] = "[recovered from malformed response]"
+    return result
+
+
+def parse_response(raw: str) -> tuple[Optional[dict], Optional[str]]:
+    """Returns (parsed_dict, method) where method is one of
+    'direct' | 'repaired' | 'regex', or (None, None) on failure."""
+    content = raw.strip()
+    brace = content.find("{")
+    if brace != -1:
+        try:
+            obj, _ = json.JSONDecoder().raw_decode(content, brace)
+            if isinstance(obj, dict):
+                return obj, "direct"
+        except json.JSONDecodeError:
+            pass
+        repaired = repair_json(content)
+        if repaired:
+            obj = json.loads(repaired)
+            if isinstance(obj, dict):
+                return obj, "repaired"
+    extracted = regex_extract(raw)
+    if extracted:
+        return extracted, "regex"
+    return None, None
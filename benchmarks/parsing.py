@@ -0,0 +1,180 @@
+"""Response parsing benchmark: parse time against response length.
+
+Times werewolf.agents.response_parser.parse_response on synthetic model
+responses from 1 to 320 KB, next to the pre-rewrite parser frozen in
+benchmarks/parse_reference.py, for each kind of response:
+- valid: well-formed JSON after a prose preamble ("direct")
+- quotes: a long thought full of unescaped quotes ("repaired")
+- truncated: cut off mid-string ("repaired")
+- regex: not JSON at all, only salvageable fields ("regex")
+
+Every case first checks that both parsers return the same result. Per
+case it reports parse_us and reference_parse_us (best of --repeats,
+each a mean over enough calls to fill ~20 ms) and the speedup. Per kind,
+a "<kind>/scaling" case reports scaling_exponent: the log-log slope of
+parse time against size, 1.0 for linear and 2.0 for quadratic. The
+command exits 1 when any kind's exponent exceeds --max-exponent.
+
+Usage:
+    python -m benchmarks.parsing [--sizes-kb 1 5 20 80 320]
+        [--kinds valid quotes truncated regex] [--repeats 5] [--output PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import statistics
+import time
+
+from benchmarks import parse_reference
+from benchmarks.results import new_results, write_results
+from werewolf.agents.response_parser import parse_response
+
+SUITE = "parsing"
+
+SIZES_KB = (1, 5, 20, 80, 320)
+KINDS = ("valid", "quotes", "truncated", "regex")
+EXPECTED_METHOD = {
+    "valid": "direct", "quotes": "repaired", "truncated": "repaired", "regex": "regex",
+}
+DEFAULT_REPEATS = 5
+DEFAULT_OUTPUT = "outputs/bench/parsing.json"
+DEFAULT_MAX_EXPONENT = 1.3
+TARGET_SECONDS = 0.02
+
+_SENTENCE = 'P3 said "I am the seer" but P5 doubts it, so P3 is "probably" lying. '
+_TAIL = '", "action": {"vote_target": 3}, "say": {"public": "I vote P3."}}'
+
+
+def make_response(kind: str, size: int) -> str:
+    """A response of about size characters."""
+    filler = (_SENTENCE * (size // len(_SENTENCE) + 1))[:size]
+    if kind == "valid":
+        thought = filler.replace('"', "'")
+        return "Here is my move:\n" + '{"thought": "' + thought + _TAIL
+    if kind == "quotes":
+        return '{"thought": "' + filler + _TAIL
+    if kind == "truncated":
+        return '{"action": {"vote_target": 3}, "thought": "' + filler
+    if kind == "regex":
+        return filler.replace("{", "(") + ' "vote_target": 3, "public": "I vote P3."'
+    raise ValueError(f"Unknown response kind {kind!r}")
+
+
+def time_call(fn, raw: str, repeats: int) -> float:
+    """Best-of-repeats mean microseconds per call."""
+    start = time.perf_counter()
+    fn(raw)
+    once = max(time.perf_counter() - start, 1e-7)
+    number = max(1, int(TARGET_SECONDS / once))
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(raw)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+def scaling_exponent(sizes, times) -> float:
+    """Least-squares slope of log(time) against log(size)."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(t) for t in times]
+    x_mean, y_mean = statistics.mean(xs), statistics.mean(ys)
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    return numerator / sum((x - x_mean) ** 2 for x in xs)
+
+
+def run_kind(kind: str, sizes_kb, repeats: int) -> dict:
+    cases = {}
+    sizes, new_times, reference_times = [], [], []
+    for size_kb in sizes_kb:
+        raw = make_response(kind, size_kb * 1024)
+        parsed = parse_response(raw)
+        if parsed != parse_reference.parse_response(raw):
+            raise AssertionError(f"{kind}/{size_kb}kb: parsers disagree")
+        if parsed[1] != EXPECTED_METHOD[kind]:
+            raise AssertionError(
+                f"{kind}/{size_kb}kb: parsed by {parsed[1]!r}, "
+                f"expected {EXPECTED_METHOD[kind]!r}"
+            )
+        new_us = time_call(parse_response, raw, repeats)
+        reference_us = time_call(parse_reference.parse_response, raw, repeats)
+        cases[f"{kind}/{size_kb}kb"] = {
+            "params": {"kind": kind, "size_kb": size_kb, "parse_method": parsed[1]},
+            "metrics": {
+                "parse_us": new_us,
+                "reference_parse_us": reference_us,
+                "speedup": reference_us / new_us,
+            },
+        }
+        sizes.append(len(raw))
+        new_times.append(new_us)
+        reference_times.append(reference_us)
+    if len(sizes) > 1:
+        cases[f"{kind}/scaling"] = {
+            "params": {"kind": kind, "sizes_kb": list(sizes_kb)},
+            "metrics": {
+                "scaling_exponent": scaling_exponent(sizes, new_times),
+                "reference_scaling_exponent": scaling_exponent(sizes, reference_times),
+            },
+        }
+    return cases
+
+
+def run_suite(sizes_kb=SIZES_KB, kinds=KINDS, repeats: int = DEFAULT_REPEATS,
+              progress=None) -> dict:
+    results = new_results(SUITE, {
+        "sizes_kb": list(sizes_kb), "kinds": list(kinds), "repeats": repeats,
+    })
+    for kind in kinds:
+        for name, case in run_kind(kind, sizes_kb, repeats).items():
+            results["cases"][name] = case
+            if progress:
+                progress(name, case["metrics"])
+    return results
+
+
+def over_exponent(results: dict, max_exponent: float) -> list[str]:
+    return [
+        f"{name}: parse time grows as size^{case['metrics']['scaling_exponent']:.2f} "
+        f"(max {max_exponent:.2f})"
+        for name, case in sorted(results["cases"].items())
+        if case["metrics"].get("scaling_exponent", 0.0) > max_exponent
+    ]
+
+
+def _print_case(name: str, metrics: dict) -> None:
+    if "scaling_exponent" in metrics:
+        print(
+            f"  {name:<18} exponent {metrics['scaling_exponent']:.2f} "
+            f"(reference {metrics['reference_scaling_exponent']:.2f})"
+        )
+    else:
+        print(
+            f"  {name:<18} {metrics['parse_us']:10.1f} us  "
+            f"reference {metrics['reference_parse_us']:10.1f} us  "
+            f"x{metrics['speedup']:.1f}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Response parsing benchmark")
+    parser.add_argument("--sizes-kb", type=int, nargs="+", default=list(SIZES_KB))
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--max-exponent", type=float, default=DEFAULT_MAX_EXPONENT)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes_kb, args.kinds, args.repeats, progress=_print_case)
+    write_results(args.output, results)
+    print(f"Results: {args.output}")
+    failures = over_exponent(results, args.max_exponent)
+    for failure in failures:
+        print(f"  SCALING {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
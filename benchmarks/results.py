@@ -0,0 +1,144 @@
+"""Benchmark results files and regression comparison.
+
+A results file is one JSON object:
+
+    {"benchmark_schema_version": 1, "suite": "engine", "created_at": ...,
+     "code_commit": ..., "runtime": {...}, "settings": {...},
+     "cases": {"<case id>": {"params": {...}, "metrics": {...}}}}
+
+Metric values are numbers or one level of nested {name: number} dicts
+(e.g. per-phase timings), flattened as ``phase_ms.day_vote`` when
+compared. Each metric name maps to a direction in METRIC_RULES; unknown
+metrics are reported but never flagged.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from werewolf.engine.game import get_code_commit
+from werewolf.llm.records import utc_now_iso
+from werewolf.reporting.runtime import collect_runtime_metadata
+
+BENCHMARK_SCHEMA_VERSION = 1
+
+HIGHER_IS_BETTER = "higher"
+LOWER_IS_BETTER = "lower"
+
+DEFAULT_TOLERANCE = 0.10
+
+# metric (or prefix before ".") -> (direction, noise floor). Changes where
+# both values sit below the floor are timer noise and never flagged.
+METRIC_RULES = {
+    "games_per_sec": (HIGHER_IS_BETTER, 0.0),
+    "game_ms": (LOWER_IS_BETTER, 0.5),
+    "setup_ms": (LOWER_IS_BETTER, 0.5),
+    "phase_ms": (LOWER_IS_BETTER, 0.5),
+    "alloc_peak_kb": (LOWER_IS_BETTER, 64.0),
+    "alloc_retained_kb": (LOWER_IS_BETTER, 64.0),
+    "alloc_growth_kb": (LOWER_IS_BETTER, 64.0),
+    "rss_growth_kb": (LOWER_IS_BETTER, 1024.0),
+    "log_bytes_per_game": (LOWER_IS_BETTER, 0.0),
+    "parse_us": (LOWER_IS_BETTER, 5.0),
+    "scaling_exponent": (LOWER_IS_BETTER, 1.2),
+}
+
+
+def new_results(suite: str, settings: dict) -> dict:
+    return {
+        "benchmark_schema_version": BENCHMARK_SCHEMA_VERSION,
+        "suite": suite,
+        "created_at": utc_now_iso(),
+        "code_commit": get_code_commit(),
+        "runtime": collect_runtime_metadata(),
+        "settings": settings,
+        "cases": {},
+    }
+
+
+def write_results(path: str, results: dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        results = json.load(f)
+    version = results.get("benchmark_schema_version")
+    if version != BENCHMARK_SCHEMA_VERSION:
+        raise ValueError(
+            f"{path}: benchmark_schema_version {version!r}, "
+            f"expected {BENCHMARK_SCHEMA_VERSION}"
+        )
+    return results
+
+
+def flatten_metrics(metrics: dict) -> dict[str, float]:
+    flat = {}
+    for name, value in metrics.items():
+        if isinstance(value, dict):
+            for key, inner in value.items():
+                if isinstance(inner, (int, float)):
+                    flat[f"{name}.{key}"] = inner
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+@dataclass(frozen=True)
+class MetricChange:
+    case: str
+    metric: str
+    baseline: float
+    current: float
+    change: Optional[float]  # relative to |baseline|; positive = larger value
+    regression: bool
+    improvement: bool
+
+
+def _rule(metric: str):
+    return METRIC_RULES.get(metric.split(".", 1)[0])
+
+
+def compare_results(
+    baseline: dict, current: dict, tolerance: float = DEFAULT_TOLERANCE,
+) -> list[MetricChange]:
+    """Every metric present in both files for cases present in both."""
+    if baseline.get("suite") != current.get("suite"):
+        raise ValueError(
+            f"Cannot compare suite {current.get('suite')!r} against "
+            f"baseline suite {baseline.get('suite')!r}"
+        )
+    changes = []
+    for case in sorted(set(baseline["cases"]) & set(current["cases"])):
+        before = flatten_metrics(baseline["cases"][case]["metrics"])
+        after = flatten_metrics(current["cases"][case]["metrics"])
+        for metric in sorted(set(before) & set(after)):
+            old, new = before[metric], after[metric]
+            # Relative to |old|: growth metrics can have a negative baseline.
+            change = (new - old) / abs(old) if old else None
+            regression = improvement = False
+            rule = _rule(metric)
+            if rule is not None and change is not None:
+                direction, floor = rule
+                if max(abs(old), abs(new)) > floor:
+                    worse = change < 0 if direction == HIGHER_IS_BETTER else change > 0
+                    regression = worse and abs(change) > tolerance
+                    improvement = not worse and abs(change) > tolerance
+            changes.append(MetricChange(
+                case, metric, old, new, change, regression, improvement,
+            ))
+    return changes
+
+
+__all__ = [
+    "BENCHMARK_SCHEMA_VERSION", "DEFAULT_TOLERANCE", "HIGHER_IS_BETTER",
+    "LOWER_IS_BETTER", "METRIC_RULES", "MetricChange", "compare_results",
+    "flatten_metrics", "load_results", "new_results", "write_results",
+]
@@ -0,0 +1,250 @@
+import copy
+import json
+import tempfile
+import unittest
+
+from benchmarks.engine import fake_response
+from werewolf.engine.action_schemas import (
+    ACTION_SCHEMA_VERSION,
+    action_schema,
+    valid_targets,
+)
+from werewolf.engine.game import GameEngine
+from werewolf.engine.validate import validate_action
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.llm.ledger import aggregate_game_summaries
+from werewolf.llm.litellm_provider import build_completion_kwargs
+from werewolf.llm.provider import GenerationConfig, ModelRequest
+from werewolf.llm.xai_provider import HAS_XAI_SCHEMA, build_chat_kwargs
+
+ALIVE = [0, 1, 2, 4, 5]
+WOLVES = [1, 4]
+TARGET_KEYS = {
+    "choose_wolf_kill": "kill_target", "seer_divine": "divine_target",
+    "vote": "vote_target", "runoff_vote": "vote_target",
+}
+
+
+def conforms(value, schema) -> bool:
+    """The subset of JSON Schema the action schemas use."""
+    if "anyOf" in schema:
+        return any(conforms(value, option) for option in schema["anyOf"])
+    kind = schema["type"]
+    if kind == "null":
+        return value is None
+    if kind == "string":
+        return isinstance(value, str)
+    if kind in ("integer", "number"):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        if kind == "integer" and not isinstance(value, int):
+            return False
+        if "enum" in schema and value not in schema["enum"]:
+            return False
+        return schema.get("minimum", value) <= value <= schema.get("maximum", value)
+    if kind == "object":
+        return (
+            isinstance(value, dict)
+            and set(value) == set(schema["required"]) == set(schema["properties"])
+            and all(conforms(value[k], s) for k, s in schema["properties"].items())
+        )
+    raise AssertionError(f"unexpected schema type {kind!r}")
+
+
+def instance(schema):
+    """The first value a schema allows: what a strict provider might send."""
+    if "anyOf" in schema:
+        return instance(schema["anyOf"][0])
+    kind = schema["type"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    if kind == "object":
+        return {k: instance(s) for k, s in schema["properties"].items()}
+    return {"null": None, "string": "notes", "number": 0.5}[kind]
+
+
+def observation(action, self_id=0, role="villager", turn_context=None):
+    obs = {
+        "required_action": action,
+        "self": {"id": self_id, "role": role},
+        "round": 1,
+        "phase": "day_vote",
+        "alive_players": [{"id": pid} for pid in ALIVE],
+        "recent_events": [],
+        "private_info": {"wolf_roster": WOLVES} if role == "werewolf" else {},
+    }
+    if turn_context is not None:
+        obs["turn_context"] = turn_context
+    return obs
+
+
+def observations():
+    yield observation("wolf_chat", 1, "werewolf")
+    yield observation("speak_public", 0)
+    yield observation("speak_public", 4, "werewolf")
+    yield observation("assess_beliefs", 0)
+    yield observation("assess_beliefs", 1, "werewolf")
+    yield observation("choose_wolf_kill", 1, "werewolf")
+    yield observation("seer_divine", 2, "seer")
+    yield observation("vote", 0)
+    yield observation("vote", 4, "werewolf")
+    yield observation("runoff_vote", 2, turn_context={"runoff_candidates": [0, 2, 5]})
+
+
+class SchemaMatchesValidatorTests(unittest.TestCase):
+    def test_schema_instances_are_valid_actions(self):
+        for obs in observations():
+            with self.subTest(action=obs["required_action"], role=obs["self"]["role"]):
+                schema = action_schema(obs)
+                response = instance(schema)
+                self.assertTrue(conforms(response, schema))
+                self.assertEqual(validate_action(obs, response, None), (True, None))
+
+    def test_targets_match_the_validator(self):
+        for obs in observations():
+            key = TARGET_KEYS.get(obs["required_action"])
+            if key is None:
+                continue
+            schema = action_schema(obs)
+            base = instance(schema)
+            for target in range(-1, 8):
+                with self.subTest(action=obs["required_action"], target=target):
+                    response = copy.deepcopy(base)
+                    response["action"] = {key: target}
+                    valid, _ = validate_action(obs, copy.deepcopy(response), None)
+                    self.assertEqual(conforms(response, schema), valid)
+                    self.assertEqual(target in valid_targets(obs), valid)
+
+    def test_beliefs_need_every_other_player(self):
+        for obs in (observation("assess_beliefs", 0), observation("vote", 4, "werewolf")):
+            schema = action_schema(obs)
+            response = instance(schema)
+            self.assertEqual(
+                sorted(response["beliefs"]["wolf_probabilities"]),
+                [str(pid) for pid in ALIVE if pid != obs["self"]["id"]],
+            )
+            del response["beliefs"]["wolf_probabilities"]["2"]
+            self.assertFalse(conforms(response, schema))
+        villager = instance(action_schema(observation("vote", 0)))
+        self.assertIsNone(villager["beliefs"]["estimated_suspicion_of_me"])
+
+    def test_say_channels(self):
+        chat = action_schema(observation("wolf_chat", 1, "werewolf"))
+        self.assertTrue(conforms({"thought": "", "say": {"werewolf": "P2"},
+                                  "action": None, "updated_memory": ""}, chat))
+        self.assertFalse(conforms({"thought": "", "say": {"public": "P2"},
+                                   "action": None, "updated_memory": ""}, chat))
+        kill = action_schema(observation("choose_wolf_kill", 1, "werewolf"))
+        self.assertEqual(kill["properties"]["say"], {"type": "null"})
+
+    def test_no_schema_without_legal_targets(self):
+        obs = observation("runoff_vote", 2, turn_context={"runoff_candidates": [2]})
+        self.assertIsNone(action_schema(obs))
+        self.assertIsNone(action_schema(observation("dance", 0)))
+
+    def test_versioned_title(self):
+        schema = action_schema(observation("vote", 0))
+        self.assertEqual(schema["title"], f"vote_response_v{ACTION_SCHEMA_VERSION}")
+
+
+class ProviderMappingTests(unittest.TestCase):
+    def request(self, **generation):
+        schema = action_schema(observation("vote", 0))
+        return ModelRequest(
+            model="gemini/gemini-3.5-flash", system_prompt="s", user_prompt="u",
+            generation=GenerationConfig(response_schema=True, **generation),
+            response_schema=schema,
+        ), schema
+
+    def test_litellm_sends_a_strict_schema(self):
+        request, schema = self.request()
+        response_format = build_completion_kwargs(request, "k", 10)["response_format"]
+        self.assertEqual(response_format["type"], "json_schema")
+        self.assertEqual(response_format["json_schema"], {
+            "name": schema["title"], "schema": schema, "strict": True,
+        })
+        unsupported = build_completion_kwargs(request, "k", 10, schema_supported=False)
+        self.assertEqual(unsupported["response_format"], {"type": "json_object"})
+
+    def test_xai_sends_a_schema_format(self):
+        request, _ = self.request()
+        response_format = build_chat_kwargs(request)["response_format"]
+        if not HAS_XAI_SCHEMA:
+            self.assertEqual(response_format, "json_object")
+        else:
+            self.assertIn('"vote_target"', response_format.schema)
+
+
+class SchemaProvider(FakeProvider):
+    """Answers every request with the first instance of its schema."""
+
+    def complete(self, request):
+        self.requests.append(request)
+        return success_result(instance(request.response_schema))
+
+
+class EngineSchemaTests(unittest.TestCase):
+    def play(self, tmpdir, provider, response_schema):
+        engine = GameEngine(
+            n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+            api_key="", transcript_enabled=False, show_all_channels=False,
+            provider=provider,
+            generation_config=GenerationConfig(response_schema=response_schema),
+        )
+        engine.run()
+        return engine.ledger.game_summary()
+
+    def test_schemas_remove_invalid_action_retries(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            before = self.play(
+                tmpdir, FakeProvider(default=success_result(fake_response(7))), False,
+            )
+            provider = SchemaProvider()
+            after = self.play(tmpdir, provider, True)
+
+        self.assertTrue(all(r.response_schema for r in provider.requests))
+        self.assertTrue(any(
+            counts["invalid_game_action"] for counts in before["reliability_by_action"].values()
+        ))
+        for action, counts in after["reliability_by_action"].items():
+            with self.subTest(action=action):
+                self.assertEqual(counts["retry_rate"], 0.0)
+                self.assertEqual(counts["malformed_json"] + counts["invalid_game_action"], 0)
+                self.assertEqual(counts["fallbacks"], 0)
+                self.assertEqual(counts["repair_rate"], 0.0)
+        self.assertEqual(after["retries"], 0)
+
+        batch = aggregate_game_summaries([before, after])
+        vote = batch["reliability_by_action"]["vote"]
+        self.assertEqual(
+            vote["turns"],
+            before["reliability_by_action"]["vote"]["turns"]
+            + after["reliability_by_action"]["vote"]["turns"],
+        )
+        self.assertEqual(
+            vote["retry_rate"],
+            round((vote["attempts"] - vote["turns"]) / vote["turns"], 4),
+        )
+
+    def test_records_name_the_schema(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = GameEngine(
+                n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                api_key="", transcript_enabled=False, show_all_channels=False,
+                provider=SchemaProvider(),
+                generation_config=GenerationConfig(response_schema=True),
+            )
+            engine.run()
+        records = [r for r in engine.ledger.records if r.api_attempted]
+        self.assertTrue(records)
+        for record in records:
+            self.assertEqual(
+                record.provider_metadata["response_schema"],
+                f"{record.context.required_action}_response_v{ACTION_SCHEMA_VERSION}",
+            )
+            self.assertTrue(record.requested_generation["response_schema"])
+            json.dumps(record.to_json_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
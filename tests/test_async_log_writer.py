@@ -0,0 +1,138 @@
+import json
+import tempfile
+import time
+import unittest
+
+from werewolf.engine.game import GameEngine
+from werewolf.engine.log_writer import AsyncLogWriter
+from werewolf.engine.logging import DURABILITY_PHASE, JSONLLogger
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.llm.ledger import UsageLedger
+from tests.test_belief_snapshots_engine import full_beliefs_response
+from tests.test_usage_ledger import make_record
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def run_game(tmpdir, **kwargs):
+    engine = GameEngine(
+        n_players=4, n_wolves=1, n_seers=0, seed=11,
+        output_dir=tmpdir, api_key="",
+        provider=FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=100)
+        ),
+        transcript_enabled=False, show_all_channels=False, **kwargs,
+    )
+    engine.run()
+    return engine
+
+
+def shape(rows):
+    return [(row["type"], row.get("event", {}).get("id")) for row in rows]
+
+
+class AsyncLogWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.writer = AsyncLogWriter(queue_size=2)
+
+    def tearDown(self):
+        self.writer.close()
+        self.tmp.cleanup()
+
+    def test_rows_are_ordered_per_game(self):
+        logs = [JSONLLogger(self.tmp.name, f"g{i}", writer=self.writer) for i in range(2)]
+        for n in range(50):
+            for log in logs:
+                log.log_event({"id": n})
+        for log in logs:
+            log.close()
+            self.assertEqual(
+                [row["event"]["id"] for row in read_rows(log.filepath)],
+                list(range(50)),
+            )
+        stats = self.writer.stats()
+        self.assertEqual(stats["records"], 100)
+        self.assertLessEqual(stats["max_queue_depth"], 2)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_full_queue_blocks_instead_of_dropping(self):
+        log = JSONLLogger(self.tmp.name, "g1", writer=self.writer)
+        original = log._write_now
+
+        def slow_write(obj):
+            time.sleep(0.002)
+            original(obj)
+
+        log._write_now = slow_write
+        for n in range(20):
+            log.log_event({"id": n})
+        self.assertGreater(self.writer.stats()["put_wait_ms"], 0)
+        log.flush()
+        self.assertEqual(len(read_rows(log.filepath)), 20)
+        log.close()
+
+    def test_buffered_durability_runs_on_writer(self):
+        log = JSONLLogger(
+            self.tmp.name, "g1", durability=DURABILITY_PHASE, writer=self.writer,
+        )
+        log.log_event({"id": 1})
+        self.writer.drain()
+        self.assertEqual(read_rows(log.filepath), [])
+        log.handle("phase_boundary", {})
+        log.flush()
+        self.assertEqual(len(read_rows(log.filepath)), 1)
+        log.close()
+        self.assertTrue(log.file.closed)
+
+    def test_write_errors_surface_on_logging_thread(self):
+        log = JSONLLogger(self.tmp.name, "g1", writer=self.writer)
+
+        def broken(obj):
+            raise OSError("disk full")
+
+        log._write_now = broken
+        with self.assertLogs("werewolf.log_writer", level="ERROR"):
+            log.log_event({"id": 1})
+            with self.assertRaises(OSError):
+                log.flush()
+        self.assertEqual(self.writer.stats()["errors"], 1)
+        log.close()
+
+    def test_closed_writer_rejects_rows(self):
+        log = JSONLLogger(self.tmp.name, "g1", writer=self.writer)
+        log.close()
+        self.writer.close()
+        with self.assertRaises(RuntimeError):
+            self.writer.drain()
+
+
+class EngineAsyncLogTests(unittest.TestCase):
+    def test_async_log_matches_inline_log(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inline = read_rows(run_game(tmpdir).logger.filepath)
+        writer = AsyncLogWriter()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = run_game(tmpdir, log_writer=writer)
+            rows = read_rows(engine.logger.filepath)
+        writer.close()
+        self.assertEqual(shape(rows), shape(inline))
+        self.assertEqual(rows[0]["log_durability"]["writer"], "async")
+        self.assertEqual(inline[0]["log_durability"]["writer"], "inline")
+        self.assertEqual(writer.stats()["records"], len(rows))
+
+    def test_ledger_sink_runs_outside_lock(self):
+        ledger = UsageLedger()
+        held = []
+        ledger._sink = lambda row: held.append(ledger._lock.locked())
+        ledger.record(make_record())
+        ledger.record(make_record())
+        self.assertEqual(held, [False, False])
+        self.assertEqual(ledger.count(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import tempfile
+import unittest
+
+from tests.test_belief_metrics import build_rows, snapshot_event
+from tests.test_instrumentation_isolation import player_visible_events, scripted_response
+from werewolf.cli.run_game import belief_sampling_from_args
+from werewolf.engine.belief_sampling import BeliefSampling, SamplingDesign
+from werewolf.engine.game import GameEngine
+from werewolf.evaluation.belief_metrics import aggregate_belief_metrics, compute_game_metrics
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.reporting.analysis import build_belief_analysis
+
+POLICY = {"sampling_version": 1, "every_k_rounds": 1,
+          "observer_fraction": 0.5, "max_rounds": None}
+
+
+def design_event(round_, frame, sampled):
+    n, size = len(sampled), len(frame)
+    return {"type": "event", "event": {
+        "id": 0, "round": round_, "phase": "day_assess",
+        "type": "belief_sample", "channel": "moderator_only",
+        "speaker_id": None,
+        "payload": {
+            "sampling_version": 1, "checkpoint": "pre_discussion",
+            "frame_ids": frame, "sampled_ids": sampled, "every_k_rounds": 1,
+            "inclusion_probability": n / size,
+            "pair_inclusion_probability": n * (n - 1) / (size * (size - 1)),
+        },
+    }}
+
+
+def sampled_rows():
+    """P0, P1 villagers, P2 the wolf. Round 1 sampled only P0 (weight 3):
+    P0 goes from right to wrong (harmful). Round 2 is a census (weight 1):
+    P0 stays right, P1 goes from wrong to right (beneficial)."""
+    config = {"type": "config", "belief_sampling": POLICY, "role_map": {
+        "0": {"role": "villager", "team": "village"},
+        "1": {"role": "villager", "team": "village"},
+        "2": {"role": "werewolf", "team": "wolf"},
+    }}
+    return [
+        config,
+        design_event(1, [0, 1, 2], [0]),
+        snapshot_event(1, 0, "pre_discussion", {1: 0.2, 2: 0.7}),
+        snapshot_event(1, 0, "post_discussion", {1: 0.8, 2: 0.3}),
+        snapshot_event(1, 1, "post_discussion", {0: 0.2, 2: 0.9}),
+        snapshot_event(1, 2, "post_discussion", {0: 0.0, 1: 0.0}),
+        design_event(2, [0, 1, 2], [0, 1, 2]),
+        snapshot_event(2, 0, "pre_discussion", {1: 0.2, 2: 0.7}),
+        snapshot_event(2, 1, "pre_discussion", {0: 0.6, 2: 0.3}),
+        snapshot_event(2, 2, "pre_discussion", {0: 0.0, 1: 0.0}),
+        snapshot_event(2, 0, "post_discussion", {1: 0.1, 2: 0.9}),
+        snapshot_event(2, 1, "post_discussion", {0: 0.2, 2: 0.9}),
+        snapshot_event(2, 2, "post_discussion", {0: 0.0, 1: 0.0}),
+    ]
+
+
+def run_game(belief_sampling=None):
+    provider = FakeProvider(default=success_result(scripted_response()))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = GameEngine(
+            n_players=4, n_wolves=1, n_seers=0, seed=23,
+            output_dir=tmpdir, api_key="", provider=provider,
+            transcript_enabled=False, show_all_channels=False,
+            belief_sampling=belief_sampling,
+        )
+        engine.run()
+        with open(engine.logger.filepath, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    return provider, rows
+
+
+def events_of(rows, event_type):
+    return [r["event"] for r in rows
+            if r["type"] == "event" and r["event"]["type"] == event_type]
+
+
+class PolicyTests(unittest.TestCase):
+    def test_selection_is_seeded_and_sized(self):
+        policy = BeliefSampling(observer_fraction=0.4)
+        picked = policy.select(7, 2, [6, 1, 3, 0, 4])
+        self.assertEqual(len(picked), 2)
+        self.assertEqual(picked, sorted(picked))
+        self.assertEqual(picked, policy.select(7, 2, [0, 1, 3, 4, 6]))
+        self.assertEqual(len(BeliefSampling(observer_fraction=0.01).select(7, 1, [1, 2])), 1)
+
+        rounds = BeliefSampling(every_k_rounds=2, max_rounds=3)
+        self.assertEqual([r for r in range(1, 7) if rounds.round_sampled(r)], [1, 3])
+        self.assertEqual(rounds.select(7, 2, [1, 2, 3]), [])
+        payload = BeliefSampling(observer_fraction=0.5).design_payload(7, 1, [0, 1, 2, 3])
+        self.assertEqual(payload["inclusion_probability"], 0.5)
+        self.assertAlmostEqual(payload["pair_inclusion_probability"], 1 / 6)
+
+    def test_validation_census_and_round_trip(self):
+        for kwargs in ({"every_k_rounds": 0}, {"observer_fraction": 0.0},
+                       {"observer_fraction": 1.5}, {"max_rounds": True}):
+            with self.assertRaises(ValueError):
+                BeliefSampling(**kwargs)
+        self.assertTrue(BeliefSampling().census)
+        policy = BeliefSampling(every_k_rounds=3, observer_fraction=0.25, max_rounds=4)
+        self.assertEqual(BeliefSampling.from_json_dict(policy.to_json_dict()), policy)
+
+        args = argparse.Namespace(belief_every_k=1, belief_observer_fraction=1.0,
+                                  belief_max_rounds=None)
+        self.assertIsNone(belief_sampling_from_args(args))
+        args.belief_every_k = 0
+        with self.assertRaises(SystemExit):
+            belief_sampling_from_args(args)
+
+
+class EngineTests(unittest.TestCase):
+    def test_sampled_game_asks_fewer_players_and_plays_the_same(self):
+        census_provider, census_rows = run_game()
+        provider, rows = run_game(BeliefSampling(observer_fraction=0.5))
+
+        self.assertEqual(player_visible_events(rows), player_visible_events(census_rows))
+        self.assertLess(len(provider.requests), len(census_provider.requests))
+        self.assertIsNone(census_rows[0]["belief_sampling"])
+        self.assertEqual(rows[0]["belief_sampling"]["observer_fraction"], 0.5)
+        self.assertEqual(events_of(census_rows, "belief_sample"), [])
+
+        designs = events_of(rows, "belief_sample")
+        self.assertTrue(designs)
+        pre = [e for e in events_of(rows, "belief_snapshot")
+               if e["payload"]["checkpoint"] == "pre_discussion"]
+        for design in designs:
+            self.assertEqual(design["channel"], "moderator_only")
+            payload = design["payload"]
+            self.assertEqual(len(payload["sampled_ids"]),
+                             (len(payload["frame_ids"]) + 1) // 2)
+            self.assertEqual(
+                sorted(e["speaker_id"] for e in pre if e["round"] == design["round"]),
+                payload["sampled_ids"],
+            )
+        metrics = compute_game_metrics(rows)
+        self.assertEqual(metrics["coverage"]["pre_discussion"]["not_sampled"],
+                         metrics["sampling"]["not_sampled"])
+        self.assertGreater(metrics["sampling"]["not_sampled"], 0)
+
+
+class WeightedMetricsTests(unittest.TestCase):
+    def test_pre_dependent_metrics_are_design_weighted(self):
+        metrics = compute_game_metrics(sampled_rows())
+        self.assertEqual(metrics["coverage"]["pre_discussion"],
+                         {"emitted": 4, "valid": 4, "not_sampled": 2})
+        self.assertEqual(metrics["harmful_revision"]["n"], 2)
+        self.assertEqual(metrics["harmful_revision"]["weighted_n"], 4.0)
+        self.assertAlmostEqual(metrics["harmful_revision"]["rate"], 0.75)
+        self.assertAlmostEqual(metrics["initial_correctness"]["rate"], 0.8)
+        self.assertEqual(metrics["beneficial_revision"]["rate"], 1.0)
+        self.assertEqual(metrics["calibration_brier"]["weighted_n_post"],
+                         metrics["calibration_brier"]["n_post"])
+
+        census = compute_game_metrics(build_rows())
+        self.assertNotIn("not_sampled", census["coverage"]["pre_discussion"])
+        self.assertEqual(census["harmful_revision"]["weighted_n"],
+                         census["harmful_revision"]["n"])
+        rollup = aggregate_belief_metrics([metrics, census])
+        self.assertAlmostEqual(rollup["harmful_revision"]["rate"], (0.75 * 4 + 1.0) / 5)
+        self.assertEqual(rollup["harmful_revision"]["n"], 3)
+        self.assertEqual(rollup["coverage"]["pre_discussion"]["not_sampled"], 2)
+        self.assertEqual(rollup["sampled_games"], 1)
+
+    def test_report_analysis_marks_skips_and_weights_revisions(self):
+        rows = sampled_rows()
+        timeline = [r["event"] for r in rows if r["type"] == "event"]
+        beliefs = build_belief_analysis(rows[0], timeline)
+        statuses = {(c["round"], c["observer_id"], c["checkpoint"]): c["status"]
+                    for c in beliefs["checkpoints"]}
+        self.assertEqual(statuses[(1, 1, "pre_discussion")], "not_sampled")
+        self.assertEqual(statuses[(1, 0, "pre_discussion")], "valid")
+        self.assertNotIn("missing", statuses.values())
+        self.assertEqual(beliefs["coverage"]["pre_discussion"]["not_sampled"], 2)
+        weighted = beliefs["summary"]["weighted"]
+        self.assertEqual(weighted["harmful_revisions"], 3.0)
+        self.assertAlmostEqual(weighted["harmful_revision_rate"], 0.75)
+        self.assertEqual(beliefs["summary"]["harmful_revisions"], 1)
+        self.assertEqual(SamplingDesign.from_rows(rows).summary()["sampled_rounds"], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
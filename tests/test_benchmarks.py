@@ -0,0 +1,112 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks import compare
+from benchmarks import memory
+from benchmarks import parsing
+from benchmarks.engine import run_suite
+from benchmarks.results import compare_results, load_results, new_results, write_results
+
+
+def results_with(metrics: dict) -> dict:
+    results = new_results("engine", {})
+    results["cases"]["fake/p7/c1"] = {"params": {}, "metrics": metrics}
+    return results
+
+
+class CompareResultsTests(unittest.TestCase):
+    def test_direction_tolerance_and_noise_floor(self):
+        baseline = results_with({
+            "games_per_sec": 100.0, "game_ms": 10.0,
+            "phase_ms": {"day_vote": 0.1, "day_discuss": 4.0},
+            "log_bytes_per_game": 1000, "events_per_game": 50,
+        })
+        current = results_with({
+            "games_per_sec": 80.0, "game_ms": 10.5,
+            "phase_ms": {"day_vote": 0.3, "day_discuss": 3.0},
+            "log_bytes_per_game": 1200, "events_per_game": 90,
+        })
+        changes = {c.metric: c for c in compare_results(baseline, current, 0.1)}
+        self.assertTrue(changes["games_per_sec"].regression)
+        self.assertFalse(changes["game_ms"].regression)  # within tolerance
+        self.assertFalse(changes["phase_ms.day_vote"].regression)  # timer noise
+        self.assertTrue(changes["phase_ms.day_discuss"].improvement)
+        self.assertTrue(changes["log_bytes_per_game"].regression)
+        self.assertFalse(changes["events_per_game"].regression)  # no rule
+
+    def test_growth_from_a_negative_baseline_is_a_regression(self):
+        baseline = results_with({"alloc_growth_kb": -100.0, "rss_growth_kb": -2048.0})
+        leak = results_with({"alloc_growth_kb": 900.0, "rss_growth_kb": 8192.0})
+        changes = {c.metric: c for c in compare_results(baseline, leak, 0.1)}
+        for metric, change in (("alloc_growth_kb", 10.0), ("rss_growth_kb", 5.0)):
+            self.assertAlmostEqual(changes[metric].change, change)
+            self.assertTrue(changes[metric].regression, metric)
+            self.assertFalse(changes[metric].improvement, metric)
+        shrink = results_with({"alloc_growth_kb": -500.0, "rss_growth_kb": -4096.0})
+        changes = {c.metric: c for c in compare_results(baseline, shrink, 0.1)}
+        self.assertTrue(changes["alloc_growth_kb"].improvement)
+        self.assertTrue(changes["rss_growth_kb"].improvement)
+
+    def test_compare_command_exit_code(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base, fast, slow = (Path(tmpdir) / f"{n}.json" for n in ("b", "f", "s"))
+            write_results(str(base), results_with({"games_per_sec": 100.0}))
+            write_results(str(fast), results_with({"games_per_sec": 105.0}))
+            write_results(str(slow), results_with({"games_per_sec": 50.0}))
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(compare.main([str(base), str(fast)]), 0)
+                self.assertEqual(compare.main([str(base), str(slow)]), 1)
+
+    def test_rejects_other_schema_versions(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "old.json"
+            path.write_text(json.dumps({"benchmark_schema_version": 0}))
+            with self.assertRaises(ValueError):
+                load_results(str(path))
+
+
+class EngineSuiteTests(unittest.TestCase):
+    def test_suite_reports_every_metric(self):
+        results = run_suite(players=[7], cycles=[1], agents=["fake", "scripted"],
+                            games=1, repeats=1)
+        self.assertEqual(set(results["cases"]), {"fake/p7/c1", "scripted/p7/c1"})
+        fake = results["cases"]["fake/p7/c1"]["metrics"]
+        scripted = results["cases"]["scripted/p7/c1"]["metrics"]
+        for key in ("games_per_sec", "phase_ms", "alloc_peak_kb", "log_bytes_per_game"):
+            self.assertIn(key, fake)
+        self.assertGreater(fake["llm_calls_per_game"], 0)
+        self.assertEqual(scripted["llm_calls_per_game"], 0)
+        self.assertIn("day_vote", fake["phase_ms"])
+
+
+class MemorySuiteTests(unittest.TestCase):
+    def test_consecutive_games_do_not_grow(self):
+        results = memory.run_suite(players=[7], agents=["scripted"], games=4, warmup=1)
+        case = results["cases"]["scripted/p7/c2"]
+        self.assertEqual(len(case["samples"]["traced_kb"]), 4)
+        self.assertEqual(memory.over_budget(
+            results, memory.DEFAULT_MAX_GROWTH_KB, memory.DEFAULT_MAX_RSS_GROWTH_KB,
+        ), [])
+        case["metrics"]["alloc_growth_kb"] = memory.DEFAULT_MAX_GROWTH_KB + 1
+        self.assertEqual(len(memory.over_budget(
+            results, memory.DEFAULT_MAX_GROWTH_KB, memory.DEFAULT_MAX_RSS_GROWTH_KB,
+        )), 1)
+
+
+class ParsingSuiteTests(unittest.TestCase):
+    def test_every_kind_parses_as_expected(self):
+        results = parsing.run_suite(sizes_kb=[1, 4], repeats=1)
+        for kind in parsing.KINDS:
+            case = results["cases"][f"{kind}/4kb"]
+            self.assertEqual(case["params"]["parse_method"], parsing.EXPECTED_METHOD[kind])
+            self.assertIn("scaling_exponent", results["cases"][f"{kind}/scaling"]["metrics"])
+        results["cases"]["quotes/scaling"]["metrics"]["scaling_exponent"] = 2.0
+        self.assertEqual(len(parsing.over_exponent(results, 1.3)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
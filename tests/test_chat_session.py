@@ -0,0 +1,107 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks.engine import fake_response
+from werewolf.agents.prompts import get_prompt_version
+from werewolf.engine.game import GameEngine
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.llm.litellm_provider import build_messages
+from werewolf.llm.provider import ModelRequest
+
+
+def play(tmpdir, prompt_layout="chat"):
+    provider = FakeProvider(default=success_result(fake_response(7)))
+    engine = GameEngine(
+        n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+        api_key="", provider=provider, transcript_enabled=False,
+        show_all_channels=False, prompt_layout=prompt_layout,
+    )
+    engine.run()
+    return engine, provider
+
+
+def requests_by_player(provider):
+    by_player: dict[str, list[ModelRequest]] = {}
+    for request in provider.requests:
+        by_player.setdefault(request.system_prompt, []).append(request)
+    return by_player.values()
+
+
+class ChatSessionTests(unittest.TestCase):
+    def test_history_is_append_only_and_turns_are_deltas(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine, provider = play(tmpdir)
+            config = load_rows(engine.logger.filepath)[0]
+        self.assertEqual(config["prompt_version"], get_prompt_version("chat"))
+        self.assertNotEqual(config["prompt_version"], get_prompt_version())
+        self.assertEqual(config["prompt_layout"]["name"], "chat")
+        self.assertIn("history_max_tokens", config["prompt_layout"])
+
+        for requests in requests_by_player(provider):
+            self.assertEqual(requests[0].history, [])
+            self.assertIn("=== YOUR MEMORY ===", requests[0].user_prompt)
+            for earlier, later in zip(requests, requests[1:]):
+                self.assertEqual(later.history[:len(earlier.history)], earlier.history)
+            for request in requests:
+                self.assertEqual(request.cache_prefix_chars, 0)
+                self.assertEqual(
+                    [m["role"] for m in request.history],
+                    ["user", "assistant"] * (len(request.history) // 2),
+                )
+                sent_before = "\n".join(m["content"] for m in request.history)
+                for line in request.user_prompt.split("\n"):
+                    if line.startswith("[PUBLIC]") or line.startswith("[VOTE]"):
+                        self.assertNotIn(line, sent_before)
+        self.assertTrue(any(
+            "same rules and JSON format" in request.user_prompt
+            for request in provider.requests
+        ))
+
+    def test_belief_assessments_stay_out_of_the_session(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine, provider = play(tmpdir)
+        assessed = [
+            r.user_prompt for r in provider.requests
+            if "Private Assessment" in r.user_prompt
+        ]
+        self.assertTrue(assessed)
+        for agent in engine.agents.values():
+            kept = {m["content"] for m in agent.session}
+            self.assertFalse(kept & set(assessed))
+
+    def test_eviction_keeps_session_within_budget(self):
+        with mock.patch("werewolf.agents.ai_agent.CHAT_HISTORY_MAX_TOKENS", 400):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                engine, provider = play(tmpdir)
+        agents = list(engine.agents.values())
+        self.assertTrue(any(agent.session_evictions for agent in agents))
+        for agent in agents:
+            if len(agent.session) > 2:
+                self.assertLessEqual(agent._session_tokens(), 400)
+        for requests in requests_by_player(provider):
+            for earlier, later in zip(requests, requests[1:]):
+                if len(later.history) < len(earlier.history):
+                    self.assertIn("=== YOUR MEMORY ===", later.user_prompt)
+
+    def test_cache_hints_mark_the_last_turn(self):
+        history = [
+            {"role": "user", "content": "turn 1"},
+            {"role": "assistant", "content": "{}"},
+        ]
+        request = ModelRequest(
+            model="anthropic/claude-haiku-4-5", system_prompt="rules",
+            user_prompt="turn 2", history=history, cache_prefix_chars=0,
+        )
+        messages = build_messages(request)
+        self.assertEqual([m["role"] for m in messages],
+                         ["system", "user", "assistant", "user"])
+        self.assertEqual(messages[1]["content"], "turn 1")
+        self.assertIn("cache_control", messages[2]["content"][0])
+        self.assertEqual(messages[3]["content"], [{"type": "text", "text": "turn 2"}])
+        self.assertEqual(history[1]["content"], "{}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import gzip
+import hashlib
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from werewolf.engine.game import GameEngine
+from werewolf.engine.logging import DURABILITY_PHASE, JSONLLogger
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.evaluation.validity import classify_game_from_file
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.log_files import (
+    COMPRESSION_GZIP,
+    COMPRESSION_ZSTD,
+    HAS_ZSTD,
+    game_id_from_log_name,
+    read_log_bytes,
+)
+from werewolf.reporting.parser import parse_game_log
+from werewolf.reporting.repository import GameRepository
+from werewolf.web import app as web_app
+from tests.test_belief_snapshots_engine import full_beliefs_response
+from tests.test_report_api import write_private_game
+
+
+def run_game(tmpdir, **kwargs):
+    engine = GameEngine(
+        n_players=5, n_wolves=1, n_seers=0, seed=31,
+        output_dir=tmpdir, api_key="",
+        provider=FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=100)
+        ),
+        transcript_enabled=False, show_all_channels=False, **kwargs,
+    )
+    engine.run()
+    return engine
+
+
+def gzip_log(path: Path) -> Path:
+    target = path.with_name(path.name + ".gz")
+    target.write_bytes(gzip.compress(path.read_bytes()))
+    path.unlink()
+    return target
+
+
+class LogFileTests(unittest.TestCase):
+    def test_game_id_from_log_name(self):
+        self.assertEqual(game_id_from_log_name("game_1_x.jsonl"), "game_1_x")
+        self.assertEqual(game_id_from_log_name("game_1_x.jsonl.gz"), "game_1_x")
+        self.assertEqual(game_id_from_log_name("game_1_x.jsonl.zst"), "game_1_x")
+        self.assertIsNone(game_id_from_log_name("game_1_x.meta.json"))
+
+    def test_committed_rows_survive_unclosed_gzip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = JSONLLogger(
+                tmpdir, "game_1_x", durability=DURABILITY_PHASE,
+                compression=COMPRESSION_GZIP,
+            )
+            log.log_config({"game_id": "game_1_x"})
+            log.log_event({"id": 1})
+            log.commit()
+            log.log_event({"id": 2})  # buffered, lost in the "crash"
+            crashed = Path(tmpdir) / "crashed.jsonl.gz"
+            shutil.copy(log.filepath, crashed)
+            rows = [json.loads(line) for line in read_log_bytes(crashed).splitlines()]
+            log.close()
+        self.assertEqual([row["type"] for row in rows], ["config", "event"])
+
+    @unittest.skipUnless(HAS_ZSTD, "zstandard not installed")
+    def test_zstd_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = run_game(tmpdir, log_compression=COMPRESSION_ZSTD)
+            self.assertTrue(engine.logger.filepath.endswith(".jsonl.zst"))
+            rows = load_rows(engine.logger.filepath)
+        self.assertEqual(rows[-1]["type"], "outcome")
+
+
+class CompressedGameTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.engine = run_game(
+            self.tmp.name, log_compression=COMPRESSION_GZIP,
+            log_durability=DURABILITY_PHASE,
+        )
+        self.path = Path(self.engine.logger.filepath)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_readers_see_canonical_rows(self):
+        self.assertEqual(self.path.suffixes[-2:], [".jsonl", ".gz"])
+        canonical = gzip.decompress(self.path.read_bytes())
+        rows = [json.loads(line) for line in canonical.splitlines()]
+        self.assertEqual(rows[0]["log_durability"]["compression"], "gzip")
+        self.assertEqual(load_rows(self.path), rows)
+        self.assertIn("clean", classify_game_from_file(self.path))
+
+        parsed = parse_game_log(self.path)
+        self.assertEqual(parsed.sha256, hashlib.sha256(canonical).hexdigest())
+        self.assertEqual(parsed.canonical_size, len(canonical))
+        self.assertEqual(parsed.source_size, self.path.stat().st_size)
+        self.assertEqual(parsed.game_id, self.engine.state.game_id)
+        self.assertNotIn(
+            "game_id_mismatch", [w.code for w in parsed.warnings],
+        )
+
+    def test_repository_indexes_compressed_logs(self):
+        plain_path = write_private_game(self.root)
+        plain_sha = hashlib.sha256(plain_path.read_bytes()).hexdigest()
+        gzip_log(plain_path)
+        repository = GameRepository(self.root)
+        entries = {entry["game_id"]: entry for entry in repository.rebuild()}
+        self.assertEqual(
+            set(entries), {self.engine.state.game_id, "game_7_private"},
+        )
+        self.assertEqual(entries["game_7_private"]["log_name"], "game_7_private.jsonl.gz")
+        report = json.loads(repository.report_path("game_7_private").read_text())
+        self.assertEqual(report["source"]["sha256"], plain_sha)
+        self.assertEqual(report["source"]["compression"], "gzip")
+        # Unchanged compressed logs hit the sidecar fast path.
+        self.assertEqual(repository.rebuild(), repository.rebuild())
+
+    def test_raw_endpoint_serves_decompressed_jsonl(self):
+        old_repository = web_app.game_repository
+        web_app.game_repository = GameRepository(self.root)
+        try:
+            client = web_app.app.test_client()
+            response = client.get(f"/api/games/{self.engine.state.game_id}/raw")
+            body = response.get_data()
+        finally:
+            web_app.game_repository = old_repository
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, gzip.decompress(self.path.read_bytes()))
+        self.assertIn(
+            f"{self.engine.state.game_id}.jsonl\"",
+            response.headers["Content-Disposition"],
+        )
+
+    def test_fork_reads_compressed_parent(self):
+        checkpoint = next(
+            cp for cp in self.engine.checkpoints if cp.phase == "day_discuss"
+        )
+        child = self.engine.fork(checkpoint)
+        child.run()
+        rows = load_rows(child.logger.filepath)
+        self.assertTrue(child.logger.filepath.endswith(".jsonl.gz"))
+        self.assertTrue(any(row.get("inherited_from") for row in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
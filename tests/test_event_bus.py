@@ -0,0 +1,128 @@
+import contextlib
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+
+from werewolf.engine.bus import EventBus, EventFeed, Subscriber
+from werewolf.engine.game import GameEngine
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from tests.test_belief_snapshots_engine import full_beliefs_response
+
+
+def make_engine(tmpdir, **kwargs):
+    return GameEngine(
+        n_players=4, n_wolves=1, n_seers=0, seed=11,
+        output_dir=tmpdir, api_key="",
+        provider=FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=100)
+        ),
+        show_all_channels=False, **kwargs,
+    )
+
+
+class EventBusTests(unittest.TestCase):
+    def test_sync_delivery_in_order_with_topic_filter(self):
+        bus = EventBus()
+        seen, events_only = [], []
+        bus.subscribe(lambda topic, payload: seen.append((topic, payload["n"])))
+        bus.subscribe(
+            lambda topic, payload: events_only.append(payload["n"]),
+            topics={"event"},
+        )
+        bus.publish("config", {"n": 0})
+        bus.publish("event", {"n": 1})
+        bus.publish("event", {"n": 2})
+        self.assertEqual(seen, [("config", 0), ("event", 1), ("event", 2)])
+        self.assertEqual(events_only, [1, 2])
+
+    def test_unknown_topic_rejected(self):
+        with self.assertRaises(ValueError):
+            EventBus().subscribe(lambda topic, payload: None, topics={"evnt"})
+
+    def test_sync_errors_propagate(self):
+        bus = EventBus()
+
+        def broken(topic, payload):
+            raise OSError("disk full")
+
+        bus.subscribe(broken)
+        with self.assertRaises(OSError):
+            bus.publish("event", {})
+
+    def test_background_subscriber_is_ordered_and_isolated(self):
+        bus = EventBus()
+        seen = []
+
+        def slow(topic, payload):
+            if payload["n"] == 3:
+                raise RuntimeError("subscriber bug")
+            time.sleep(0.001)
+            seen.append(payload["n"])
+
+        subscription = bus.subscribe(slow, background=True, queue_size=2)
+        with self.assertLogs("werewolf.bus", level="ERROR"):
+            for n in range(10):
+                bus.publish("event", {"n": n})
+            bus.flush()
+        self.assertEqual(seen, [n for n in range(10) if n != 3])
+        self.assertEqual(subscription.errors, 1)
+        self.assertLessEqual(subscription.stats()["max_queue_depth"], 2)
+        bus.close()
+
+    def test_feed_long_poll(self):
+        feed = EventFeed()
+        threading.Timer(0.05, feed, args=("event", {"id": 4})).start()
+        self.assertEqual(feed.wait_for(3, timeout=2.0), [{"id": 4}])
+        self.assertEqual(feed.since(4), [])
+
+
+class EngineBusTests(unittest.TestCase):
+    def test_subscriber_sees_every_log_row(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            seen = []
+            background = []
+            engine = make_engine(
+                tmpdir, transcript_enabled=False,
+                subscribers=[
+                    lambda topic, payload: seen.append(topic),
+                    Subscriber(
+                        lambda topic, payload: background.append(payload["id"]),
+                        topics=frozenset({"event"}), background=True,
+                    ),
+                ],
+            )
+            engine.run()
+            with open(engine.logger.filepath, encoding="utf-8") as handle:
+                rows = [json.loads(line) for line in handle]
+        logged = [row["type"] for row in rows]
+        self.assertEqual([t for t in seen if t != "phase_boundary"], logged)
+        self.assertIn("phase_boundary", seen)
+        self.assertEqual(background, [e["id"] for e in engine.state.events])
+        self.assertEqual(
+            engine.metrics.topics["event"], len(engine.state.events),
+        )
+
+    def test_transcript_is_a_subscriber(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                engine = make_engine(tmpdir, transcript_enabled=True)
+                engine.run()
+        text = out.getvalue()
+        self.assertIn("NIGHT 1", text)
+        self.assertIn("DAY 1", text)
+        self.assertIn("GAME OVER", text)
+        self.assertEqual(text.count("NIGHT 1"), 1)
+
+    def test_disabled_transcript_is_not_subscribed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = make_engine(tmpdir, transcript_enabled=False)
+            engine.close()
+        self.assertNotIn("transcript", [s["name"] for s in engine.bus.stats()])
+
+
+if __name__ == "__main__":
+    unittest.main()
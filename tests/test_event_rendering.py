@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks.engine import fake_response
+from werewolf.agents.rendering import EventRenderCache, render_event
+from werewolf.engine.game import GameEngine
+from werewolf.llm.fake_provider import FakeProvider, success_result
+
+MESSAGE = {
+    "id": 3, "type": "message", "channel": "public", "speaker_id": 2,
+    "payload": {"text": "I trust P4."},
+}
+VOTE = {"id": 4, "type": "vote", "payload": {"voter_id": 1, "target_id": 5}}
+
+
+class EventRenderCacheTests(unittest.TestCase):
+    def test_renders_each_event_once(self):
+        cache = EventRenderCache()
+        first = cache.render(MESSAGE)
+        self.assertEqual(first, "[PUBLIC] P2: I trust P4.")
+        self.assertIs(cache.render(dict(MESSAGE)), first)
+        self.assertEqual(cache.render(VOTE), "[VOTE] P1 voted for P5")
+        self.assertEqual(cache.stats(), {"events": 2, "hits": 1, "misses": 2})
+
+    def test_version_is_part_of_the_key(self):
+        cache = EventRenderCache()
+        cache.render(MESSAGE)
+        with mock.patch("werewolf.agents.rendering.EVENT_RENDER_VERSION", 2):
+            cache.render(MESSAGE)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_events_without_id_are_not_cached(self):
+        cache = EventRenderCache()
+        event = {k: v for k, v in VOTE.items() if k != "id"}
+        self.assertEqual(cache.render(event), render_event(event))
+        self.assertEqual(cache.stats(), {"events": 0, "hits": 0, "misses": 0})
+
+    def test_one_cache_serves_every_agent_in_a_game(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = GameEngine(
+                n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                api_key="", transcript_enabled=False, show_all_channels=False,
+                provider=FakeProvider(default=success_result(fake_response(7))),
+            )
+            engine.run()
+        self.assertTrue(all(
+            agent.render_cache is engine.render_cache
+            for agent in engine.agents.values()
+        ))
+        stats = engine.render_cache.stats()
+        self.assertGreater(stats["events"], 0)
+        self.assertGreater(stats["hits"], stats["misses"])
+
+
+if __name__ == "__main__":
+    unittest.main()
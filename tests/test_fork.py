@@ -0,0 +1,161 @@
+import json
+import tempfile
+import unittest
+
+from werewolf.engine.game import GameEngine
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.reporting.builder import build_full_report_from_file
+from tests.test_belief_snapshots_engine import full_beliefs_response
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def comparable(event):
+    payload = {
+        key: value for key, value in event["payload"].items()
+        if key != "vote_source_call_ids"
+    }
+    return (
+        event["id"], event["round"], event["phase"], event["type"],
+        event["channel"], event["speaker_id"], json.dumps(payload, sort_keys=True),
+    )
+
+
+class ForkTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.parent_provider = FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=100)
+        )
+        self.parent = GameEngine(
+            n_players=5, n_wolves=1, n_seers=0, seed=31,
+            output_dir=self.tmp.name, api_key="", provider=self.parent_provider,
+            transcript_enabled=False, show_all_channels=False,
+        )
+        self.parent.run()
+        self.checkpoint = next(
+            cp for cp in self.parent.checkpoints
+            if cp.phase == "day_discuss" and cp.round == 1
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fork(self, provider):
+        return self.parent.fork(
+            self.checkpoint,
+            role_models={"villager": "fake-model-b"},
+            role_providers={
+                "werewolf": provider, "villager": provider, "seer": provider,
+            },
+        )
+
+    def test_same_models_reproduce_parent_suffix(self):
+        provider = FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=100)
+        )
+        child = self.fork(provider)
+        child.run()
+        self.assertEqual(child.state.winner, self.parent.state.winner)
+        self.assertEqual(
+            [comparable(e) for e in child.state.events],
+            [comparable(e) for e in self.parent.state.events],
+        )
+        self.assertLess(provider.calls_made, self.parent_provider.calls_made)
+
+    def test_child_log_reuses_prefix_with_provenance(self):
+        provider = FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=7)
+        )
+        child = self.fork(provider)
+        child.run()
+        parent_id = self.parent.state.game_id
+        rows = read_rows(child.logger.filepath)
+        lineage = rows[0]["lineage"]
+        self.assertEqual(lineage["parent_game_id"], parent_id)
+        self.assertEqual(lineage["checkpoint"]["phase"], "day_discuss")
+
+        parent_rows = read_rows(self.parent.logger.filepath)
+        prefix = [
+            row for row in parent_rows[:self.checkpoint.log_records]
+            if row["type"] in ("event", "llm_call")
+        ]
+        inherited = [row for row in rows if row.get("inherited_from")]
+        self.assertEqual(inherited, [{**row, "inherited_from": parent_id} for row in prefix])
+        self.assertEqual(lineage["inherited_events"], self.checkpoint.event_count)
+
+        summary = child.ledger.game_summary()
+        self.assertEqual(summary["calls"], provider.calls_made)
+        self.assertEqual(summary["cost_ticks_total"], 7 * provider.calls_made)
+        self.assertEqual(
+            summary["inherited_calls"],
+            sum(1 for row in inherited if row.get("api_attempted")),
+        )
+        new_calls = [
+            row for row in rows
+            if row["type"] == "llm_call" and not row.get("inherited_from")
+        ]
+        self.assertTrue(all(row["game_id"] == child.state.game_id for row in new_calls))
+
+    def test_report_understands_lineage(self):
+        provider = FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=7)
+        )
+        child = self.fork(provider)
+        child.run()
+        report = build_full_report_from_file(child.logger.filepath)
+        lineage = report["overview"]["lineage"]
+        self.assertEqual(lineage["parent_game_id"], self.parent.state.game_id)
+        self.assertEqual(lineage["inherited_events"], self.checkpoint.event_count)
+        self.assertEqual(
+            lineage["fork_event_id"], f"evt_{self.checkpoint.event_count:06d}",
+        )
+        self.assertEqual(report["usage"]["attempts"], provider.calls_made)
+        self.assertGreater(report["usage"]["inherited"]["attempts"], 0)
+        self.assertEqual(report["usage"]["terminal_consistency"]["status"], "matched")
+        self.assertEqual(
+            report["links"]["parent_report"], f"/games/{self.parent.state.game_id}",
+        )
+        self.assertNotIn("lineage_prefix_mismatch", [
+            warning["code"] for warning in report["source"]["warnings"]
+        ])
+
+    def test_fork_of_fork_keeps_original_provenance(self):
+        provider = FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=7)
+        )
+        child = self.fork(provider)
+        child.run()
+        later = next(
+            cp for cp in child.checkpoints
+            if cp.event_count > self.checkpoint.event_count
+        )
+        grandchild = child.fork(later)
+        grandchild.run()
+        rows = read_rows(grandchild.logger.filepath)
+        self.assertEqual(rows[0]["lineage"]["parent_game_id"], child.state.game_id)
+        sources = {row["inherited_from"] for row in rows if row.get("inherited_from")}
+        self.assertEqual(sources, {self.parent.state.game_id, child.state.game_id})
+        self.assertEqual(
+            grandchild.ledger.game_summary()["inherited_calls"],
+            sum(
+                1 for row in rows
+                if row.get("inherited_from") and row.get("api_attempted")
+            ),
+        )
+
+    def test_rejects_mismatched_checkpoint(self):
+        with self.assertRaises(ValueError):
+            GameEngine(
+                n_players=6, n_wolves=1, n_seers=0, seed=31,
+                output_dir=self.tmp.name, api_key="",
+                provider=self.parent_provider, transcript_enabled=False,
+                checkpoint=self.checkpoint,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+import tempfile
+import threading
+from concurrent.futures import Future
+import time
+import unittest
+
+from tests.test_agent_with_fake_provider import VALID_VOTE, make_observation, run_act
+from werewolf.agents.ai_agent import AIAgent
+from werewolf.engine.game import GameEngine
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.fake_provider import FakeProvider, error_result, success_result
+from werewolf.llm.hedging import HedgePolicy, HedgingProvider, LatencyTracker
+from werewolf.llm.ledger import UsageLedger, aggregate_game_summaries
+from werewolf.llm.preflight import TokenRateLimiter
+from werewolf.llm.provider import ModelRequest
+from werewolf.llm.records import ErrorCategory
+from werewolf.llm.retry import RetryPolicy
+from werewolf.llm.streaming import (
+    STREAM_FULL,
+    early_stop_result,
+    read_stream,
+    with_stream_timings,
+)
+from werewolf.reporting.usage import compare_terminal_summary, compute_usage
+
+POLICY = HedgePolicy(percentile=0.9, window=20, min_samples=5, min_delay_ms=0)
+KEY = ("fake-model-1", "vote")
+
+
+class DelayedProvider:
+    """Streams a vote over `delay` seconds per scripted call, in 20
+    chunks, honouring request.cancel between chunks."""
+
+    name = "delayed"
+
+    def __init__(self, delays, result=None):
+        self._delays = list(delays)
+        self._result = result
+        self._lock = threading.Lock()
+        self.requests = []
+
+    def complete(self, request):
+        with self._lock:
+            self.requests.append(request)
+            delay = self._delays.pop(0)
+        if isinstance(delay, ErrorCategory):
+            return error_result(delay)
+        result = self._result or success_result(VALID_VOTE)
+        text = result.text
+        size = max(1, len(text) // 20)
+
+        def deltas():
+            for i in range(0, len(text), size):
+                time.sleep(delay / 20)
+                yield text[i:i + size]
+
+        started = time.monotonic()
+        outcome = read_stream(deltas(), started, False, request.cancel)
+        latency_ms = int((time.monotonic() - started) * 1000)
+        if outcome.cut:
+            return early_stop_result(request, outcome, latency_ms)
+        return with_stream_timings(
+            success_result(VALID_VOTE, latency_ms=latency_ms), request, outcome,
+        )
+
+
+def warm(tracker, latency_ms=50, n=5):
+    for _ in range(n):
+        tracker.observe(KEY, latency_ms)
+
+
+def request():
+    return ModelRequest(
+        model="fake-model-1", system_prompt="s", user_prompt="u",
+        stream=STREAM_FULL, required_action="vote",
+    )
+
+
+class TrackerTests(unittest.TestCase):
+    def test_delay_is_the_recent_percentile(self):
+        tracker = LatencyTracker(POLICY)
+        warm(tracker, n=4)
+        self.assertIsNone(tracker.delay_ms(KEY))
+        for latency in (100, 200, 300, 400, 500, 600):
+            tracker.observe(KEY, latency)
+        # 10 samples: 50 x4, 100..600; nearest-rank p90 is the 9th.
+        self.assertEqual(tracker.delay_ms(KEY), 500)
+        self.assertIsNone(tracker.delay_ms(("fake-model-1", "speak_public")))
+        floor = LatencyTracker(HedgePolicy(min_samples=1, min_delay_ms=250))
+        floor.observe(KEY, 10)
+        self.assertEqual(floor.delay_ms(KEY), 250)
+
+    def test_window_forgets_old_latencies(self):
+        tracker = LatencyTracker(HedgePolicy(window=5, min_samples=5, min_delay_ms=0))
+        warm(tracker, latency_ms=1000)
+        warm(tracker, latency_ms=10)
+        self.assertEqual(tracker.delay_ms(KEY), 10)
+
+    def test_policy_validation(self):
+        for kwargs in ({"percentile": 1.0}, {"percentile": 0}, {"min_samples": 0},
+                       {"window": 5, "min_samples": 6}, {"min_delay_ms": -1}):
+            with self.assertRaises(ValueError, msg=kwargs):
+                HedgePolicy(**kwargs)
+
+
+class HedgingProviderTests(unittest.TestCase):
+    def hedging(self, inner):
+        provider = HedgingProvider(inner, POLICY)
+        warm(provider.tracker)
+        return provider
+
+    def test_cold_keys_are_not_hedged(self):
+        inner = DelayedProvider([0.01])
+        provider = HedgingProvider(inner, POLICY)
+        result = provider.complete(request())
+        self.assertIsNone(result.hedge_loser)
+        self.assertNotIn("hedge", result.provider_metadata)
+        self.assertEqual(len(inner.requests), 1)
+        self.assertEqual(len(provider.tracker._latencies[KEY]), 1)
+
+    def test_fast_primary_is_not_hedged(self):
+        inner = DelayedProvider([0.0])
+        result = self.hedging(inner).complete(request())
+        self.assertIsNone(result.hedge_loser)
+        self.assertNotIn("hedge", result.provider_metadata)
+        self.assertEqual(len(inner.requests), 1)
+
+    def test_slow_primary_loses_to_the_hedge_and_is_cancelled(self):
+        inner = DelayedProvider([2.0, 0.02])
+        started = time.monotonic()
+        result = self.hedging(inner).complete(request())
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.provider_metadata["hedge"],
+                         {"role": "hedge", "delay_ms": 50, "won": True})
+        loser = result.hedge_loser.result(timeout=2)
+        self.assertTrue(loser.provider_metadata["stream"]["cancelled"])
+        self.assertEqual(loser.provider_metadata["hedge"]["role"], "primary")
+        self.assertFalse(loser.provider_metadata["hedge"]["won"])
+        self.assertLess(loser.latency_ms, 1000)
+        first, second = inner.requests
+        self.assertIsNot(first.cancel, second.cancel)
+        self.assertTrue(first.cancel.is_set())
+        self.assertFalse(second.cancel.is_set())
+
+    def test_a_failed_finisher_waits_for_the_other(self):
+        inner = DelayedProvider([0.3, ErrorCategory.PROVIDER_ERROR])
+        result = self.hedging(inner).complete(request())
+        self.assertTrue(result.ok)
+        self.assertEqual(result.provider_metadata["hedge"]["role"], "primary")
+        loser = result.hedge_loser.result(timeout=2)
+        self.assertEqual(loser.error_category, ErrorCategory.PROVIDER_ERROR)
+
+    def test_both_failing_returns_the_primary_failure(self):
+        inner = DelayedProvider([ErrorCategory.TIMEOUT, ErrorCategory.PROVIDER_ERROR])
+        provider = self.hedging(inner)
+        provider.tracker = LatencyTracker(HedgePolicy(min_samples=1, min_delay_ms=0))
+        provider.tracker.observe(KEY, 0)
+        result = provider.complete(request())
+        self.assertFalse(result.ok)
+        self.assertEqual(result.error_category, ErrorCategory.TIMEOUT)
+
+
+class AgentHedgingTests(unittest.TestCase):
+    def test_both_attempts_are_recorded(self):
+        inner = DelayedProvider([2.0, 0.02])
+        provider = HedgingProvider(inner, POLICY)
+        warm(provider.tracker)
+        ledger = UsageLedger()
+        agent = AIAgent(
+            player_id=1, role="villager", team="village", provider=provider,
+            model="fake-model-1", ledger=ledger, run_context={"game_id": "g_test"},
+            streaming=STREAM_FULL,
+        )
+        response = run_act(agent, make_observation())
+        self.assertEqual(response["action"]["vote_target"], 2)
+        self.assertEqual(len(ledger.records), 1)
+        agent.record_hedges()
+
+        winner, loser = ledger.records
+        self.assertEqual(winner.call_id, loser.call_id)
+        self.assertEqual(winner.attempt, loser.attempt)
+        self.assertTrue(winner.hedged and loser.hedged)
+        self.assertEqual(winner.error_category, ErrorCategory.COMPLETED)
+        self.assertEqual(loser.error_category, ErrorCategory.HEDGE_LOST)
+        self.assertTrue(loser.to_json_dict()["hedged"])
+
+        summary = ledger.game_summary()
+        self.assertEqual(summary["calls"], 2)
+        self.assertEqual(summary["retries"], 0)
+        self.assertEqual(summary["hedging"], {
+            "hedged_calls": 1, "hedge_wins": 1, "losers": 1, "cancelled": 1,
+            "losers_without_cost": 1, "loser_total_tokens": 0,
+            "loser_cost_usd": 0.0,
+        })
+        self.assertEqual(summary["reliability_by_action"]["vote"]["attempts"], 1)
+        batch = aggregate_game_summaries([summary, summary])
+        self.assertEqual(batch["hedging"]["hedge_wins"], 2)
+
+    def test_report_counts_match_the_ledger(self):
+        inner = DelayedProvider([ErrorCategory.PROVIDER_ERROR, 2.0, 0.02])
+        provider = HedgingProvider(inner, POLICY)
+        warm(provider.tracker)
+        ledger = UsageLedger()
+        agent = AIAgent(
+            player_id=1, role="villager", team="village", provider=provider,
+            model="fake-model-1", ledger=ledger, run_context={"game_id": "g_test"},
+            retry_policy=RetryPolicy(base_ms=0),
+        )
+        run_act(agent, make_observation())
+        agent.record_hedges()
+        self.assertEqual([r.attempt for r in ledger.records], [1, 2, 2])
+        summary = ledger.game_summary()
+        self.assertEqual(summary["retries"], 1)
+        rows = [r.to_json_dict() for r in ledger.records]
+        self.assertEqual(compute_usage(rows)["retries"], 1)
+        self.assertEqual(
+            compare_terminal_summary(compute_usage(rows), summary)["status"], "matched",
+        )
+
+
+    def test_losers_are_settled_against_the_rate_limiter(self):
+        limiter = TokenRateLimiter(10_000, clock=lambda: 0.0, sleep=lambda s: None)
+        agent = AIAgent(
+            player_id=1, role="villager", team="village", provider=FakeProvider(),
+            model="fake-model-1", ledger=UsageLedger(),
+            run_context={"game_id": "g_test"}, rate_limiter=limiter,
+        )
+        loser = Future()
+        loser.set_result(success_result(VALID_VOTE, input_tokens=500, output_tokens=100))
+        agent._hedge_losers.append((loser, make_observation(), "call_1", 1))
+        agent.record_hedges()
+        self.assertEqual(limiter._available, 10_000 - 600)
+        self.assertEqual(agent.ledger.records[0].error_category, ErrorCategory.HEDGE_LOST)
+
+
+class EngineHedgingTests(unittest.TestCase):
+    def test_providers_are_wrapped_and_policy_logged(self):
+        policy = HedgePolicy(percentile=0.99)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = GameEngine(
+                n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                api_key="", transcript_enabled=False, show_all_channels=False,
+                provider=FakeProvider(default=success_result(VALID_VOTE)),
+                hedging=policy,
+            )
+            engine.run()
+            rows = load_rows(engine.logger.filepath)
+        self.assertEqual(rows[0]["hedging"], policy.to_json_dict())
+        providers = {id(agent.provider) for agent in engine.agents.values()}
+        self.assertEqual(len(providers), 1)
+        self.assertIsInstance(engine.agents[0].provider, HedgingProvider)
+        calls = [r for r in rows if r["type"] == "llm_call" and r["api_attempted"]]
+        # The fake answers at once: nothing outlives its hedge delay.
+        self.assertFalse(any(r["hedged"] for r in calls))
+
+    def test_off_by_default(self):
+        provider = FakeProvider(default=success_result(VALID_VOTE))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = GameEngine(
+                n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                api_key="", transcript_enabled=False, show_all_channels=False,
+                provider=provider,
+            )
+            engine.close()
+        self.assertIs(engine.agents[0].provider, provider)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import random
+import tempfile
+import unittest
+
+from tests.test_agent_with_fake_provider import make_observation
+from werewolf.agents.ai_agent import AIAgent
+from werewolf.agents.prompts import (
+    LEAN_THOUGHT_MAX_CHARS,
+    RESPONSE_RULES,
+    get_action_instruction,
+    get_prompt_version,
+    get_system_prompt,
+)
+from werewolf.engine.action_schemas import action_schema
+from werewolf.engine.beliefs import CHECKPOINT_POST, expand_lean_beliefs, parse_belief_snapshot
+from werewolf.engine.game import GameEngine
+from werewolf.engine.validate import expand_lean_response, get_fallback_action, validate_action
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.evaluation.validity import classify_game, summarize_validity
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.llm.ledger import UsageLedger
+from werewolf.llm.provider import GenerationConfig
+
+
+def observation(required_action, role="villager", **extra):
+    obs = make_observation(required_action)
+    obs["self"]["role"] = role
+    obs.update(extra)
+    return obs
+
+
+def lean_agent(provider, response_protocol="lean", **kwargs):
+    return AIAgent(
+        player_id=1, role="villager", team="village", provider=provider,
+        model="fake-model-1", ledger=UsageLedger(),
+        run_context={"game_id": "g_test"}, response_protocol=response_protocol,
+        **kwargs,
+    )
+
+
+def act(agent, obs):
+    rng = random.Random(0)
+    return agent.act(
+        obs,
+        validator=lambda o, r: validate_action(o, r, None),
+        fallback_fn=lambda o: get_fallback_action(o, rng),
+        rng=rng,
+    )
+
+
+class ExpandTests(unittest.TestCase):
+    def test_target_say_memory_and_thought_cap(self):
+        vote = expand_lean_response(
+            observation("vote"), {"target": "P2", "thought": "x", "memory": "P2 lied"},
+        )
+        self.assertEqual(vote, {
+            "action": {"vote_target": "P2"}, "updated_memory": "P2 lied",
+            "say": None,
+        })
+        self.assertEqual(validate_action(observation("vote"), vote, None), (True, None))
+        self.assertEqual(vote["action"]["vote_target"], 2)
+
+        cap = LEAN_THOUGHT_MAX_CHARS["speak_public"]
+        speech = expand_lean_response(
+            observation("speak_public"), {"say": "I trust P3.", "thought": "y" * (cap + 50)},
+        )
+        self.assertEqual(speech["say"], {"public": "I trust P3."})
+        self.assertEqual(len(speech["thought"]), cap)
+        self.assertIsNone(speech["action"])
+
+        chat = expand_lean_response(
+            observation("wolf_chat", role="werewolf"), {"say": "Kill P3", "memory": None},
+        )
+        self.assertEqual(chat["say"], {"werewolf": "Kill P3"})
+        self.assertNotIn("updated_memory", chat)
+
+    def test_full_shape_wins(self):
+        response = expand_lean_response(
+            observation("vote"), {"target": 3, "action": {"vote_target": 2}},
+        )
+        self.assertEqual(response["action"], {"vote_target": 2})
+
+    def test_short_belief_keys(self):
+        raw = {"p": {"2": 0.7, "3": 0.2}, "v": 2, "c": 0.8, "s": None, "e": None,
+               "wolf_probabilities": {"2": 0.1, "3": 0.1}}
+        expanded = expand_lean_beliefs(raw)
+        self.assertEqual(expanded["wolf_probabilities"], {"2": 0.1, "3": 0.1})
+        self.assertEqual(expanded["intended_vote"], 2)
+        self.assertNotIn("p", expanded)
+        snapshot = parse_belief_snapshot(
+            expand_lean_beliefs({"p": {"2": 0.7, "3": 0.2}, "v": 2, "c": 0.8}),
+            CHECKPOINT_POST, 1, [1, 2, 3], is_wolf=False,
+        )
+        self.assertTrue(snapshot.valid)
+        self.assertEqual(snapshot.vote_confidence, 0.8)
+        self.assertEqual(expand_lean_beliefs("junk"), "junk")
+
+
+class PromptTests(unittest.TestCase):
+    def test_lean_prompts_replace_the_full_format(self):
+        system = get_system_prompt("villager", 1, protocol="lean")
+        self.assertNotIn('"updated_memory"', system)
+        self.assertIn('"memory"', system)
+        self.assertLess(len(system), len(get_system_prompt("villager", 1)))
+        vote = get_action_instruction("vote", protocol="lean")
+        self.assertIn('REPLY: {"target": <player_id>, "beliefs"', vote)
+        self.assertIn('No "thought"', vote)
+        self.assertIn("at most 150 characters", get_action_instruction("seer_divine", protocol="lean"))
+        self.assertTrue(get_prompt_version("legacy", "verbose", "lean").endswith("+lean.v1"))
+
+    def test_lean_schema(self):
+        obs = observation("vote")
+        schema = action_schema(obs, "lean")
+        self.assertEqual(schema["title"], "vote_lean_response_v1")
+        self.assertEqual(set(schema["required"]), {"target", "beliefs", "memory"})
+        self.assertEqual(schema["properties"]["target"]["enum"], [2, 3])
+        self.assertEqual(set(schema["properties"]["beliefs"]["required"]),
+                         {"p", "v", "c", "s", "e"})
+        speech = action_schema(observation("speak_public"), "lean")
+        self.assertEqual(set(speech["required"]), {"say", "thought", "memory"})
+        self.assertEqual(action_schema(obs)["title"], "vote_response_v1")
+
+
+class AgentTests(unittest.TestCase):
+    def test_lean_vote_round_trip(self):
+        provider = FakeProvider(default=success_result(
+            {"target": 3, "memory": "watch P3"}, output_tokens=12,
+        ))
+        agent = lean_agent(provider)
+        response = act(agent, observation("vote"))
+        self.assertEqual(response["action"], {"vote_target": 3})
+        self.assertNotIn("thought", response)
+        self.assertEqual(agent.memory, "watch P3")
+        request = provider.requests[0]
+        self.assertIn('REPLY: {"target"', request.user_prompt)
+        self.assertNotIn(RESPONSE_RULES.strip(), request.user_prompt)
+        self.assertEqual(agent.ledger.records[0].validation_ok, True)
+
+    def test_missing_memory_keeps_notes_and_schema_is_lean(self):
+        provider = FakeProvider(default=success_result({"target": 2}))
+        agent = lean_agent(provider, generation=GenerationConfig(response_schema=True))
+        agent.memory = {"notes": "keep"}
+        act(agent, observation("seer_divine", role="seer"))
+        self.assertEqual(agent.memory, {"notes": "keep"})
+        self.assertEqual(provider.requests[0].response_schema["title"],
+                         "seer_divine_lean_response_v1")
+
+    def test_unknown_protocol(self):
+        with self.assertRaises(ValueError):
+            lean_agent(FakeProvider(), response_protocol="terse")
+
+
+class EngineTests(unittest.TestCase):
+    def test_config_row_and_validity_record_the_protocol(self):
+        payload = {"target": 6, "say": "hello", "beliefs": {
+            "p": {str(pid): 0.5 for pid in range(7)}, "v": 6, "c": 0.5,
+            "s": None, "e": {str(pid): 0.5 for pid in range(7)},
+        }}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = GameEngine(
+                n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                api_key="", transcript_enabled=False, show_all_channels=False,
+                provider=FakeProvider(default=success_result(payload)),
+                response_protocol="lean",
+            )
+            engine.run()
+            rows = load_rows(engine.logger.filepath)
+
+        config = rows[0]
+        self.assertEqual(config["response_protocol"]["name"], "lean")
+        self.assertEqual(config["response_protocol"]["thought_max_chars"],
+                         LEAN_THOUGHT_MAX_CHARS)
+        self.assertTrue(config["prompt_version"].endswith("+lean.v1"))
+        calls = [r for r in rows if r["type"] == "llm_call" and r["api_attempted"]]
+        self.assertTrue(any(r["validation_ok"] for r in calls))
+        messages = [r["event"] for r in rows
+                    if r["type"] == "event" and r["event"]["type"] == "message"]
+        self.assertTrue(any(m["payload"]["text"] == "hello" for m in messages))
+
+        validity = classify_game(rows)
+        self.assertEqual(validity["response_protocol"], "lean")
+        self.assertEqual(classify_game([{"type": "config"}])["response_protocol"], "full")
+        rollup = summarize_validity([validity, classify_game([{"type": "config"}])])
+        self.assertEqual(rollup["response_protocols"], {"lean": 1, "full": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
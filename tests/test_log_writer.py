@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from werewolf.engine.game import GameEngine
+from werewolf.engine.logging import (
+    DURABILITY_PHASE,
+    DURABILITY_PHASE_FSYNC,
+    DURABILITY_RECORD,
+    JSONLLogger,
+)
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from tests.test_belief_snapshots_engine import full_beliefs_response
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def make_engine(tmpdir, provider=None, **kwargs):
+    return GameEngine(
+        n_players=4, n_wolves=1, n_seers=0, seed=11,
+        output_dir=tmpdir, api_key="",
+        provider=provider or FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=100)
+        ),
+        transcript_enabled=False, show_all_channels=False, **kwargs,
+    )
+
+
+class JSONLLoggerDurabilityTests(unittest.TestCase):
+    def test_record_level_writes_through(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = JSONLLogger(tmpdir, "g1")
+            log.log_event({"id": "evt_000001"})
+            self.assertEqual(len(read_rows(log.filepath)), 1)
+            log.close()
+
+    def test_phase_level_buffers_until_boundary(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = JSONLLogger(tmpdir, "g1", durability=DURABILITY_PHASE)
+            log.log_config({"game_id": "g1"})
+            self.assertEqual(len(read_rows(log.filepath)), 1)
+            for n in range(3):
+                log.log_event({"id": n})
+            self.assertEqual(len(read_rows(log.filepath)), 1)
+            self.assertEqual(log.records_written, 4)
+            log.handle("phase_boundary", {})
+            rows = read_rows(log.filepath)
+            self.assertEqual([row["event"]["id"] for row in rows[1:]], [0, 1, 2])
+            self.assertEqual(log.commits, 2)
+            log.close()
+
+    def test_buffer_is_bounded(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = JSONLLogger(
+                tmpdir, "g1", durability=DURABILITY_PHASE, max_buffered_records=2,
+            )
+            for n in range(5):
+                log.log_event({"id": n})
+            self.assertEqual(len(read_rows(log.filepath)), 4)
+            log.close()
+            self.assertEqual(len(read_rows(log.filepath)), 5)
+
+    def test_fsync_level_syncs_each_commit(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = JSONLLogger(tmpdir, "g1", durability=DURABILITY_PHASE_FSYNC)
+            with mock.patch("werewolf.engine.logging.os.fsync") as fsync:
+                log.log_event({"id": 1})
+                log.commit()
+                log.commit()  # empty buffer: nothing to sync
+            self.assertEqual(fsync.call_count, 1)
+            log.close()
+
+    def test_invalid_level_rejected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.assertRaises(ValueError):
+                JSONLLogger(tmpdir, "g1", durability="sometimes")
+            self.assertEqual(os.listdir(tmpdir), [])
+
+
+class EngineDurabilityTests(unittest.TestCase):
+    def test_buffered_log_matches_record_log(self):
+        logs = {}
+        for level in (DURABILITY_RECORD, DURABILITY_PHASE):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                engine = make_engine(tmpdir, log_durability=level)
+                engine.run()
+                rows = read_rows(engine.logger.filepath)
+            self.assertEqual(rows[0]["log_durability"]["level"], level)
+            logs[level] = [
+                (row["type"], row.get("event", {}).get("id")) for row in rows
+            ]
+            if level == DURABILITY_PHASE:
+                self.assertLessEqual(engine.logger.commits, len(engine.checkpoints) + 2)
+        self.assertEqual(logs[DURABILITY_RECORD], logs[DURABILITY_PHASE])
+
+    def test_crash_flushes_buffered_rows(self):
+        provider = FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=100)
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = make_engine(
+                tmpdir, provider=provider, log_durability=DURABILITY_PHASE,
+            )
+            original = engine._run_phase
+
+            def crash_on_vote(phase_name):
+                if phase_name == "day_vote":
+                    raise KeyboardInterrupt
+                original(phase_name)
+
+            engine._run_phase = crash_on_vote
+            with self.assertRaises(KeyboardInterrupt):
+                engine.run()
+            rows = read_rows(engine.logger.filepath)
+            engine.close()
+        logged = [row["event"]["id"] for row in rows if row["type"] == "event"]
+        self.assertEqual(logged, [e["id"] for e in engine.state.events])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import tempfile
+import tracemalloc
+import unittest
+
+from werewolf.engine.game import GameEngine
+from werewolf.engine.memory import aggregate_memory
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from tests.test_belief_snapshots_engine import full_beliefs_response
+
+
+def run_game(tmpdir, **kwargs):
+    engine = GameEngine(
+        n_players=5, n_wolves=1, n_seers=1, seed=21,
+        output_dir=tmpdir, api_key="",
+        provider=FakeProvider(default=success_result(full_beliefs_response())),
+        transcript_enabled=False, show_all_channels=False, **kwargs,
+    )
+    engine.run()
+    return engine
+
+
+class MemoryTrackingTests(unittest.TestCase):
+    def test_memory_row_before_terminal_rows(self):
+        self.assertFalse(tracemalloc.is_tracing())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = run_game(tmpdir, memory_tracking=True)
+            rows = load_rows(engine.logger.filepath)
+        self.assertFalse(tracemalloc.is_tracing())
+        memory = [row for row in rows if row["type"] == "memory"]
+        self.assertEqual(len(memory), 1)
+        self.assertEqual(
+            [row["type"] for row in rows[-3:]], ["memory", "usage_summary", "outcome"],
+        )
+        row = memory[0]
+        self.assertEqual(row, {"type": "memory", **engine.memory_report})
+        self.assertEqual(
+            [p["phase"] for p in row["phases"]],
+            [cp.phase for cp in engine.checkpoints],
+        )
+        self.assertGreater(row["peak_kb"], 0)
+        self.assertGreaterEqual(row["peak_kb"], row["retained_kb"])
+        self.assertTrue(row["top_sites"])
+        sizes = [site["size_kb"] for site in row["top_sites"]]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertTrue(any(
+            site["site"].startswith("werewolf/") for site in row["top_sites"]
+        ))
+
+    def test_outer_tracing_is_left_running(self):
+        tracemalloc.start()
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                run_game(tmpdir, memory_tracking=True)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_off_by_default(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = run_game(tmpdir)
+            rows = load_rows(engine.logger.filepath)
+        self.assertIsNone(engine.memory_report)
+        self.assertFalse(any(row["type"] == "memory" for row in rows))
+
+    def test_aggregate(self):
+        rows = [
+            {"peak_kb": 10.0, "retained_kb": 4.0, "top_sites": [
+                {"site": "a.py:1", "size_kb": 3.0, "count": 2},
+            ]},
+            {"peak_kb": 20.0, "retained_kb": 6.0, "top_sites": [
+                {"site": "a.py:1", "size_kb": 1.0, "count": 1},
+                {"site": "b.py:2", "size_kb": 2.5, "count": 1},
+            ]},
+            None,
+        ]
+        summary = aggregate_memory(rows)
+        self.assertEqual(summary["games"], 2)
+        self.assertEqual(summary["peak_kb"], {"mean": 15.0, "max": 20.0})
+        self.assertEqual(
+            [(s["site"], s["size_kb"], s["games"]) for s in summary["top_sites"]],
+            [("a.py:1", 4.0, 2), ("b.py:2", 2.5, 1)],
+        )
+        self.assertEqual(aggregate_memory([]), {"games": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from tests.test_agent_with_fake_provider import (
+    VALID_VOTE,
+    make_agent,
+    make_observation,
+    run_act,
+)
+from werewolf.cli import output_caps as output_caps_cli
+from werewolf.engine.game import GameEngine
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.llm.ledger import UsageLedger, aggregate_game_summaries
+from werewolf.llm.output_caps import (
+    OutputCapTable,
+    build_cap_table,
+    hit_output_cap,
+)
+from werewolf.llm.provider import GenerationConfig
+from werewolf.llm.registry import resolve
+from werewolf.reporting.usage import compute_usage
+
+
+def call_row(action, output_tokens, model="m", reasoning=None, **extra):
+    row = {
+        "type": "llm_call", "requested_model": model, "required_action": action,
+        "api_attempted": True, "api_ok": True, "finish_reason": "stop",
+        "usage": {"output_tokens": output_tokens, "reasoning_tokens": reasoning},
+        "provider_metadata": {},
+    }
+    row.update(extra)
+    return row
+
+
+class CapTableTests(unittest.TestCase):
+    def test_hit_detection(self):
+        for reason in ("length", "max_tokens", "REASON_MAX_LEN", "LENGTH"):
+            self.assertTrue(hit_output_cap(reason), reason)
+        for reason in (None, "", "stop", "end_turn", "REASON_STOP"):
+            self.assertFalse(hit_output_cap(reason), reason)
+
+    def test_cap_is_percentile_with_headroom_rounded_up(self):
+        rows = [call_row("vote", n) for n in range(1, 101)]
+        rows += [call_row("speak_public", 300)] * 5
+        table = build_cap_table(rows, percentile=0.95, headroom=1.2,
+                                min_samples=20, round_to=16)
+        # p95 of 1..100 is 95; 95 * 1.2 = 114 -> 128.
+        self.assertEqual(table.caps, {"m": {"vote": 128}})
+        self.assertIsNone(table.stats["m"]["speak_public"]["cap"])
+        self.assertEqual(table.stats["m"]["vote"]["p50"], 50)
+        self.assertEqual(table.stats["m"]["vote"]["max"], 100)
+
+    def test_censored_inherited_and_failed_rows_are_not_samples(self):
+        rows = [call_row("vote", 10, reasoning=30)] * 3 + [
+            call_row("vote", 999, finish_reason="length"),
+            call_row("vote", 999, provider_metadata={"stream": {"stopped_early": True}}),
+            call_row("vote", 999, inherited_from="g_parent"),
+            call_row("vote", 999, api_ok=False),
+            {"type": "event", "required_action": "vote"},
+        ]
+        table = build_cap_table(rows, min_samples=1, headroom=1.0, round_to=1)
+        self.assertEqual(table.caps, {"m": {"vote": 40}})  # output + reasoning
+        self.assertEqual(table.stats["m"]["vote"]["samples"], 3)
+        self.assertEqual(table.stats["m"]["vote"]["censored"], 2)
+
+    def test_round_trip_and_pinned_hash(self):
+        table = build_cap_table([call_row("vote", 50)] * 30)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "caps.json")
+            table.save(path)
+            loaded = OutputCapTable.load(path)
+            self.assertEqual(loaded, table)
+            self.assertEqual(loaded.table_hash, table.table_hash)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.assertEqual(
+            OutputCapTable.from_json_dict({**data, "stats": {}}).table_hash,
+            table.table_hash,
+        )
+        data["caps"]["m"]["vote"] += 1
+        with self.assertRaises(ValueError):
+            OutputCapTable.from_json_dict(data)
+        with self.assertRaises(ValueError):
+            OutputCapTable.from_json_dict({**data, "output_caps_version": 99})
+        other = build_cap_table([call_row("vote", 50)] * 30, percentile=0.9)
+        self.assertNotEqual(other.table_hash, table.table_hash)
+
+    def test_apply_never_raises_a_global_cap(self):
+        table = OutputCapTable(caps={"m": {"vote": 64, "speak_public": 512}})
+        self.assertEqual(
+            table.apply(GenerationConfig(), "m", "vote").max_output_tokens, 64,
+        )
+        capped = GenerationConfig(max_output_tokens=256)
+        self.assertEqual(table.apply(capped, "m", "vote").max_output_tokens, 64)
+        self.assertEqual(table.apply(capped, "m", "speak_public").max_output_tokens, 256)
+        self.assertIs(table.apply(capped, "m", "wolf_chat"), capped)
+        self.assertIs(table.apply(capped, "other", "vote"), capped)
+
+
+class AgentCapTests(unittest.TestCase):
+    def test_requests_and_records_carry_the_cap(self):
+        provider = FakeProvider(default=success_result(VALID_VOTE))
+        ledger = UsageLedger()
+        agent = make_agent(provider, ledger)
+        agent.output_caps = OutputCapTable(caps={"fake-model-1": {"vote": 64}})
+        run_act(agent, make_observation("vote"))
+        run_act(agent, make_observation("speak_public"))
+        vote, speech = provider.requests
+        self.assertEqual(vote.generation.max_output_tokens, 64)
+        self.assertIsNone(speech.generation.max_output_tokens)
+        self.assertEqual(
+            ledger.records[0].requested_generation["max_output_tokens"], 64,
+        )
+        self.assertIsNone(agent.generation.max_output_tokens)
+
+
+class EngineCapTests(unittest.TestCase):
+    def test_config_row_hit_rates_and_cli(self):
+        model = resolve("grok-4.3").model
+        table = OutputCapTable(caps={model: {"vote": 64}})
+        truncated = success_result(VALID_VOTE, finish_reason="length")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = GameEngine(
+                n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                api_key="", transcript_enabled=False, show_all_channels=False,
+                provider=FakeProvider(default=truncated), output_caps=table,
+            )
+            engine.run()
+            rows = load_rows(engine.logger.filepath)
+
+            caps_path = os.path.join(tmpdir, "caps.json")
+            argv = ["output_caps", "--game", engine.logger.filepath,
+                    "--min-samples", "1", "--output", caps_path]
+            with mock.patch.object(sys, "argv", argv), redirect_stdout(StringIO()) as out:
+                output_caps_cli.main()
+            built = OutputCapTable.load(caps_path)
+
+        self.assertEqual(rows[0]["output_caps"], table.config_dict())
+        self.assertEqual(rows[0]["output_caps"]["hash"], table.table_hash)
+        calls = [r for r in rows if r["type"] == "llm_call" and r["api_attempted"]]
+        for call in calls:
+            expected = 64 if call["required_action"] == "vote" else None
+            self.assertEqual(call["requested_generation"]["max_output_tokens"], expected)
+
+        hits = engine.ledger.game_summary()["output_cap_hits"]
+        self.assertEqual(hits["vote"]["hit_rate"], 1.0)
+        self.assertEqual(sum(h["calls"] for h in hits.values()), len(calls))
+        batch = aggregate_game_summaries([engine.ledger.game_summary()] * 2)
+        self.assertEqual(batch["output_cap_hits"]["vote"]["calls"], 2 * hits["vote"]["calls"])
+        report_hits = compute_usage(calls)["output_cap_hits"]
+        self.assertEqual(report_hits["vote"]["hits"], hits["vote"]["hits"])
+
+        # Every call hit its cap: all censored, so nothing gets a cap.
+        self.assertEqual(built.caps, {})
+        self.assertIn(built.table_hash, out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
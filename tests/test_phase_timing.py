@@ -0,0 +1,114 @@
+import tempfile
+import time
+import unittest
+
+from werewolf.engine.game import GameEngine
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.reporting.builder import build_full_report_from_file
+from werewolf.reporting.privacy import build_public_report
+from tests.test_belief_snapshots_engine import full_beliefs_response
+
+
+class SlowFakeProvider(FakeProvider):
+    def complete(self, request):
+        time.sleep(0.002)
+        return super().complete(request)
+
+
+def run_game(tmpdir, provider_cls=FakeProvider, **kwargs):
+    engine = GameEngine(
+        n_players=5, n_wolves=1, n_seers=1, seed=21,
+        output_dir=tmpdir, api_key="",
+        provider=provider_cls(
+            default=success_result(full_beliefs_response(), cost_ticks=100)
+        ),
+        transcript_enabled=False, show_all_channels=False, **kwargs,
+    )
+    engine.run()
+    return engine
+
+
+class PhaseTimingTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = run_game(self.tmp.name, SlowFakeProvider)
+        self.path = self.engine.logger.filepath
+        self.rows = load_rows(self.path)
+        self.timings = [row for row in self.rows if row["type"] == "timing"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_one_row_per_phase_before_terminal_rows(self):
+        self.assertEqual(len(self.timings), len(self.engine.checkpoints))
+        self.assertEqual(
+            [row["phase"] for row in self.timings],
+            [cp.phase for cp in self.engine.checkpoints],
+        )
+        self.assertEqual(
+            [row["type"] for row in self.rows[-2:]], ["usage_summary", "outcome"],
+        )
+        self.assertFalse(any(
+            row["event"]["type"] == "timing"
+            for row in self.rows if row["type"] == "event"
+        ))
+
+    def test_breakdown_accounts_for_calls_and_provider_time(self):
+        api_calls = [
+            row for row in self.rows
+            if row["type"] == "llm_call" and row["api_attempted"]
+        ]
+        self.assertEqual(sum(row["calls"] for row in self.timings), len(api_calls))
+        for row in self.timings:
+            self.assertGreaterEqual(row["provider_wall_ms"], 2 * row["calls"])
+            parts = sum(row[field] for field in (
+                "provider_wall_ms", "prompt_build_ms", "validation_ms",
+                "log_ms", "engine_ms",
+            ))
+            self.assertAlmostEqual(parts, row["wall_ms"], delta=0.05)
+            if row["calls"]:
+                self.assertEqual(row["provider_latency_ms"], 150 * row["calls"])
+                self.assertGreater(row["prompt_build_ms"], 0)
+
+    def test_report_waterfall(self):
+        report = build_full_report_from_file(self.path)
+        timing = report["timing"]
+        self.assertTrue(timing["available"])
+        phases = timing["phases"]
+        self.assertEqual(phases[0]["start_ms"], 0)
+        for before, after in zip(phases, phases[1:]):
+            self.assertAlmostEqual(
+                after["start_ms"], before["start_ms"] + before["wall_ms"], places=2,
+            )
+        self.assertEqual(timing["totals"]["calls"], sum(p["calls"] for p in phases))
+        self.assertEqual(build_public_report(report)["timing"], timing)
+
+    def test_fork_times_only_its_own_phases(self):
+        checkpoint = next(
+            cp for cp in self.engine.checkpoints if cp.phase == "day_discuss"
+        )
+        child = self.engine.fork(checkpoint)
+        child.run()
+        rows = load_rows(child.logger.filepath)
+        timings = [row for row in rows if row["type"] == "timing"]
+        self.assertFalse(any(row.get("inherited_from") for row in timings))
+        self.assertEqual(timings[0]["phase"], "day_discuss")
+
+
+class LegacyLogTests(unittest.TestCase):
+    def test_log_without_timing_rows(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = run_game(tmpdir)
+            with open(engine.logger.filepath, encoding="utf-8") as handle:
+                lines = handle.readlines()
+            with open(engine.logger.filepath, "w", encoding="utf-8") as handle:
+                handle.writelines(line for line in lines if '"type": "timing"' not in line)
+            report = build_full_report_from_file(engine.logger.filepath)
+        self.assertEqual(
+            report["timing"], {"available": False, "reason": "no_timing_rows"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,287 @@
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from benchmarks.engine import fake_response
+from tests.test_agent_with_fake_provider import (
+    VALID_VOTE,
+    make_agent,
+    make_observation,
+    run_act,
+)
+from werewolf.agents.ai_agent import AIAgent
+from werewolf.cli import calibrate_tokens as calibrate_cli
+from werewolf.engine.game import GameEngine
+from werewolf.engine.timing import RATE_LIMIT
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.llm.ledger import UsageLedger, aggregate_game_summaries
+from werewolf.llm.preflight import (
+    ESTIMATOR_AGREEMENT_TOLERANCE,
+    Preflight,
+    TokenCalibration,
+    TokenRateLimiter,
+    calibrate,
+    class_counts,
+    preflight_for,
+    raw_estimate,
+    request_messages,
+)
+from werewolf.llm.provider import GenerationConfig, ModelRequest
+from werewolf.llm.records import ErrorCategory
+from werewolf.llm.registry import resolve
+from werewolf.llm.tokens import estimate_tokens
+from werewolf.reporting.usage import compute_usage
+
+
+def call_row(family, raw, reported, **extra):
+    row = {
+        "type": "llm_call", "api_attempted": True, "api_ok": True,
+        "usage": {"input_tokens": reported},
+        "preflight": {"family": family, "raw_input_tokens": raw, "input_tokens": raw},
+    }
+    row.update(extra)
+    return row
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class EstimatorTests(unittest.TestCase):
+    def test_class_counts_are_utf8_bytes(self):
+        self.assertEqual(class_counts('Vote P3, "now"!\n日'), {
+            "letters": 8, "digits": 1, "whitespace": 3, "punctuation": 4,
+            "non_ascii": 3,
+        })
+        self.assertEqual(sum(class_counts("héllo wörld").values()), len("héllo wörld".encode()))
+
+    def test_estimate_scales_and_prices(self):
+        request = ModelRequest(
+            model="m", system_prompt="You are player 3." * 20,
+            user_prompt='{"vote_target": 2}' * 10,
+            history=[{"role": "user", "content": "hi"}, {"role": "assistant", "content": "ok"}],
+        )
+        raw = raw_estimate(["You are player 3." * 20, "hi", "ok", '{"vote_target": 2}' * 10])
+        estimate = Preflight(family="Gemini", scale=1.5, input_usd_per_mtok=2.0).estimate(request)
+        self.assertEqual(estimate["family"], "Gemini")
+        self.assertEqual(estimate["raw_input_tokens"], round(raw))
+        self.assertEqual(estimate["input_tokens"], -(-raw * 1.5 // 1))
+        self.assertAlmostEqual(estimate["input_usd"], estimate["input_tokens"] * 2e-6)
+        self.assertIsNone(Preflight().estimate(request)["input_usd"])
+
+    def test_fits_counts_the_output_cap(self):
+        preflight = Preflight(context_window=1000)
+        self.assertTrue(preflight.fits({"input_tokens": 1000}, GenerationConfig()))
+        self.assertFalse(preflight.fits(
+            {"input_tokens": 900}, GenerationConfig(max_output_tokens=101),
+        ))
+        self.assertTrue(Preflight().fits({"input_tokens": 10**9}, GenerationConfig()))
+
+    def test_calibration_is_reported_over_estimated_per_family(self):
+        rows = [call_row("Gemini", 100, 120)] * 20 + [call_row("Claude", 100, 90)] * 5 + [
+            call_row("Gemini", 100, 999, inherited_from="g_parent"),
+            call_row("Gemini", 100, 999, api_ok=False),
+            call_row("Gemini", 0, 999),
+            {"type": "event"},
+        ]
+        calibration = calibrate(rows)
+        self.assertEqual(calibration.scales, {"Gemini": 1.2})
+        self.assertEqual(calibration.calls, {"Gemini": 20})
+        self.assertEqual(calibration.scale_for("Claude"), 1.0)
+        self.assertEqual(calibrate(rows, min_calls=5).scales["Claude"], 0.9)
+
+    def test_calibration_round_trip_and_version_checks(self):
+        calibration = TokenCalibration(scales={"GPT": 1.07}, calls={"GPT": 40})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "calibration.json")
+            calibration.save(path)
+            self.assertEqual(TokenCalibration.load(path), calibration)
+        data = calibration.to_json_dict()
+        with self.assertRaises(ValueError):
+            TokenCalibration.from_json_dict({**data, "preflight_version": 99})
+        with self.assertRaises(ValueError):
+            TokenCalibration.from_json_dict({**data, "estimator": "bytes_div_4"})
+
+    def test_preflight_for_prefers_the_registry(self):
+        class InfoProvider:
+            def model_info(self, model):
+                return {"context_window": 32_000, "input_usd_per_mtok": 9.0}
+
+        spec = resolve("gemini_flash_lite")
+        calibration = TokenCalibration(scales={"Gemini": 1.1})
+        preflight = preflight_for(spec, InfoProvider(), calibration)
+        self.assertEqual(preflight, Preflight(
+            family="Gemini", scale=1.1, context_window=32_000, input_usd_per_mtok=0.25,
+        ))
+        self.assertEqual(preflight_for(resolve("grok-4.3")).context_window, None)
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_debt_is_waited_off_and_settled(self):
+        clock = FakeClock()
+        limiter = TokenRateLimiter(600, clock=clock, sleep=clock.sleep)  # 10/s
+        self.assertEqual(limiter.acquire(500), 0.0)
+        self.assertEqual(limiter.acquire(200), 10.0)  # 100 available, needs 200
+        self.assertEqual(clock.slept, [10.0])
+        # Reserved 200, used 50: 150 come back.
+        limiter.settle(200, 50)
+        self.assertEqual(limiter.acquire(150), 0.0)
+        limiter.settle(100, None)  # unknown usage keeps the reservation
+        # A reservation bigger than the bucket waits for a full bucket.
+        clock.now += 1000
+        self.assertEqual(limiter.acquire(5000), 0.0)
+        self.assertEqual(limiter.acquire(10), (10 + 4400) / 10)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            TokenRateLimiter(0)
+
+
+class AgentPreflightTests(unittest.TestCase):
+    def test_records_carry_the_estimate_and_error_is_summarized(self):
+        provider = FakeProvider(default=success_result(VALID_VOTE, input_tokens=800))
+        ledger = UsageLedger()
+        agent = make_agent(provider, ledger)
+        agent.preflight = Preflight(family="Grok", input_usd_per_mtok=1.0)
+        run_act(agent, make_observation())
+        record = ledger.records[0]
+        estimate = Preflight(family="Grok", input_usd_per_mtok=1.0).estimate(provider.requests[0])
+        self.assertEqual(record.preflight, estimate)
+        self.assertEqual(record.to_json_dict()["preflight"], estimate)
+
+        summary = ledger.game_summary()["preflight"]
+        grok = summary["by_family"]["Grok"]
+        self.assertEqual(grok["calls"], 1)
+        self.assertEqual(grok["reported_input_tokens"], 800)
+        self.assertAlmostEqual(grok["bias"], estimate["input_tokens"] / 800 - 1, places=4)
+        self.assertEqual(summary["refused"], 0)
+        batch = aggregate_game_summaries([ledger.game_summary()] * 2)
+        self.assertEqual(batch["preflight"]["by_family"]["Grok"]["calls"], 2)
+        self.assertEqual(batch["preflight"]["by_family"]["Grok"]["bias"], grok["bias"])
+        report = compute_usage([r.to_json_dict() for r in ledger.records])["preflight"]
+        self.assertEqual(report["by_family"]["Grok"]["abs_error_tokens"], grok["abs_error_tokens"])
+
+    def test_oversized_prompt_is_refused_without_a_call(self):
+        provider = FakeProvider(default=success_result(VALID_VOTE))
+        ledger = UsageLedger()
+        agent = make_agent(provider, ledger)
+        agent.preflight = Preflight(context_window=50)
+        response = run_act(agent, make_observation())
+        self.assertIn("vote_target", response["action"])
+        self.assertEqual(provider.calls_made, 0)
+        refused, fallback = ledger.records
+        self.assertFalse(refused.api_attempted)
+        self.assertEqual(refused.error_category, ErrorCategory.CONTEXT_WINDOW_EXCEEDED)
+        self.assertGreater(refused.preflight["input_tokens"], 50)
+        self.assertEqual(fallback.error_category, ErrorCategory.FALLBACK_USED)
+        self.assertEqual(ledger.game_summary()["preflight"]["refused"], 1)
+
+    def test_chat_session_sheds_old_turns_to_fit(self):
+        provider = FakeProvider(default=success_result(VALID_VOTE))
+        ledger = UsageLedger()
+        agent = AIAgent(
+            player_id=1, role="villager", team="village", provider=provider,
+            model="fake-model-1", ledger=ledger, run_context={"game_id": "g_test"},
+            prompt_layout="chat",
+        )
+        run_act(agent, make_observation())
+        first = ledger.records[0].preflight["input_tokens"]
+        turn = [{"role": "user", "content": "word " * 900},
+                {"role": "assistant", "content": "{}"}]
+        agent.session = turn * 2 + agent.session
+        agent.preflight = Preflight(context_window=first + 1500)
+
+        run_act(agent, make_observation())
+        sent = provider.requests[-1]
+        self.assertEqual(len(sent.history), 4)  # one padded turn and the real one
+        self.assertEqual(agent.session_evictions, 1)
+        self.assertLessEqual(ledger.records[-1].preflight["input_tokens"], first + 1500)
+
+    def test_rate_limiter_wait_is_timed_and_settled(self):
+        clock = FakeClock()
+        limiter = TokenRateLimiter(60, clock=clock, sleep=clock.sleep)
+        provider = FakeProvider(default=success_result(VALID_VOTE, input_tokens=40,
+                                                       output_tokens=20))
+        ledger = UsageLedger()
+        agent = make_agent(provider, ledger)
+        agent.rate_limiter = limiter
+        run_act(agent, make_observation())
+        reserved = ledger.records[0].preflight["input_tokens"]
+        # The first reservation finds a full bucket and leaves it in
+        # debt; settling against the 60 reported tokens empties it.
+        self.assertEqual(clock.slept, [])
+        self.assertAlmostEqual(limiter._available, 60 - 60, places=6)
+        run_act(agent, make_observation())
+        self.assertEqual(len(clock.slept), 1)
+        self.assertGreater(clock.slept[0], 0)
+        self.assertIn(RATE_LIMIT, agent.timings)
+        self.assertGreater(reserved, 60)
+
+
+class EngineTests(unittest.TestCase):
+    def test_budget_and_preflight_estimators_agree_on_game_prompts(self):
+        for layout in ("legacy", "cache", "chat"):
+            for render in ("verbose", "compact"):
+                provider = FakeProvider(default=success_result(fake_response(7)))
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    GameEngine(
+                        n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                        api_key="", transcript_enabled=False, show_all_channels=False,
+                        provider=provider, prompt_layout=layout, prompt_render=render,
+                    ).run()
+                for request in provider.requests:
+                    messages = request_messages(request)
+                    budget = sum(estimate_tokens(text) for text in messages)
+                    gap = abs(raw_estimate(messages) - budget) / budget
+                    self.assertLessEqual(gap, ESTIMATOR_AGREEMENT_TOLERANCE,
+                                         (layout, render))
+
+    def test_config_row_timing_and_calibration_cli(self):
+        limiter = TokenRateLimiter(10**9)
+        calibration = TokenCalibration(scales={"Grok": 1.25})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = GameEngine(
+                n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                api_key="", transcript_enabled=False, show_all_channels=False,
+                provider=FakeProvider(default=success_result(VALID_VOTE)),
+                token_calibration=calibration, rate_limiter=limiter,
+            )
+            engine.run()
+            rows = load_rows(engine.logger.filepath)
+
+            out_path = os.path.join(tmpdir, "calibration.json")
+            argv = ["calibrate_tokens", "--game", engine.logger.filepath,
+                    "--min-calls", "1", "--output", out_path]
+            with mock.patch.object(sys, "argv", argv), redirect_stdout(StringIO()) as out:
+                calibrate_cli.main()
+            fitted = TokenCalibration.load(out_path)
+
+        config = rows[0]
+        self.assertEqual(config["preflight"]["villager"]["scale"], 1.25)
+        self.assertEqual(config["preflight"]["villager"]["family"], "Grok")
+        self.assertEqual(config["rate_limit"], {"tokens_per_minute": 10**9})
+        timings = [r for r in rows if r["type"] == "timing"]
+        self.assertTrue(timings and all("rate_limit_ms" in r for r in timings))
+        self.assertTrue(all(r["timing_schema_version"] == 3 for r in timings))
+        calls = [r for r in rows if r["type"] == "llm_call" and r["api_attempted"]]
+        self.assertTrue(all(r["preflight"]["family"] == "Grok" for r in calls))
+        self.assertIn("Grok", fitted.scales)
+        self.assertIn("Grok", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
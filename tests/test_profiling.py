@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from werewolf.agents.scripted import DEFAULT_POLICIES
+from werewolf.cli.run_trials import run_one_trial
+from werewolf.profiling import BUCKETS, aggregate_profiles, bucket_for
+
+
+def profiled_trial(tmpdir, index=0):
+    return run_one_trial(
+        trial_index=index, seed=50 + index, n_players=7, n_wolves=2, n_seers=1,
+        output_dir=tmpdir, api_key="", model="scripted", quiet=True,
+        role_agents=dict(DEFAULT_POLICIES), profile=True,
+    )
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_profile_written_next_to_log_and_aggregated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            records = [profiled_trial(tmpdir, i) for i in range(2)]
+            for record in records:
+                self.assertEqual(
+                    os.path.dirname(record["profile_path"]),
+                    os.path.dirname(record["log_path"]),
+                )
+                self.assertTrue(record["profile_path"].endswith(
+                    f"{record['game_id']}.prof"
+                ))
+            paths = [r["profile_path"] for r in records]
+            profile = aggregate_profiles(paths + [os.path.join(tmpdir, "gone.prof")], 10)
+
+        self.assertEqual((profile["files"], profile["missing"]), (2, 1))
+        self.assertEqual(set(profile["buckets"]), set(BUCKETS))
+        self.assertAlmostEqual(
+            sum(b["tottime_ms"] for b in profile["buckets"].values()),
+            profile["total_ms"], delta=0.05,
+        )
+        self.assertGreater(profile["buckets"]["engine"]["tottime_ms"], 0)
+        self.assertGreater(profile["buckets"]["agent"]["tottime_ms"], 0)
+        functions = profile["functions"]
+        self.assertEqual(len(functions), 10)
+        own = [f["tottime_ms"] for f in functions]
+        self.assertEqual(own, sorted(own, reverse=True))
+        self.assertFalse(any(
+            f["function"].startswith(os.sep) for f in functions
+            if f["bucket"] != "other"
+        ))
+
+    def test_unprofiled_trial_has_no_profile_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            record = run_one_trial(
+                trial_index=0, seed=50, n_players=7, n_wolves=2, n_seers=1,
+                output_dir=tmpdir, api_key="", model="scripted", quiet=True,
+                role_agents=dict(DEFAULT_POLICIES),
+            )
+            self.assertNotIn("profile_path", record)
+            self.assertFalse(any(name.endswith(".prof") for name in os.listdir(tmpdir)))
+
+    def test_buckets(self):
+        self.assertEqual(bucket_for("werewolf/engine/game.py"), "engine")
+        self.assertEqual(bucket_for("werewolf/engine/logging.py"), "ledger_logging")
+        self.assertEqual(bucket_for("werewolf/llm/ledger.py"), "ledger_logging")
+        self.assertEqual(bucket_for("werewolf/agents/ai_agent.py"), "agent")
+        self.assertEqual(bucket_for("werewolf/evaluation/validity.py"), "reporting")
+        self.assertEqual(bucket_for("<stdlib>/json/encoder.py"), "other")
+
+
+if __name__ == "__main__":
+    unittest.main()
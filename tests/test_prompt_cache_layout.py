@@ -0,0 +1,121 @@
+import tempfile
+import unittest
+
+from werewolf.agents.prompts import PROMPT_LAYOUT_VERSION
+from werewolf.engine.game import GameEngine
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.llm.ledger import UsageLedger, aggregate_game_summaries
+from werewolf.llm.litellm_provider import build_messages
+from werewolf.llm.provider import ModelRequest
+from tests.test_belief_snapshots_engine import full_beliefs_response
+
+
+def play(tmpdir, prompt_layout, cached_input_tokens=None):
+    provider = FakeProvider(default=success_result(
+        full_beliefs_response(), cached_input_tokens=cached_input_tokens,
+    ))
+    engine = GameEngine(
+        n_players=5, n_wolves=1, n_seers=1, seed=8, output_dir=tmpdir,
+        api_key="", provider=provider,
+        transcript_enabled=False, show_all_channels=False,
+        prompt_layout=prompt_layout,
+    )
+    engine.run()
+    return engine, provider
+
+
+class CacheLayoutTests(unittest.TestCase):
+    def test_each_request_extends_the_previous_prefix(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine, provider = play(tmpdir, "cache")
+            config = load_rows(engine.logger.filepath)[0]
+        self.assertEqual(
+            config["prompt_layout"], {"name": "cache", "version": PROMPT_LAYOUT_VERSION},
+        )
+        by_player: dict[str, list[ModelRequest]] = {}
+        for request in provider.requests:
+            by_player.setdefault(request.system_prompt, []).append(request)
+        self.assertGreaterEqual(len(by_player), 4)
+        for requests in by_player.values():
+            self.assertIn("LIMITS:", requests[0].system_prompt)
+            prefixes = [r.user_prompt[:r.cache_prefix_chars] for r in requests]
+            self.assertTrue(prefixes[0].startswith("=== EVENT HISTORY ==="))
+            for earlier, later in zip(prefixes, prefixes[1:]):
+                self.assertTrue(later.startswith(earlier))
+            if len(requests) > 3:
+                self.assertGreater(len(prefixes[-1]), len(prefixes[0]))
+            for request in requests:
+                volatile = request.user_prompt[request.cache_prefix_chars:]
+                self.assertIn("=== CURRENT GAME STATE ===", volatile)
+                self.assertNotIn("LIMITS:", request.user_prompt)
+
+    def test_legacy_layout_sends_no_hints(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine, provider = play(tmpdir, "legacy")
+            config = load_rows(engine.logger.filepath)[0]
+        self.assertEqual(config["prompt_layout"]["name"], "legacy")
+        self.assertTrue(all(r.cache_prefix_chars is None for r in provider.requests))
+        self.assertTrue(provider.requests[0].user_prompt.startswith(
+            "=== CURRENT GAME STATE ==="
+        ))
+
+    def test_unknown_layout_rejected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.assertRaises(ValueError):
+                play(tmpdir, "compact-ish")
+
+
+class CacheControlHintTests(unittest.TestCase):
+    def request(self, model, cache_prefix_chars=6):
+        return ModelRequest(
+            model=model, system_prompt="rules", user_prompt="histor|now",
+            cache_prefix_chars=cache_prefix_chars,
+        )
+
+    def test_anthropic_gets_cache_breakpoints(self):
+        system, user = build_messages(self.request("anthropic/claude-haiku-4-5"))
+        self.assertEqual(system["content"][0]["cache_control"], {"type": "ephemeral"})
+        self.assertEqual(
+            [block["text"] for block in user["content"]], ["histor", "|now"],
+        )
+        self.assertIn("cache_control", user["content"][0])
+        self.assertNotIn("cache_control", user["content"][1])
+
+    def test_implicit_caching_providers_get_plain_messages(self):
+        for request in (
+            self.request("openai/gpt-5.4-nano-2026-03-17"),
+            self.request("gemini/gemini-3.5-flash"),
+            self.request("anthropic/claude-haiku-4-5", cache_prefix_chars=None),
+        ):
+            system, user = build_messages(request)
+            self.assertEqual(system["content"], "rules")
+            self.assertEqual(user["content"], "histor|now")
+
+
+class CacheHitRateTests(unittest.TestCase):
+    def test_game_and_batch_hit_rates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cached = play(tmpdir, "cache", cached_input_tokens=400)[0]
+            silent = play(tmpdir, "cache")[0]
+        cached_summary = cached.ledger.game_summary()
+        silent_summary = silent.ledger.game_summary()
+        self.assertEqual(cached_summary["prompt_cache"]["hit_rate"], 0.8)
+        self.assertEqual(
+            cached_summary["prompt_cache"]["calls_reporting"], cached_summary["calls"],
+        )
+        # Providers that do not report cached tokens are not counted as misses.
+        self.assertEqual(silent_summary["prompt_cache"]["calls_reporting"], 0)
+        self.assertIsNone(silent_summary["prompt_cache"]["hit_rate"])
+
+        batch = aggregate_game_summaries([cached_summary, silent_summary])
+        self.assertEqual(batch["prompt_cache"]["hit_rate"], 0.8)
+        self.assertEqual(batch["prompt_cache"]["per_game"]["games_counted"], 1)
+        self.assertIsNone(
+            aggregate_game_summaries([UsageLedger().game_summary()])
+            ["prompt_cache"]["per_game"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from benchmarks.engine import fake_response
+from tests.test_agent_with_fake_provider import VALID_VOTE, make_observation, run_act
+from werewolf.agents.ai_agent import AIAgent
+from werewolf.agents.prompts import RESPONSE_RULES, get_prompt_version, get_stable_rules
+from werewolf.agents.rendering import EventRenderCache, render_event
+from werewolf.cli import render_savings as savings_cli
+from werewolf.engine.game import GameEngine
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.evaluation.render_savings import render_savings
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.llm.ledger import UsageLedger
+
+EVENTS = [
+    {"id": 1, "type": "message", "channel": "public", "speaker_id": 2,
+     "payload": {"text": "I trust P4."}},
+    {"id": 2, "type": "message", "channel": "werewolf", "speaker_id": 5,
+     "payload": {"text": "Kill P3."}},
+    {"id": 3, "type": "death_announcement",
+     "payload": {"victim_id": 3, "victim_role": "seer", "cause": "wolf_kill"}},
+    {"id": 4, "type": "vote", "payload": {"voter_id": 1, "target_id": 5}},
+    {"id": 5, "type": "divine_result", "payload": {"target_id": 5, "is_werewolf": True}},
+    {"id": 6, "type": "game_status", "payload": {"alive_wolves": 2, "alive_villagers": 4}},
+]
+
+
+def make_agent(provider, prompt_render, **kwargs):
+    return AIAgent(
+        player_id=1, role="villager", team="village", provider=provider,
+        model="fake-model-1", ledger=UsageLedger(),
+        run_context={"game_id": "g_test"}, prompt_render=prompt_render,
+        **kwargs,
+    )
+
+
+def call_row(action, input_tokens, **extra):
+    row = {
+        "type": "llm_call", "requested_model": "m", "required_action": action,
+        "api_attempted": True, "api_ok": True,
+        "usage": {"input_tokens": input_tokens},
+    }
+    row.update(extra)
+    return row
+
+
+def game(render, *rows):
+    config = {"type": "config", "prompt_layout": {"name": "legacy", "version": 1}}
+    if render is not None:
+        config["prompt_render"] = {"name": render, "version": 1}
+    return [config, *rows]
+
+
+class CompactEventTests(unittest.TestCase):
+    def test_compact_lines(self):
+        self.assertEqual(
+            [render_event(event, "compact") for event in EVENTS],
+            ["P2: I trust P4.", "wolf> P5: Kill P3.", "P3 killed at night",
+             "P1 votes P5", "divine: P5 wolf", "alive: 2 wolves, 4 village"],
+        )
+        for event in EVENTS:
+            self.assertLess(len(render_event(event, "compact")), len(render_event(event)))
+
+    def test_mode_is_part_of_the_cache(self):
+        cache = EventRenderCache("compact")
+        self.assertEqual(cache.render(EVENTS[3]), "P1 votes P5")
+        self.assertEqual(EventRenderCache().render(EVENTS[3]), "[VOTE] P1 voted for P5")
+        with self.assertRaises(ValueError):
+            EventRenderCache("terse")
+
+
+class CompactPromptTests(unittest.TestCase):
+    def build(self, prompt_render):
+        provider = FakeProvider(default=success_result(VALID_VOTE))
+        agent = make_agent(provider, prompt_render)
+        agent.memory = {"suspects": [5, 2], "notes": "P5 pushed hard on P3"}
+        observation = make_observation()
+        observation["recent_events"] = EVENTS
+        run_act(agent, observation)
+        return provider.requests[0]
+
+    def test_compact_prompt_is_shorter_and_rules_move_to_system(self):
+        verbose = self.build("verbose")
+        compact = self.build("compact")
+        self.assertIn(RESPONSE_RULES.strip(), verbose.user_prompt)
+        self.assertNotIn(RESPONSE_RULES.strip(), compact.user_prompt)
+        self.assertIn(get_stable_rules(), compact.system_prompt)
+        self.assertIn('{"suspects":[5,2],"notes":"P5 pushed hard on P3"}',
+                      compact.user_prompt)
+        self.assertIn("P1 votes P5", compact.user_prompt)
+        self.assertLess(len(compact.user_prompt),
+                        len(verbose.user_prompt) - len(get_stable_rules()))
+
+    def test_prompt_version_and_cache_mode_checks(self):
+        self.assertNotEqual(get_prompt_version(), get_prompt_version("legacy", "compact"))
+        self.assertTrue(get_prompt_version("cache", "compact").endswith("+cache.v1+compact.v1"))
+        provider = FakeProvider(default=success_result(VALID_VOTE))
+        with self.assertRaises(ValueError):
+            make_agent(provider, "terse")
+        with self.assertRaises(ValueError):
+            make_agent(provider, "compact", render_cache=EventRenderCache())
+
+
+class SavingsReportTests(unittest.TestCase):
+    def test_measured_savings_are_matched_per_cell(self):
+        corpus = [
+            game(None, call_row("vote", 1000), call_row("vote", 1200),
+                 call_row("speak_public", 2000)),
+            game("compact", call_row("vote", 700), call_row("vote", 800),
+                 call_row("vote", 9999, inherited_from="g_parent"),
+                 call_row("vote", 9999, api_ok=False),
+                 call_row("wolf_chat", 500)),
+        ]
+        report = render_savings(corpus)
+        self.assertEqual(report["games"], {"verbose": 1, "compact": 1})
+        measured = report["measured"]
+        self.assertEqual(measured["matched_compact_calls"], 2)
+        self.assertEqual(measured["saved_share"], round(1 - 1500 / 2200, 4))
+        cells = {cell["required_action"]: cell for cell in measured["by_cell"]}
+        self.assertEqual(cells["vote"]["verbose_mean_input_tokens"], 1100.0)
+        self.assertIsNone(cells["speak_public"]["saved_share"])
+        self.assertIsNone(cells["wolf_chat"]["saved_share"])
+
+    def test_event_savings_skip_moderator_rows(self):
+        rows = [{"type": "event", "event": event} for event in EVENTS]
+        rows.append({"type": "event", "event": {
+            "id": 7, "type": "belief_snapshot", "channel": "moderator_only",
+            "payload": {"beliefs": {}},
+        }})
+        events = render_savings([game(None, *rows)])["events"]
+        self.assertEqual(events["events"], len(EVENTS))
+        self.assertLess(events["compact_tokens"], events["verbose_tokens"])
+        self.assertIsNone(render_savings([])["events"]["saved_share"])
+
+
+class EngineTests(unittest.TestCase):
+    def test_compact_game_config_and_savings_cli(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for render in ("verbose", "compact"):
+                engine = GameEngine(
+                    n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                    api_key="", transcript_enabled=False, show_all_channels=False,
+                    provider=FakeProvider(default=success_result(fake_response(7))),
+                    prompt_render=render,
+                )
+                engine.run()
+                paths.append(engine.logger.filepath)
+            self.assertEqual(engine.render_cache.mode, "compact")
+            self.assertTrue(all(
+                agent.prompt_render == "compact" for agent in engine.agents.values()
+            ))
+            rows = load_rows(paths[1])
+
+            out_path = os.path.join(tmpdir, "savings.json")
+            argv = ["render_savings", "--game", *paths, "--output", out_path]
+            with mock.patch.object(sys, "argv", argv), redirect_stdout(StringIO()) as out:
+                savings_cli.main()
+            with open(out_path, encoding="utf-8") as f:
+                report = json.load(f)
+
+        config = rows[0]
+        self.assertEqual(config["prompt_render"], {"name": "compact", "version": 1})
+        self.assertEqual(config["prompt_version"], get_prompt_version("legacy", "compact"))
+        calls = [r for r in rows if r["type"] == "llm_call"]
+        self.assertTrue(all(r["prompt_version"] == config["prompt_version"] for r in calls))
+        self.assertEqual(report["games"], {"verbose": 1, "compact": 1})
+        self.assertGreater(report["events"]["saved_share"], 0)
+        self.assertIn("Event lines", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -189,7 +189,7 @@ class GenerationConfigTests(unittest.TestCase):
         for call in llm_calls:
             self.assertEqual(call["requested_generation"]["temperature"], 0.0)
             self.assertEqual(call["requested_generation"]["provider_seed"], 7)
-            self.assertEqual(call["schema_version"], 2)
+            self.assertEqual(call["schema_version"], 6)
         config_row = next(r for r in rows if r["type"] == "config")
         self.assertEqual(config_row["generation_config"]["temperature"], 0.0)
         self.assertEqual(config_row["discussion_cycles"], 2)
@@ -0,0 +1,88 @@
+import json
+import random
+import time
+import unittest
+from pathlib import Path
+
+from benchmarks import parse_reference
+from werewolf.agents.ai_agent import AIAgent
+from werewolf.agents.response_parser import parse_response, regex_extract, repair_json
+
+CORPUS = Path(__file__).parent / "data" / "malformed_responses.jsonl"
+MUTATIONS_PER_SEED = 40
+INSERTS = ('"', "\n", "\\", "{", "}", "[", "]", ",", ":", " ", "\t", "\\u")
+
+
+def load_corpus() -> list[tuple[str, str]]:
+    with open(CORPUS, encoding="utf-8") as f:
+        return [(row["name"], row["raw"]) for row in map(json.loads, f)]
+
+
+def mutate(raw: str, rng: random.Random) -> str:
+    if not raw:
+        return rng.choice(INSERTS)
+    i = rng.randrange(len(raw) + 1)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return raw[:i]
+    if kind == 1:
+        return raw[:i] + rng.choice(INSERTS) + raw[i:]
+    return raw[:i] + raw[i + 1:]
+
+
+def fuzz_cases():
+    rng = random.Random(41)
+    for name, raw in load_corpus():
+        yield name, raw
+        for n in range(MUTATIONS_PER_SEED):
+            yield f"{name}~{n}", mutate(raw, rng)
+
+
+class EquivalenceTests(unittest.TestCase):
+    def test_identical_to_reference_on_fuzz_corpus(self):
+        methods = set()
+        for name, raw in fuzz_cases():
+            with self.subTest(case=name):
+                expected = parse_reference.parse_response(raw)
+                self.assertEqual(parse_response(raw), expected)
+                self.assertEqual(repair_json(raw), parse_reference.repair_json(raw))
+                self.assertEqual(regex_extract(raw), parse_reference.regex_extract(raw))
+                methods.add(expected[1])
+        self.assertEqual(methods, {"direct", "repaired", "regex", None})
+
+    def test_seed_labels(self):
+        labels = {name: parse_response(raw)[1] for name, raw in load_corpus()}
+        self.assertEqual(labels["code_fence"], "direct")
+        self.assertEqual(labels["unescaped_quotes"], "repaired")
+        self.assertEqual(labels["truncated_after_colon"], "repaired")
+        self.assertEqual(labels["regex_only_no_brace"], "regex")
+        self.assertIsNone(labels["plain_text"])
+
+    def test_agent_uses_the_parser(self):
+        agent = AIAgent(player_id=0, role="villager", team="village")
+        raw = '{"thought": "he said "go"", "action": {"vote_target": 2}}'
+        self.assertEqual(agent._parse_response(raw), parse_response(raw))
+
+
+class ScalingTests(unittest.TestCase):
+    @staticmethod
+    def _repair_seconds(size: int) -> float:
+        # A long thought full of unescaped quotes: the old parser rescanned
+        # the rest of the text at every one of them.
+        text = '{"thought": "' + 'say "no" ' * (size // 9) + '", "action": null}'
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            repair_json(text)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_repair_is_linear(self):
+        small = self._repair_seconds(20_000)
+        large = self._repair_seconds(320_000)
+        # Linear is 16x; the old parser measured ~65x here.
+        self.assertLess(large / small, 36)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import random
+import tempfile
+import unittest
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+from tests.test_agent_with_fake_provider import VALID_VOTE, make_observation, run_act
+from werewolf.agents.ai_agent import AIAgent
+from werewolf.engine.game import GameEngine
+from werewolf.engine.timing import BACKOFF
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.fake_provider import FakeProvider, error_result, success_result
+from werewolf.llm.ledger import UsageLedger, aggregate_game_summaries
+from werewolf.llm.records import ErrorCategory
+from werewolf.llm.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+
+def make_agent(provider, ledger, policy=None, budget=None):
+    agent = AIAgent(
+        player_id=1, role="villager", team="village", provider=provider,
+        model="fake-model-1", ledger=ledger, run_context={"game_id": "g_test"},
+        retry_policy=policy, retry_budget=budget,
+    )
+    agent.slept = []
+    agent.sleep = agent.slept.append
+    return agent
+
+
+def rate_limited(retry_after_ms=None):
+    result = error_result(ErrorCategory.RATE_LIMITED)
+    result.retry_after_ms = retry_after_ms
+    return result
+
+
+class PolicyTests(unittest.TestCase):
+    def test_full_jitter_doubles_up_to_the_cap(self):
+        policy = RetryPolicy(base_ms=100, max_backoff_ms=1000)
+        rng = random.Random(3)
+        for retry, ceiling in ((1, 100), (2, 200), (3, 400), (4, 800), (5, 1000), (9, 1000)):
+            delays = [
+                policy.backoff_ms(ErrorCategory.RATE_LIMITED, retry, None, rng)
+                for _ in range(200)
+            ]
+            self.assertTrue(all(0 <= d <= ceiling for d in delays), retry)
+            self.assertGreater(max(delays), ceiling * 0.8)
+
+    def test_content_errors_do_not_wait(self):
+        policy = RetryPolicy()
+        for category in (ErrorCategory.MALFORMED_JSON, ErrorCategory.INVALID_GAME_ACTION):
+            self.assertEqual(policy.backoff_ms(category, 2, None, random.Random()), 0)
+
+    def test_retry_after_is_a_floor_and_long_hints_stop_retrying(self):
+        policy = RetryPolicy(base_ms=100, max_retry_after_ms=5000)
+        rng = random.Random(0)
+        self.assertEqual(policy.backoff_ms(ErrorCategory.RATE_LIMITED, 1, 3000, rng), 3000)
+        self.assertIsNone(policy.backoff_ms(ErrorCategory.RATE_LIMITED, 1, 6000, rng))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after({"Retry-After": "2"}), 2000)
+        self.assertEqual(parse_retry_after({"retry-after-ms": "250", "retry-after": "9"}), 250)
+        self.assertEqual(parse_retry_after((("retry-after", "0.5"),)), 500)
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        parsed = parse_retry_after({"Retry-After": format_datetime(when, usegmt=True)})
+        self.assertTrue(25_000 <= parsed <= 30_000, parsed)
+        for headers in (None, {}, {"retry-after": "soon"}, {"retry-after": "inf"}):
+            self.assertIsNone(parse_retry_after(headers), headers)
+
+    def test_budget(self):
+        budget = RetryBudget(2)
+        self.assertEqual([budget.take() for _ in range(3)], [True, True, False])
+        self.assertEqual(budget.to_json_dict(), {"limit": 2, "used": 2, "denied": 1})
+        self.assertTrue(all(RetryBudget(None).take() for _ in range(100)))
+
+
+class AgentRetryTests(unittest.TestCase):
+    def test_transport_errors_back_off_and_log_the_wait(self):
+        provider = FakeProvider([
+            rate_limited(), rate_limited(retry_after_ms=1500),
+            success_result(VALID_VOTE),
+        ])
+        ledger = UsageLedger()
+        agent = make_agent(provider, ledger, RetryPolicy(base_ms=100))
+        response = run_act(agent, make_observation())
+
+        self.assertEqual(response["action"]["vote_target"], 2)
+        records = ledger.records
+        self.assertEqual([r.attempt for r in records], [1, 2, 3])
+        self.assertIsNone(records[0].backoff_ms)
+        self.assertLessEqual(records[1].backoff_ms, 100)
+        self.assertEqual(records[2].backoff_ms, 1500)
+        self.assertEqual(records[1].provider_metadata["retry_after_ms"], 1500)
+        self.assertEqual(agent.slept, [
+            ms / 1000 for ms in (records[1].backoff_ms, records[2].backoff_ms) if ms
+        ])
+        self.assertGreater(agent.timings[BACKOFF], 0)
+        self.assertEqual(records[2].to_json_dict()["backoff_ms"], 1500)
+        backoff = ledger.game_summary()["backoff"]
+        self.assertEqual(backoff["backoff_ms"], records[1].backoff_ms + 1500)
+
+    def test_content_errors_retry_immediately(self):
+        provider = FakeProvider([
+            success_result(text="no json"), success_result(VALID_VOTE),
+        ])
+        ledger = UsageLedger()
+        agent = make_agent(provider, ledger)
+        run_act(agent, make_observation())
+        self.assertEqual(ledger.records[1].backoff_ms, 0)
+        self.assertEqual(agent.slept, [])
+
+    def test_per_category_retry_counts(self):
+        provider = FakeProvider([error_result(ErrorCategory.TIMEOUT)] * 2
+                                + [success_result(VALID_VOTE)])
+        ledger = UsageLedger()
+        resilient = RetryPolicy.for_profile("resilient", base_ms=0)
+        run_act(make_agent(provider, ledger, resilient), make_observation())
+        # TIMEOUT gets one retry under the resilient profile, then the turn falls back.
+        self.assertEqual(provider.calls_made, 2)
+        self.assertEqual(ledger.game_summary()["fallbacks"], 1)
+
+        provider = FakeProvider([rate_limited()] * 4 + [success_result(VALID_VOTE)])
+        ledger = UsageLedger()
+        run_act(make_agent(provider, ledger, resilient), make_observation())
+        self.assertEqual(provider.calls_made, 5)
+        self.assertEqual(ledger.game_summary()["fallbacks"], 0)
+
+    def test_default_policy_matches_the_baseline(self):
+        policy = RetryPolicy()
+        self.assertEqual(policy.max_attempts, 3)
+        self.assertIsNone(policy.game_budget)
+        self.assertTrue(all(n == 2 for n in policy.retries.values()))
+        provider = FakeProvider([rate_limited()] * 3 + [success_result(VALID_VOTE)])
+        ledger = UsageLedger()
+        run_act(make_agent(provider, ledger, RetryPolicy(base_ms=0)), make_observation())
+        self.assertEqual(provider.calls_made, 3)
+        self.assertEqual(ledger.game_summary()["fallbacks"], 1)
+        resilient = RetryPolicy.for_profile("resilient", game_budget=None)
+        self.assertEqual((resilient.max_attempts, resilient.game_budget), (5, None))
+        self.assertEqual(resilient.to_json_dict()["profile"], "resilient")
+        with self.assertRaises(ValueError):
+            RetryPolicy.for_profile("aggressive")
+
+    def test_max_attempts(self):
+        provider = FakeProvider(default=success_result(text="no json"))
+        policy = RetryPolicy(retries={"malformed_json": 10}, max_attempts=4)
+        run_act(make_agent(provider, UsageLedger(), policy), make_observation())
+        self.assertEqual(provider.calls_made, 4)
+
+    def test_long_retry_hint_falls_back_at_once(self):
+        provider = FakeProvider([rate_limited(retry_after_ms=600_000)])
+        ledger = UsageLedger()
+        agent = make_agent(provider, ledger)
+        run_act(agent, make_observation())
+        self.assertEqual(provider.calls_made, 1)
+        self.assertEqual(agent.slept, [])
+        self.assertEqual(ledger.game_summary()["fallbacks"], 1)
+
+    def test_shared_budget_runs_out(self):
+        budget = RetryBudget(1)
+        policy = RetryPolicy(base_ms=0)
+        ledger = UsageLedger()
+        provider = FakeProvider(default=error_result(ErrorCategory.PROVIDER_ERROR))
+        run_act(make_agent(provider, ledger, policy, budget), make_observation())
+        run_act(make_agent(provider, ledger, policy, budget), make_observation())
+        self.assertEqual(provider.calls_made, 3)  # 1 + 1 retry, then 1
+        errors = ledger.game_summary()["errors_by_category"]
+        self.assertEqual(errors["retry_budget_exhausted"], 2)
+        self.assertEqual(errors["fallback_used"], 2)
+        self.assertEqual(budget.denied, 2)
+
+
+class EngineRetryTests(unittest.TestCase):
+    def test_policy_is_logged_and_budget_shared(self):
+        policy = RetryPolicy(base_ms=0, game_budget=3)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = GameEngine(
+                n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+                api_key="", transcript_enabled=False, show_all_channels=False,
+                provider=FakeProvider(default=rate_limited()), retry_policy=policy,
+            )
+            engine.run()
+            rows = load_rows(engine.logger.filepath)
+        self.assertEqual(rows[0]["retry_policy"], policy.to_json_dict())
+        agents = list(engine.agents.values())
+        self.assertTrue(all(a.retry_budget is engine.retry_budget for a in agents))
+        self.assertEqual(engine.retry_budget.used, 3)
+        calls = [r for r in rows if r["type"] == "llm_call" and r["api_attempted"]]
+        self.assertEqual(sum(1 for r in calls if r["attempt"] > 1), 3)
+        timings = [r for r in rows if r["type"] == "timing"]
+        self.assertTrue(all("backoff_ms" in r for r in timings))
+        summary = engine.ledger.game_summary()
+        batch = aggregate_game_summaries([summary, summary])
+        self.assertEqual(batch["backoff"]["attempts"], 2 * summary["backoff"]["attempts"])
+
+
+if __name__ == "__main__":
+    unittest.main()
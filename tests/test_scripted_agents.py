@@ -0,0 +1,173 @@
+import tempfile
+import unittest
+
+from werewolf.agents.scripted import (
+    DEFAULT_POLICIES,
+    BandwagonVillager,
+    QuietHunterWolf,
+    RevealingSeer,
+    resolve_role_agents,
+)
+from werewolf.engine.game import GameEngine
+from werewolf.evaluation.belief_metrics import compute_game_metrics_from_file, load_rows
+from werewolf.evaluation.validity import classify_game_from_file
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from tests.test_belief_snapshots_engine import full_beliefs_response
+
+
+def run_game(tmpdir, seed=5, **kwargs):
+    kwargs.setdefault("role_agents", DEFAULT_POLICIES)
+    engine = GameEngine(
+        n_players=7, n_wolves=2, n_seers=1, seed=seed,
+        output_dir=tmpdir, transcript_enabled=False, show_all_channels=False,
+        **kwargs,
+    )
+    engine.run()
+    return engine
+
+
+class VoteForSelfVillager(BandwagonVillager):
+    """A broken script: votes for itself, which the validator rejects."""
+
+    def vote(self, observation, knowledge, rng):
+        response = super().vote(observation, knowledge, rng)
+        return {**response, "action": {"vote_target": self.player_id}}
+
+
+def event_trace(rows):
+    return [
+        {k: v for k, v in row["event"].items() if k != "t"}
+        for row in rows if row["type"] == "event"
+    ]
+
+
+class ScriptedGameTests(unittest.TestCase):
+    def test_fully_scripted_game_needs_no_llm(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = run_game(tmpdir)
+            rows = load_rows(engine.logger.filepath)
+            validity = classify_game_from_file(engine.logger.filepath)
+            metrics = compute_game_metrics_from_file(engine.logger.filepath)
+        self.assertNotIn("llm_call", {row["type"] for row in rows})
+        self.assertEqual(rows[-1]["type"], "outcome")
+        self.assertTrue(validity["clean"], validity)
+        self.assertIsNotNone(metrics)
+        self.assertEqual(rows[0]["model"], "scripted")
+        self.assertEqual(
+            rows[0]["role_models"]["werewolf"]["scripted_policy"], "quiet_hunter",
+        )
+        self.assertEqual(engine.ledger.count(), 0)
+
+    def test_same_seed_same_game(self):
+        traces = []
+        for _ in range(2):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                traces.append(event_trace(load_rows(run_game(tmpdir).logger.filepath)))
+        self.assertEqual(traces[0], traces[1])
+
+    def test_scripted_roles_mix_with_llm_roles(self):
+        provider = FakeProvider(
+            default=success_result(full_beliefs_response(), cost_ticks=100)
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = run_game(
+                tmpdir, api_key="", provider=provider,
+                role_agents={"werewolf": QuietHunterWolf},
+            )
+            rows = load_rows(engine.logger.filepath)
+        wolves = {p.id for p in engine.players.values() if p.role == "werewolf"}
+        callers = {
+            row["player_id"] for row in rows if row["type"] == "llm_call"
+        }
+        self.assertTrue(callers)
+        self.assertFalse(callers & wolves)
+        self.assertEqual(
+            engine.role_models_resolved["werewolf"]["provider"], "scripted",
+        )
+
+    def test_invalid_scripted_move_is_recorded_as_fallback(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = run_game(
+                tmpdir, role_agents={**DEFAULT_POLICIES, "villager": VoteForSelfVillager},
+            )
+            rows = load_rows(engine.logger.filepath)
+            validity = classify_game_from_file(engine.logger.filepath)
+        calls = [row for row in rows if row["type"] == "llm_call"]
+        self.assertTrue(calls)
+        villagers = {p.id for p in engine.players.values() if p.role == "villager"}
+        for call in calls:
+            self.assertEqual(call["error_category"], "fallback_used")
+            self.assertFalse(call["api_attempted"])
+            self.assertEqual(call["required_action"], "vote")
+            self.assertIn(call["player_id"], villagers)
+            self.assertEqual(call["requested_model"], "scripted:bandwagon")
+        self.assertFalse(validity["clean"])
+        self.assertEqual(validity["violations"]["fallback_vote"], len(calls))
+
+    def test_default_matchup_is_not_a_foregone_conclusion(self):
+        winners = []
+        for seed in range(40):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                rows = load_rows(run_game(tmpdir, seed=seed).logger.filepath)
+            winners.append(rows[-1]["winner"])
+        self.assertGreaterEqual(winners.count("village"), 6, winners)
+        self.assertGreater(winners.count("wolf"), winners.count("village"))
+
+    def test_fork_keeps_scripted_agents(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = run_game(tmpdir)
+            checkpoint = next(
+                cp for cp in engine.checkpoints if cp.phase == "day_discuss"
+            )
+            child = engine.fork(checkpoint)
+            child.run()
+            self.assertTrue(classify_game_from_file(child.logger.filepath)["clean"])
+        self.assertIsInstance(
+            next(a for a in child.agents.values() if a.role == "werewolf"),
+            QuietHunterWolf,
+        )
+
+
+def public_message(event_id, speaker, text):
+    return {"id": event_id, "round": 1, "type": "message", "channel": "public",
+            "speaker_id": speaker, "payload": {"text": text}}
+
+
+class AccusationCredibilityTests(unittest.TestCase):
+    def test_echoes_count_once_and_seer_attackers_lose_their_voice(self):
+        villager = BandwagonVillager(player_id=1, role="villager", team="village")
+        knowledge = villager._observe({}, {"recent_events": [
+            public_message(0, 3, "I suspect P5."),
+            public_message(1, 3, "I suspect P5."),
+            public_message(2, 6, "I suspect P5."),
+            public_message(3, 1, "I suspect P5."),
+        ]})
+        self.assertEqual(knowledge["accusers"], {"5": [3, 6]})
+        self.assertAlmostEqual(villager.suspicion(knowledge, 5), 0.5)
+
+        knowledge = villager._observe(knowledge, {"recent_events": [
+            public_message(4, 5, "I am the seer. P4 is NOT a werewolf."),
+        ]})
+        self.assertEqual(knowledge["seer_claims"], {"4": "village"})
+        self.assertEqual(knowledge["seer_claimants"], [5])
+        self.assertEqual(villager.credibility(knowledge, 3), 0.0)
+        self.assertAlmostEqual(villager.suspicion(knowledge, 5), 0.3)
+        self.assertAlmostEqual(villager.suspicion(knowledge, 3), 0.5)
+        self.assertLess(villager.suspicion(knowledge, 4), 0.3)
+
+
+class ResolveRoleAgentsTests(unittest.TestCase):
+    def test_accepts_names_and_classes(self):
+        resolved = resolve_role_agents({"seer": "reveal_on_wolf", "werewolf": QuietHunterWolf})
+        self.assertIs(resolved["seer"], RevealingSeer)
+        self.assertIs(resolved["werewolf"], QuietHunterWolf)
+
+    def test_rejects_unknown_policy_and_role(self):
+        with self.assertRaises(ValueError):
+            resolve_role_agents({"seer": "psychic"})
+        with self.assertRaises(ValueError):
+            resolve_role_agents({"mayor": "bandwagon"})
+
+
+if __name__ == "__main__":
+    unittest.main()
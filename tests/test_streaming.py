@@ -0,0 +1,174 @@
+import json
+import tempfile
+import time
+import unittest
+
+from benchmarks.engine import fake_response
+from tests.test_response_parser import load_corpus
+from werewolf.agents.response_parser import parse_response
+from werewolf.engine.game import GameEngine
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.llm.ledger import aggregate_game_summaries
+from werewolf.llm.provider import ModelRequest
+from werewolf.llm.records import CostSource
+from werewolf.llm.streaming import ObjectWatcher, read_stream
+
+OBJECT = '{"thought": "P2 wrote \\"}\\" and {x}", "action": {"vote_target": 2}}'
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class ClosingStream:
+    def __init__(self, deltas):
+        self._deltas = iter(deltas)
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        delta = next(self._deltas)
+        self.consumed += 1
+        return delta
+
+    def close(self):
+        self.closed = True
+
+
+class ObjectWatcherTests(unittest.TestCase):
+    def feed_all(self, text, size):
+        watcher = ObjectWatcher()
+        for delta in chunked(text, size):
+            watcher.feed(delta)
+        return watcher
+
+    def test_finds_the_end_at_any_chunking(self):
+        text = "Sure:\n" + OBJECT + "\nHope that helps! {trailing}"
+        for size in range(1, len(text) + 1):
+            watcher = self.feed_all(text, size)
+            self.assertEqual(text[watcher.start:watcher.end], OBJECT, size)
+
+    def test_objects_the_parser_would_not_take_directly_are_abandoned(self):
+        for text in (
+            "Thinking {not json} then " + OBJECT,
+            '{"thought": "he said "hi"", "action": null}',
+            '{"thought": "cut off',
+        ):
+            watcher = self.feed_all(text, 3)
+            self.assertFalse(watcher.complete, text)
+
+
+class ReadStreamTests(unittest.TestCase):
+    def test_early_stop_closes_the_stream(self):
+        deltas = chunked(OBJECT, 8) + [" and then a long epilogue"] * 50
+        stream = ClosingStream(deltas)
+        outcome = read_stream(stream, time.monotonic(), stop_early=True)
+        self.assertTrue(outcome.stopped_early)
+        self.assertTrue(stream.closed)
+        self.assertLess(stream.consumed, len(deltas))
+        self.assertTrue(outcome.text.startswith(OBJECT))
+        self.assertIsNotNone(outcome.ttft_ms)
+        self.assertGreaterEqual(outcome.object_complete_ms, outcome.ttft_ms)
+
+    def test_full_mode_reads_to_the_end(self):
+        stream = ClosingStream(chunked(OBJECT + " epilogue", 5))
+        outcome = read_stream(stream, time.monotonic(), stop_early=False)
+        self.assertFalse(outcome.stopped_early)
+        self.assertFalse(stream.closed)
+        self.assertEqual(outcome.text, OBJECT + " epilogue")
+        self.assertIsNotNone(outcome.object_complete_ms)
+
+    def test_stopping_never_changes_the_parse(self):
+        for name, raw in load_corpus():
+            with self.subTest(case=name):
+                outcome = read_stream(iter(chunked(raw, 7)), time.monotonic(), True)
+                self.assertEqual(parse_response(outcome.text), parse_response(raw))
+
+
+class ProviderStreamingTests(unittest.TestCase):
+    def request(self, stream):
+        return ModelRequest(
+            model="fake", system_prompt="system " * 50, user_prompt="user " * 100,
+            stream=stream,
+        )
+
+    def test_modes(self):
+        text = OBJECT + "\n\nExplanation: " + "words " * 200
+        provider = FakeProvider(default=success_result(text=text))
+        off = provider.complete(self.request("off"))
+        self.assertIsNone(off.ttft_ms)
+        self.assertNotIn("stream", off.provider_metadata)
+
+        full = provider.complete(self.request("full"))
+        self.assertEqual(full.text, text)
+        self.assertEqual(full.usage.output_tokens, 100)
+        self.assertEqual(full.cost.source, CostSource.PROVIDER_REPORTED)
+        self.assertFalse(full.provider_metadata["stream"]["stopped_early"])
+        self.assertNotIn("stream", provider._default.provider_metadata)
+
+        early = provider.complete(self.request("early_stop"))
+        self.assertLess(len(early.text), len(text))
+        self.assertIsNone(early.usage.output_tokens)
+        self.assertEqual(early.cost.source, CostSource.UNAVAILABLE)
+        stream = early.provider_metadata["stream"]
+        self.assertTrue(stream["stopped_early"])
+        self.assertGreater(stream["estimated_input_tokens"], 100)
+        self.assertGreater(stream["received_output_tokens"], 0)
+
+
+class EngineStreamingTests(unittest.TestCase):
+    def play(self, tmpdir, streaming):
+        text = json.dumps(fake_response(7)) + "\nI chose carefully."
+        engine = GameEngine(
+            n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir=tmpdir,
+            api_key="", transcript_enabled=False, show_all_channels=False,
+            provider=FakeProvider(default=success_result(text=text)),
+            streaming=streaming,
+        )
+        engine.run()
+        return engine, load_rows(engine.logger.filepath)
+
+    def test_early_stop_records_timings_and_estimates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine, rows = self.play(tmpdir, "early_stop")
+        self.assertEqual(rows[0]["streaming"], "early_stop")
+        calls = [r for r in rows if r["type"] == "llm_call" and r["api_attempted"]]
+        self.assertTrue(calls)
+        for call in calls:
+            self.assertIsNotNone(call["ttft_ms"])
+            self.assertIsNotNone(call["object_complete_ms"])
+            self.assertTrue(call["provider_metadata"]["stream"]["stopped_early"])
+            self.assertIsNone(call["usage"]["input_tokens"])
+        summary = engine.ledger.game_summary()
+        streaming = summary["streaming"]
+        self.assertEqual(streaming["calls"], len(calls))
+        self.assertEqual(streaming["stopped_early"], len(calls))
+        self.assertGreater(streaming["estimated_input_tokens"], 0)
+        self.assertEqual(summary["calls_missing_usage"], len(calls))
+        self.assertFalse(summary["cost_complete"])
+        batch = aggregate_game_summaries([summary, summary])
+        self.assertEqual(batch["streaming"]["stopped_early"], 2 * len(calls))
+        self.assertEqual(batch["streaming"]["ttft_ms"]["calls"], 2 * len(calls))
+
+    def test_full_streaming_keeps_reported_usage(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine, _ = self.play(tmpdir, "full")
+        summary = engine.ledger.game_summary()
+        self.assertEqual(summary["streaming"]["stopped_early"], 0)
+        self.assertEqual(summary["calls_missing_usage"], 0)
+        self.assertTrue(summary["cost_complete"])
+
+    def test_rejects_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            GameEngine(
+                n_players=7, n_wolves=2, n_seers=1, seed=4, output_dir="unused",
+                api_key="", provider=FakeProvider(), streaming="sometimes",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
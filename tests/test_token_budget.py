@@ -0,0 +1,98 @@
+import unittest
+
+from werewolf.agents.ai_agent import AIAgent
+from werewolf.engine.limits import (
+    INPUT_TOKEN_BUDGETS,
+    LIMITS_VERSION,
+    input_token_budget,
+    limits_dict,
+)
+from werewolf.engine.visibility import filter_events_for_player
+from werewolf.llm.tokens import TOKEN_ESTIMATOR, estimate_tokens
+
+
+def message(event_id, text):
+    return {
+        "id": event_id, "type": "message", "channel": "public",
+        "speaker_id": event_id % 5, "payload": {"text": text},
+    }
+
+
+def vote(event_id):
+    return {"id": event_id, "type": "vote", "payload": {"voter_id": 1, "target_id": 2}}
+
+
+def observation(events, required_action="vote"):
+    return {
+        "required_action": required_action,
+        "self": {"id": 0, "role": "villager", "team": "village"},
+        "round": 3, "phase": "day_vote",
+        "alive_players": [{"id": i} for i in range(5)],
+        "recent_events": events, "private_info": {},
+    }
+
+
+def prompt_tokens(agent, prompt):
+    return estimate_tokens(agent.system_prompt) + estimate_tokens(prompt)
+
+
+class TokenEstimateTests(unittest.TestCase):
+    def test_estimate(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcd"), 1)
+        self.assertEqual(estimate_tokens("abcde"), 2)
+        self.assertEqual(estimate_tokens("é" * 4), 2)
+
+    def test_budgets_are_logged(self):
+        limits = limits_dict()
+        self.assertEqual(limits["limits_version"], LIMITS_VERSION)
+        self.assertEqual(limits["input_token_budgets"], INPUT_TOKEN_BUDGETS)
+        self.assertEqual(limits["token_estimator"], TOKEN_ESTIMATOR)
+        self.assertEqual(
+            input_token_budget("not_an_action"), limits["default_input_token_budget"],
+        )
+
+
+class EventWindowTests(unittest.TestCase):
+    def test_observations_are_not_capped(self):
+        events = [vote(i) for i in range(120)]
+        self.assertEqual(len(filter_events_for_player(events, "villager")), 120)
+
+    def test_long_events_fill_the_budget_newest_first(self):
+        agent = AIAgent(player_id=0, role="villager", team="village")
+        events = [message(i, f"speech {i} " + "x" * 790) for i in range(60)]
+        prompt = agent._build_user_prompt(observation(events), errors=[])
+        self.assertLessEqual(prompt_tokens(agent, prompt), input_token_budget("vote"))
+        self.assertIn("speech 59 ", prompt)
+        self.assertNotIn("speech 0 ", prompt)
+        self.assertLess(prompt.count("[PUBLIC]"), 20)
+
+    def test_short_events_are_not_cut_at_ten(self):
+        agent = AIAgent(player_id=0, role="villager", team="village")
+        prompt = agent._build_user_prompt(
+            observation([vote(i) for i in range(40)]), errors=[],
+        )
+        self.assertEqual(prompt.count("[VOTE]"), 40)
+
+    def test_cache_layout_history_stays_within_budget(self):
+        agent = AIAgent(
+            player_id=0, role="villager", team="village", prompt_layout="cache",
+        )
+        events = []
+        prefixes = []
+        for turn in range(12):
+            events += [message(turn * 10 + i, "y" * 700) for i in range(10)]
+            prompt, prefix_chars = agent._build_cached_user_prompt(
+                observation(list(events)), errors=[],
+            )
+            self.assertLessEqual(prompt_tokens(agent, prompt), input_token_budget("vote"))
+            prefixes.append(prompt[:prefix_chars])
+        stable = sum(
+            later.startswith(earlier) for earlier, later in zip(prefixes, prefixes[1:])
+        )
+        self.assertGreater(stable, 0)
+        self.assertLess(stable, len(prefixes) - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from werewolf.engine.game import GameEngine
+from werewolf.llm.fake_provider import FakeProvider, success_result
+from werewolf.tracing import NULL_TRACER, Tracer, trace_format_for_path
+from tests.test_belief_snapshots_engine import full_beliefs_response
+
+
+def make_engine(tmpdir, **kwargs):
+    return GameEngine(
+        n_players=5, n_wolves=1, n_seers=1, seed=21,
+        output_dir=tmpdir, api_key="",
+        provider=FakeProvider(default=success_result(full_beliefs_response())),
+        transcript_enabled=False, show_all_channels=False, **kwargs,
+    )
+
+
+class TracerTests(unittest.TestCase):
+    def test_nesting_errors_and_worker_threads_under_root(self):
+        tracer = Tracer()
+        with tracer.root_span("batch", batch_id="b1"):
+            with tracer.span("game", game_id="g1"):
+                with self.assertRaises(RuntimeError):
+                    with tracer.span("attempt"):
+                        raise RuntimeError("boom")
+            worker = threading.Thread(
+                target=lambda: tracer.span("game", game_id="g2").__enter__().__exit__(
+                    None, None, None,
+                ),
+            )
+            worker.start()
+            worker.join()
+        spans = {(s["name"], s["attributes"].get("game_id")): s for s in tracer.spans()}
+        batch = spans[("batch", None)]
+        self.assertIsNone(batch["parent_id"])
+        self.assertEqual(spans[("game", "g1")]["parent_id"], batch["span_id"])
+        self.assertEqual(spans[("game", "g2")]["parent_id"], batch["span_id"])
+        attempt = spans[("attempt", None)]
+        self.assertEqual(attempt["parent_id"], spans[("game", "g1")]["span_id"])
+        self.assertEqual(attempt["error"], "RuntimeError: boom")
+        self.assertIsNone(tracer.root)
+
+    def test_null_tracer_allocates_nothing(self):
+        first = NULL_TRACER.span("act", player_id=1)
+        self.assertIs(first, NULL_TRACER.span("attempt"))
+        with first as span:
+            span.set(ok=True)
+
+    def test_format_from_path(self):
+        self.assertEqual(trace_format_for_path("t.otlp.json"), "otlp")
+        self.assertEqual(trace_format_for_path("t.json"), "chrome")
+        with self.assertRaises(ValueError):
+            Tracer().export("t.json", "svg")
+
+
+class EngineTracingTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tracer = Tracer()
+        self.engine = make_engine(self.tmp.name, tracer=self.tracer)
+        self.engine.run()
+        self.spans = self.tracer.spans()
+        self.by_id = {s["span_id"]: s for s in self.spans}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def parent_name(self, span):
+        return self.by_id[span["parent_id"]]["name"]
+
+    def test_span_hierarchy_and_attributes(self):
+        names = {s["name"] for s in self.spans}
+        self.assertEqual(names, {
+            "game", "phase", "act", "attempt", "provider.complete", "parse",
+            "validate",
+        })
+        expected_parent = {
+            "phase": "game", "act": "phase", "attempt": "act",
+            "provider.complete": "attempt", "parse": "attempt",
+            "validate": "attempt",
+        }
+        for span in self.spans:
+            if span["name"] == "game":
+                self.assertIsNone(span["parent_id"])
+                self.assertEqual(span["attributes"]["winner"], self.engine.state.winner)
+            else:
+                self.assertEqual(self.parent_name(span), expected_parent[span["name"]])
+            self.assertFalse(span["unfinished"])
+        phases = [s for s in self.spans if s["name"] == "phase"]
+        self.assertEqual(len(phases), len(self.engine.checkpoints))
+        act = next(s for s in self.spans if s["name"] == "act")
+        self.assertEqual(act["attributes"]["game_id"], self.engine.state.game_id)
+        self.assertIn("player_id", act["attributes"])
+        self.assertIn("required_action", act["attributes"])
+
+    def test_chrome_and_otlp_exports(self):
+        chrome_path = Path(self.tmp.name) / "trace.json"
+        otlp_path = Path(self.tmp.name) / "trace.otlp.json"
+        self.tracer.export(str(chrome_path))
+        self.tracer.export(str(otlp_path))
+
+        chrome = json.loads(chrome_path.read_text())
+        complete = [e for e in chrome["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual(len(complete), len(self.spans))
+        self.assertTrue(any(e["ph"] == "M" for e in chrome["traceEvents"]))
+        game = next(e for e in complete if e["name"] == "game")
+        for event in complete:
+            self.assertGreaterEqual(event["ts"], game["ts"])
+            self.assertLessEqual(event["ts"] + event["dur"], game["ts"] + game["dur"] + 1)
+
+        otlp = json.loads(otlp_path.read_text())
+        spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual(len(spans), len(self.spans))
+        ids = {s["spanId"] for s in spans}
+        for span in spans:
+            self.assertEqual(len(span["traceId"]), 32)
+            self.assertEqual(len(span["spanId"]), 16)
+            self.assertIsInstance(span["startTimeUnixNano"], str)
+            if "parentSpanId" in span:
+                self.assertIn(span["parentSpanId"], ids)
+
+    def test_fork_records_on_the_shared_tracer(self):
+        checkpoint = next(
+            cp for cp in self.engine.checkpoints if cp.phase == "day_discuss"
+        )
+        child = self.engine.fork(checkpoint)
+        self.assertIs(child.tracer, self.tracer)
+        child.run()
+        games = [s for s in self.tracer.spans() if s["name"] == "game"]
+        self.assertEqual(
+            {s["attributes"]["game_id"] for s in games},
+            {self.engine.state.game_id, child.state.game_id},
+        )
+
+
+class DisabledTracingTests(unittest.TestCase):
+    def test_default_engine_uses_null_tracer(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = make_engine(tmpdir)
+            self.assertIs(engine.tracer, NULL_TRACER)
+            self.assertIs(engine.agents[1].tracer, NULL_TRACER)
+            engine.run()
+            self.assertIsNotNone(engine.state.winner)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -447,6 +447,15 @@ class WebApiTests(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.get_json()["errors"]["request"]["code"], "invalid_type")
 
+    def test_event_poll_rejects_non_numeric_and_non_finite_wait(self):
+        for wait in ("soon", "nan", "NaN", "inf", "-inf"):
+            response = self.client.get(f"/api/events?wait={wait}")
+            self.assertEqual(response.status_code, 400, wait)
+            self.assertIn("wait", response.get_json()["error"])
+        response = self.client.get("/api/events?after=3&wait=0")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["events"], [])
+
     def test_failed_creation_preserves_active_engine(self):
         old_engine = mock.Mock()
         self.webapp.game_engine = old_engine
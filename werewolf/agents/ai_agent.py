@@ -1,14 +1,46 @@
 import json
 import logging
-import re
+import random
+import time
+from collections import Counter
+from itertools import count
 from typing import Callable, Optional
 
 from werewolf.agents.prompts import (
+    CHAT_HISTORY_MAX_TOKENS,
+    PROMPT_LAYOUT_CACHE,
+    PROMPT_LAYOUT_CHAT,
+    PROMPT_LAYOUT_LEGACY,
+    PROMPT_LAYOUTS,
+    PROMPT_RENDER_COMPACT,
+    PROMPT_RENDER_VERBOSE,
+    PROMPT_RENDERS,
+    RESPOND_JSON_ONLY,
+    RESPONSE_PROTOCOL_FULL,
+    RESPONSE_PROTOCOL_LEAN,
+    RESPONSE_PROTOCOLS,
     get_system_prompt,
     get_action_instruction,
     get_limits_notice,
+    get_response_rules,
+    get_stable_rules,
 )
-from werewolf.engine.limits import MEMORY_MAX_CHARS, truncate_text
+from werewolf.agents.rendering import EventRenderCache
+from werewolf.agents.response_parser import parse_response
+from werewolf.engine.action_schemas import action_schema
+from werewolf.engine.limits import (
+    MEMORY_MAX_CHARS,
+    input_token_budget,
+    truncate_text,
+)
+from werewolf.engine.timing import (
+    BACKOFF,
+    PROMPT_BUILD,
+    PROVIDER,
+    RATE_LIMIT,
+    VALIDATION,
+)
+from werewolf.engine.validate import expand_lean_response
 from werewolf.llm.provider import (
     GenerationConfig,
     ModelRequest,
@@ -21,11 +53,15 @@ from werewolf.llm.records import (
     UsageRecord,
     new_call_id,
 )
+from werewolf.llm.output_caps import OutputCapTable
+from werewolf.llm.preflight import Preflight, TokenRateLimiter
+from werewolf.llm.retry import RetryBudget, RetryPolicy
+from werewolf.llm.streaming import STREAM_MODES, STREAM_OFF
+from werewolf.llm.tokens import estimate_tokens
+from werewolf.tracing import NULL_TRACER
 
 logger = logging.getLogger("werewolf.agent")
 
-MAX_RETRIES = 3
-
 
 class AIAgent:
     """Prompt construction, response parsing, retry/fallback policy.
@@ -49,7 +85,95 @@ class AIAgent:
         model_alias: Optional[str] = None,
         reasoning_effort: Optional[str] = None,
         generation: Optional[GenerationConfig] = None,
+        timings: Optional[Counter] = None,
+        tracer=None,
+        prompt_layout: str = PROMPT_LAYOUT_LEGACY,
+        render_cache: Optional[EventRenderCache] = None,
+        prompt_render: str = PROMPT_RENDER_VERBOSE,
+        response_protocol: str = RESPONSE_PROTOCOL_FULL,
+        streaming: str = STREAM_OFF,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        output_caps: Optional[OutputCapTable] = None,
+        preflight: Optional[Preflight] = None,
+        rate_limiter: Optional[TokenRateLimiter] = None,
     ):
+        """timings: optional Counter shared with the engine; nanoseconds
+        spent building prompts, in the provider and in validation are
+        added to it (see werewolf/engine/timing.py).
+
+        tracer: optional werewolf.tracing.Tracer; act, attempt,
+        provider.complete, parse and validate spans are recorded on it.
+
+        prompt_layout: one of werewolf.agents.prompts.PROMPT_LAYOUTS. The
+        cache layout keeps an append-only history of every event this
+        player has observed and marks it, with the system prompt, as a
+        cacheable prefix on each request. The chat layout keeps a
+        conversation (self.session) and sends only each turn's delta;
+        read-only calls (update_memory=False) are never added to it.
+
+        render_cache: optional EventRenderCache shared by one game's
+        agents (werewolf/agents/rendering.py); each event is formatted
+        once per game instead of once per prompt that shows it. It must
+        render in prompt_render's mode.
+
+        prompt_render: one of werewolf.agents.prompts.PROMPT_RENDERS.
+        "compact" renders memory as minified JSON and events as short
+        lines, and moves the legacy layout's per-call rules into the
+        system prompt.
+
+        response_protocol: one of werewolf.agents.prompts.RESPONSE_PROTOCOLS.
+        "lean" asks only for what each action needs (a bare target, a
+        plain-string say, short belief keys, an optional capped thought);
+        responses are expanded to the full shape before validation
+        (werewolf.engine.validate.expand_lean_response), so callers see
+        no difference.
+
+        streaming: one of werewolf.llm.streaming.STREAM_MODES, sent on
+        every request; "early_stop" stops reading once the response's
+        JSON object is complete.
+
+        retry_policy / retry_budget: werewolf/llm/retry.py. The budget is
+        normally shared by a game's agents; without one, this agent gets
+        its own of the policy's game_budget.
+
+        output_caps: optional werewolf.llm.output_caps.OutputCapTable;
+        each request's max_output_tokens is this model's cap for its
+        required_action (never above generation.max_output_tokens).
+
+        preflight: werewolf.llm.preflight.Preflight for this model
+        (default: uncalibrated, no context window). Every request is
+        estimated before it is sent; one that would not fit the context
+        window first sheds old chat turns (not on read-only calls), then
+        is refused and falls back.
+
+        rate_limiter: optional werewolf.llm.preflight.TokenRateLimiter,
+        normally shared by a batch; each request reserves its estimate
+        plus max_output_tokens from it before it is sent."""
+        if prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(
+                f"Unknown prompt_layout {prompt_layout!r}; "
+                f"expected one of {PROMPT_LAYOUTS}"
+            )
+        if prompt_render not in PROMPT_RENDERS:
+            raise ValueError(
+                f"Unknown prompt_render {prompt_render!r}; "
+                f"expected one of {PROMPT_RENDERS}"
+            )
+        if response_protocol not in RESPONSE_PROTOCOLS:
+            raise ValueError(
+                f"Unknown response_protocol {response_protocol!r}; "
+                f"expected one of {RESPONSE_PROTOCOLS}"
+            )
+        if render_cache is not None and render_cache.mode != prompt_render:
+            raise ValueError(
+                f"render_cache renders {render_cache.mode!r} events, "
+                f"not {prompt_render!r}"
+            )
+        if streaming not in STREAM_MODES:
+            raise ValueError(
+                f"Unknown streaming mode {streaming!r}; expected one of {STREAM_MODES}"
+            )
         self.player_id = player_id
         self.role = role
         self.team = team
@@ -65,7 +189,35 @@ class AIAgent:
         self.show_prompts = show_prompts
         self.ledger = ledger
         self.run_context = run_context or {}
-        self.system_prompt = get_system_prompt(role, player_id, wolf_roster)
+        self.timings = timings if timings is not None else Counter()
+        self.tracer = tracer or NULL_TRACER
+        self.render_cache = render_cache or EventRenderCache(prompt_render)
+        self.prompt_layout = prompt_layout
+        self.prompt_render = prompt_render
+        self.response_protocol = response_protocol
+        self.streaming = streaming
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_budget = retry_budget or RetryBudget(self.retry_policy.game_budget)
+        self.output_caps = output_caps
+        self.preflight = preflight or Preflight()
+        self.rate_limiter = rate_limiter
+        self.sleep = time.sleep
+        self._jitter = random.Random()
+        self._hedge_losers: list[tuple] = []
+        self.system_prompt = get_system_prompt(
+            role, player_id, wolf_roster, response_protocol,
+        )
+        if (prompt_layout in (PROMPT_LAYOUT_CACHE, PROMPT_LAYOUT_CHAT)
+                or prompt_render == PROMPT_RENDER_COMPACT):
+            self.system_prompt += "\n" + get_stable_rules(response_protocol)
+        self._history: list[str] = []
+        self._history_tokens: list[int] = []
+        self._history_last_id = -1
+        self.session: list[dict] = []
+        self.session_evictions = 0
+        self._session_last_id = -1
+        self._session_instructions: set[str] = set()
+        self._resend_memory = True
 
         logger.debug(f"P{player_id} initialized as {role} ({team})")
 
@@ -84,9 +236,21 @@ class AIAgent:
         """update_memory=False makes the call read-only with respect to
         agent state: any updated_memory in the response is discarded.
         Used for belief assessments, which must never affect the game."""
+        with self.tracer.span(
+            "act", game_id=self.run_context.get("game_id"),
+            player_id=self.player_id, role=self.role,
+            required_action=observation["required_action"],
+        ):
+            return self._act(
+                observation, validator, fallback_fn, rng, update_memory,
+            )
+
+    def _act(self, observation, validator, fallback_fn, rng,
+             update_memory) -> dict:
         required_action = observation["required_action"]
         call_id = new_call_id()
         logger.debug(f"P{self.player_id} acting: {required_action}")
+        self.record_hedges(wait=False)
 
         if self.provider is None:
             logger.error("No LLM provider available, using fallback")
@@ -106,88 +270,162 @@ class AIAgent:
             fallback["_source_call_id"] = call_id
             return fallback
 
+        # Built once per turn: retries see the same observation.
+        response_schema = (
+            action_schema(observation, self.response_protocol)
+            if self.generation.response_schema else None
+        )
+        generation = self._generation_for(required_action)
         errors = []
         attempts_made = 0
-        for attempt in range(1, MAX_RETRIES + 1):
-            attempts_made = attempt
-            logger.debug(f"P{self.player_id} attempt {attempt}/{MAX_RETRIES}")
-            user_prompt = self._build_user_prompt(observation, errors)
-
-            if self.show_prompts:
-                print(f"\n{'='*60}")
-                print(f"  PROMPT TO P{self.player_id} ({self.role})")
-                print(f"{'='*60}")
-                print(f"[SYSTEM PROMPT]\n{self.system_prompt[:500]}...")
-                print(f"\n[USER PROMPT]\n{user_prompt}")
-                print(f"{'='*60}\n")
-
-            result = self.provider.complete(ModelRequest(
-                model=self.model,
-                system_prompt=self.system_prompt,
-                user_prompt=user_prompt,
-                generation=self.generation,
-            ))
-            record = self._record_from_result(
-                observation, call_id, attempt, result
-            )
-
-            if not result.ok:
-                logger.warning(
-                    f"P{self.player_id} API failure "
-                    f"({result.error_category and result.error_category.value}): "
-                    f"{result.error_message}"
-                )
-                self._record(record)
-                if result.retryable is False:
-                    break  # retrying cannot help (auth, context window, ...)
-                continue
-
-            parsed, parse_method = self._parse_response(result.text)
-            record.parse_method = parse_method
-            if parse_method == "regex":
-                logger.warning(
-                    f"P{self.player_id} recovered action via regex extraction"
+        retries = Counter()
+        failure = None  # (category, retry_after_ms) of the last attempt
+        backoff_ms = None
+        for attempt in count(1):
+            if failure is not None:
+                backoff_ms = self._retry_delay(observation, call_id, attempt,
+                                               retries, *failure)
+                if backoff_ms is None:
+                    break
+                self._wait(backoff_ms)
+            with self.tracer.span("attempt", attempt=attempt):
+                attempts_made = attempt
+                logger.debug(f"P{self.player_id} attempt {attempt}")
+                request, session_turn = self._build_request(
+                    observation, errors, generation, response_schema,
                 )
-
-            if parsed is None:
-                record.parse_ok = False
-                record.error_category = ErrorCategory.MALFORMED_JSON
-                record.retryable = True
-                self._record(record)
-                errors.append(
-                    "Your previous response was not valid JSON. "
-                    "Respond with a single valid JSON object only."
+                estimate = self.preflight.estimate(request)
+                # Read-only calls must not change the session: no eviction.
+                while (not self.preflight.fits(estimate, generation)
+                       and update_memory and self.session):
+                    self._evict_oldest_turn()
+                    request, session_turn = self._build_request(
+                        observation, errors, generation, response_schema,
+                    )
+                    estimate = self.preflight.estimate(request)
+                if not self.preflight.fits(estimate, generation):
+                    logger.warning(
+                        f"P{self.player_id} prompt of ~{estimate['input_tokens']} "
+                        f"tokens exceeds the {self.preflight.context_window}-token "
+                        f"context window; not sent"
+                    )
+                    self._record_non_api(
+                        observation, call_id, attempt=attempt,
+                        category=ErrorCategory.CONTEXT_WINDOW_EXCEEDED,
+                        preflight=estimate,
+                    )
+                    break
+
+                if self.show_prompts:
+                    print(f"\n{'='*60}")
+                    print(f"  PROMPT TO P{self.player_id} ({self.role})")
+                    print(f"{'='*60}")
+                    print(f"[SYSTEM PROMPT]\n{self.system_prompt[:500]}...")
+                    print(f"\n[USER PROMPT]\n{request.user_prompt}")
+                    print(f"{'='*60}\n")
+
+                reserved = estimate["input_tokens"] + (generation.max_output_tokens or 0)
+                self._throttle(reserved)
+                with self.tracer.span("provider.complete", model=self.model) as span:
+                    started = time.perf_counter_ns()
+                    result = self.provider.complete(request)
+                    self.timings[PROVIDER] += time.perf_counter_ns() - started
+                    span.set(
+                        ok=result.ok, latency_ms=result.latency_ms,
+                        ttft_ms=result.ttft_ms,
+                        error_category=result.error_category and result.error_category.value,
+                    )
+                if self.rate_limiter is not None:
+                    self.rate_limiter.settle(reserved, result.usage.total_tokens)
+                record = self._record_from_result(
+                    observation, call_id, attempt, result
                 )
-                logger.error(
-                    f"P{self.player_id} parsing failed, "
-                    f"raw[:300]: {str(result.text)[:300]}"
-                )
-                continue
+                record.backoff_ms = backoff_ms
+                record.preflight = estimate
+                if result.hedge_loser is not None:
+                    record.hedged = True
+                    self._hedge_losers.append(
+                        (result.hedge_loser, observation, call_id, attempt)
+                    )
+                if response_schema is not None:
+                    record.provider_metadata["response_schema"] = response_schema["title"]
+                if result.retry_after_ms is not None:
+                    record.provider_metadata["retry_after_ms"] = result.retry_after_ms
+
+                if not result.ok:
+                    logger.warning(
+                        f"P{self.player_id} API failure "
+                        f"({result.error_category and result.error_category.value}): "
+                        f"{result.error_message}"
+                    )
+                    self._record(record)
+                    if result.retryable is False:
+                        break  # retrying cannot help (auth, context window, ...)
+                    failure = (
+                        result.error_category or ErrorCategory.PROVIDER_ERROR,
+                        result.retry_after_ms,
+                    )
+                    continue
 
-            record.parse_ok = True
-            if not parsed.get("thought"):
-                parsed["thought"] = (
-                    "No specific reasoning provided - making decision based "
-                    "on available information."
-                )
+                with self.tracer.span("parse") as span:
+                    parsed, parse_method = self._parse_response(result.text)
+                    span.set(method=parse_method)
+                record.parse_method = parse_method
+                if parse_method == "regex":
+                    logger.warning(
+                        f"P{self.player_id} recovered action via regex extraction"
+                    )
+
+                if parsed is None:
+                    record.parse_ok = False
+                    record.error_category = ErrorCategory.MALFORMED_JSON
+                    record.retryable = True
+                    self._record(record)
+                    errors.append(
+                        "Your previous response was not valid JSON. "
+                        "Respond with a single valid JSON object only."
+                    )
+                    logger.error(
+                        f"P{self.player_id} parsing failed, "
+                        f"raw[:300]: {str(result.text)[:300]}"
+                    )
+                    failure = (ErrorCategory.MALFORMED_JSON, None)
+                    continue
 
-            is_valid, error = validator(observation, parsed)
-            if is_valid:
-                record.validation_ok = True
-                record.error_category = ErrorCategory.COMPLETED
+                record.parse_ok = True
+                if self.response_protocol == RESPONSE_PROTOCOL_LEAN:
+                    # A lean response may carry no thought at all.
+                    expand_lean_response(observation, parsed)
+                elif not parsed.get("thought"):
+                    parsed["thought"] = (
+                        "No specific reasoning provided - making decision based "
+                        "on available information."
+                    )
+
+                with self.tracer.span("validate") as span:
+                    started = time.perf_counter_ns()
+                    is_valid, error = validator(observation, parsed)
+                    self.timings[VALIDATION] += time.perf_counter_ns() - started
+                    span.set(valid=is_valid)
+                if is_valid:
+                    record.validation_ok = True
+                    record.error_category = ErrorCategory.COMPLETED
+                    self._record(record)
+                    if update_memory and "updated_memory" in parsed:
+                        self.memory = parsed["updated_memory"]
+                    if update_memory and session_turn is not None:
+                        self._commit_turn(request.user_prompt, result.text, *session_turn)
+                    parsed["_source_call_id"] = call_id
+                    logger.debug(f"P{self.player_id} action valid")
+                    return parsed
+
+                record.validation_ok = False
+                record.error_category = ErrorCategory.INVALID_GAME_ACTION
+                record.retryable = True
                 self._record(record)
-                if update_memory and "updated_memory" in parsed:
-                    self.memory = parsed["updated_memory"]
-                parsed["_source_call_id"] = call_id
-                logger.debug(f"P{self.player_id} action valid")
-                return parsed
-
-            record.validation_ok = False
-            record.error_category = ErrorCategory.INVALID_GAME_ACTION
-            record.retryable = True
-            self._record(record)
-            logger.warning(f"P{self.player_id} invalid action: {error}")
-            errors.append(error)
+                logger.warning(f"P{self.player_id} invalid action: {error}")
+                errors.append(error)
+                failure = (ErrorCategory.INVALID_GAME_ACTION, None)
 
         logger.warning(
             f"P{self.player_id} using fallback after {attempts_made} attempt(s)"
@@ -203,10 +441,125 @@ class AIAgent:
         fallback["_source_call_id"] = call_id
         return fallback
 
+    # ------------------------------------------------------------------
+    # Requests and pre-flight checks (werewolf/llm/preflight.py)
+    # ------------------------------------------------------------------
+
+    def _build_request(self, observation: dict, errors: list[str],
+                       generation: GenerationConfig,
+                       response_schema: Optional[dict]) -> tuple[ModelRequest, Optional[tuple]]:
+        """The attempt's request, and for the chat layout the turn to
+        commit if it completes."""
+        started = time.perf_counter_ns()
+        session_turn = None
+        if self.prompt_layout == PROMPT_LAYOUT_CACHE:
+            user_prompt, cache_prefix_chars = self._build_cached_user_prompt(
+                observation, errors,
+            )
+        elif self.prompt_layout == PROMPT_LAYOUT_CHAT:
+            user_prompt, session_turn = self._build_chat_turn(observation, errors)
+            cache_prefix_chars = 0
+        else:
+            user_prompt = self._build_user_prompt(observation, errors)
+            cache_prefix_chars = None
+        self.timings[PROMPT_BUILD] += time.perf_counter_ns() - started
+        return ModelRequest(
+            model=self.model,
+            system_prompt=self.system_prompt,
+            user_prompt=user_prompt,
+            generation=generation,
+            history=list(self.session),
+            cache_prefix_chars=cache_prefix_chars,
+            stream=self.streaming,
+            response_schema=response_schema,
+            required_action=observation["required_action"],
+        ), session_turn
+
+    def _throttle(self, tokens: int) -> None:
+        if self.rate_limiter is None:
+            return
+        with self.tracer.span("rate_limit", tokens=tokens):
+            started = time.perf_counter_ns()
+            self.rate_limiter.acquire(tokens)
+            self.timings[RATE_LIMIT] += time.perf_counter_ns() - started
+
+    # ------------------------------------------------------------------
+    # Retries (werewolf/llm/retry.py)
+    # ------------------------------------------------------------------
+
+    def _retry_delay(self, observation: dict, call_id: str, attempt: int,
+                     retries: Counter, category: ErrorCategory,
+                     retry_after_ms: Optional[int]) -> Optional[int]:
+        """Milliseconds to wait before this attempt, or None to stop and
+        fall back. Spends one unit of the game's retry budget."""
+        policy = self.retry_policy
+        if attempt > policy.max_attempts:
+            return None
+        if retries[category] >= policy.retries_for(category):
+            return None
+        delay = policy.backoff_ms(category, attempt - 1, retry_after_ms, self._jitter)
+        if delay is None:
+            logger.warning(
+                f"P{self.player_id} not retrying: provider asked to wait "
+                f"{retry_after_ms} ms"
+            )
+            return None
+        if not self.retry_budget.take():
+            logger.warning(f"P{self.player_id} game retry budget exhausted")
+            self._record_non_api(
+                observation, call_id, attempt=attempt - 1,
+                category=ErrorCategory.RETRY_BUDGET_EXHAUSTED,
+            )
+            return None
+        retries[category] += 1
+        return delay
+
+    def _wait(self, delay_ms: int) -> None:
+        if delay_ms <= 0:
+            return
+        with self.tracer.span("backoff", ms=delay_ms):
+            started = time.perf_counter_ns()
+            self.sleep(delay_ms / 1000)
+            self.timings[BACKOFF] += time.perf_counter_ns() - started
+
+    # ------------------------------------------------------------------
+    # Hedged calls (werewolf/llm/hedging.py)
+    # ------------------------------------------------------------------
+
+    def record_hedges(self, wait: bool = True) -> None:
+        """Record losing hedge attempts that have finished, or with wait,
+        all of them. Called on the game thread so the ledger sink keeps
+        one writer."""
+        pending = []
+        for loser, observation, call_id, attempt in self._hedge_losers:
+            if not wait and not loser.done():
+                pending.append((loser, observation, call_id, attempt))
+                continue
+            try:
+                result = loser.result()
+            except Exception:
+                logger.exception(f"P{self.player_id} hedge attempt raised")
+                continue
+            if self.rate_limiter is not None:
+                # Sent without a reservation, but billed against the same
+                # tokens-per-minute quota as the winner.
+                self.rate_limiter.settle(0, result.usage.total_tokens)
+            record = self._record_from_result(observation, call_id, attempt, result)
+            record.hedged = True
+            record.error_category = ErrorCategory.HEDGE_LOST
+            record.retryable = False
+            self._record(record)
+        self._hedge_losers = pending
+
     # ------------------------------------------------------------------
     # Usage recording
     # ------------------------------------------------------------------
 
+    def _generation_for(self, required_action: str) -> GenerationConfig:
+        if self.output_caps is None:
+            return self.generation
+        return self.output_caps.apply(self.generation, self.model, required_action)
+
     def _build_context(self, observation: dict) -> CallContext:
         rc = self.run_context
         return CallContext(
@@ -238,19 +591,23 @@ class AIAgent:
             usage=result.usage,
             cost=result.cost,
             latency_ms=result.latency_ms,
+            ttft_ms=result.ttft_ms,
+            object_complete_ms=result.object_complete_ms,
             provider_request_id=result.provider_request_id,
             finish_reason=result.finish_reason,
             api_attempted=True,
             api_ok=result.ok,
             error_category=result.error_category,
             retryable=result.retryable,
-            requested_generation=self.generation.to_json_dict(),
+            requested_generation=self._generation_for(
+                observation.get("required_action", "")
+            ).to_json_dict(),
             provider_metadata=dict(result.provider_metadata),
         )
 
     def _record_non_api(
         self, observation: dict, call_id: str, attempt: int,
-        category: ErrorCategory,
+        category: ErrorCategory, preflight: Optional[dict] = None,
     ) -> None:
         self._record(UsageRecord(
             context=self._build_context(observation),
@@ -262,6 +619,7 @@ class AIAgent:
             api_ok=False,
             error_category=category,
             retryable=False,
+            preflight=preflight,
         ))
 
     def _record(self, record: UsageRecord) -> None:
@@ -269,44 +627,37 @@ class AIAgent:
             self.ledger.record(record)
 
     # ------------------------------------------------------------------
-    # Parsing (unchanged semantics; now reports which method succeeded)
+    # Parsing (werewolf/agents/response_parser.py)
     # ------------------------------------------------------------------
 
     def _parse_response(self, raw: str) -> tuple[Optional[dict], Optional[str]]:
         """Returns (parsed_dict, method) where method is one of
         'direct' | 'repaired' | 'regex', or (None, None) on failure."""
-        content = raw.strip()
-        brace = content.find("{")
-        if brace != -1:
-            try:
-                obj, _ = json.JSONDecoder().raw_decode(content, brace)
-                if isinstance(obj, dict):
-                    return obj, "direct"
-            except json.JSONDecodeError:
-                pass
-            repaired = self._repair_json(content)
-            if repaired:
-                obj = json.loads(repaired)
-                if isinstance(obj, dict):
-                    return obj, "repaired"
-        extracted = self._regex_extract(raw)
-        if extracted:
-            return extracted, "regex"
-        return None, None
+        return parse_response(raw)
 
     def _build_user_prompt(self, observation: dict, errors: list[str]) -> str:
         required_action = observation["required_action"]
         turn_context = observation.get("turn_context")
-        action_instruction = get_action_instruction(required_action, turn_context)
+        action_instruction = get_action_instruction(
+            required_action, turn_context, self.response_protocol,
+        )
 
+        compact = self.prompt_render == PROMPT_RENDER_COMPACT
         alive_list = ", ".join(f"P{p['id']}" for p in observation["alive_players"])
-        prompt_parts = [
-            "=== CURRENT GAME STATE ===",
-            f"Round: {observation['round']}",
-            f"Phase: {observation['phase']}",
-            f"You are: P{observation['self']['id']} ({observation['self']['role']})",
-            f"Alive players: {alive_list}",
-        ]
+        if compact:
+            prompt_parts = [
+                f"STATE: round {observation['round']}, {observation['phase']}. "
+                f"You: P{observation['self']['id']} ({observation['self']['role']}). "
+                f"Alive: {alive_list}",
+            ]
+        else:
+            prompt_parts = [
+                "=== CURRENT GAME STATE ===",
+                f"Round: {observation['round']}",
+                f"Phase: {observation['phase']}",
+                f"You are: P{observation['self']['id']} ({observation['self']['role']})",
+                f"Alive players: {alive_list}",
+            ]
 
         if observation.get("private_info"):
             private = observation["private_info"]
@@ -317,189 +668,205 @@ class AIAgent:
                 is_wolf = "WEREWOLF" if result.get("is_werewolf") else "NOT WEREWOLF"
                 prompt_parts.append(f"Last divine: P{result['target_id']} is {is_wolf}")
 
-        if observation.get("recent_events"):
+        tail_parts = [
+            f"\n=== YOUR MEMORY ===\n{self._render_memory()}",
+            f"\n=== INSTRUCTIONS ===\n{action_instruction}",
+        ]
+        if not compact:  # compact: the rules are in the system prompt
+            tail_parts += [get_limits_notice(),
+                           get_response_rules(self.response_protocol)]
+        self._append_errors(tail_parts, errors)
+        if not compact:
+            tail_parts.append(RESPOND_JSON_ONLY)
+
+        lines = self._event_window(
+            observation.get("recent_events", ()),
+            input_token_budget(required_action)
+            - self._estimate(self.system_prompt, *prompt_parts, *tail_parts),
+        )
+        if lines:
             prompt_parts.append("\n=== RECENT EVENTS ===")
-            for event in observation["recent_events"][-10:]:
-                prompt_parts.append(self._format_event(event))
+            prompt_parts.extend(lines)
+
+        return "\n".join(prompt_parts + tail_parts)
+
+    def _build_cached_user_prompt(self, observation: dict,
+                                  errors: list[str]) -> tuple[str, int]:
+        """Cache layout: returns (prompt, cache_prefix_chars). The prefix
+        is the event history, which only ever grows between calls, so
+        each request shares it with the previous one; everything after
+        it changes per call. When the history outgrows the input budget,
+        the oldest lines are evicted in one step down to half of what the
+        budget leaves for it, so the prefix then holds for many calls."""
+        for event in observation.get("recent_events", ()):
+            if event.get("id", -1) > self._history_last_id:
+                self._history.append(self._format_event(event))
+                self._history_tokens.append(self.render_cache.tokens(event))
+                self._history_last_id = event["id"]
+
+        required_action = observation["required_action"]
+        alive_list = ", ".join(f"P{p['id']}" for p in observation["alive_players"])
+        prompt_parts = [
+            f"\n=== YOUR MEMORY ===\n{self._render_memory()}",
+            "\n=== CURRENT GAME STATE ===",
+            f"Round: {observation['round']}",
+            f"Phase: {observation['phase']}",
+            f"You are: P{observation['self']['id']} ({observation['self']['role']})",
+            f"Alive players: {alive_list}",
+        ]
+        private = observation.get("private_info") or {}
+        if "last_divine_result" in private:
+            result = private["last_divine_result"]
+            is_wolf = "WEREWOLF" if result.get("is_werewolf") else "NOT WEREWOLF"
+            prompt_parts.append(f"Last divine: P{result['target_id']} is {is_wolf}")
+        prompt_parts.append(
+            "\n=== INSTRUCTIONS ===\n"
+            + get_action_instruction(
+                required_action, observation.get("turn_context"),
+                self.response_protocol,
+            )
+        )
+        self._append_errors(prompt_parts, errors)
+
+        room = input_token_budget(required_action) - self._estimate(
+            self.system_prompt, "=== EVENT HISTORY ===", *prompt_parts,
+        )
+        if sum(self._history_tokens) > room:
+            keep, total = 0, 0
+            for cost in reversed(self._history_tokens):
+                if total + cost > room // 2:
+                    break
+                keep, total = keep + 1, total + cost
+            evict = len(self._history) - keep
+            del self._history[:evict]
+            del self._history_tokens[:evict]
+        prefix = "\n".join(["=== EVENT HISTORY ==="] + self._history) + "\n"
+        return prefix + "\n".join(prompt_parts), len(prefix)
+
+    def _build_chat_turn(self, observation: dict,
+                         errors: list[str]) -> tuple[str, tuple[int, str]]:
+        """Chat layout: returns (this turn's user message, (event cursor,
+        instruction) to commit if the turn completes). Nothing the session
+        already holds is repeated: seen events are skipped and an
+        instruction identical to one sent earlier is referenced by name.
+        Memory is sent on the first turn and again after an eviction,
+        since the model's own replies carry it otherwise."""
+        new_events = [
+            event for event in observation.get("recent_events", ())
+            if event.get("id", -1) > self._session_last_id
+        ]
+        prompt_parts = []
+        if self._resend_memory:
+            prompt_parts.append(f"\n=== YOUR MEMORY ===\n{self._render_memory()}")
+        alive_list = ", ".join(f"P{p['id']}" for p in observation["alive_players"])
+        prompt_parts.append(
+            f"\n=== NOW === Round {observation['round']}, {observation['phase']}. "
+            f"Alive: {alive_list}"
+        )
+        private = observation.get("private_info") or {}
+        if "last_divine_result" in private:
+            result = private["last_divine_result"]
+            is_wolf = "WEREWOLF" if result.get("is_werewolf") else "NOT WEREWOLF"
+            prompt_parts.append(f"Last divine: P{result['target_id']} is {is_wolf}")
+        required_action = observation["required_action"]
+        instruction = get_action_instruction(
+            required_action, observation.get("turn_context"),
+            self.response_protocol,
+        )
+        if instruction in self._session_instructions:
+            prompt_parts.append(
+                f"REQUIRED ACTION: {required_action}, with the same rules and "
+                f"JSON format as your earlier {required_action} turn."
+            )
+        else:
+            prompt_parts.append(instruction)
+        self._append_errors(prompt_parts, errors)
+        # The session is bounded by CHAT_HISTORY_MAX_TOKENS; the delta's
+        # events get what the input budget leaves after the rest of it.
+        lines = self._event_window(
+            new_events,
+            input_token_budget(required_action)
+            - self._estimate(self.system_prompt, *prompt_parts),
+        )
+        if lines:
+            prompt_parts[:0] = ["=== NEW EVENTS ===", *lines]
+        cursor = new_events[-1]["id"] if new_events else self._session_last_id
+        return "\n".join(prompt_parts).lstrip("\n"), (cursor, instruction)
+
+    def _commit_turn(self, user_prompt: str, reply: str, cursor: int,
+                     instruction: str) -> None:
+        self.session.append({"role": "user", "content": user_prompt})
+        self.session.append({"role": "assistant", "content": reply})
+        self._session_last_id = cursor
+        self._session_instructions.add(instruction)
+        self._resend_memory = False
+        if self._session_tokens() <= CHAT_HISTORY_MAX_TOKENS:
+            return
+        # Evict whole (user, assistant) turns, oldest first, down to half
+        # the budget; the newest turn is always kept.
+        while (len(self.session) > 2
+               and self._session_tokens() > CHAT_HISTORY_MAX_TOKENS // 2):
+            del self.session[:2]
+        self.session_evictions += 1
+        # The turns that carried full instructions may be gone.
+        self._session_instructions.clear()
+        self._resend_memory = True
+
+    def _evict_oldest_turn(self) -> None:
+        """Drop the oldest session turn so a request fits the model's
+        context window; the next turn resends instructions and memory."""
+        del self.session[:2]
+        self.session_evictions += 1
+        self._session_instructions.clear()
+        self._resend_memory = True
+
+    def _session_tokens(self) -> int:
+        return sum(estimate_tokens(message["content"]) for message in self.session)
+
+    def _event_window(self, events, token_budget: int) -> list[str]:
+        """Rendered lines of the newest events whose estimated tokens fit
+        token_budget, oldest first."""
+        lines = []
+        for event in reversed(events):
+            token_budget -= self.render_cache.tokens(event)
+            if token_budget < 0:
+                break
+            lines.append(self._format_event(event))
+        lines.reverse()
+        return lines
+
+    @staticmethod
+    def _estimate(*parts: str) -> int:
+        return sum(estimate_tokens(part) for part in parts)
 
+    def _render_memory(self) -> str:
         # Persistent-memory bandwidth cap: a verbose model must not receive
         # more effective context than a concise one. Stored memory is kept
-        # intact; only what is rendered into the prompt is bounded.
-        memory_json, truncated_from = truncate_text(
-            json.dumps(self.memory, indent=2), MEMORY_MAX_CHARS
-        )
+        # intact; only what is rendered into the prompt is bounded. The
+        # cap applies to the rendered text, so compact memory holds more
+        # before it is cut: compare games within one rendering only.
+        if self.prompt_render == PROMPT_RENDER_COMPACT:
+            rendered = json.dumps(self.memory, separators=(",", ":"),
+                                  ensure_ascii=False)
+        else:
+            rendered = json.dumps(self.memory, indent=2)
+        memory_json, truncated_from = truncate_text(rendered, MEMORY_MAX_CHARS)
         if truncated_from is not None:
             memory_json += (
                 f"\n...[memory truncated: {truncated_from} chars exceeds "
                 f"the {MEMORY_MAX_CHARS}-char limit]"
             )
-        prompt_parts.append(f"\n=== YOUR MEMORY ===\n{memory_json}")
-        prompt_parts.append(f"\n=== INSTRUCTIONS ===\n{action_instruction}")
-        prompt_parts.append(get_limits_notice())
-        prompt_parts.append("\nIMPORTANT: Always explain your reasoning in the 'thought' field. If you don't have enough information, say so.")
+        return memory_json
 
+    @staticmethod
+    def _append_errors(prompt_parts: list[str], errors: list[str]) -> None:
         if errors:
             prompt_parts.append(f"\n=== PREVIOUS ERRORS (fix these!) ===")
             for i, err in enumerate(errors, 1):
                 prompt_parts.append(f"{i}. {err}")
 
-        prompt_parts.append("\nRespond with a valid JSON object only. No extra text.")
-
-        return "\n".join(prompt_parts)
-
     def _format_event(self, event: dict) -> str:
-        etype = event.get("type")
-        payload = event.get("payload", {})
-        speaker = event.get("speaker_id")
-        channel = event.get("channel", "public")
-
-        if etype == "message":
-            return f"[{channel.upper()}] P{speaker}: {payload.get('text', '')}"
-        elif etype == "death_announcement":
-            victim_id = payload.get("victim_id")
-            victim_role = payload.get("victim_role")
-            cause = payload.get("cause")
-            if cause == "wolf_kill":
-                return f"[DEATH] P{victim_id} was killed during the night"
-            else:
-                return f"[DEATH] P{victim_id} was eliminated by vote ({victim_role})"
-        elif etype == "vote":
-            return f"[VOTE] P{payload.get('voter_id')} voted for P{payload.get('target_id')}"
-        elif etype == "elimination":
-            return f"[ELIMINATED] P{payload.get('eliminated_id')} ({payload.get('eliminated_role')})"
-        elif etype == "divine_result":
-            result = "WEREWOLF" if payload.get("is_werewolf") else "NOT WEREWOLF"
-            return f"[DIVINE] P{payload.get('target_id')} is {result}"
-        elif etype == "runoff_announcement":
-            candidates_str = ", ".join(f"P{c}" for c in payload.get("candidates", []))
-            return f"[RUNOFF] Vote tied! Runoff between: {candidates_str}"
-        elif etype == "no_elimination":
-            return f"[NO ELIMINATION] Runoff tied — no one is eliminated today"
-        elif etype == "game_status":
-            return f"[STATUS] Wolves: {payload.get('alive_wolves')}, Village: {payload.get('alive_villagers')}"
-        else:
-            return f"[{etype.upper()}] {json.dumps(payload)}"
-
-    @staticmethod
-    def _repair_json(text: str) -> Optional[str]:
-        start = text.find("{")
-        if start == -1:
-            return None
-
-        chars = []
-        i = start
-        in_string = False
-        brace_depth = 0
-        bracket_depth = 0
-
-        while i < len(text):
-            c = text[i]
-
-            if in_string:
-                if c == "\\" and i + 1 < len(text):
-                    next_c = text[i + 1]
-                    if next_c in '"\\bfnrtu/':
-                        chars.append(c)
-                        chars.append(next_c)
-                    else:
-                        chars.append("\\\\")
-                        chars.append(next_c)
-                    i += 2
-                    continue
-                if c == '"':
-                    rest = text[i + 1:].lstrip()
-                    if not rest or rest[0] in ":,}]":
-                        in_string = False
-                        chars.append(c)
-                    else:
-                        chars.append('\\"')
-                    i += 1
-                    continue
-                if c in "\n\r":
-                    chars.append("\\n")
-                    i += 1
-                    continue
-                if c == "\t":
-                    chars.append("\\t")
-                    i += 1
-                    continue
-                chars.append(c)
-                i += 1
-                continue
-
-            if c == '"':
-                in_string = True
-            elif c == "{":
-                brace_depth += 1
-            elif c == "}":
-                brace_depth -= 1
-            elif c == "[":
-                bracket_depth += 1
-            elif c == "]":
-                bracket_depth -= 1
-
-            chars.append(c)
-            i += 1
-
-            if brace_depth == 0 and bracket_depth <= 0:
-                break
-
-        if in_string:
-            chars.append('"')
-
-        joined = "".join(chars).rstrip()
-        if joined.endswith(":"):
-            last_quote = joined.rfind('"', 0, len(joined) - 1)
-            if last_quote != -1:
-                second_last = joined.rfind('"', 0, last_quote)
-                if second_last != -1:
-                    joined = joined[:second_last].rstrip().rstrip(",")
-            else:
-                joined = joined[:-1].rstrip().rstrip(",")
-        elif joined.endswith(","):
-            joined = joined[:-1]
-
-        while bracket_depth > 0:
-            joined += "]"
-            bracket_depth -= 1
-        while brace_depth > 0:
-            joined += "}"
-            brace_depth -= 1
-
-        try:
-            json.loads(joined)
-            return joined
-        except json.JSONDecodeError:
-            return None
-
-    @staticmethod
-    def _regex_extract(text: str) -> Optional[dict]:
-        result = {}
-        action = {}
-
-        for key in ("vote_target", "kill_target", "divine_target"):
-            m = re.search(rf'"{key}"\s*:\s*"?(\w+)"?', text)
-            if m:
-                action[key] = m.group(1)
-
-        for channel in ("public", "werewolf"):
-            m = re.search(
-                rf'"{channel}"\s*:\s*"((?:[^"\\]|\\.)*)"',
-                text,
-            )
-            if m:
-                result.setdefault("say", {})[channel] = m.group(1)
-
-        if not action and "say" not in result:
-            return None
-
-        if action:
-            result["action"] = action
-        else:
-            result["action"] = None
-        result.setdefault("say", None)
-        result["thought"] = "[recovered from malformed response]"
-        return result
+        return self.render_cache.render(event)
 
 
 def create_agents(
@@ -513,6 +880,18 @@ def create_agents(
     model_alias: Optional[str] = None,
     reasoning_effort: Optional[str] = None,
     generation: Optional[GenerationConfig] = None,
+    timings: Optional[Counter] = None,
+    tracer=None,
+    prompt_layout: str = PROMPT_LAYOUT_LEGACY,
+    render_cache: Optional[EventRenderCache] = None,
+    prompt_render: str = PROMPT_RENDER_VERBOSE,
+    response_protocol: str = RESPONSE_PROTOCOL_FULL,
+    streaming: str = STREAM_OFF,
+    retry_policy: Optional[RetryPolicy] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    output_caps: Optional[OutputCapTable] = None,
+    preflight: Optional[Preflight] = None,
+    rate_limiter: Optional[TokenRateLimiter] = None,
 ) -> dict[int, AIAgent]:
     """Backward-compatible factory. If no provider is injected, one is
     built from (model, api_key) via the registry; with no key or SDK the
@@ -523,6 +902,8 @@ def create_agents(
         provider = build_provider(resolve(model), api_key=api_key).provider
 
     wolf_roster = [p.id for p in players.values() if p.role == "werewolf"]
+    retry_policy = retry_policy or RetryPolicy()
+    retry_budget = retry_budget or RetryBudget(retry_policy.game_budget)
 
     agents = {}
     for pid, player in players.items():
@@ -539,6 +920,18 @@ def create_agents(
             model_alias=model_alias,
             reasoning_effort=reasoning_effort,
             generation=generation,
+            timings=timings,
+            tracer=tracer,
+            prompt_layout=prompt_layout,
+            render_cache=render_cache,
+            prompt_render=prompt_render,
+            response_protocol=response_protocol,
+            streaming=streaming,
+            retry_policy=retry_policy,
+            retry_budget=retry_budget,
+            output_caps=output_caps,
+            preflight=preflight,
+            rate_limiter=rate_limiter,
         )
 
     return agents
@@ -214,18 +214,132 @@ You cannot vote for yourself."""
 }
 
 
-def get_system_prompt(role: str, player_id: int, wolf_roster: list[int] = None) -> str:
+# Response protocols. "full" asks every response for thought, say,
+# action and updated_memory. "lean" asks only for what the action needs:
+# a bare "target" id, "say" as a plain string, "beliefs" with short keys
+# and optional "thought" (capped per required_action, not requested at
+# all where the cap is 0) and "memory" (omitted: notes unchanged).
+# engine/validate.py expands lean responses to the full shape before
+# validation. Lean games spend fewer output tokens and record less
+# reasoning, so the protocol is logged in the config row and in validity
+# metadata and folded into prompt_version. Bump RESPONSE_PROTOCOL_VERSION
+# whenever the lean format or its caps change.
+RESPONSE_PROTOCOL_FULL = "full"
+RESPONSE_PROTOCOL_LEAN = "lean"
+RESPONSE_PROTOCOLS = (RESPONSE_PROTOCOL_FULL, RESPONSE_PROTOCOL_LEAN)
+RESPONSE_PROTOCOL_VERSION = 1
+
+LEAN_THOUGHT_MAX_CHARS = {
+    "wolf_chat": 300,
+    "speak_public": 300,
+    "choose_wolf_kill": 150,
+    "seer_divine": 150,
+    "vote": 0,
+    "runoff_vote": 0,
+    "assess_beliefs": 0,
+}
+
+LEAN_RESPONSE_FORMAT = """RESPONSE FORMAT:
+Reply with one JSON object holding only the keys the REPLY line of your
+instruction lists, plus where allowed:
+- "thought": your private reasoning (only the moderator sees it), within
+  the stated character limit
+- "memory": notes for your next turn, replacing your current notes; omit
+  it to keep them unchanged
+Player ids are plain integers (3, not "P3").
+"""
+
+# Short belief keys: engine/beliefs.py LEAN_BELIEF_KEYS.
+_LEAN_BELIEFS = (
+    '{"p": {"<id>": <0.0-1.0>, ...}, "v": <id>, "c": <0.0-1.0>, '
+    '"s": <id or null>, "e": {"<id>": <0.0-1.0>, ...} or null}'
+)
+_LEAN_BELIEFS_HELP = (
+    "p: probability that each alive player except you is a werewolf (all "
+    "of them). v: who you would vote for now. c: confidence in that vote. "
+    "s: most influential recent speaker. e: WEREWOLVES ONLY - how "
+    "suspicious each other alive player is of you; null otherwise."
+)
+
+LEAN_ACTION_INSTRUCTIONS = {
+    "wolf_chat": "NIGHT - WOLF CHAT: coordinate with your fellow wolves.",
+    "choose_wolf_kill": "NIGHT - WOLF KILL: choose an alive non-wolf to kill.",
+    "seer_divine": (
+        "NIGHT - SEER DIVINE: choose a player (not yourself) to learn whether "
+        "they are a werewolf. Keep the result in your memory."
+    ),
+    "speak_public": (
+        "DAY - DISCUSSION, cycle {discussion_cycle} of {total_cycles}. You are "
+        "speaker {your_position}. Spoken: {already_spoken}. Yet to speak: "
+        "{yet_to_speak}. Only call out silence from earlier cycles or rounds."
+    ),
+    "assess_beliefs": (
+        "DAY - PRIVATE ASSESSMENT: moderator-only, never shown to players and "
+        "no effect on the game. Answer honestly, out of character."
+    ),
+    "vote": (
+        "DAY - VOTE: vote to eliminate a player (not yourself). Also report "
+        "your private, moderator-only beliefs."
+    ),
+    "runoff_vote": (
+        "DAY - RUNOFF: the vote tied. Vote for one of {runoff_candidates} "
+        "(not yourself). Another tie eliminates no one."
+    ),
+}
+
+_LEAN_REPLIES = {
+    "wolf_chat": '{"say": "<message to the wolves>"}',
+    "choose_wolf_kill": '{"target": <player_id>}',
+    "seer_divine": '{"target": <player_id>}',
+    "speak_public": '{"say": "<public message>"}',
+    "assess_beliefs": '{"beliefs": ' + _LEAN_BELIEFS + "}",
+    "vote": '{"target": <player_id>, "beliefs": ' + _LEAN_BELIEFS + "}",
+    "runoff_vote": '{"target": <player_id>}',
+}
+
+
+def lean_reply(required_action: str) -> str:
+    """The REPLY line of a lean instruction, with its thought allowance."""
+    cap = LEAN_THOUGHT_MAX_CHARS.get(required_action, 0)
+    thought = (
+        f'Optional "thought" of at most {cap} characters.' if cap
+        else 'No "thought".'
+    )
+    memory = "" if required_action == "assess_beliefs" else ' Optional "memory".'
+    lines = [f"REPLY: {_LEAN_REPLIES.get(required_action, '{}')}"]
+    if "beliefs" in lines[0]:
+        lines.append(_LEAN_BELIEFS_HELP)
+    lines.append(thought + memory)
+    return "\n".join(lines)
+
+
+def response_protocol_dict(protocol: str) -> dict:
+    info = {"name": protocol, "version": RESPONSE_PROTOCOL_VERSION}
+    if protocol == RESPONSE_PROTOCOL_LEAN:
+        info["thought_max_chars"] = dict(LEAN_THOUGHT_MAX_CHARS)
+    return info
+
+
+def get_system_prompt(role: str, player_id: int, wolf_roster: list[int] = None,
+                      protocol: str = RESPONSE_PROTOCOL_FULL) -> str:
     if role == "werewolf":
         roster_str = ", ".join(f"P{w}" for w in wolf_roster) if wolf_roster else "unknown"
-        return WEREWOLF_SYSTEM_PROMPT.format(player_id=player_id, wolf_roster=roster_str)
+        prompt = WEREWOLF_SYSTEM_PROMPT.format(player_id=player_id, wolf_roster=roster_str)
     elif role == "seer":
-        return SEER_SYSTEM_PROMPT.format(player_id=player_id)
+        prompt = SEER_SYSTEM_PROMPT.format(player_id=player_id)
     else:
-        return VILLAGER_SYSTEM_PROMPT.format(player_id=player_id)
-
-
-def get_action_instruction(required_action: str, turn_context: dict = None) -> str:
-    template = ACTION_INSTRUCTIONS.get(required_action, "Unknown action required.")
+        prompt = VILLAGER_SYSTEM_PROMPT.format(player_id=player_id)
+    if protocol == RESPONSE_PROTOCOL_LEAN:
+        # The full format and its examples are replaced, not contradicted.
+        prompt = prompt[:prompt.index("RESPONSE FORMAT:")] + LEAN_RESPONSE_FORMAT
+    return prompt
+
+
+def get_action_instruction(required_action: str, turn_context: dict = None,
+                           protocol: str = RESPONSE_PROTOCOL_FULL) -> str:
+    lean = protocol == RESPONSE_PROTOCOL_LEAN
+    instructions = LEAN_ACTION_INSTRUCTIONS if lean else ACTION_INSTRUCTIONS
+    template = instructions.get(required_action, "Unknown action required.")
     if turn_context and required_action == "speak_public":
         already = ", ".join(f"P{p}" for p in turn_context["already_spoken"]) or "nobody yet"
         yet = ", ".join(f"P{p}" for p in turn_context["yet_to_speak"]) or "nobody"
@@ -239,6 +353,8 @@ def get_action_instruction(required_action: str, turn_context: dict = None) -> s
     elif turn_context and required_action == "runoff_vote":
         candidates_str = ", ".join(f"P{c}" for c in turn_context["runoff_candidates"])
         template = template.format(runoff_candidates=candidates_str)
+    if lean:
+        template += "\n" + lean_reply(required_action)
     return template
 
 
@@ -260,16 +376,100 @@ def get_limits_notice() -> str:
     )
 
 
+RESPONSE_RULES = (
+    "\nIMPORTANT: Always explain your reasoning in the 'thought' field. "
+    "If you don't have enough information, say so."
+)
+RESPOND_JSON_ONLY = "\nRespond with a valid JSON object only. No extra text."
+LEAN_RESPONSE_RULES = (
+    "\nIMPORTANT: Reply with only the keys your REPLY line lists. Keep any "
+    "thought within its limit."
+)
+
+
+def get_response_rules(protocol: str = RESPONSE_PROTOCOL_FULL) -> str:
+    if protocol == RESPONSE_PROTOCOL_LEAN:
+        return LEAN_RESPONSE_RULES
+    return RESPONSE_RULES
+
+
+# Prompt layouts. "legacy" is the original single user message: game
+# state first, then as many of the newest events as fit the action's
+# input token budget (INPUT_TOKEN_BUDGETS in werewolf/engine/limits.py;
+# no fixed event count), then instructions and rules. "cache" orders the
+# request for provider-side prefix caching: role prompt and rules in the
+# system message, then the player's append-only event history, then
+# memory, and per-call state and instructions last. "chat" keeps one
+# conversation per agent and sends only what is new each turn (events,
+# state, instruction), evicting the oldest turns past a token budget.
+# Bump PROMPT_LAYOUT_VERSION when a layout's section order or its
+# stable/volatile split changes; both are logged in every game config.
+PROMPT_LAYOUT_LEGACY = "legacy"
+PROMPT_LAYOUT_CACHE = "cache"
+PROMPT_LAYOUT_CHAT = "chat"
+PROMPT_LAYOUTS = (PROMPT_LAYOUT_LEGACY, PROMPT_LAYOUT_CACHE, PROMPT_LAYOUT_CHAT)
+PROMPT_LAYOUT_VERSION = 1
+
+# Chat sessions: prior turns are kept while their estimated tokens
+# (werewolf/llm/tokens.py) stay within CHAT_HISTORY_MAX_TOKENS. Past it
+# the oldest turns are evicted down to half the budget in one step, so
+# the cached prefix survives many turns between evictions instead of
+# shifting on every call.
+CHAT_HISTORY_MAX_TOKENS = 8000
+
+# Prompt renderings, orthogonal to the layout. "verbose" is the original
+# text: pretty-printed memory, bracketed event tags, per-call rules in
+# the legacy user message. "compact" minifies memory, uses short event
+# lines (werewolf/agents/rendering.py) and moves the legacy layout's
+# per-call rules into the system message. A compact game spends fewer
+# input tokens on the same information, so it is a separate condition
+# with its own prompt_version. Bump PROMPT_RENDER_VERSION whenever the
+# compact text changes.
+PROMPT_RENDER_VERBOSE = "verbose"
+PROMPT_RENDER_COMPACT = "compact"
+PROMPT_RENDERS = (PROMPT_RENDER_VERBOSE, PROMPT_RENDER_COMPACT)
+PROMPT_RENDER_VERSION = 1
+
+
+def prompt_layout_dict(layout: str) -> dict:
+    info = {"name": layout, "version": PROMPT_LAYOUT_VERSION}
+    if layout == PROMPT_LAYOUT_CHAT:
+        info["history_max_tokens"] = CHAT_HISTORY_MAX_TOKENS
+    return info
+
+
+def prompt_render_dict(render: str) -> dict:
+    return {"name": render, "version": PROMPT_RENDER_VERSION}
+
+
+def get_stable_rules(protocol: str = RESPONSE_PROTOCOL_FULL) -> str:
+    """Per-game constant rules moved into the system message by the cache
+    and chat layouts, and by the compact rendering."""
+    return get_limits_notice() + get_response_rules(protocol) + RESPOND_JSON_ONLY
+
+
 _PROMPT_VERSION_CACHE = None
 
 
-def get_prompt_version() -> str:
+def get_prompt_version(layout: str = PROMPT_LAYOUT_LEGACY,
+                       render: str = PROMPT_RENDER_VERBOSE,
+                       protocol: str = RESPONSE_PROTOCOL_FULL) -> str:
     """Content hash of this prompts module, recorded on every usage record
-    so results can be attributed to the exact prompt set that produced them."""
+    so results can be attributed to the exact prompt set that produced them.
+    Non-legacy layouts are separate conditions: "<hash>+<layout>.v<N>",
+    and so are the compact rendering ("...+compact.v<N>") and the lean
+    response protocol ("...+lean.v<N>")."""
     global _PROMPT_VERSION_CACHE
     if _PROMPT_VERSION_CACHE is None:
         import hashlib
         import pathlib
         source = pathlib.Path(__file__).read_bytes()
         _PROMPT_VERSION_CACHE = hashlib.sha256(source).hexdigest()[:12]
-    return _PROMPT_VERSION_CACHE
+    version = _PROMPT_VERSION_CACHE
+    if layout != PROMPT_LAYOUT_LEGACY:
+        version += f"+{layout}.v{PROMPT_LAYOUT_VERSION}"
+    if render != PROMPT_RENDER_VERBOSE:
+        version += f"+{render}.v{PROMPT_RENDER_VERSION}"
+    if protocol != RESPONSE_PROTOCOL_FULL:
+        version += f"+{protocol}.v{RESPONSE_PROTOCOL_VERSION}"
+    return version
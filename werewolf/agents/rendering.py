@@ -0,0 +1,155 @@
+"""Event lines for prompts, rendered once per game.
+
+    cache = EventRenderCache()            # one per game, shared by agents
+    cache = EventRenderCache("compact")   # short lines (--prompt-render)
+    lines = [cache.render(event) for event in observation["recent_events"]]
+    cost = cache.tokens(event)            # estimated tokens of that line
+
+Every player sees the same public events, and every prompt that shows an
+event used to format it again: a public message was rendered once per
+listener per remaining turn. The cache renders each event once and hands
+the same string to every agent, so prompt assembly is a join of cached
+fragments. Each line's token estimate is cached with it, so budgeted
+windows (werewolf/engine/limits.py) are sums of cached integers.
+
+Rules:
+- A line depends only on the event, never on who reads it; visibility is
+  filtered before rendering, so one cache serves every player.
+- A cache renders in one mode, "verbose" or "compact" (the prompt
+  renderings in werewolf/agents/prompts.py). Compact lines drop the
+  bracketed tags and say the same thing in fewer tokens.
+- Keys are (event id, EVENT_RENDER_VERSION, mode). Bump the version
+  whenever the verbose output changes, PROMPT_RENDER_VERSION whenever
+  the compact output does. Events without an id are rendered uncached.
+- Events are immutable once emitted, so entries never go stale. Event ids
+  are unique within one game (forks included), so a cache must not be
+  shared across games.
+- Not locked: a game's agents act on one thread. A racing duplicate
+  render would only store an identical string twice.
+"""
+from __future__ import annotations
+
+import json
+
+from werewolf.agents.prompts import (
+    PROMPT_RENDER_COMPACT,
+    PROMPT_RENDER_VERBOSE,
+    PROMPT_RENDERS,
+)
+from werewolf.llm.tokens import estimate_tokens
+
+EVENT_RENDER_VERSION = 1
+
+
+def render_event(event: dict, mode: str = PROMPT_RENDER_VERBOSE) -> str:
+    if mode == PROMPT_RENDER_COMPACT:
+        return render_event_compact(event)
+    etype = event.get("type")
+    payload = event.get("payload", {})
+    speaker = event.get("speaker_id")
+    channel = event.get("channel", "public")
+
+    if etype == "message":
+        return f"[{channel.upper()}] P{speaker}: {payload.get('text', '')}"
+    elif etype == "death_announcement":
+        victim_id = payload.get("victim_id")
+        victim_role = payload.get("victim_role")
+        cause = payload.get("cause")
+        if cause == "wolf_kill":
+            return f"[DEATH] P{victim_id} was killed during the night"
+        else:
+            return f"[DEATH] P{victim_id} was eliminated by vote ({victim_role})"
+    elif etype == "vote":
+        return f"[VOTE] P{payload.get('voter_id')} voted for P{payload.get('target_id')}"
+    elif etype == "elimination":
+        return f"[ELIMINATED] P{payload.get('eliminated_id')} ({payload.get('eliminated_role')})"
+    elif etype == "divine_result":
+        result = "WEREWOLF" if payload.get("is_werewolf") else "NOT WEREWOLF"
+        return f"[DIVINE] P{payload.get('target_id')} is {result}"
+    elif etype == "runoff_announcement":
+        candidates_str = ", ".join(f"P{c}" for c in payload.get("candidates", []))
+        return f"[RUNOFF] Vote tied! Runoff between: {candidates_str}"
+    elif etype == "no_elimination":
+        return f"[NO ELIMINATION] Runoff tied — no one is eliminated today"
+    elif etype == "game_status":
+        return f"[STATUS] Wolves: {payload.get('alive_wolves')}, Village: {payload.get('alive_villagers')}"
+    else:
+        return f"[{etype.upper()}] {json.dumps(payload)}"
+
+
+def render_event_compact(event: dict) -> str:
+    etype = event.get("type")
+    payload = event.get("payload", {})
+    channel = event.get("channel", "public")
+
+    if etype == "message":
+        line = f"P{event.get('speaker_id')}: {payload.get('text', '')}"
+        if channel == "public":
+            return line
+        return f"{'wolf' if channel == 'werewolf' else channel}> {line}"
+    elif etype == "death_announcement":
+        victim_id = payload.get("victim_id")
+        if payload.get("cause") == "wolf_kill":
+            return f"P{victim_id} killed at night"
+        return f"P{victim_id} voted out ({payload.get('victim_role')})"
+    elif etype == "vote":
+        return f"P{payload.get('voter_id')} votes P{payload.get('target_id')}"
+    elif etype == "elimination":
+        return f"P{payload.get('eliminated_id')} out ({payload.get('eliminated_role')})"
+    elif etype == "divine_result":
+        result = "wolf" if payload.get("is_werewolf") else "not wolf"
+        return f"divine: P{payload.get('target_id')} {result}"
+    elif etype == "runoff_announcement":
+        candidates = ",".join(f"P{c}" for c in payload.get("candidates", []))
+        return f"tie, runoff: {candidates}"
+    elif etype == "no_elimination":
+        return "runoff tied, no elimination"
+    elif etype == "game_status":
+        return (f"alive: {payload.get('alive_wolves')} wolves, "
+                f"{payload.get('alive_villagers')} village")
+    else:
+        return f"{etype}: {json.dumps(payload, separators=(',', ':'))}"
+
+
+class EventRenderCache:
+    """Rendered event lines for one game; see the module docstring."""
+
+    def __init__(self, mode: str = PROMPT_RENDER_VERBOSE):
+        if mode not in PROMPT_RENDERS:
+            raise ValueError(
+                f"Unknown prompt render {mode!r}; expected one of {PROMPT_RENDERS}"
+            )
+        self.mode = mode
+        self._lines: dict[tuple[int, int, str], tuple[str, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, event: dict) -> tuple[str, int]:
+        event_id = event.get("id")
+        if event_id is None:
+            line = render_event(event, self.mode)
+            return line, estimate_tokens(line)
+        key = (event_id, EVENT_RENDER_VERSION, self.mode)
+        entry = self._lines.get(key)
+        if entry is None:
+            line = render_event(event, self.mode)
+            entry = self._lines[key] = (line, estimate_tokens(line))
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def render(self, event: dict) -> str:
+        return self._entry(event)[0]
+
+    def tokens(self, event: dict) -> int:
+        return self._entry(event)[1]
+
+    def stats(self) -> dict:
+        return {"events": len(self._lines), "hits": self.hits, "misses": self.misses}
+
+
+__all__ = [
+    "EVENT_RENDER_VERSION", "EventRenderCache", "render_event",
+    "render_event_compact",
+]
@@ -0,0 +1,199 @@
+"""Model response parsing: strict JSON, then repair, then regex salvage.
+
+    obj, method = parse_response(raw)   # method: direct | repaired | regex
+
+Rules:
+- Three tiers, tried in order, each labeled by the parse_method recorded
+  on usage records: "direct" (the first JSON object in the text parses
+  as is), "repaired" (repair_json made it parse), "regex" (only the
+  action targets and say texts could be salvaged). (None, None) means
+  nothing was recoverable.
+- Linear time in the response length. Verbose reasoning models return
+  5-20 KB, so every tier scans the text once: repair_json matches each
+  string body with one regex (looking past a quote only as far as the
+  whitespace after it) and escapes it in bulk, and a repaired object is
+  decoded once, not validated and then decoded again.
+- Recovery semantics are frozen: for any input, results match the
+  original implementation kept in benchmarks/parse_reference.py. That is
+  checked on a seeded fuzz corpus (tests/test_response_parser.py). A
+  deliberate behavior change updates both in the same commit.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Optional
+
+_DECODER = json.JSONDecoder()
+
+# A string body up to the quote that ends it: escape pairs, ordinary
+# characters and quotes that cannot end a string (an ending quote is
+# followed by optional whitespace and one of : , } ] or the end).
+_ENDING_QUOTE = re.compile(r'"(?=\s*(?:[:,}\]]|\Z))')
+_STRING_BODY = re.compile(r'(?:[^"\\]+|\\.|"(?!\s*(?:[:,}\]]|\Z)))*', re.S)
+_BODY_TOKEN = re.compile(r'\\(.)|["\n\r\t]', re.S)
+_ESCAPED = {'"': '\\"', "\n": "\\n", "\r": "\\n", "\t": "\\t"}
+_VALID_ESCAPES = frozenset('"\\bfnrtu/')
+_STRUCTURE_RUN = re.compile(r'[^"{}\[\]]+')
+_DEPTH = {"{": (1, 0), "}": (-1, 0), "[": (0, 1), "]": (0, -1)}
+
+_TARGET_PATTERNS = tuple(
+    (key, re.compile(rf'"{key}"\s*:\s*"?(\w+)"?'))
+    for key in ("vote_target", "kill_target", "divine_target")
+)
+_SAY_PATTERNS = tuple(
+    (channel, re.compile(rf'"{channel}"\s*:\s*"((?:[^"\\]|\\.)*)"'))
+    for channel in ("public", "werewolf")
+)
+
+
+def _escape_token(match: re.Match) -> str:
+    escaped = match.group(1)
+    if escaped is None:
+        return _ESCAPED[match.group()]
+    return ("\\" if escaped in _VALID_ESCAPES else "\\\\") + escaped
+
+
+def _escape_body(body: str) -> str:
+    if "\\" not in body:
+        return (body.replace('"', '\\"').replace("\r", "\\n")
+                .replace("\n", "\\n").replace("\t", "\\t"))
+    return _BODY_TOKEN.sub(_escape_token, body)
+
+
+def _repair(text: str) -> Optional[tuple[str, object]]:
+    """(repaired text, decoded value), or None if it still does not parse.
+
+    From the first "{": escapes bare newlines, tabs, invalid backslashes
+    and quotes that cannot end a string (an ending quote is followed by
+    optional whitespace and one of : , } ] or the end of the text), stops
+    when the first object closes, then drops a dangling key or comma and
+    closes whatever is still open."""
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    n = len(text)
+    chars = []
+    append = chars.append
+    i = start
+    in_string = False
+    brace_depth = 0
+    bracket_depth = 0
+
+    while i < n:
+        if in_string:
+            ending = _ENDING_QUOTE.search(text, i)
+            end = ending.start() if ending else n
+            if text.find("\\", i, end) != -1:
+                # Escape pairs can hide a candidate ending quote.
+                end = _STRING_BODY.match(text, i).end()
+            append(_escape_body(text[i:end]))
+            i = end
+            if i < n:
+                # The ending quote, or a backslash that is the last char.
+                in_string = text[i] != '"'
+                append(text[i])
+                i += 1
+            continue
+
+        run = _STRUCTURE_RUN.match(text, i)
+        if run:
+            # Depth only changes on structural characters, and the loop
+            # stops as soon as the outer object closes, so a run never
+            # crosses the stopping point.
+            append(run.group())
+            i = run.end()
+            continue
+        c = text[i]
+        if c == '"':
+            in_string = True
+        else:
+            braces, brackets = _DEPTH[c]
+            brace_depth += braces
+            bracket_depth += brackets
+        append(c)
+        i += 1
+        if brace_depth == 0 and bracket_depth <= 0:
+            break
+
+    if in_string:
+        append('"')
+
+    joined = "".join(chars).rstrip()
+    if joined.endswith(":"):
+        last_quote = joined.rfind('"', 0, len(joined) - 1)
+        if last_quote != -1:
+            second_last = joined.rfind('"', 0, last_quote)
+            if second_last != -1:
+                joined = joined[:second_last].rstrip().rstrip(",")
+        else:
+            joined = joined[:-1].rstrip().rstrip(",")
+    elif joined.endswith(","):
+        joined = joined[:-1]
+
+    if bracket_depth > 0:
+        joined += "]" * bracket_depth
+    if brace_depth > 0:
+        joined += "}" * brace_depth
+
+    try:
+        return joined, json.loads(joined)
+    except json.JSONDecodeError:
+        return None
+
+
+def repair_json(text: str) -> Optional[str]:
+    """The repaired JSON text for the first object in text, or None."""
+    repaired = _repair(text)
+    return repaired[0] if repaired else None
+
+
+def regex_extract(text: str) -> Optional[dict]:
+    result = {}
+    action = {}
+
+    for key, pattern in _TARGET_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            action[key] = m.group(1)
+
+    for channel, pattern in _SAY_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            result.setdefault("say", {})[channel] = m.group(1)
+
+    if not action and "say" not in result:
+        return None
+
+    if action:
+        result["action"] = action
+    else:
+        result["action"] = None
+    result.setdefault("say", None)
+    result["thought"] = "[recovered from malformed response]"
+    return result
+
+
+def parse_response(raw: str) -> tuple[Optional[dict], Optional[str]]:
+    """Returns (parsed_dict, method) where method is one of
+    'direct' | 'repaired' | 'regex', or (None, None) on failure."""
+    content = raw.strip()
+    brace = content.find("{")
+    if brace != -1:
+        try:
+            obj, _ = _DECODER.raw_decode(content, brace)
+            if isinstance(obj, dict):
+                return obj, "direct"
+        except json.JSONDecodeError:
+            pass
+        repaired = _repair(content)
+        if repaired and isinstance(repaired[1], dict):
+            return repaired[1], "repaired"
+    extracted = regex_extract(raw)
+    if extracted:
+        return extracted, "regex"
+    return None, None
+
+
+__all__ = ["parse_response", "regex_extract", "repair_json"]
@@ -0,0 +1,604 @@
+"""Rule-based scripted agents for LLM-free, high-volume simulation.
+
+Scripted agents implement the AIAgent contract,
+``act(observation, validator, fallback_fn, rng, update_memory=True)``,
+so the engine, logs, belief metrics and validity gates treat them like
+any other player. They never touch a provider, so a healthy scripted
+game's log has the normal config/event/usage_summary/outcome rows and
+no ``llm_call`` rows.
+
+Rules:
+- Determinism: every random choice uses the engine RNG passed to act(),
+  so a seed reproduces a scripted game exactly. Belief assessments never
+  draw from it (ties break by player id), so an instrumented scripted
+  game plays out exactly like an uninstrumented one.
+- State lives in ``self.memory`` and is replaced wholesale, never mutated
+  in place, which keeps phase checkpoints and forks valid
+  (see werewolf/engine/checkpoint.py).
+- Observations only carry events the player has not yet seen, and the
+  read-only assess_beliefs turn re-sends them; events are folded into
+  memory by id, so nothing is counted twice.
+- Responses go through the engine validator. An invalid scripted
+  response is a policy bug: it is replaced by fallback_fn and written to
+  the usage ledger as the same non-API FALLBACK_USED record an AIAgent
+  writes, so the validity gates flag the game instead of passing it.
+- Public messages use fixed phrasings ("I suspect P3.", "I am the seer.
+  P3 is a WEREWOLF. P5 is NOT a werewolf.") that other scripted agents
+  parse back.
+- Accusations count once per accuser, never from the agent itself, and
+  only from credible players: anyone who has accused a seer claimant or
+  a seer-cleared player loses their voice and becomes a suspect. Without
+  this, two wolves repeating one name talk the table into voting out
+  the seer.
+
+Policies (SCRIPTED_POLICIES):
+- bandwagon (villager): votes with the day's leading target unless it
+  has a confident read of its own; trusts seer claims.
+- reveal_on_wolf (seer): divines its top unknown suspect and claims
+  publicly, with every result so far, as soon as it has found a wolf or
+  is accused while holding a clear.
+- quiet_hunter (werewolf): kills a claimed seer first, otherwise the
+  pack's first proposal or the quietest villager; deflects onto whoever
+  the table already suspects.
+- random (any role): uniform random legal actions and flat beliefs, a
+  null model for calibrating metrics.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Callable, Optional
+
+from werewolf.llm.ledger import UsageLedger
+from werewolf.llm.records import CallContext, ErrorCategory, UsageRecord
+
+logger = logging.getLogger("werewolf.agent.scripted")
+
+ROLES = ("werewolf", "villager", "seer")
+
+BASE_SUSPICION = 0.3
+CONFIDENT_SUSPICION = 0.7
+ACCUSATION_WEIGHT = 0.1  # per credible accuser, at most four
+DISCREDITED_SUSPICION = 0.2
+MIN_PROBABILITY = 0.02
+MAX_PROBABILITY = 0.98
+
+_SEER_CLAIM = re.compile(r"\bI am the seer\b", re.IGNORECASE)
+_SEER_RESULT = re.compile(r"\bP(\d+) is (a WEREWOLF|NOT a werewolf)", re.IGNORECASE)
+_ACCUSATION = re.compile(r"\bsuspect P(\d+)", re.IGNORECASE)
+_KILL_PROPOSAL = re.compile(r"Let's take P(\d+)", re.IGNORECASE)
+
+
+def _clamp(value: float) -> float:
+    return round(min(MAX_PROBABILITY, max(MIN_PROBABILITY, value)), 3)
+
+
+def _count(mapping: dict, key: int, amount: int = 1) -> dict:
+    return {**mapping, str(key): mapping.get(str(key), 0) + amount}
+
+
+class ScriptedAgent:
+    """Base class: event bookkeeping, beliefs, and action dispatch.
+    Subclasses override the per-action methods they care about."""
+
+    policy = "scripted"
+
+    def __init__(
+        self, player_id: int, role: str, team: str,
+        wolf_roster: list[int] = None,
+        ledger: Optional[UsageLedger] = None,
+        run_context: Optional[dict] = None,
+    ):
+        self.player_id = player_id
+        self.role = role
+        self.team = team
+        self.wolf_roster = wolf_roster or []
+        self.model = f"scripted:{self.policy}"
+        self.memory = {}
+        self.ledger = ledger
+        self.run_context = run_context or {}
+
+    # ------------------------------------------------------------------
+    # Main entry point (AIAgent contract)
+    # ------------------------------------------------------------------
+
+    def act(
+        self,
+        observation: dict,
+        validator: Callable[[dict, dict], tuple[bool, Optional[str]]],
+        fallback_fn: Callable[[dict], dict],
+        rng,
+        update_memory: bool = True,
+    ) -> dict:
+        knowledge = self._observe(self.memory, observation)
+        required_action = observation["required_action"]
+        handler = getattr(self, required_action, None)
+        response = handler(observation, knowledge, rng) if handler else None
+        if response is not None:
+            is_valid, error = validator(observation, response)
+        else:
+            is_valid, error = False, f"no rule for {required_action}"
+        if not is_valid:
+            logger.warning(
+                f"P{self.player_id} scripted {self.policy} produced an invalid "
+                f"{required_action} ({error}); using fallback"
+            )
+            self._record_fallback(observation)
+            response = fallback_fn(observation)
+        if update_memory:
+            self.memory = knowledge
+        return response
+
+    def _record_fallback(self, observation: dict) -> None:
+        if self.ledger is None:
+            return
+        rc = self.run_context
+        self.ledger.record(UsageRecord(
+            context=CallContext(
+                game_id=rc.get("game_id", ""),
+                batch_id=rc.get("batch_id"),
+                trial_index=rc.get("trial_index"),
+                seed=rc.get("seed"),
+                round=observation.get("round", 0),
+                phase=observation.get("phase", ""),
+                required_action=observation.get("required_action", ""),
+                player_id=self.player_id,
+                player_role=self.role,
+                player_team=self.team,
+                prompt_version=rc.get("prompt_version"),
+            ),
+            provider="scripted",
+            requested_model=self.model,
+            attempt=0,
+            api_attempted=False,
+            api_ok=False,
+            error_category=ErrorCategory.FALLBACK_USED,
+            retryable=False,
+        ))
+
+    # ------------------------------------------------------------------
+    # Knowledge
+    # ------------------------------------------------------------------
+
+    def _observe(self, memory: dict, observation: dict) -> dict:
+        """New knowledge dict with unseen events folded in (memory itself
+        is left untouched)."""
+        knowledge = {
+            "last_event_id": memory.get("last_event_id", -1),
+            "messages": memory.get("messages", {}),
+            "accusers": memory.get("accusers", {}),
+            "accused_me": memory.get("accused_me", []),
+            "votes": memory.get("votes", {}),
+            "seer_claims": memory.get("seer_claims", {}),
+            "seer_claimants": memory.get("seer_claimants", []),
+            "known": memory.get("known", {}),
+            "kill_plans": memory.get("kill_plans", {}),
+        }
+        for event in observation.get("recent_events", []):
+            event_id = event.get("id")
+            if not isinstance(event_id, int) or event_id <= knowledge["last_event_id"]:
+                continue
+            knowledge["last_event_id"] = event_id
+            self._fold_event(knowledge, event)
+        last_divine = (observation.get("private_info") or {}).get("last_divine_result")
+        if last_divine and "target_id" in last_divine:
+            knowledge["known"] = {
+                **knowledge["known"],
+                str(last_divine["target_id"]):
+                    "wolf" if last_divine.get("is_werewolf") else "village",
+            }
+        return knowledge
+
+    def _fold_event(self, knowledge: dict, event: dict) -> None:
+        etype = event.get("type")
+        payload = event.get("payload") or {}
+        speaker = event.get("speaker_id")
+        if etype == "message" and event.get("channel") == "public":
+            knowledge["messages"] = _count(knowledge["messages"], speaker)
+            text = str(payload.get("text", ""))
+            if _SEER_CLAIM.search(text):
+                for match in _SEER_RESULT.finditer(text):
+                    knowledge["seer_claims"] = {
+                        **knowledge["seer_claims"],
+                        match.group(1):
+                            "village" if match.group(2).upper().startswith("NOT") else "wolf",
+                    }
+                if speaker not in knowledge["seer_claimants"]:
+                    knowledge["seer_claimants"] = [
+                        *knowledge["seer_claimants"], speaker,
+                    ]
+            for match in _ACCUSATION.finditer(text):
+                target = int(match.group(1))
+                if target == self.player_id and speaker not in knowledge["accused_me"]:
+                    knowledge["accused_me"] = [*knowledge["accused_me"], speaker]
+                accusers = knowledge["accusers"].get(str(target), [])
+                # One voice per accuser, and never our own echo.
+                if speaker != self.player_id and speaker not in accusers:
+                    knowledge["accusers"] = {
+                        **knowledge["accusers"], str(target): [*accusers, speaker],
+                    }
+        elif etype == "message" and event.get("channel") == "werewolf":
+            proposal = _KILL_PROPOSAL.search(str(payload.get("text", "")))
+            round_key = str(event.get("round"))
+            if proposal and round_key not in knowledge["kill_plans"]:
+                knowledge["kill_plans"] = {
+                    **knowledge["kill_plans"], round_key: int(proposal.group(1)),
+                }
+        elif etype == "vote":
+            target = payload.get("target_id")
+            if target is not None:
+                round_key = str(event.get("round"))
+                tally = knowledge["votes"].get(round_key, {})
+                knowledge["votes"] = {
+                    **knowledge["votes"], round_key: _count(tally, target),
+                }
+                if target == self.player_id and payload.get("voter_id") not in knowledge["accused_me"]:
+                    knowledge["accused_me"] = [
+                        *knowledge["accused_me"], payload.get("voter_id"),
+                    ]
+        elif etype == "divine_result" and speaker == self.player_id:
+            knowledge["known"] = {
+                **knowledge["known"],
+                str(payload.get("target_id")):
+                    "wolf" if payload.get("is_werewolf") else "village",
+            }
+
+    # ------------------------------------------------------------------
+    # Shared heuristics
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _others(observation: dict) -> list[int]:
+        self_id = observation["self"]["id"]
+        return [p["id"] for p in observation["alive_players"] if p["id"] != self_id]
+
+    def suspicion(self, knowledge: dict, pid: int) -> float:
+        """Probability-like wolf suspicion from a villager's viewpoint."""
+        key = str(pid)
+        known = knowledge["known"].get(key)
+        if known == "wolf":
+            return MAX_PROBABILITY
+        if known == "village":
+            return MIN_PROBABILITY
+        score = BASE_SUSPICION
+        claim = knowledge["seer_claims"].get(key)
+        if claim == "wolf":
+            score += 0.6
+        elif claim == "village":
+            score -= 0.25
+        if self.discredited(knowledge, pid):
+            score += DISCREDITED_SUSPICION
+        score += ACCUSATION_WEIGHT * min(sum(
+            self.credibility(knowledge, accuser)
+            for accuser in knowledge["accusers"].get(key, [])
+        ), 4)
+        score += 0.05 * sum(
+            tally.get(key, 0) for tally in knowledge["votes"].values()
+        )
+        return _clamp(score)
+
+    @staticmethod
+    def discredited(knowledge: dict, pid: int) -> bool:
+        """True once pid has accused a seer claimant or a player a seer
+        claim cleared - the line a wolf takes against a real seer."""
+        return any(
+            pid in accusers and (
+                int(target) in knowledge["seer_claimants"]
+                or knowledge["seer_claims"].get(target) == "village"
+            )
+            for target, accusers in knowledge["accusers"].items()
+        )
+
+    def credibility(self, knowledge: dict, accuser: int) -> float:
+        """Weight of one player's accusation: none from a discredited
+        player or one known or claimed to be a wolf, full otherwise."""
+        key = str(accuser)
+        if (knowledge["known"].get(key) == "wolf"
+                or knowledge["seer_claims"].get(key) == "wolf"
+                or self.discredited(knowledge, accuser)):
+            return 0.0
+        return 1.0
+
+    def _ranked(self, knowledge: dict, candidates: list[int], rng) -> list[int]:
+        """Candidates by descending suspicion; ties broken by the RNG, or
+        by player id when rng is None."""
+        ordered = sorted(candidates)
+        if rng is not None:
+            rng.shuffle(ordered)
+        return sorted(ordered, key=lambda pid: -self.suspicion(knowledge, pid))
+
+    def _leading_vote(self, knowledge: dict, observation: dict, exclude) -> Optional[int]:
+        tally = knowledge["votes"].get(str(observation["round"]), {})
+        alive = set(self._others(observation))
+        options = [
+            (count, int(pid)) for pid, count in tally.items()
+            if int(pid) in alive and int(pid) not in exclude
+        ]
+        return max(options)[1] if options else None
+
+    def wolf_probabilities(self, knowledge: dict, observation: dict) -> dict:
+        return {
+            str(pid): self.suspicion(knowledge, pid)
+            for pid in self._others(observation)
+        }
+
+    def choose_vote(self, observation: dict, knowledge: dict, rng) -> int:
+        return self._ranked(knowledge, self._others(observation), rng)[0]
+
+    def beliefs(self, observation: dict, knowledge: dict, target: int) -> dict:
+        probabilities = self.wolf_probabilities(knowledge, observation)
+        beliefs = {
+            "wolf_probabilities": probabilities,
+            "intended_vote": target,
+            "vote_confidence": probabilities.get(str(target), BASE_SUSPICION),
+            "most_influential_recent_speaker": None,
+        }
+        if self.role == "werewolf":
+            accused_me = set(knowledge["accused_me"])
+            beliefs["estimated_suspicion_of_me"] = {
+                str(pid): _clamp(0.2 + (0.5 if pid in accused_me else 0.0))
+                for pid in self._others(observation)
+            }
+        return beliefs
+
+    def thought(self, text: str) -> str:
+        return f"[scripted:{self.policy}] {text}"
+
+    # ------------------------------------------------------------------
+    # Actions (method name == required_action)
+    # ------------------------------------------------------------------
+
+    def assess_beliefs(self, observation, knowledge, rng) -> dict:
+        return {
+            "thought": self.thought("assessing"),
+            "say": None,
+            "action": None,
+            "beliefs": self.beliefs(
+                observation, knowledge,
+                self.choose_vote(observation, knowledge, None),
+            ),
+        }
+
+    def wolf_chat(self, observation, knowledge, rng) -> dict:
+        return {"thought": self.thought("nothing to add"), "say": None, "action": None}
+
+    def choose_wolf_kill(self, observation, knowledge, rng) -> Optional[dict]:
+        wolves = set((observation.get("private_info") or {}).get("wolf_roster", []))
+        targets = [pid for pid in self._others(observation) if pid not in wolves]
+        if not targets:
+            return None
+        target = rng.choice(sorted(targets))
+        return {
+            "thought": self.thought(f"killing P{target}"),
+            "say": None,
+            "action": {"kill_target": target},
+        }
+
+    def seer_divine(self, observation, knowledge, rng) -> dict:
+        unknown = [
+            pid for pid in self._others(observation)
+            if str(pid) not in knowledge["known"]
+        ]
+        target = self._ranked(knowledge, unknown or self._others(observation), rng)[0]
+        return {
+            "thought": self.thought(f"divining P{target}"),
+            "say": None,
+            "action": {"divine_target": target},
+        }
+
+    def speak_public(self, observation, knowledge, rng) -> dict:
+        ranked = self._ranked(knowledge, self._others(observation), rng)
+        target = ranked[0] if ranked else None
+        if target is not None and self.suspicion(knowledge, target) >= CONFIDENT_SUSPICION:
+            text = f"I suspect P{target}."
+        else:
+            text = "No strong read yet."
+        return {"thought": self.thought(text), "say": {"public": text}, "action": None}
+
+    def vote(self, observation, knowledge, rng) -> dict:
+        target = self.choose_vote(observation, knowledge, rng)
+        return {
+            "thought": self.thought(f"voting P{target}"),
+            "say": None,
+            "action": {"vote_target": target},
+            "beliefs": self.beliefs(observation, knowledge, target),
+        }
+
+    def runoff_vote(self, observation, knowledge, rng) -> dict:
+        candidates = [
+            c for c in (observation.get("turn_context") or {}).get("runoff_candidates", [])
+            if c != self.player_id
+        ]
+        if not candidates:
+            return None
+        target = self._ranked(knowledge, candidates, rng)[0]
+        return {
+            "thought": self.thought(f"runoff vote P{target}"),
+            "say": None,
+            "action": {"vote_target": target},
+        }
+
+
+class BandwagonVillager(ScriptedAgent):
+    policy = "bandwagon"
+
+    def choose_vote(self, observation, knowledge, rng) -> int:
+        own = super().choose_vote(observation, knowledge, rng)
+        if self.suspicion(knowledge, own) >= CONFIDENT_SUSPICION:
+            return own
+        leader = self._leading_vote(knowledge, observation, exclude={self.player_id})
+        return leader if leader is not None else own
+
+
+class RevealingSeer(ScriptedAgent):
+    policy = "reveal_on_wolf"
+
+    def _known_wolves(self, observation, knowledge) -> list[int]:
+        return [
+            pid for pid in self._others(observation)
+            if knowledge["known"].get(str(pid)) == "wolf"
+        ]
+
+    def speak_public(self, observation, knowledge, rng) -> dict:
+        wolves = self._known_wolves(observation, knowledge)
+        cleared = sorted(
+            int(pid) for pid, side in knowledge["known"].items() if side == "village"
+        )
+        if not wolves and not (cleared and knowledge["accused_me"]):
+            return super().speak_public(observation, knowledge, rng)
+        results = [f"P{pid} is a WEREWOLF." for pid in wolves]
+        results += [f"P{pid} is NOT a werewolf." for pid in cleared]
+        text = " ".join(["I am the seer.", *results])
+        if wolves:
+            text += f" I suspect P{wolves[0]}."
+        return {"thought": self.thought("revealing"), "say": {"public": text}, "action": None}
+
+
+class QuietHunterWolf(ScriptedAgent):
+    policy = "quiet_hunter"
+
+    def _villagers(self, observation) -> list[int]:
+        wolves = set((observation.get("private_info") or {}).get("wolf_roster", []))
+        return [pid for pid in self._others(observation) if pid not in wolves]
+
+    def wolf_probabilities(self, knowledge, observation) -> dict:
+        wolves = set(self.wolf_roster)
+        return {
+            str(pid): MAX_PROBABILITY if pid in wolves else MIN_PROBABILITY
+            for pid in self._others(observation)
+        }
+
+    def _kill_target(self, observation, knowledge, rng) -> Optional[int]:
+        villagers = self._villagers(observation)
+        if not villagers:
+            return None
+        claimants = [pid for pid in knowledge["seer_claimants"] if pid in villagers]
+        if claimants:
+            return claimants[0]
+        # Follow the pack's first proposal so wolf kill votes agree.
+        planned = knowledge["kill_plans"].get(str(observation["round"]))
+        if planned in villagers:
+            return planned
+        shuffled = sorted(villagers)
+        rng.shuffle(shuffled)
+        return min(shuffled, key=lambda pid: knowledge["messages"].get(str(pid), 0))
+
+    def _scapegoat(self, observation, knowledge, rng) -> Optional[int]:
+        villagers = self._villagers(observation)
+        if not villagers:
+            return None
+        return self._ranked(knowledge, villagers, rng)[0]
+
+    def choose_vote(self, observation, knowledge, rng) -> int:
+        leader = self._leading_vote(
+            knowledge, observation, exclude={self.player_id, *self.wolf_roster},
+        )
+        if leader is not None:
+            return leader
+        target = self._scapegoat(observation, knowledge, rng)
+        return target if target is not None else self._others(observation)[0]
+
+    def wolf_chat(self, observation, knowledge, rng) -> dict:
+        target = self._kill_target(observation, knowledge, rng)
+        text = f"Let's take P{target} tonight." if target is not None else "No target."
+        return {"thought": self.thought(text), "say": {"werewolf": text}, "action": None}
+
+    def choose_wolf_kill(self, observation, knowledge, rng) -> Optional[dict]:
+        target = self._kill_target(observation, knowledge, rng)
+        if target is None:
+            return None
+        return {
+            "thought": self.thought(f"killing P{target}"),
+            "say": None,
+            "action": {"kill_target": target},
+        }
+
+    def speak_public(self, observation, knowledge, rng) -> dict:
+        exposed = [
+            pid for pid, claim in knowledge["seer_claims"].items()
+            if claim == "wolf" and int(pid) in self.wolf_roster
+        ]
+        claimants = [
+            pid for pid in knowledge["seer_claimants"]
+            if pid in self._villagers(observation)
+        ]
+        if exposed and claimants:
+            text = f"P{claimants[0]} is lying about being the seer. I suspect P{claimants[0]}."
+        else:
+            target = self._scapegoat(observation, knowledge, rng)
+            text = f"I suspect P{target}." if target is not None else "No strong read yet."
+        return {"thought": self.thought(text), "say": {"public": text}, "action": None}
+
+
+class RandomScriptedAgent(ScriptedAgent):
+    """Null model: uniform random legal actions, flat beliefs."""
+
+    policy = "random"
+
+    def suspicion(self, knowledge, pid) -> float:
+        return 0.5
+
+    def choose_vote(self, observation, knowledge, rng) -> int:
+        others = sorted(self._others(observation))
+        return rng.choice(others) if rng is not None else others[0]
+
+    def speak_public(self, observation, knowledge, rng) -> dict:
+        return {"thought": self.thought("silent"), "say": {"public": "..."}, "action": None}
+
+    def seer_divine(self, observation, knowledge, rng) -> dict:
+        return {
+            "thought": self.thought("random divine"),
+            "say": None,
+            "action": {"divine_target": rng.choice(sorted(self._others(observation)))},
+        }
+
+    def runoff_vote(self, observation, knowledge, rng) -> Optional[dict]:
+        candidates = [
+            c for c in (observation.get("turn_context") or {}).get("runoff_candidates", [])
+            if c != self.player_id
+        ]
+        if not candidates:
+            return None
+        return {
+            "thought": self.thought("random runoff vote"),
+            "say": None,
+            "action": {"vote_target": rng.choice(sorted(candidates))},
+        }
+
+
+SCRIPTED_POLICIES: dict[str, type[ScriptedAgent]] = {
+    cls.policy: cls
+    for cls in (BandwagonVillager, RevealingSeer, QuietHunterWolf, RandomScriptedAgent)
+}
+
+DEFAULT_POLICIES = {
+    "werewolf": QuietHunterWolf.policy,
+    "villager": BandwagonVillager.policy,
+    "seer": RevealingSeer.policy,
+}
+
+
+def resolve_role_agents(role_agents: dict) -> dict[str, type[ScriptedAgent]]:
+    """{"werewolf": "quiet_hunter" | ScriptedAgent subclass, ...} ->
+    {role: class}. Unknown roles or policy names raise ValueError."""
+    unknown = set(role_agents) - set(ROLES)
+    if unknown:
+        raise ValueError(f"Unknown roles in role_agents: {sorted(unknown)}")
+    resolved = {}
+    for role, policy in role_agents.items():
+        if isinstance(policy, str):
+            if policy not in SCRIPTED_POLICIES:
+                raise ValueError(
+                    f"Unknown scripted policy {policy!r}; "
+                    f"expected one of {sorted(SCRIPTED_POLICIES)}"
+                )
+            policy = SCRIPTED_POLICIES[policy]
+        resolved[role] = policy
+    return resolved
+
+
+__all__ = [
+    "BandwagonVillager", "DEFAULT_POLICIES", "QuietHunterWolf",
+    "RandomScriptedAgent", "RevealingSeer", "SCRIPTED_POLICIES",
+    "ScriptedAgent", "resolve_role_agents",
+]
@@ -0,0 +1,62 @@
+"""Fit per-family pre-flight token estimate scales from past games.
+
+Usage:
+    python -m werewolf.cli.calibrate_tokens --game outputs/games/game_x.jsonl [...]
+    python -m werewolf.cli.calibrate_tokens --manifest outputs/games/trials_manifest_X.jsonl
+    ... [--min-calls 20] --output token_calibration.json
+
+Pure computation over existing logs - never makes API calls. Compares
+each call's logged pre-flight estimate with the input_tokens the
+provider reported. Apply with run_trials / run_game --token-calibration.
+"""
+import argparse
+import json
+
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.preflight import DEFAULT_MIN_CALLS, calibrate
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calibrate pre-flight input-token estimates per model family"
+    )
+    parser.add_argument("--game", nargs="*", default=[],
+                        help="Per-game JSONL log path(s)")
+    parser.add_argument("--manifest", nargs="*", default=[],
+                        help="Trial manifest JSONL(s); reads every game in them")
+    parser.add_argument("--min-calls", type=int, default=DEFAULT_MIN_CALLS,
+                        help="Calls a family needs before it gets a scale "
+                             "(default: %(default)s)")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write the calibration JSON to this path")
+    args = parser.parse_args()
+
+    game_paths = list(args.game)
+    for manifest in args.manifest:
+        with open(manifest, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("log_path"):
+                        game_paths.append(record["log_path"])
+    if not game_paths:
+        raise SystemExit("Nothing to read: pass --game and/or --manifest")
+
+    rows = [row for path in game_paths for row in load_rows(path)]
+    try:
+        calibration = calibrate(rows, min_calls=args.min_calls)
+    except ValueError as exc:
+        raise SystemExit(f"Error: {exc}")
+    print(f"Read {len(game_paths)} game log(s)")
+    if not calibration.scales:
+        print("No family has enough comparable calls; nothing calibrated")
+    for family, scale in calibration.scales.items():
+        print(f"  {family:<12} scale {scale:.4f} "
+              f"(n={calibration.calls[family]})")
+    if args.output:
+        calibration.save(args.output)
+        print(f"\nCalibration written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Build a pinned max_output_tokens table from past games' llm_call rows.
+
+Usage:
+    python -m werewolf.cli.output_caps --game outputs/games/game_x.jsonl [...]
+    python -m werewolf.cli.output_caps --manifest outputs/games/trials_manifest_X.jsonl
+    ... [--percentile 95] [--headroom 1.2] --output output_caps.json
+
+Pure computation over existing logs - never makes API calls. Apply the
+table with run_trials / run_game --output-caps output_caps.json.
+"""
+import argparse
+import json
+
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.llm.output_caps import (
+    DEFAULT_HEADROOM,
+    DEFAULT_MIN_SAMPLES,
+    DEFAULT_ROUND_TO,
+    build_cap_table,
+)
+
+
+def print_table(table) -> None:
+    print(f"Output cap table {table.table_hash} "
+          f"(p{table.percentile * 100:g} x {table.headroom:g})")
+    for model, actions in sorted(table.stats.items()):
+        print(f"\n=== {model} ===")
+        for action, cell in sorted(actions.items()):
+            cap = "no cap" if cell["cap"] is None else f"cap {cell['cap']}"
+            spread = (
+                f"p50 {cell['p50']} | p90 {cell['p90']} | p99 {cell['p99']} | "
+                f"max {cell['max']}" if cell["samples"] else "no samples"
+            )
+            print(f"  {action:<18} {cap:<10} n={cell['samples']} "
+                  f"censored={cell['censored']}  {spread}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute per-(model, action) max_output_tokens caps from game logs"
+    )
+    parser.add_argument("--game", nargs="*", default=[],
+                        help="Per-game JSONL log path(s)")
+    parser.add_argument("--manifest", nargs="*", default=[],
+                        help="Trial manifest JSONL(s); reads every game in them")
+    parser.add_argument("--percentile", type=float, default=95.0,
+                        help="Output-token percentile the cap covers, 0-100 "
+                             "(default: %(default)s)")
+    parser.add_argument("--headroom", type=float, default=DEFAULT_HEADROOM,
+                        help="Multiplier on the percentile (default: %(default)s)")
+    parser.add_argument("--min-samples", type=int, default=DEFAULT_MIN_SAMPLES,
+                        help="Calls needed before a cell gets a cap "
+                             "(default: %(default)s)")
+    parser.add_argument("--round-to", type=int, default=DEFAULT_ROUND_TO,
+                        help="Round caps up to a multiple of this "
+                             "(default: %(default)s)")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write the table JSON to this path")
+    args = parser.parse_args()
+
+    if not 0 < args.percentile <= 100:
+        raise SystemExit("Error: --percentile must be in (0, 100]")
+    game_paths = list(args.game)
+    for manifest in args.manifest:
+        with open(manifest, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("log_path"):
+                        game_paths.append(record["log_path"])
+    if not game_paths:
+        raise SystemExit("Nothing to read: pass --game and/or --manifest")
+
+    rows = [row for path in game_paths for row in load_rows(path)]
+    try:
+        table = build_cap_table(
+            rows, percentile=args.percentile / 100, headroom=args.headroom,
+            min_samples=args.min_samples, round_to=args.round_to,
+        )
+    except ValueError as exc:
+        raise SystemExit(f"Error: {exc}")
+    print(f"Read {len(game_paths)} game log(s)")
+    print_table(table)
+    if args.output:
+        table.save(args.output)
+        print(f"\nTable written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
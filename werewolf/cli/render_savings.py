@@ -0,0 +1,75 @@
+"""Report input-token savings of --prompt-render compact over logged games.
+
+Usage:
+    python -m werewolf.cli.render_savings --game outputs/games/game_x.jsonl [...]
+    python -m werewolf.cli.render_savings --manifest outputs/games/trials_manifest_X.jsonl
+    ... [--output render_savings.json]
+
+Pure computation over existing logs - never makes API calls. Measured
+savings need games of both renderings in the corpus (e.g. one batch per
+--prompt-render value); the event-format savings need any games.
+"""
+import argparse
+import json
+
+from werewolf.evaluation.belief_metrics import load_rows
+from werewolf.evaluation.render_savings import render_savings
+
+
+def _pct(share) -> str:
+    return "n/a" if share is None else f"{share:.1%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Input-token savings of the compact prompt rendering"
+    )
+    parser.add_argument("--game", nargs="*", default=[],
+                        help="Per-game JSONL log path(s)")
+    parser.add_argument("--manifest", nargs="*", default=[],
+                        help="Trial manifest JSONL(s); reads every game in them")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write the report JSON to this path")
+    args = parser.parse_args()
+
+    game_paths = list(args.game)
+    for manifest in args.manifest:
+        with open(manifest, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("log_path"):
+                        game_paths.append(record["log_path"])
+    if not game_paths:
+        raise SystemExit("Nothing to read: pass --game and/or --manifest")
+
+    report = render_savings(load_rows(path) for path in game_paths)
+    games = ", ".join(f"{n} {render}" for render, n in sorted(report["games"].items()))
+    print(f"Read {len(game_paths)} game log(s): {games}")
+
+    events = report["events"]
+    print(f"\nEvent lines ({events['events']} events, estimated): "
+          f"{events['verbose_tokens']} -> {events['compact_tokens']} tokens, "
+          f"saved {_pct(events['saved_share'])}")
+
+    measured = report["measured"]
+    print(f"\nReported input tokens: saved {_pct(measured['saved_share'])} "
+          f"over {measured['matched_compact_calls']} matched compact call(s)")
+    for cell in measured["by_cell"]:
+        if cell["saved_share"] is None:
+            continue
+        print(f"  {cell['model']} {cell['prompt_layout']:<7} "
+              f"{cell['required_action']:<18} "
+              f"{cell['verbose_mean_input_tokens']:>8} -> "
+              f"{cell['compact_mean_input_tokens']:<8} "
+              f"({_pct(cell['saved_share'])}, n={cell['verbose_calls']}/"
+              f"{cell['compact_calls']})")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nReport written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
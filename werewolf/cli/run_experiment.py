@@ -238,6 +238,7 @@ def main():
     parser.add_argument("--top-p", type=float, default=None)
     parser.add_argument("--max-output-tokens", type=int, default=None)
     parser.add_argument("--provider-seed", type=int, default=None)
+    parser.add_argument("--response-schema", action="store_true")
     args = parser.parse_args()
 
     load_env_file()
@@ -272,6 +273,7 @@ def main():
             top_p=args.top_p,
             max_output_tokens=args.max_output_tokens,
             provider_seed=args.provider_seed,
+            response_schema=args.response_schema,
         ),
         discussion_cycles=args.discussion_cycles,
         belief_snapshots=not args.no_belief_snapshots,
@@ -4,6 +4,17 @@ import os
 import sys
 from pathlib import Path
 
+from werewolf.agents.prompts import (
+    PROMPT_LAYOUT_LEGACY,
+    PROMPT_LAYOUTS,
+    PROMPT_RENDER_VERBOSE,
+    PROMPT_RENDERS,
+    RESPONSE_PROTOCOL_FULL,
+    RESPONSE_PROTOCOLS,
+)
+from werewolf.engine.belief_sampling import BeliefSampling
+from werewolf.engine.logging import DURABILITY_LEVELS, DURABILITY_RECORD
+from werewolf.log_files import COMPRESSION_NONE, COMPRESSIONS
 from werewolf.llm.provider import GenerationConfig
 from werewolf.llm.registry import (
     MODEL_REGISTRY,
@@ -11,6 +22,19 @@ from werewolf.llm.registry import (
     get_api_key as _registry_key,
     resolve,
 )
+from werewolf.llm.hedging import HedgePolicy
+from werewolf.llm.output_caps import OutputCapTable
+from werewolf.llm.preflight import TokenCalibration, TokenRateLimiter
+from werewolf.llm.retry import RETRY_PROFILE_BASELINE, RETRY_PROFILES, RetryPolicy
+from werewolf.llm.streaming import STREAM_MODES, STREAM_OFF
+from werewolf.profiling import (
+    DEFAULT_TOP_N,
+    aggregate_profiles,
+    format_profile,
+    profile_path_for,
+    run_profiled,
+)
+from werewolf.tracing import TRACE_FORMATS, Tracer
 
 # Backward-compatible alias map, derived from the registry (single source
 # of truth in werewolf/llm/registry.py).
@@ -47,6 +71,32 @@ def get_api_key(model: str = "fast") -> str:
     return _registry_key(resolve(model))
 
 
+def retry_policy_from_args(args) -> RetryPolicy:
+    """RetryPolicy from --retry-profile and the flags overriding it."""
+    overrides = {"base_ms": args.retry_base_ms}
+    if args.max_attempts is not None:
+        overrides["max_attempts"] = args.max_attempts
+    if args.retry_budget is not None:
+        overrides["game_budget"] = None if args.retry_budget < 0 else args.retry_budget
+    try:
+        return RetryPolicy.for_profile(args.retry_profile, **overrides)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+
+
+def belief_sampling_from_args(args):
+    """BeliefSampling from the --belief-* flags; None for a census."""
+    try:
+        sampling = BeliefSampling(
+            every_k_rounds=args.belief_every_k,
+            observer_fraction=args.belief_observer_fraction,
+            max_rounds=args.belief_max_rounds,
+        )
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+    return None if sampling.census else sampling
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run a Werewolf game with AI agents powered by Grok"
@@ -113,6 +163,16 @@ def main():
         help="Disable structured belief/suspicion snapshots (cheaper, but "
              "games cannot be analyzed for manipulation metrics)"
     )
+    parser.add_argument("--belief-every-k", type=int, default=1, metavar="K",
+                        help="Take pre-discussion belief snapshots only every "
+                             "K-th day (default: every day)")
+    parser.add_argument("--belief-observer-fraction", type=float, default=1.0,
+                        metavar="F",
+                        help="Ask a seeded random share F of alive players "
+                             "for pre-discussion snapshots (default: all)")
+    parser.add_argument("--belief-max-rounds", type=int, default=None, metavar="N",
+                        help="Take pre-discussion snapshots only in the first "
+                             "N days (default: every day)")
     parser.add_argument("--discussion-cycles", type=int, default=2,
                         help="Discussion cycles per day (default: 2; "
                              "order reverses between cycles)")
@@ -124,8 +184,84 @@ def main():
                         help="Max output tokens per call (default: provider default)")
     parser.add_argument("--provider-seed", type=int, default=None,
                         help="Provider-side sampling seed, where supported")
+    parser.add_argument("--response-schema", action="store_true",
+                        help="Send a strict JSON Schema per required_action "
+                             "where the provider supports it")
+    parser.add_argument("--log-durability", choices=DURABILITY_LEVELS,
+                        default=DURABILITY_RECORD,
+                        help="JSONL crash safety: flush every record (default), "
+                             "group-commit per phase, or fsync per phase")
+    parser.add_argument("--log-compression", choices=COMPRESSIONS,
+                        default=COMPRESSION_NONE,
+                        help="Write game logs as .jsonl (default), .jsonl.gz "
+                             "or .jsonl.zst (needs zstandard)")
+    parser.add_argument("--trace", type=str, default=None, metavar="PATH",
+                        help="Record game/phase/agent spans and write them to "
+                             "PATH for Perfetto (*.otlp.json selects OTLP/JSON)")
+    parser.add_argument("--trace-format", choices=TRACE_FORMATS, default=None,
+                        help="Trace file format (default: from --trace's name)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run the game under cProfile, write <game_id>.prof "
+                             "next to its log and print the hottest functions")
+    parser.add_argument("--memory", action="store_true",
+                        help="Track the game's heap with tracemalloc (slow) and "
+                             "log peak/retained KB and top allocation sites")
+    parser.add_argument("--prompt-layout", choices=PROMPT_LAYOUTS,
+                        default=PROMPT_LAYOUT_LEGACY,
+                        help="Request layout: legacy (default), cache "
+                             "(stable prefix first, for provider prompt caching) "
+                             "or chat (multi-turn history sending per-turn "
+                             "deltas, oldest turns evicted past a token budget)")
+    parser.add_argument("--prompt-render", choices=PROMPT_RENDERS,
+                        default=PROMPT_RENDER_VERBOSE,
+                        help="Prompt text: verbose (default) or compact "
+                             "(minified memory, short event lines, rules in "
+                             "the system prompt; a separate prompt_version)")
+    parser.add_argument("--response-protocol", choices=RESPONSE_PROTOCOLS,
+                        default=RESPONSE_PROTOCOL_FULL,
+                        help="Response format: full (default) or lean (bare "
+                             "targets, optional capped thoughts; fewer output "
+                             "tokens, a separate prompt_version)")
+    parser.add_argument("--streaming", choices=STREAM_MODES, default=STREAM_OFF,
+                        help="Stream completions: off (default), full (record "
+                             "time-to-first-token) or early_stop (also stop "
+                             "reading once the JSON object closes; usage of "
+                             "those calls is estimated)")
+    parser.add_argument("--retry-profile", choices=sorted(RETRY_PROFILES),
+                        default=RETRY_PROFILE_BASELINE,
+                        help="Retry defaults: baseline (3 attempts per turn, "
+                             "no game budget) or resilient (more rate-limit "
+                             "retries, 5 attempts, 40 retries in the game)")
+    parser.add_argument("--max-attempts", type=int, default=None, metavar="N",
+                        help="Attempts per turn in all (default: the profile's)")
+    parser.add_argument("--retry-budget", type=int, default=None, metavar="N",
+                        help="Retries allowed in the game across all agents; "
+                             "-1 for unlimited (default: the profile's)")
+    parser.add_argument("--retry-base-ms", type=int, default=RetryPolicy.base_ms,
+                        help="Backoff before the first retry of a transport "
+                             "error, doubling per retry with full jitter "
+                             "(default: %(default)s)")
+    parser.add_argument("--hedge-percentile", type=float, default=None, metavar="P",
+                        help="Resend a call still running after the P-th "
+                             "percentile (0-100) of recent latency for its "
+                             "model and action; first answer wins (default: off)")
+    parser.add_argument("--output-caps", type=str, default=None, metavar="PATH",
+                        help="max_output_tokens table per model and action, "
+                             "from python -m werewolf.cli.output_caps")
+    parser.add_argument("--token-calibration", type=str, default=None, metavar="PATH",
+                        help="Per-family pre-flight token estimate scales, "
+                             "from python -m werewolf.cli.calibrate_tokens")
+    parser.add_argument("--tpm-limit", type=int, default=None, metavar="N",
+                        help="Hold requests so the game stays under N "
+                             "estimated tokens per minute (default: off)")
 
     args = parser.parse_args()
+    if args.hedge_percentile is not None and not 0 < args.hedge_percentile < 100:
+        raise SystemExit("Error: --hedge-percentile must be between 0 and 100")
+    if args.tpm_limit is not None and args.tpm_limit < 1:
+        raise SystemExit("Error: --tpm-limit must be >= 1")
+    belief_sampling = belief_sampling_from_args(args)
+    retry_policy = retry_policy_from_args(args)
 
     load_env_file()
     setup_logging(args.debug)
@@ -173,6 +309,7 @@ def main():
             f"{provider_result.error or 'unknown initialization error'}"
         )
 
+    tracer = Tracer() if args.trace else None
     engine = GameEngine(
         n_players=args.n,
         n_wolves=args.wolves,
@@ -194,21 +331,81 @@ def main():
             top_p=args.top_p,
             max_output_tokens=args.max_output_tokens,
             provider_seed=args.provider_seed,
+            response_schema=args.response_schema,
         ),
         discussion_cycles=args.discussion_cycles,
+        log_durability=args.log_durability,
+        log_compression=args.log_compression,
+        tracer=tracer,
+        memory_tracking=args.memory,
+        prompt_layout=args.prompt_layout,
+        prompt_render=args.prompt_render,
+        response_protocol=args.response_protocol,
+        streaming=args.streaming,
+        retry_policy=retry_policy,
+        hedging=(
+            HedgePolicy(percentile=args.hedge_percentile / 100)
+            if args.hedge_percentile is not None else None
+        ),
+        output_caps=OutputCapTable.load(args.output_caps) if args.output_caps else None,
+        token_calibration=(
+            TokenCalibration.load(args.token_calibration)
+            if args.token_calibration else None
+        ),
+        rate_limiter=TokenRateLimiter(args.tpm_limit) if args.tpm_limit else None,
+        belief_sampling=belief_sampling,
     )
 
-    winner = engine.run()
+    profile_path = None
+    if args.profile:
+        profile_path = profile_path_for(engine.logger.filepath, engine.state.game_id)
+    try:
+        if profile_path:
+            winner = run_profiled(engine.run, profile_path)
+        else:
+            winner = engine.run()
+    finally:
+        if tracer is not None:
+            tracer.export(args.trace, args.trace_format)
+            print(f"Trace saved to: {args.trace}")
 
     print(f"\nGame complete! Winner: {winner}")
     print(f"Log saved to: {engine.logger.filepath}")
+    if engine.memory_report is not None:
+        print(
+            f"Memory: peak {engine.memory_report['peak_kb']:.0f} KB, "
+            f"retained {engine.memory_report['retained_kb']:.0f} KB"
+        )
+    if profile_path:
+        print(f"Profile saved to: {profile_path}")
+        print(format_profile(aggregate_profiles([profile_path], DEFAULT_TOP_N), limit=15))
 
     summary = engine.ledger.game_summary()
     if summary["calls"]:
         print(
             f"LLM calls: {summary['calls']} "
-            f"(retries: {summary['retries']}, fallbacks: {summary['fallbacks']})"
+            f"(retries: {summary['retries']}, fallbacks: {summary['fallbacks']}, "
+            f"backoff: {summary['backoff']['backoff_ms'] / 1000:.1f} s)"
         )
+        hedging = summary["hedging"]
+        if hedging["hedged_calls"]:
+            print(
+                f"Hedging: {hedging['hedged_calls']} calls hedged, "
+                f"{hedging['hedge_wins']} won by the hedge, "
+                f"{hedging['losers']} losing attempts "
+                f"(${hedging['loser_cost_usd']:.6f} known cost)"
+            )
+        hits = sum(c["hits"] for c in summary["output_cap_hits"].values())
+        if engine.output_caps is not None or hits:
+            print(f"Output-token cap hits: {hits}/{summary['calls']} calls")
+        for family, counts in summary["preflight"]["by_family"].items():
+            if counts["bias"] is None:
+                continue
+            print(f"Pre-flight estimate ({family}): bias {counts['bias']:+.1%}, "
+                  f"error {counts['error_rate']:.1%} over {counts['calls']} calls")
+        if summary["preflight"]["refused"]:
+            print(f"Refused before sending (context window): "
+                  f"{summary['preflight']['refused']} calls")
         cost = summary["cost_usd_total"]
         if cost is None:
             print("Cost: unavailable (provider reported no cost data)")
@@ -216,6 +413,13 @@ def main():
             exact = "" if summary["cost_complete"] else " (incomplete)"
             print(f"Cost: ${cost:.6f}{exact} "
                   f"[sources: {', '.join(summary['cost_by_source'])}]")
+        if summary["prompt_cache"]["hit_rate"] is not None:
+            print(f"Prompt cache: {summary['prompt_cache']['hit_rate']:.1%} "
+                  f"of input tokens cached")
+        streaming = summary["streaming"]
+        if streaming["ttft_ms"] is not None:
+            print(f"Streaming: mean time to first token {streaming['ttft_ms']['mean']:.0f} ms, "
+                  f"{streaming['stopped_early']}/{streaming['calls']} calls stopped early")
 
 
 if __name__ == "__main__":
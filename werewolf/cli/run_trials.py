@@ -1,12 +1,35 @@
 import argparse
+import contextlib
 import csv
 import json
 import os
 from datetime import datetime, timezone
+from functools import partial
 from statistics import mean
 
-from werewolf.cli.run_game import MODEL_PRESETS, get_api_key, load_env_file, setup_logging
+from werewolf.agents.prompts import (
+    PROMPT_LAYOUT_LEGACY,
+    PROMPT_LAYOUTS,
+    PROMPT_RENDER_VERBOSE,
+    PROMPT_RENDERS,
+    RESPONSE_PROTOCOL_FULL,
+    RESPONSE_PROTOCOLS,
+)
+from werewolf.agents.scripted import DEFAULT_POLICIES
+from werewolf.cli.run_game import (
+    MODEL_PRESETS,
+    belief_sampling_from_args,
+    retry_policy_from_args,
+    get_api_key,
+    load_env_file,
+    setup_logging,
+)
+from werewolf.engine.belief_sampling import BeliefSampling
 from werewolf.engine.game import GameEngine
+from werewolf.engine.log_writer import AsyncLogWriter
+from werewolf.engine.memory import aggregate_memory
+from werewolf.engine.logging import DURABILITY_LEVELS, DURABILITY_RECORD
+from werewolf.log_files import COMPRESSION_NONE, COMPRESSIONS
 from werewolf.evaluation.belief_metrics import (
     aggregate_belief_metrics,
     compute_game_metrics_from_file,
@@ -18,6 +41,19 @@ from werewolf.evaluation.validity import (
 from werewolf.llm.ledger import aggregate_game_summaries
 from werewolf.llm.provider import GenerationConfig
 from werewolf.llm.registry import build_provider, registry_snapshot, resolve
+from werewolf.llm.hedging import HedgePolicy
+from werewolf.llm.output_caps import OutputCapTable
+from werewolf.llm.preflight import TokenCalibration, TokenRateLimiter
+from werewolf.llm.retry import RETRY_PROFILE_BASELINE, RETRY_PROFILES, RetryPolicy
+from werewolf.llm.streaming import STREAM_MODES, STREAM_OFF
+from werewolf.profiling import (
+    DEFAULT_TOP_N,
+    aggregate_profiles,
+    format_profile,
+    profile_path_for,
+    run_profiled,
+)
+from werewolf.tracing import TRACE_FORMATS, Tracer
 
 
 def _now_utc() -> str:
@@ -57,6 +93,23 @@ def run_one_trial(
     role_models: dict = None,
     role_providers: dict = None,
     allow_provider_fallback: bool = False,
+    log_durability: str = DURABILITY_RECORD,
+    log_writer: AsyncLogWriter = None,
+    log_compression: str = COMPRESSION_NONE,
+    role_agents: dict = None,
+    tracer=None,
+    profile: bool = False,
+    memory_tracking: bool = False,
+    prompt_layout: str = PROMPT_LAYOUT_LEGACY,
+    prompt_render: str = PROMPT_RENDER_VERBOSE,
+    response_protocol: str = RESPONSE_PROTOCOL_FULL,
+    streaming: str = STREAM_OFF,
+    retry_policy: RetryPolicy = None,
+    hedging: HedgePolicy = None,
+    output_caps: OutputCapTable = None,
+    token_calibration: TokenCalibration = None,
+    rate_limiter: TokenRateLimiter = None,
+    belief_sampling: BeliefSampling = None,
 ) -> dict:
     engine = GameEngine(
         n_players=n_players,
@@ -80,10 +133,31 @@ def run_one_trial(
         role_models=role_models,
         role_providers=role_providers,
         allow_provider_fallback=allow_provider_fallback,
+        log_durability=log_durability,
+        log_writer=log_writer,
+        log_compression=log_compression,
+        role_agents=role_agents,
+        tracer=tracer,
+        memory_tracking=memory_tracking,
+        prompt_layout=prompt_layout,
+        prompt_render=prompt_render,
+        response_protocol=response_protocol,
+        streaming=streaming,
+        retry_policy=retry_policy,
+        hedging=hedging,
+        output_caps=output_caps,
+        token_calibration=token_calibration,
+        rate_limiter=rate_limiter,
+        belief_sampling=belief_sampling,
     )
-    winner = engine.run()
+    profile_path = None
+    if profile:
+        profile_path = profile_path_for(engine.logger.filepath, engine.state.game_id)
+        winner = run_profiled(engine.run, profile_path)
+    else:
+        winner = engine.run()
     remaining = [p.id for p in engine.state.get_alive_players()]
-    return {
+    record = {
         "trial_index": trial_index,
         "seed": seed,
         "batch_id": batch_id,
@@ -103,6 +177,14 @@ def run_one_trial(
             "role_models": engine.role_models_resolved,
         },
     }
+    if profile_path is not None:
+        record["profile_path"] = profile_path
+    if engine.memory_report is not None:
+        record["memory"] = {
+            field: engine.memory_report[field]
+            for field in ("peak_kb", "retained_kb", "top_sites")
+        }
+    return record
 
 
 def write_manifest(path: str, records: list[dict]):
@@ -138,6 +220,7 @@ def write_summary_csv(path: str, summary: dict):
         "total_tokens",
         "reasoning_tokens",
         "cached_input_tokens",
+        "cache_hit_rate",
         "llm_calls",
         "retries",
         "fallbacks",
@@ -178,6 +261,7 @@ def write_summary_csv(path: str, summary: dict):
             "total_tokens": (usage.get("tokens") or {}).get("total_tokens"),
             "reasoning_tokens": (usage.get("tokens") or {}).get("reasoning_tokens"),
             "cached_input_tokens": (usage.get("tokens") or {}).get("cached_input_tokens"),
+            "cache_hit_rate": (usage.get("prompt_cache") or {}).get("hit_rate"),
             "llm_calls": usage.get("calls"),
             "retries": usage.get("retries"),
             "fallbacks": usage.get("fallbacks"),
@@ -292,6 +376,23 @@ def run_health_check(
     belief_snapshots: bool = True,
     generation_config=None,
     discussion_cycles: int = 2,
+    log_durability: str = DURABILITY_RECORD,
+    log_writer: AsyncLogWriter = None,
+    log_compression: str = COMPRESSION_NONE,
+    role_agents: dict = None,
+    tracer=None,
+    profile: bool = False,
+    memory_tracking: bool = False,
+    prompt_layout: str = PROMPT_LAYOUT_LEGACY,
+    prompt_render: str = PROMPT_RENDER_VERBOSE,
+    response_protocol: str = RESPONSE_PROTOCOL_FULL,
+    streaming: str = STREAM_OFF,
+    retry_policy: RetryPolicy = None,
+    hedging: HedgePolicy = None,
+    output_caps: OutputCapTable = None,
+    token_calibration: TokenCalibration = None,
+    rate_limiter: TokenRateLimiter = None,
+    belief_sampling: BeliefSampling = None,
 ) -> list[dict]:
     health_output_dir = os.path.join(output_dir, "healthcheck")
     records = []
@@ -313,10 +414,42 @@ def run_health_check(
             belief_snapshots=belief_snapshots,
             generation_config=generation_config,
             discussion_cycles=discussion_cycles,
+            log_durability=log_durability,
+            log_writer=log_writer,
+            log_compression=log_compression,
+            role_agents=role_agents,
+            tracer=tracer,
+            profile=profile,
+            memory_tracking=memory_tracking,
+            prompt_layout=prompt_layout,
+            prompt_render=prompt_render,
+            response_protocol=response_protocol,
+            streaming=streaming,
+            retry_policy=retry_policy,
+            hedging=hedging,
+            output_caps=output_caps,
+            token_calibration=token_calibration,
+            rate_limiter=rate_limiter,
+            belief_sampling=belief_sampling,
         ))
     return records
 
 
+@contextlib.contextmanager
+def _batch_trace(tracer, path: str, fmt: str, batch_id: str):
+    """Wrap the batch in a root span and write the trace when it ends,
+    including when a trial fails."""
+    if tracer is None:
+        yield
+        return
+    try:
+        with tracer.root_span("batch", batch_id=batch_id):
+            yield
+    finally:
+        tracer.export(path, fmt)
+        print(f"Trace: {path}")
+
+
 def _fmt_cost(usd) -> str:
     return f"${usd:.4f}" if usd is not None else "$?"
 
@@ -359,12 +492,106 @@ def main():
         help="Disable structured belief/suspicion snapshots (cheaper, but "
              "games cannot be analyzed for manipulation metrics)",
     )
+    parser.add_argument("--belief-every-k", type=int, default=1, metavar="K",
+                        help="Take pre-discussion belief snapshots only every "
+                             "K-th day (default: every day)")
+    parser.add_argument("--belief-observer-fraction", type=float, default=1.0,
+                        metavar="F",
+                        help="Ask a seeded random share F of alive players "
+                             "for pre-discussion snapshots (default: all)")
+    parser.add_argument("--belief-max-rounds", type=int, default=None, metavar="N",
+                        help="Take pre-discussion snapshots only in the first "
+                             "N days (default: every day)")
     parser.add_argument("--discussion-cycles", type=int, default=2,
                         help="Discussion cycles per day (default: 2)")
     parser.add_argument("--temperature", type=float, default=None)
     parser.add_argument("--top-p", type=float, default=None)
     parser.add_argument("--max-output-tokens", type=int, default=None)
     parser.add_argument("--provider-seed", type=int, default=None)
+    parser.add_argument("--response-schema", action="store_true",
+                        help="Send a strict JSON Schema per required_action "
+                             "where the provider supports it (JSON mode "
+                             "elsewhere)")
+    parser.add_argument("--log-durability", choices=DURABILITY_LEVELS,
+                        default=DURABILITY_RECORD,
+                        help="JSONL crash safety: flush every record (default), "
+                             "group-commit per phase, or fsync per phase")
+    parser.add_argument("--log-compression", choices=COMPRESSIONS,
+                        default=COMPRESSION_NONE,
+                        help="Write game logs as .jsonl (default), .jsonl.gz "
+                             "or .jsonl.zst (needs zstandard)")
+    parser.add_argument("--async-logs", action="store_true",
+                        help="Serialize and write game logs on one shared "
+                             "background writer thread")
+    parser.add_argument("--scripted", action="store_true",
+                        help="Play every role with the default rule-based "
+                             "scripted agents: no API key, no LLM calls")
+    parser.add_argument("--trace", type=str, default=None, metavar="PATH",
+                        help="Record batch/game/phase/agent spans and write "
+                             "them to PATH for Perfetto (*.otlp.json selects "
+                             "OTLP/JSON)")
+    parser.add_argument("--trace-format", choices=TRACE_FORMATS, default=None,
+                        help="Trace file format (default: from --trace's name)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run each game under cProfile, write <game_id>.prof "
+                             "next to its log, and add a hot-function table to "
+                             "the batch summary")
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP_N,
+                        help=f"Functions in the summary's profile table "
+                             f"(default: {DEFAULT_TOP_N})")
+    parser.add_argument("--memory", action="store_true",
+                        help="Track each game's heap with tracemalloc (slow): "
+                             "peak/retained KB and top allocation sites in "
+                             "each log and in the batch summary")
+    parser.add_argument("--prompt-layout", choices=PROMPT_LAYOUTS,
+                        default=PROMPT_LAYOUT_LEGACY,
+                        help="Request layout: legacy (default), cache "
+                             "(stable prefix first, for provider prompt "
+                             "caching) or chat (multi-turn history sending "
+                             "per-turn deltas, oldest turns evicted past a "
+                             "token budget); both change what the model sees")
+    parser.add_argument("--prompt-render", choices=PROMPT_RENDERS,
+                        default=PROMPT_RENDER_VERBOSE,
+                        help="Prompt text: verbose (default) or compact "
+                             "(minified memory, short event lines, rules in "
+                             "the system prompt; a separate prompt_version)")
+    parser.add_argument("--response-protocol", choices=RESPONSE_PROTOCOLS,
+                        default=RESPONSE_PROTOCOL_FULL,
+                        help="Response format: full (default) or lean (bare "
+                             "targets, optional capped thoughts; fewer output "
+                             "tokens, a separate prompt_version)")
+    parser.add_argument("--streaming", choices=STREAM_MODES, default=STREAM_OFF,
+                        help="Stream completions: off (default), full (record "
+                             "time-to-first-token) or early_stop (also stop "
+                             "reading once the JSON object closes; usage of "
+                             "those calls is estimated)")
+    parser.add_argument("--retry-profile", choices=sorted(RETRY_PROFILES),
+                        default=RETRY_PROFILE_BASELINE,
+                        help="Retry defaults: baseline (3 attempts per turn, "
+                             "no game budget) or resilient (more rate-limit "
+                             "retries, 5 attempts, 40 retries per game)")
+    parser.add_argument("--max-attempts", type=int, default=None, metavar="N",
+                        help="Attempts per turn in all (default: the profile's)")
+    parser.add_argument("--retry-budget", type=int, default=None, metavar="N",
+                        help="Retries allowed per game across all agents; "
+                             "-1 for unlimited (default: the profile's)")
+    parser.add_argument("--retry-base-ms", type=int, default=RetryPolicy.base_ms,
+                        help="Backoff before the first retry of a transport "
+                             "error, doubling per retry with full jitter "
+                             "(default: %(default)s)")
+    parser.add_argument("--hedge-percentile", type=float, default=None, metavar="P",
+                        help="Resend a call still running after the P-th "
+                             "percentile (0-100) of recent latency for its "
+                             "model and action; first answer wins (default: off)")
+    parser.add_argument("--output-caps", type=str, default=None, metavar="PATH",
+                        help="max_output_tokens table per model and action, "
+                             "from python -m werewolf.cli.output_caps")
+    parser.add_argument("--token-calibration", type=str, default=None, metavar="PATH",
+                        help="Per-family pre-flight token estimate scales, "
+                             "from python -m werewolf.cli.calibrate_tokens")
+    parser.add_argument("--tpm-limit", type=int, default=None, metavar="N",
+                        help="Hold requests so the batch stays under N "
+                             "estimated tokens per minute (default: off)")
 
     args = parser.parse_args()
     load_env_file()
@@ -373,23 +600,33 @@ def main():
     spec = resolve(args.model)
     model_name = spec.model
 
-    api_key = get_api_key(args.model)
-    if not api_key:
-        env_names = " or ".join(spec.api_key_env) or "an API key"
-        raise SystemExit(f"Error: {env_names} environment variable is not set.")
-    provider_result = build_provider(spec, api_key=api_key)
-    if not provider_result.ok:
-        raise SystemExit(
-            f"Error: provider unavailable ({provider_result.status.value}): "
-            f"{provider_result.error or 'unknown initialization error'}"
-        )
-    provider = provider_result.provider
+    role_agents = dict(DEFAULT_POLICIES) if args.scripted else None
+    if args.scripted:
+        api_key, provider = "", None
+    else:
+        api_key = get_api_key(args.model)
+        if not api_key:
+            env_names = " or ".join(spec.api_key_env) or "an API key"
+            raise SystemExit(f"Error: {env_names} environment variable is not set.")
+        provider_result = build_provider(spec, api_key=api_key)
+        if not provider_result.ok:
+            raise SystemExit(
+                f"Error: provider unavailable ({provider_result.status.value}): "
+                f"{provider_result.error or 'unknown initialization error'}"
+            )
+        provider = provider_result.provider
 
     validate_config(args.n, args.wolves, args.seers)
     if args.trials < 1 and not args.health_check_only:
         raise SystemExit("Error: --trials must be >= 1")
     if args.health_check < 0:
         raise SystemExit("Error: --health-check must be >= 0")
+    if args.hedge_percentile is not None and not 0 < args.hedge_percentile < 100:
+        raise SystemExit("Error: --hedge-percentile must be between 0 and 100")
+    if args.tpm_limit is not None and args.tpm_limit < 1:
+        raise SystemExit("Error: --tpm-limit must be >= 1")
+    belief_sampling = belief_sampling_from_args(args)
+    retry_policy = retry_policy_from_args(args)
 
     output_dir = args.output_dir
     os.makedirs(output_dir, exist_ok=True)
@@ -404,7 +641,19 @@ def main():
         top_p=args.top_p,
         max_output_tokens=args.max_output_tokens,
         provider_seed=args.provider_seed,
+        response_schema=args.response_schema,
+    )
+    hedging = (
+        HedgePolicy(percentile=args.hedge_percentile / 100)
+        if args.hedge_percentile is not None else None
     )
+    output_caps = OutputCapTable.load(args.output_caps) if args.output_caps else None
+    token_calibration = (
+        TokenCalibration.load(args.token_calibration) if args.token_calibration else None
+    )
+    rate_limiter = TokenRateLimiter(args.tpm_limit) if args.tpm_limit else None
+    log_writer = AsyncLogWriter() if args.async_logs else None
+    tracer = Tracer() if args.trace else None
     trial_kwargs = dict(
         provider=provider,
         model_alias=spec.alias,
@@ -412,86 +661,110 @@ def main():
         belief_snapshots=not args.no_belief_snapshots,
         generation_config=generation_config,
         discussion_cycles=args.discussion_cycles,
+        log_durability=args.log_durability,
+        log_writer=log_writer,
+        log_compression=args.log_compression,
+        role_agents=role_agents,
+        tracer=tracer,
+        profile=args.profile,
+        memory_tracking=args.memory,
+        prompt_layout=args.prompt_layout,
+        prompt_render=args.prompt_render,
+        response_protocol=args.response_protocol,
+        streaming=args.streaming,
+        retry_policy=retry_policy,
+        hedging=hedging,
+        output_caps=output_caps,
+        token_calibration=token_calibration,
+        rate_limiter=rate_limiter,
+        belief_sampling=belief_sampling,
     )
 
-    health_records = None
-    if args.health_check > 0:
-        health_records = run_health_check(
-            checks=args.health_check,
-            seed_start=args.seed_start,
-            n_players=args.n,
-            n_wolves=args.wolves,
-            n_seers=args.seers,
-            output_dir=output_dir,
-            api_key=api_key,
-            model=model_name,
-            **trial_kwargs,
-        )
-        health_cost = aggregate_game_summaries(
-            [r["usage"] for r in health_records]
-        )["cost_usd_total"]
-        print(f"Health check passed ({args.health_check} games, "
-              f"cost {_fmt_cost(health_cost)})")
-    if args.health_check_only:
-        return
-
-    started_at = _now_utc()
-    records = []
-    errors = 0
-    total = args.trials
-    # Manifest is appended and flushed per trial so a crash mid-batch
-    # loses nothing.
-    manifest_file = open(manifest_path, "w", encoding="utf-8")
-    try:
-        for i in range(total):
-            seed = args.seed_start + i
-            try:
-                record = run_one_trial(
-                    trial_index=i,
-                    seed=seed,
-                    n_players=args.n,
-                    n_wolves=args.wolves,
-                    n_seers=args.seers,
-                    output_dir=output_dir,
-                    api_key=api_key,
-                    model=model_name,
-                    quiet=args.quiet,
-                    **trial_kwargs,
-                )
-                records.append(record)
-                manifest_file.write(json.dumps(record) + "\n")
-                manifest_file.flush()
-            except Exception as exc:
-                errors += 1
-                if args.continue_on_error:
-                    print(f"[trial {i}] failed: {exc}")
-                    continue
-                raise
-
-            done = i + 1
-            w = sum(1 for r in records if r["winner"] == "wolf")
-            v = sum(1 for r in records if r["winner"] == "village")
-            costs = [
-                r["usage"]["cost_usd_total"] for r in records
-                if r["usage"].get("cost_usd_total") is not None
-            ]
-            cost_str = _fmt_cost(sum(costs) if costs else None)
-            bar_len = 30
-            filled = int(bar_len * done / total)
-            bar = "█" * filled + "░" * (bar_len - filled)
-            err_str = f" err={errors}" if errors else ""
-            print(
-                f"\r  [{bar}] {done}/{total}  W:{w} V:{v}  {cost_str}{err_str}",
-                end="",
-                flush=True,
+    with _batch_trace(tracer, args.trace, args.trace_format, run_id):
+        health_records = None
+        if args.health_check > 0:
+            health_records = run_health_check(
+                checks=args.health_check,
+                seed_start=args.seed_start,
+                n_players=args.n,
+                n_wolves=args.wolves,
+                n_seers=args.seers,
+                output_dir=output_dir,
+                api_key=api_key,
+                model=model_name,
+                **trial_kwargs,
             )
-        print()
-    finally:
-        manifest_file.close()
+            health_cost = aggregate_game_summaries(
+                [r["usage"] for r in health_records]
+            )["cost_usd_total"]
+            print(f"Health check passed ({args.health_check} games, "
+                  f"cost {_fmt_cost(health_cost)})")
+        if args.health_check_only:
+            if log_writer is not None:
+                log_writer.close()
+            return
+
+        started_at = _now_utc()
+        records = []
+        errors = 0
+        total = args.trials
+        # Manifest is appended and flushed per trial so a crash mid-batch
+        # loses nothing.
+        manifest_file = open(manifest_path, "w", encoding="utf-8")
+        try:
+            for i in range(total):
+                seed = args.seed_start + i
+                try:
+                    record = run_one_trial(
+                        trial_index=i,
+                        seed=seed,
+                        n_players=args.n,
+                        n_wolves=args.wolves,
+                        n_seers=args.seers,
+                        output_dir=output_dir,
+                        api_key=api_key,
+                        model=model_name,
+                        quiet=args.quiet,
+                        **trial_kwargs,
+                    )
+                    records.append(record)
+                    manifest_file.write(json.dumps(record) + "\n")
+                    manifest_file.flush()
+                except Exception as exc:
+                    errors += 1
+                    if args.continue_on_error:
+                        print(f"[trial {i}] failed: {exc}")
+                        continue
+                    raise
+
+                done = i + 1
+                w = sum(1 for r in records if r["winner"] == "wolf")
+                v = sum(1 for r in records if r["winner"] == "village")
+                costs = [
+                    r["usage"]["cost_usd_total"] for r in records
+                    if r["usage"].get("cost_usd_total") is not None
+                ]
+                cost_str = _fmt_cost(sum(costs) if costs else None)
+                bar_len = 30
+                filled = int(bar_len * done / total)
+                bar = "█" * filled + "░" * (bar_len - filled)
+                err_str = f" err={errors}" if errors else ""
+                print(
+                    f"\r  [{bar}] {done}/{total}  W:{w} V:{v}  {cost_str}{err_str}",
+                    end="",
+                    flush=True,
+                )
+            print()
+        finally:
+            manifest_file.close()
+            # Every game closed its own log; this only stops the thread.
+            if log_writer is not None:
+                log_writer.close()
 
     completed_at = _now_utc()
 
-    summary = build_batch_summary(
+    build_summary = partial(
+        build_batch_summary,
         records,
         run_id=run_id,
         started_at=started_at,
@@ -509,15 +782,50 @@ def main():
             "provider": spec.provider,
             "generation_config": generation_config.to_json_dict(),
             "discussion_cycles": args.discussion_cycles,
+            "log_durability": args.log_durability,
+            "async_logs": args.async_logs,
+            "log_compression": args.log_compression,
+            "role_agents": role_agents,
+            "profile": args.profile,
+            "memory_tracking": args.memory,
+            "prompt_layout": args.prompt_layout,
+            "prompt_render": args.prompt_render,
+            "response_protocol": args.response_protocol,
+            "streaming": args.streaming,
+            "retry_policy": retry_policy.to_json_dict(),
+            "hedging": hedging.to_json_dict() if hedging else None,
+            "output_caps": output_caps.config_dict() if output_caps else None,
+            "token_calibration": (
+                token_calibration.to_json_dict() if token_calibration else None
+            ),
+            "tpm_limit": args.tpm_limit,
+            "belief_sampling": (
+                belief_sampling.to_json_dict() if belief_sampling else None
+            ),
             "quiet": args.quiet,
             "health_check": args.health_check,
         },
         manifest_path=manifest_path,
         health_check_records=health_records,
     )
+    if args.profile:
+        # The summary re-reads every log (metrics, validity): that is the
+        # reporting share of the profile.
+        summary_profile_path = os.path.join(output_dir, f"trials_summary_{run_id}.prof")
+        summary = run_profiled(build_summary, summary_profile_path)
+        summary["profile"] = aggregate_profiles(
+            [r["profile_path"] for r in records] + [summary_profile_path],
+            args.profile_top,
+        )
+    else:
+        summary = build_summary()
 
     summary_json_path = os.path.join(output_dir, f"trials_summary_{run_id}.json")
     summary_csv_path = os.path.join(output_dir, f"trials_summary_{run_id}.csv")
+    if log_writer is not None:
+        summary["log_writer"] = log_writer.stats()
+    if args.memory:
+        summary["memory"] = aggregate_memory([r.get("memory") for r in records])
     write_summary_json(summary_json_path, summary)
     write_summary_csv(summary_csv_path, summary)
 
@@ -535,10 +843,75 @@ def main():
             f"median {_fmt_cost(per_game['median'])} | "
             f"p90 {_fmt_cost(per_game['p90'])}"
         )
+    backoff = usage.get("backoff") or {}
     print(
         f"Calls: {usage['calls']} (retries: {usage['retries']}, "
-        f"fallbacks: {usage['fallbacks']})"
+        f"fallbacks: {usage['fallbacks']}, "
+        f"backoff: {backoff.get('backoff_ms', 0) / 1000:.1f} s)"
     )
+    hedging_usage = usage.get("hedging") or {}
+    if hedging_usage.get("hedged_calls"):
+        print(
+            f"Hedging: {hedging_usage['hedged_calls']} calls hedged, "
+            f"{hedging_usage['hedge_wins']} won by the hedge; losers cost "
+            f"{_fmt_cost(hedging_usage['loser_cost_usd'])}"
+            + (f" (+{hedging_usage['losers_without_cost']} without cost)"
+               if hedging_usage["losers_without_cost"] else "")
+        )
+    prompt_cache = usage.get("prompt_cache") or {}
+    if prompt_cache.get("hit_rate") is not None:
+        per_game_cache = prompt_cache["per_game"]
+        print(
+            f"Prompt cache: {prompt_cache['hit_rate']:.1%} of input tokens cached "
+            f"(per game {per_game_cache['min']:.1%}-{per_game_cache['max']:.1%})"
+        )
+    streaming = usage.get("streaming") or {}
+    if streaming.get("ttft_ms") is not None:
+        print(
+            f"Streaming: mean time to first token {streaming['ttft_ms']['mean']:.0f} ms, "
+            f"{streaming['stopped_early']}/{streaming['calls']} calls stopped early"
+        )
+    reliability = {
+        action: counts
+        for action, counts in (usage.get("reliability_by_action") or {}).items()
+        if counts["turns"]
+    }
+    if reliability:
+        print("Retries by action:")
+    for action, counts in reliability.items():
+        repair_rate = counts["repair_rate"]
+        print(
+            f"  {action:<18} retry rate {counts['retry_rate']:.1%} "
+            f"(malformed {counts['malformed_json']}, invalid "
+            f"{counts['invalid_game_action']}), repaired "
+            + (f"{repair_rate:.1%}" if repair_rate is not None else "-")
+            + f", fallbacks {counts['fallbacks']}"
+        )
+    cap_hits = usage.get("output_cap_hits") or {}
+    if output_caps is not None or any(c["hits"] for c in cap_hits.values()):
+        print("Output-token cap hits by action"
+              + (f" (table {output_caps.table_hash}):" if output_caps else ":"))
+        for action, counts in cap_hits.items():
+            print(f"  {action:<18} {counts['hits']}/{counts['calls']} "
+                  f"({counts['hit_rate']:.1%})")
+    preflight = usage.get("preflight") or {}
+    if preflight.get("by_family") or preflight.get("refused"):
+        print("Pre-flight input-token estimates"
+              + (f" ({preflight['refused']} calls refused: context window):"
+                 if preflight.get("refused") else ":"))
+        for family, counts in preflight["by_family"].items():
+            if counts["bias"] is None:
+                continue
+            print(f"  {family:<18} {counts['calls']} calls, bias {counts['bias']:+.1%}, "
+                  f"error {counts['error_rate']:.1%}")
+    if args.profile:
+        print(format_profile(summary["profile"], limit=10))
+    if args.memory and summary["memory"]["games"]:
+        memory = summary["memory"]
+        print(
+            f"Memory per game: peak {memory['peak_kb']['max']:.0f} KB max, "
+            f"retained {memory['retained_kb']['max']:.0f} KB max"
+        )
     print(f"Manifest: {manifest_path}")
     print(f"Summary JSON: {summary_json_path}")
     print(f"Summary CSV: {summary_csv_path}")
@@ -0,0 +1,183 @@
+"""Strict JSON Schemas for model responses, one per required_action.
+
+    schema = action_schema(observation)   # None: no schema for this turn
+
+Generic JSON mode only guarantees that a response parses; the model can
+still omit kill_target, vote for itself or return a partial beliefs
+object, and each such miss costs a full retry. A schema built from the
+observation encodes what engine/validate.py and the belief schema in
+engine/beliefs.py would accept, so a provider enforcing it strictly
+cannot return a MALFORMED_JSON or INVALID_GAME_ACTION response.
+
+Rules:
+- Derived from the validators, never the other way round: validate.py
+  stays the source of truth and still runs on every response. Targets
+  are enums of the player ids the validator accepts for this observation
+  (alive, not self, not a fellow wolf, a runoff candidate).
+- "say" carries only the channel the engine reads for the action
+  (werewolf for wolf_chat, public for speak_public) and is null for
+  every other action, which ignores it.
+- "beliefs" is required where the prompt asks for it (assess_beliefs and
+  vote): wolf_probabilities has one required key per other alive player
+  and estimated_suspicion_of_me is a map for wolves and null otherwise.
+- Strict mode admits no free-form objects, so updated_memory is a
+  string under a schema (stored memory may then be a string).
+- Every object lists all its properties as required and sets
+  additionalProperties false; optional values are nullable instead.
+- Lean-protocol schemas (protocol="lean") describe the lean shape that
+  validate.expand_lean_response accepts: a bare "target", "say" as a
+  string, short belief keys and nullable "thought" / "memory" where the
+  action allows them. Their names carry the protocol.
+- ACTION_SCHEMA_VERSION is bumped whenever a schema changes; it is sent
+  with each schema (as its title) and so recorded per request.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from werewolf.agents.prompts import (
+    LEAN_THOUGHT_MAX_CHARS,
+    RESPONSE_PROTOCOL_FULL,
+    RESPONSE_PROTOCOL_LEAN,
+)
+
+ACTION_SCHEMA_VERSION = 1
+
+TARGET_KEYS = {
+    "choose_wolf_kill": "kill_target",
+    "seer_divine": "divine_target",
+    "vote": "vote_target",
+    "runoff_vote": "vote_target",
+}
+SAY_CHANNELS = {"wolf_chat": "werewolf", "speak_public": "public"}
+_BELIEF_ACTIONS = ("assess_beliefs", "vote")
+
+_NULL = {"type": "null"}
+_STRING = {"type": "string"}
+_PROBABILITY = {"type": "number", "minimum": 0.0, "maximum": 1.0}
+
+
+def _object(properties: dict) -> dict:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _nullable(schema: dict) -> dict:
+    return {"anyOf": [schema, _NULL]}
+
+
+def _player(ids) -> dict:
+    return {"type": "integer", "enum": sorted(ids)}
+
+
+def _probability_map(ids) -> dict:
+    return _object({str(pid): _PROBABILITY for pid in sorted(ids)})
+
+
+def valid_targets(observation: dict) -> Optional[list[int]]:
+    """Ids validate_action accepts as this action's target, or None when
+    the action takes no target."""
+    required_action = observation["required_action"]
+    if required_action not in TARGET_KEYS:
+        return None
+    self_id = observation["self"]["id"]
+    alive_ids = {p["id"] for p in observation["alive_players"]}
+    if required_action == "choose_wolf_kill":
+        wolves = set((observation.get("private_info") or {}).get("wolf_roster", []))
+        return sorted(alive_ids - wolves)
+    if required_action == "runoff_vote":
+        candidates = (observation.get("turn_context") or {}).get("runoff_candidates", [])
+        return sorted(set(candidates) - {self_id})
+    return sorted(alive_ids - {self_id})
+
+
+def beliefs_schema(observation: dict, lean: bool = False) -> dict:
+    required_action = observation["required_action"]
+    self_id = observation["self"]["id"]
+    alive_ids = {p["id"] for p in observation["alive_players"]}
+    others = alive_ids - {self_id}
+    # The vote prompt asks for a vote and a confidence; the private
+    # assessment allows null for both.
+    intended_vote = _player(others)
+    confidence = _PROBABILITY
+    if required_action == "assess_beliefs":
+        intended_vote, confidence = _nullable(intended_vote), _nullable(confidence)
+    is_wolf = observation["self"]["role"] == "werewolf"
+    fields = {
+        "wolf_probabilities": _probability_map(others),
+        "intended_vote": intended_vote,
+        "vote_confidence": confidence,
+        "most_influential_recent_speaker": _nullable(_player(alive_ids)),
+        "estimated_suspicion_of_me": _probability_map(others) if is_wolf else _NULL,
+    }
+    if lean:
+        from werewolf.engine.beliefs import LEAN_BELIEF_KEYS
+        fields = {short: fields[name] for short, name in LEAN_BELIEF_KEYS.items()}
+    return _object(fields)
+
+
+def schema_name(required_action: str,
+                protocol: str = RESPONSE_PROTOCOL_FULL) -> str:
+    if protocol != RESPONSE_PROTOCOL_FULL:
+        return f"{required_action}_{protocol}_response_v{ACTION_SCHEMA_VERSION}"
+    return f"{required_action}_response_v{ACTION_SCHEMA_VERSION}"
+
+
+def _lean_schema(observation: dict, targets: Optional[list[int]]) -> dict:
+    required_action = observation["required_action"]
+    properties = {}
+    if required_action in TARGET_KEYS:
+        properties["target"] = _player(targets)
+    if required_action in SAY_CHANNELS:
+        properties["say"] = _STRING
+    if required_action in _BELIEF_ACTIONS:
+        properties["beliefs"] = beliefs_schema(observation, lean=True)
+    if LEAN_THOUGHT_MAX_CHARS.get(required_action, 0):
+        properties["thought"] = _nullable(_STRING)
+    if required_action != "assess_beliefs":
+        properties["memory"] = _nullable(_STRING)
+    schema = _object(properties)
+    schema["title"] = schema_name(required_action, RESPONSE_PROTOCOL_LEAN)
+    return schema
+
+
+def action_schema(observation: dict,
+                  protocol: str = RESPONSE_PROTOCOL_FULL) -> Optional[dict]:
+    """The strict response schema for this observation, or None when the
+    action is unknown or has no legal target (the validator would reject
+    every response; send no schema and let it explain why)."""
+    required_action = observation["required_action"]
+    targets = valid_targets(observation)
+    if required_action in TARGET_KEYS:
+        if not targets:
+            return None
+        action = _object({TARGET_KEYS[required_action]: _player(targets)})
+    elif required_action in ("wolf_chat", "speak_public", "assess_beliefs"):
+        action = _NULL
+    else:
+        return None
+    if protocol == RESPONSE_PROTOCOL_LEAN:
+        return _lean_schema(observation, targets)
+
+    channel = SAY_CHANNELS.get(required_action)
+    properties = {
+        "thought": _STRING,
+        "say": _nullable(_object({channel: _STRING})) if channel else _NULL,
+        "action": action,
+        "updated_memory": _STRING,
+    }
+    if required_action in _BELIEF_ACTIONS:
+        properties["beliefs"] = beliefs_schema(observation)
+    schema = _object(properties)
+    schema["title"] = schema_name(required_action)
+    return schema
+
+
+__all__ = [
+    "ACTION_SCHEMA_VERSION", "SAY_CHANNELS", "TARGET_KEYS", "action_schema",
+    "beliefs_schema", "schema_name", "valid_targets",
+]
@@ -0,0 +1,218 @@
+"""Sampling policy for pre-discussion belief snapshots.
+
+    sampling = BeliefSampling(every_k_rounds=2, observer_fraction=0.5)
+    GameEngine(..., belief_sampling=sampling)
+    design = SamplingDesign.from_rows(rows)          # when analysing a log
+    design.pre_weight(round_number)                  # 1 / inclusion probability
+
+The pre-discussion checkpoint is one assess_beliefs call per alive
+player per day - about a quarter of a 7-player game's calls. Calibration
+batches only need a statistical sample of it.
+
+Rules:
+- Only the pre-discussion checkpoint is sampled. Post-discussion
+  snapshots ride inside the vote response and cost nothing extra.
+- A round is in the sample when (round - 1) % every_k_rounds == 0 and
+  round <= max_rounds. Inside a sampled round, ceil(observer_fraction *
+  alive) observers (at least one) are drawn without replacement from
+  the sorted alive ids by random.Random(f"{seed}:beliefs:{round}"). The
+  game's own rng is never touched, so the game plays out exactly as an
+  unsampled one would.
+- Every pre-discussion checkpoint of a sampling game logs a
+  moderator-only belief_sample event: the frame (alive ids), the
+  sampled ids, and the inclusion probabilities of one observer and of a
+  pair of observers. Unselected rounds log an empty sample.
+- Estimates are Hajek-weighted: an observation's weight is one over its
+  inclusion probability, with a selected round standing for every_k
+  rounds. A pair (a wolf's estimate of a villager's suspicion, both at
+  the pre checkpoint) uses the pair probability. Rounds past max_rounds
+  are out of scope, not missing: pre-discussion metrics then describe
+  the first max_rounds days.
+- Games without a policy (or with the census default) log no design
+  events and every weight is 1.
+"""
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from werewolf.engine.beliefs import CHECKPOINT_PRE
+from werewolf.json_safety import as_mapping
+
+BELIEF_SAMPLING_VERSION = 1
+BELIEF_SAMPLE_EVENT = "belief_sample"
+
+
+def _positive_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 1
+
+
+@dataclass(frozen=True)
+class BeliefSampling:
+    """Which (round, observer) pairs get a pre-discussion snapshot."""
+
+    every_k_rounds: int = 1
+    observer_fraction: float = 1.0
+    max_rounds: Optional[int] = None
+
+    def __post_init__(self):
+        if not _positive_int(self.every_k_rounds):
+            raise ValueError("every_k_rounds must be an integer >= 1")
+        if not 0.0 < self.observer_fraction <= 1.0:
+            raise ValueError("observer_fraction must be in (0, 1]")
+        if self.max_rounds is not None and not _positive_int(self.max_rounds):
+            raise ValueError("max_rounds must be an integer >= 1")
+
+    @property
+    def census(self) -> bool:
+        return (self.every_k_rounds == 1 and self.observer_fraction == 1.0
+                and self.max_rounds is None)
+
+    def round_sampled(self, round_number: int) -> bool:
+        if self.max_rounds is not None and round_number > self.max_rounds:
+            return False
+        return (round_number - 1) % self.every_k_rounds == 0
+
+    def sample_size(self, frame_size: int) -> int:
+        if frame_size <= 0:
+            return 0
+        return min(frame_size, max(1, math.ceil(self.observer_fraction * frame_size)))
+
+    def select(self, seed, round_number: int, alive_ids: Iterable[int]) -> list[int]:
+        """Sorted observers to assess this round (deterministic in seed)."""
+        frame = sorted(alive_ids)
+        if not self.round_sampled(round_number):
+            return []
+        n = self.sample_size(len(frame))
+        if n == len(frame):
+            return frame
+        rng = random.Random(f"{seed}:beliefs:{round_number}")
+        return sorted(rng.sample(frame, n))
+
+    def design_payload(self, seed, round_number: int, alive_ids: Iterable[int]) -> dict:
+        """Payload of the round's belief_sample event."""
+        frame = sorted(alive_ids)
+        sampled = self.select(seed, round_number, frame)
+        n, size = len(sampled), len(frame)
+        return {
+            "sampling_version": BELIEF_SAMPLING_VERSION,
+            "checkpoint": CHECKPOINT_PRE,
+            "frame_ids": frame,
+            "sampled_ids": sampled,
+            "every_k_rounds": self.every_k_rounds,
+            "inclusion_probability": n / size if size else 0.0,
+            "pair_inclusion_probability": (
+                n * (n - 1) / (size * (size - 1)) if size > 1 else 0.0
+            ),
+        }
+
+    def to_json_dict(self) -> dict:
+        return {
+            "sampling_version": BELIEF_SAMPLING_VERSION,
+            "every_k_rounds": self.every_k_rounds,
+            "observer_fraction": self.observer_fraction,
+            "max_rounds": self.max_rounds,
+        }
+
+    @classmethod
+    def from_json_dict(cls, data: dict) -> "BeliefSampling":
+        if data.get("sampling_version") != BELIEF_SAMPLING_VERSION:
+            raise ValueError(
+                f"Unsupported belief sampling version: {data.get('sampling_version')!r}"
+            )
+        return cls(
+            every_k_rounds=data.get("every_k_rounds", 1),
+            observer_fraction=data.get("observer_fraction", 1.0),
+            max_rounds=data.get("max_rounds"),
+        )
+
+
+class SamplingDesign:
+    """A logged game's realised sample, read back from its design events."""
+
+    def __init__(self, policy: Optional[dict], rounds: dict):
+        self.policy = policy  # config row's belief_sampling, or None
+        self.rounds = rounds  # {round: belief_sample payload}
+
+    @classmethod
+    def from_events(cls, config: dict, events: Iterable[dict]) -> "SamplingDesign":
+        policy = config.get("belief_sampling")
+        rounds = {}
+        for event in events:
+            if event.get("type") != BELIEF_SAMPLE_EVENT:
+                continue
+            payload = as_mapping(event.get("payload"))
+            round_number = event.get("round")
+            if isinstance(round_number, int) and not isinstance(round_number, bool):
+                rounds[round_number] = payload
+        return cls(policy if isinstance(policy, dict) else None, rounds)
+
+    @classmethod
+    def from_rows(cls, rows: list[dict]) -> "SamplingDesign":
+        config = next((r for r in rows if r.get("type") == "config"), {})
+        return cls.from_events(
+            config, (r["event"] for r in rows if r.get("type") == "event"),
+        )
+
+    @property
+    def sampled(self) -> bool:
+        return self.policy is not None
+
+    def _round_weight(self) -> int:
+        every_k = (self.policy or {}).get("every_k_rounds", 1)
+        return every_k if _positive_int(every_k) else 1
+
+    def _probability(self, round_number: int, key: str) -> Optional[float]:
+        payload = self.rounds.get(round_number)
+        if payload is None:
+            return None
+        value = payload.get(key)
+        return float(value) if isinstance(value, (int, float)) and value > 0 else None
+
+    def pre_weight(self, round_number: int) -> float:
+        """Weight of one observer's pre-discussion snapshot this round."""
+        if not self.sampled:
+            return 1.0
+        probability = self._probability(round_number, "inclusion_probability")
+        return self._round_weight() / probability if probability else 1.0
+
+    def pair_weight(self, round_number: int) -> float:
+        """Weight of a pair of pre-discussion snapshots this round."""
+        if not self.sampled:
+            return 1.0
+        probability = self._probability(round_number, "pair_inclusion_probability")
+        return self._round_weight() / probability if probability else 1.0
+
+    def not_sampled(self, round_number: int, observer_id: int) -> bool:
+        """True when the design skipped this observer's pre snapshot
+        (absent by design, not missing)."""
+        if not self.sampled:
+            return False
+        payload = self.rounds.get(round_number)
+        if payload is None:
+            return True  # unselected round, or past max_rounds
+        return observer_id not in (payload.get("sampled_ids") or [])
+
+    def summary(self) -> dict:
+        """Planned vs skipped pre-discussion snapshots, over logged rounds."""
+        planned = skipped = 0
+        for payload in self.rounds.values():
+            sampled = len(payload.get("sampled_ids") or [])
+            planned += sampled
+            skipped += len(payload.get("frame_ids") or []) - sampled
+        return {
+            "policy": self.policy,
+            "sampled_rounds": sorted(
+                r for r, p in self.rounds.items() if p.get("sampled_ids")
+            ),
+            "planned": planned,
+            "not_sampled": skipped,
+        }
+
+
+__all__ = [
+    "BELIEF_SAMPLE_EVENT", "BELIEF_SAMPLING_VERSION", "BeliefSampling",
+    "SamplingDesign",
+]
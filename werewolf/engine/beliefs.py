@@ -22,6 +22,16 @@ BELIEF_SCHEMA_VERSION = 1
 CHECKPOINT_PRE = "pre_discussion"
 CHECKPOINT_POST = "post_discussion"
 
+# The lean response protocol (werewolf/agents/prompts.py) asks for
+# beliefs under short keys.
+LEAN_BELIEF_KEYS = {
+    "p": "wolf_probabilities",
+    "v": "intended_vote",
+    "c": "vote_confidence",
+    "s": "most_influential_recent_speaker",
+    "e": "estimated_suspicion_of_me",
+}
+
 
 def _coerce_id(value) -> Optional[int]:
     from werewolf.engine.validate import _to_int  # lazy: avoid import cycle
@@ -125,6 +135,20 @@ def coerce_prob_map(raw, expected_ids: set[int]) -> tuple[dict[int, float], list
     return out, problems
 
 
+def expand_lean_beliefs(raw):
+    """A beliefs object with lean short keys renamed to the schema's
+    field names; a full name wins over its short key. Anything that is
+    not an object is returned unchanged for the parser to reject."""
+    if not isinstance(raw, dict):
+        return raw
+    expanded = {}
+    for key, value in raw.items():
+        name = LEAN_BELIEF_KEYS.get(key, key)
+        if name == key or name not in raw:
+            expanded[name] = value
+    return expanded
+
+
 @dataclass
 class BeliefSnapshot:
     checkpoint: str
@@ -0,0 +1,265 @@
+"""Engine event bus: one publish point, many subscribers.
+
+The engine publishes everything it used to hand to the logger and the
+transcript directly; the JSONL logger, console transcript, web feed and
+metrics are ordinary subscribers, so a new consumer needs no engine edits.
+
+Topics:
+- config, event, llm_call, usage_summary, outcome: canonical log rows
+- inherited: a parent row copied into a forked game's log
+- phase_boundary: start of a phase (a checkpoint was just taken)
+- timing: wall-time breakdown of a finished phase (werewolf/engine/timing.py)
+
+Delivery rules:
+- Synchronous subscribers run inline, in subscription order. Their
+  exceptions propagate: the canonical JSONL log is synchronous, and a
+  failed write must never be silent.
+- Background subscribers get a bounded queue and a dedicated daemon
+  thread. A full queue blocks the publisher (backpressure, never drops);
+  handler exceptions are logged and counted, never raised into the game.
+- Per subscriber, messages are delivered in publish order.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger("werewolf.bus")
+
+TOPICS = frozenset({
+    "config", "event", "llm_call", "usage_summary", "outcome", "inherited",
+    "phase_boundary", "timing", "memory",
+})
+
+Handler = Callable[[str, dict], None]
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Subscriber:
+    """Declarative subscription, e.g. for GameEngine(subscribers=[...])."""
+
+    handler: Handler
+    topics: Optional[frozenset] = None
+    background: bool = False
+    name: Optional[str] = None
+    queue_size: int = 1024
+
+
+class Subscription:
+    background = False
+
+    def __init__(self, handler: Handler, topics: Optional[Iterable[str]], name: str):
+        self.handler = handler
+        self.topics = frozenset(topics) if topics is not None else None
+        unknown = (self.topics or frozenset()) - TOPICS
+        if unknown:
+            raise ValueError(f"Unknown bus topics: {sorted(unknown)}")
+        self.name = name
+        self.delivered = 0
+        self.errors = 0
+        self.handler_ns = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def deliver(self, topic: str, payload: dict) -> None:
+        started = time.perf_counter_ns()
+        try:
+            self.handler(topic, payload)
+        finally:
+            self.handler_ns += time.perf_counter_ns() - started
+            self.delivered += 1
+
+    def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "background": self.background,
+            "delivered": self.delivered,
+            "errors": self.errors,
+            "handler_ms": self.handler_ns / 1e6,
+        }
+
+
+class BackgroundSubscription(Subscription):
+    background = True
+
+    def __init__(self, handler, topics, name, queue_size: int = 1024):
+        super().__init__(handler, topics, name)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.max_depth = 0
+        self.put_wait_ns = 0
+        self._thread = threading.Thread(
+            target=self._run, name=f"bus-{name}", daemon=True,
+        )
+        self._closed = False
+        self._thread.start()
+
+    def deliver(self, topic: str, payload: dict) -> None:
+        started = time.perf_counter_ns()
+        self._queue.put((topic, payload))
+        self.put_wait_ns += time.perf_counter_ns() - started
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                topic, payload = item
+                try:
+                    Subscription.deliver(self, topic, payload)
+                except Exception:
+                    self.errors += 1
+                    logger.exception("Background subscriber %s failed", self.name)
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "put_wait_ms": self.put_wait_ns / 1e6,
+        }
+
+
+class EventBus:
+    def __init__(self):
+        self._subscriptions: list[Subscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self,
+        handler: Handler | Subscriber,
+        *,
+        topics: Optional[Iterable[str]] = None,
+        background: bool = False,
+        name: Optional[str] = None,
+        queue_size: int = 1024,
+    ) -> Subscription:
+        if isinstance(handler, Subscriber):
+            spec = handler
+            handler, topics, background = spec.handler, spec.topics, spec.background
+            name, queue_size = spec.name, spec.queue_size
+        name = name or getattr(handler, "__qualname__", None) or type(handler).__name__
+        if background:
+            subscription = BackgroundSubscription(handler, topics, name, queue_size)
+        else:
+            subscription = Subscription(handler, topics, name)
+        with self._lock:
+            # Copy-on-write so publish() can iterate without the lock.
+            self._subscriptions = [*self._subscriptions, subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = [
+                s for s in self._subscriptions if s is not subscription
+            ]
+        subscription.close()
+
+    def publish(self, topic: str, payload: dict) -> None:
+        for subscription in self._subscriptions:
+            if subscription.wants(topic):
+                subscription.deliver(topic, payload)
+
+    def flush(self) -> None:
+        """Block until every background subscriber has drained its queue."""
+        for subscription in self._subscriptions:
+            subscription.drain()
+
+    def close(self) -> None:
+        for subscription in self._subscriptions:
+            subscription.close()
+
+    def stats(self) -> list[dict]:
+        return [subscription.stats() for subscription in self._subscriptions]
+
+    def inline_handler_ns(self) -> int:
+        """Total time publishers have spent inside synchronous handlers."""
+        return sum(s.handler_ns for s in self._subscriptions if not s.background)
+
+    def queue_wait_ns(self) -> int:
+        """Total time publishers have blocked on full background queues."""
+        return sum(s.put_wait_ns for s in self._subscriptions if s.background)
+
+
+class EventMetrics:
+    """Counting subscriber: messages per topic and events per type/channel."""
+
+    def __init__(self):
+        self.topics: Counter = Counter()
+        self.event_types: Counter = Counter()
+        self.channels: Counter = Counter()
+
+    def __call__(self, topic: str, payload: dict) -> None:
+        self.topics[topic] += 1
+        if topic == "event":
+            self.event_types[payload.get("type")] += 1
+            self.channels[payload.get("channel")] += 1
+
+    def to_json_dict(self) -> dict:
+        return {
+            "topics": dict(self.topics),
+            "event_types": dict(self.event_types),
+            "channels": dict(self.channels),
+        }
+
+
+class EventFeed:
+    """Bounded in-memory event buffer for live consumers such as the web
+    UI. wait_for() lets a reader long-poll for events newer than a given
+    numeric event id without touching the engine."""
+
+    def __init__(self, maxlen: int = 5000):
+        self._events: deque = deque(maxlen=maxlen)
+        self._condition = threading.Condition()
+
+    def __call__(self, topic: str, payload: dict) -> None:
+        with self._condition:
+            self._events.append(payload)
+            self._condition.notify_all()
+
+    def since(self, after_id: int) -> list[dict]:
+        with self._condition:
+            return [e for e in self._events if e.get("id", -1) > after_id]
+
+    def wait_for(self, after_id: int, timeout: float) -> list[dict]:
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._condition:
+            while True:
+                events = [e for e in self._events if e.get("id", -1) > after_id]
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events
+                self._condition.wait(remaining)
+
+
+__all__ = [
+    "BackgroundSubscription", "EventBus", "EventFeed", "EventMetrics",
+    "Subscriber", "Subscription", "TOPICS",
+]
@@ -0,0 +1,135 @@
+"""Phase-boundary checkpoints and counterfactual forks.
+
+A checkpoint is taken at the start of every phase and captures exactly what
+is needed to resume the game from that point under different models:
+player states, the event prefix, the game RNG, the pending night victim,
+and each agent's memory.
+
+Copy-on-write rules:
+- Event dicts and UsageRecords are never mutated after creation, so a
+  checkpoint holds a reference to the (append-only) parent lists plus a
+  length instead of copying them.
+- Agent memory is replaced wholesale on update, never mutated in place, so
+  memory dicts are shared by reference.
+- PlayerState is mutable (alive, observation cursor) and is copied.
+
+A fork replays nothing: the child's log starts with its own config row
+(carrying a ``lineage`` block) followed by the parent's prefix rows copied
+verbatim, each stamped with ``inherited_from``. Only the suffix makes new
+LLM calls, and inherited calls are excluded from the child's cost totals.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+from werewolf.engine.state import PlayerState
+from werewolf.log_files import iter_log_lines
+
+
+LINEAGE_SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class PhaseCheckpoint:
+    game_id: str
+    index: int
+    phase: str  # PHASE_ORDER entry about to run
+    phase_index: int
+    round: int
+    state_phase: str
+    players: tuple[PlayerState, ...]
+    rng_state: tuple
+    pending_victim_id: Optional[int]
+    memories: dict[int, dict]
+    event_count: int
+    log_path: str
+    log_records: int
+    ledger_count: int
+    # Shared, append-only parent containers; sliced by the counts above.
+    _events: list = field(repr=False, compare=False, default_factory=list)
+    _ledger: object = field(repr=False, compare=False, default=None)
+
+    @property
+    def events(self) -> list[dict]:
+        return self._events[:self.event_count]
+
+    def inherited_records(self) -> list:
+        """Parent UsageRecords made before this checkpoint, including any
+        the parent itself inherited."""
+        if self._ledger is None:
+            return []
+        return self._ledger.inherited_records + [
+            record for record in self._ledger.records[:self.ledger_count]
+            if record.context.game_id == self.game_id
+        ]
+
+    def role_map(self) -> dict[str, dict]:
+        return {
+            str(p.id): {"role": p.role, "team": p.team}
+            for p in sorted(self.players, key=lambda p: p.id)
+        }
+
+    def to_json_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "phase": self.phase,
+            "round": self.round,
+            "event_count": self.event_count,
+            "log_records": self.log_records,
+        }
+
+
+def capture_checkpoint(engine, phase: str) -> PhaseCheckpoint:
+    return PhaseCheckpoint(
+        game_id=engine.state.game_id,
+        index=len(engine.checkpoints),
+        phase=phase,
+        phase_index=engine.PHASE_ORDER.index(phase),
+        round=engine.state.round,
+        state_phase=engine.state.phase,
+        players=tuple(replace(p) for _, p in sorted(engine.players.items())),
+        rng_state=engine.rng.getstate(),
+        pending_victim_id=engine._pending_victim_id,
+        memories={pid: agent.memory for pid, agent in engine.agents.items()},
+        event_count=len(engine.state.events),
+        log_path=engine.logger.filepath,
+        log_records=engine.logger.records_written,
+        ledger_count=engine.ledger.count(),
+        _events=engine.state.events,
+        _ledger=engine.ledger,
+    )
+
+
+def read_prefix_rows(checkpoint: PhaseCheckpoint) -> list[dict]:
+    """Parent event and llm_call rows written before the checkpoint, in
+    their original interleaving."""
+    rows = []
+    for line_number, line in enumerate(iter_log_lines(checkpoint.log_path)):
+        if line_number >= checkpoint.log_records:
+            break
+        row = json.loads(line)
+        if row.get("type") in ("event", "llm_call"):
+            rows.append(row)
+    return rows
+
+
+def lineage_dict(checkpoint: PhaseCheckpoint, prefix_rows: list[dict]) -> dict:
+    return {
+        "lineage_schema_version": LINEAGE_SCHEMA_VERSION,
+        "parent_game_id": checkpoint.game_id,
+        "checkpoint": checkpoint.to_json_dict(),
+        "inherited_events": sum(
+            1 for row in prefix_rows if row.get("type") == "event"
+        ),
+        "inherited_llm_calls": sum(
+            1 for row in prefix_rows if row.get("type") == "llm_call"
+        ),
+    }
+
+
+__all__ = [
+    "LINEAGE_SCHEMA_VERSION", "PhaseCheckpoint", "capture_checkpoint",
+    "lineage_dict", "read_prefix_rows",
+]
@@ -257,3 +257,14 @@ def create_belief_snapshot_event(
         speaker_id=player_id,
         source_call_id=source_call_id,
     )
+
+
+def create_belief_sample_event(game_state, payload: dict) -> dict:
+    """Moderator-only design record of a sampled belief checkpoint (see
+    werewolf/engine/belief_sampling.py)."""
+    return create_event(
+        game_state,
+        event_type="belief_sample",
+        channel="moderator_only",
+        payload=payload,
+    )
@@ -19,6 +19,7 @@ from werewolf.engine.events import (
     create_win_event,
     create_game_status_event,
     create_belief_snapshot_event,
+    create_belief_sample_event,
 )
 from werewolf.engine.beliefs import (
     BELIEF_SCHEMA_VERSION,
@@ -26,22 +27,58 @@ from werewolf.engine.beliefs import (
     CHECKPOINT_PRE,
     parse_belief_snapshot,
 )
+from werewolf.engine.belief_sampling import BeliefSampling
 from werewolf.engine.visibility import build_observation, update_player_seen_index
 from werewolf.engine.validate import validate_action, get_fallback_action, _to_int
-from werewolf.engine.logging import LOG_SCHEMA_VERSION, JSONLLogger, ConsoleTranscript
+from werewolf.engine.logging import (
+    DURABILITY_RECORD,
+    LOG_SCHEMA_VERSION,
+    ConsoleTranscript,
+    JSONLLogger,
+)
+from werewolf.engine.bus import EventBus, EventMetrics
+from werewolf.engine.log_writer import AsyncLogWriter
+from werewolf.engine.memory import MemoryTracker
+from werewolf.log_files import COMPRESSION_NONE
+from werewolf.engine.checkpoint import (
+    PhaseCheckpoint,
+    capture_checkpoint,
+    lineage_dict,
+    read_prefix_rows,
+)
 from werewolf.roles.assign import assign_roles
 from werewolf.agents.ai_agent import AIAgent, create_agents
-from werewolf.agents.prompts import get_prompt_version
+from werewolf.agents.prompts import (
+    PROMPT_LAYOUT_LEGACY,
+    PROMPT_LAYOUTS,
+    PROMPT_RENDER_VERBOSE,
+    PROMPT_RENDERS,
+    RESPONSE_PROTOCOL_FULL,
+    RESPONSE_PROTOCOLS,
+    get_prompt_version,
+    prompt_layout_dict,
+    prompt_render_dict,
+    response_protocol_dict,
+)
+from werewolf.agents.rendering import EventRenderCache
+from werewolf.agents.scripted import ROLES, resolve_role_agents
+from werewolf.engine.timing import PhaseTimer
 from werewolf.engine.limits import (
     PUBLIC_MESSAGE_MAX_CHARS,
     WOLF_MESSAGE_MAX_CHARS,
     limits_dict,
     truncate_text,
 )
+from werewolf.llm.hedging import HedgePolicy, HedgingProvider, LatencyTracker
 from werewolf.llm.ledger import UsageLedger
+from werewolf.llm.output_caps import OutputCapTable
+from werewolf.llm.preflight import TokenCalibration, TokenRateLimiter, preflight_for
 from werewolf.llm.provider import GenerationConfig
 from werewolf.llm.records import utc_now_iso
+from werewolf.llm.retry import RetryBudget, RetryPolicy
+from werewolf.llm.streaming import STREAM_MODES, STREAM_OFF
 from werewolf.reporting.runtime import collect_runtime_metadata
+from werewolf.tracing import NULL_TRACER
 
 _CODE_COMMIT = None
 
@@ -99,13 +136,142 @@ class GameEngine:
         role_models: dict = None,
         role_providers: dict = None,
         allow_provider_fallback: bool = False,
+        checkpoint: PhaseCheckpoint = None,
+        subscribers: list = None,
+        log_durability: str = DURABILITY_RECORD,
+        log_writer: AsyncLogWriter = None,
+        log_compression: str = COMPRESSION_NONE,
+        role_agents: dict = None,
+        tracer=None,
+        memory_tracking: bool = False,
+        prompt_layout: str = PROMPT_LAYOUT_LEGACY,
+        prompt_render: str = PROMPT_RENDER_VERBOSE,
+        response_protocol: str = RESPONSE_PROTOCOL_FULL,
+        streaming: str = STREAM_OFF,
+        retry_policy: RetryPolicy = None,
+        hedging: HedgePolicy = None,
+        output_caps: OutputCapTable = None,
+        token_calibration: TokenCalibration = None,
+        rate_limiter: TokenRateLimiter = None,
+        belief_sampling: BeliefSampling = None,
     ):
         """role_models: optional {"werewolf": <alias-or-model-id>,
         "villager": ..., "seer": ...} for heterogeneous games (separates
         deception production from detection). Roles omitted fall back to
         the villager entry; providers/keys are resolved per role via the
         registry. role_providers injects pre-built providers per role
-        (tests / advanced callers) and takes precedence."""
+        (tests / advanced callers) and takes precedence.
+
+        checkpoint: resume from a parent game's phase checkpoint as a
+        counterfactual child (see werewolf/engine/checkpoint.py). Prefer
+        GameEngine.fork(), which carries the parent's settings over.
+
+        subscribers: extra event-bus consumers (callables or
+        werewolf.engine.bus.Subscriber specs), registered before the config
+        row is published so they observe the whole game.
+
+        log_durability: JSONL crash-safety level, one of
+        werewolf.engine.logging.DURABILITY_LEVELS (recorded in the config
+        row as log_durability).
+
+        log_writer: optional shared AsyncLogWriter that serializes and
+        writes this game's log on a background thread. The caller owns it
+        (forks reuse it) and closes it after its games are closed.
+
+        log_compression: none, gzip or zstd; the log is then written as
+        <game_id>.jsonl.gz / .jsonl.zst (see werewolf/log_files.py).
+
+        role_agents: optional {"werewolf": "quiet_hunter", ...} replacing
+        those roles' LLM agents with rule-based scripted agents (policy
+        names or ScriptedAgent subclasses, see werewolf/agents/scripted.py).
+        When every role is scripted no provider is needed.
+
+        tracer: optional werewolf.tracing.Tracer shared with forks; game,
+        phase and agent spans are recorded on it.
+
+        memory_tracking: log a ``memory`` row with tracemalloc peak and
+        retained bytes, per-phase samples and top allocation sites (see
+        werewolf/engine/memory.py). Slow; off by default.
+
+        prompt_layout: how LLM agents lay out requests, one of
+        werewolf.agents.prompts.PROMPT_LAYOUTS; "cache" orders them for
+        provider prompt caching, "chat" keeps a conversation per agent
+        and sends per-turn deltas. Logged in the config row and folded
+        into prompt_version.
+
+        prompt_render: one of werewolf.agents.prompts.PROMPT_RENDERS;
+        "compact" sends minified memory and short event lines and keeps
+        per-call rules in the system prompt. Logged in the config row
+        and folded into prompt_version, so the two renderings are never
+        pooled.
+
+        response_protocol: one of werewolf.agents.prompts.RESPONSE_PROTOCOLS;
+        "lean" asks for bare targets, plain-string messages and optional,
+        capped thoughts, cutting output tokens. Lean games record less
+        reasoning, so the protocol is logged in the config row (with its
+        thought caps), reported in validity metadata and folded into
+        prompt_version.
+
+        streaming: one of werewolf.llm.streaming.STREAM_MODES. "full"
+        streams every call to the end and records time-to-first-token
+        and time-to-object; "early_stop" also stops reading once the
+        JSON object is complete, at the price of estimated usage for
+        those calls. Logged in the config row.
+
+        retry_policy: werewolf.llm.retry.RetryPolicy (default
+        RetryPolicy()): per-category retries, backoff with jitter and
+        the game's retry budget, which all of its agents share. A fork
+        gets a fresh budget. Logged in the config row.
+
+        hedging: optional werewolf.llm.hedging.HedgePolicy. Every provider
+        is wrapped so a call slower than the recent percentile latency of
+        its (model, required_action) is sent again and the first answer
+        wins; latencies are tracked per game. Both attempts are logged
+        (hedged=True, the loser as hedge_lost). Logged in the config
+        row.
+
+        output_caps: optional werewolf.llm.output_caps.OutputCapTable of
+        max_output_tokens per (model, required_action), built offline by
+        werewolf.cli.output_caps. Its hash and caps go in the config
+        row.
+
+        token_calibration: optional werewolf.llm.preflight.TokenCalibration
+        (per-family scales from werewolf.cli.calibrate_tokens) for the
+        estimate every request gets before it is sent; with the model's
+        context window (registry, else the provider's model info) it
+        lets agents refuse prompts that cannot fit. The resolved settings
+        per role are logged in the config row (preflight).
+
+        rate_limiter: optional werewolf.llm.preflight.TokenRateLimiter,
+        normally shared by every game of a batch (forks reuse it);
+        agents wait on it before each request.
+
+        belief_sampling: optional werewolf.engine.belief_sampling.
+        BeliefSampling; pre-discussion snapshots are then taken only in
+        every k-th round, for a seeded subset of observers and/or the
+        first N rounds, and each checkpoint logs its design. Logged in
+        the config row; a census policy is the same as none."""
+        self._settings = {
+            "n_players": n_players, "n_wolves": n_wolves, "n_seers": n_seers,
+            "seed": seed, "output_dir": output_dir, "api_key": api_key,
+            "model": model, "show_all_channels": show_all_channels,
+            "show_prompts": show_prompts,
+            "transcript_enabled": transcript_enabled, "provider": provider,
+            "model_alias": model_alias, "batch_id": batch_id,
+            "trial_index": trial_index, "belief_snapshots": belief_snapshots,
+            "discussion_cycles": discussion_cycles,
+            "role_models": role_models, "role_providers": role_providers,
+            "allow_provider_fallback": allow_provider_fallback,
+            "log_durability": log_durability, "log_writer": log_writer,
+            "log_compression": log_compression, "role_agents": role_agents,
+            "tracer": tracer, "memory_tracking": memory_tracking,
+            "prompt_layout": prompt_layout, "prompt_render": prompt_render,
+            "response_protocol": response_protocol, "streaming": streaming,
+            "retry_policy": retry_policy, "hedging": hedging,
+            "output_caps": output_caps,
+            "token_calibration": token_calibration, "rate_limiter": rate_limiter,
+            "belief_sampling": belief_sampling,
+        }
         self.n_players = n_players
         self.n_wolves = n_wolves
         self.n_seers = n_seers
@@ -119,7 +285,35 @@ class GameEngine:
                 raise ValueError(f"Unknown roles in role_models: {sorted(unknown)}")
             if "villager" not in role_models:
                 raise ValueError('role_models requires at least a "villager" entry')
+        scripted_classes = resolve_role_agents(role_agents or {})
+        all_scripted = set(scripted_classes) == set(ROLES)
         self.belief_snapshots = belief_snapshots
+        self.belief_sampling = (
+            belief_sampling
+            if belief_snapshots and belief_sampling and not belief_sampling.census
+            else None
+        )
+        if prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt_layout: {prompt_layout!r}")
+        self.prompt_layout = prompt_layout
+        if prompt_render not in PROMPT_RENDERS:
+            raise ValueError(f"Unknown prompt_render: {prompt_render!r}")
+        self.prompt_render = prompt_render
+        if response_protocol not in RESPONSE_PROTOCOLS:
+            raise ValueError(f"Unknown response_protocol: {response_protocol!r}")
+        self.response_protocol = response_protocol
+        if streaming not in STREAM_MODES:
+            raise ValueError(f"Unknown streaming mode: {streaming!r}")
+        self.streaming = streaming
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_budget = RetryBudget(self.retry_policy.game_budget)
+        self.hedging = hedging
+        self.hedge_tracker = LatencyTracker(hedging) if hedging is not None else None
+        self.output_caps = output_caps
+        self.token_calibration = token_calibration
+        self.rate_limiter = rate_limiter
+        self.preflight_resolved: dict = {}
+        self.render_cache = EventRenderCache(prompt_render)
         from werewolf.llm.registry import build_provider, effective_generation_config, resolve
 
         requested_generation = generation_config or GenerationConfig()
@@ -144,7 +338,18 @@ class GameEngine:
 
         self.rng = random.Random(seed)
         self.players = assign_roles(n_players, n_wolves, self.rng, n_seers=n_seers)
+        if checkpoint is not None:
+            expected_roles = {
+                str(pid): {"role": p.role, "team": p.team}
+                for pid, p in sorted(self.players.items())
+            }
+            if checkpoint.role_map() != expected_roles:
+                raise ValueError(
+                    "Checkpoint does not match this game's seed and role assignment"
+                )
 
+        self._memory = MemoryTracker() if memory_tracking else None
+        self.memory_report: Optional[dict] = None
         self.state = GameState(
             seed=seed,
             round=0,
@@ -158,22 +363,41 @@ class GameEngine:
             rng=self.rng
         )
 
-        self.logger = JSONLLogger(output_dir, self.state.game_id)
+        self.logger = JSONLLogger(
+            output_dir, self.state.game_id, durability=log_durability,
+            writer=log_writer, compression=log_compression,
+        )
+        self.bus = EventBus()
+        self.metrics = EventMetrics()
+        self.timings: Counter = Counter()
+        self._phase_timer: Optional[PhaseTimer] = None
+        self.tracer = tracer or NULL_TRACER
+        self._phase_span = None
         try:
-            self.ledger = ledger or UsageLedger(sink=self.logger.log_llm_call)
+            self.bus.subscribe(self.logger.handle, name="jsonl")
+            self.bus.subscribe(self.metrics, name="metrics")
+            self.ledger = ledger or UsageLedger(sink=self._publish_llm_call)
             run_context = {
                 "game_id": self.state.game_id,
                 "seed": seed,
                 "batch_id": batch_id,
                 "trial_index": trial_index,
-                "prompt_version": get_prompt_version(),
+                "prompt_version": get_prompt_version(
+                    self.prompt_layout, self.prompt_render,
+                    self.response_protocol,
+                ),
             }
         except Exception:
             self.close()
             raise
         self.role_models_resolved = None
         try:
-            if role_models:
+            if all_scripted:
+                self.model = "scripted"
+                self.generation_config = self.requested_generation_config
+                self.agents = {}
+                self.role_models_resolved = {}
+            elif role_models:
                 self.agents, self.role_models_resolved = self._create_role_agents(
                     role_models, role_providers or {}, show_prompts, run_context,
                 )
@@ -194,6 +418,11 @@ class GameEngine:
                         "Provider is unavailable; set allow_provider_fallback=True "
                         "only for explicit fallback tests."
                     )
+                preflight = preflight_for(spec, selected_provider, token_calibration)
+                self.preflight_resolved = {
+                    role: preflight.to_json_dict() for role in ("werewolf", "villager", "seer")
+                }
+                selected_provider = self._hedged(selected_provider)
                 self.generation_config = effective_generation_config(
                     self.requested_generation_config, spec, self.reasoning_override,
                 )
@@ -204,6 +433,18 @@ class GameEngine:
                     run_context=run_context,
                     model_alias=model_alias,
                     generation=self.generation_config,
+                    timings=self.timings,
+                    tracer=self.tracer,
+                    prompt_layout=self.prompt_layout,
+                    render_cache=self.render_cache,
+                    prompt_render=self.prompt_render,
+                    response_protocol=self.response_protocol,
+                    streaming=self.streaming,
+                    retry_policy=self.retry_policy,
+                    retry_budget=self.retry_budget,
+                    output_caps=self.output_caps,
+                    preflight=preflight,
+                    rate_limiter=self.rate_limiter,
                 )
                 assignment = {
                     "alias": spec.alias,
@@ -217,20 +458,38 @@ class GameEngine:
                     role: {**assignment, "active": role != "seer" or n_seers > 0}
                     for role in ("werewolf", "villager", "seer")
                 }
+            self._install_scripted_agents(scripted_classes, run_context)
         except Exception:
+            self.bus.close()
             self.logger.close()
+            if self._memory is not None:
+                self._memory.close()
             self._closed = True
             raise
         try:
             self.transcript = ConsoleTranscript(
                 show_all=show_all_channels,
-                enabled=transcript_enabled
+                enabled=transcript_enabled,
+                players=self.players,
             )
+            if transcript_enabled:
+                self.bus.subscribe(
+                    self.transcript.handle, topics={"event"}, name="transcript",
+                )
+            for subscriber in subscribers or ():
+                self.bus.subscribe(subscriber)
 
             self._phase_index = 0
             self._pending_victim_id: Optional[int] = None
-
-            self.logger.log_config({
+            self.checkpoints: list[PhaseCheckpoint] = []
+            self.lineage = None
+            prefix_rows = []
+            if checkpoint is not None:
+                prefix_rows = read_prefix_rows(checkpoint)
+                self.lineage = lineage_dict(checkpoint, prefix_rows)
+                self._restore_checkpoint(checkpoint)
+
+            self.bus.publish("config", {
                 "created_at": utc_now_iso(),
                 "log_schema_version": LOG_SCHEMA_VERSION,
                 "runtime": collect_runtime_metadata(),
@@ -241,10 +500,26 @@ class GameEngine:
                 "model": self.model,
                 "model_alias": model_alias,
                 "prompt_version": run_context["prompt_version"],
+                "prompt_layout": prompt_layout_dict(self.prompt_layout),
+                "prompt_render": prompt_render_dict(self.prompt_render),
+                "response_protocol": response_protocol_dict(self.response_protocol),
+                "streaming": self.streaming,
+                "retry_policy": self.retry_policy.to_json_dict(),
+                "hedging": self.hedging.to_json_dict() if self.hedging else None,
+                "output_caps": (
+                    self.output_caps.config_dict() if self.output_caps else None
+                ),
+                "preflight": self.preflight_resolved or None,
+                "rate_limit": (
+                    self.rate_limiter.to_json_dict() if self.rate_limiter else None
+                ),
                 "batch_id": batch_id,
                 "trial_index": trial_index,
                 "belief_snapshots": belief_snapshots,
                 "belief_schema_version": BELIEF_SCHEMA_VERSION if belief_snapshots else None,
+                "belief_sampling": (
+                    self.belief_sampling.to_json_dict() if self.belief_sampling else None
+                ),
                 "event_schema_version": EVENT_SCHEMA_VERSION,
                 "generation_config": self.generation_config.to_json_dict(),
                 "requested_generation_config": self.requested_generation_config.to_json_dict(),
@@ -252,6 +527,8 @@ class GameEngine:
                 "discussion_cycles": self.discussion_cycles,
                 "role_models": self.role_models_resolved,
                 "limits": limits_dict(),
+                "lineage": self.lineage,
+                "log_durability": self.logger.durability_dict(),
                 "code_commit": get_code_commit(),
                 "game_id": self.state.game_id,
                 "role_map": {
@@ -259,10 +536,88 @@ class GameEngine:
                     for pid, p in sorted(self.players.items())
                 },
             })
+            if checkpoint is not None:
+                for row in prefix_rows:
+                    self.bus.publish("inherited", {
+                        "row": row, "parent_game_id": checkpoint.game_id,
+                    })
+                self.ledger.inherit(checkpoint.inherited_records())
         except Exception:
             self.close()
             raise
 
+    def _restore_checkpoint(self, checkpoint: PhaseCheckpoint) -> None:
+        for player in checkpoint.players:
+            self.players[player.id] = replace(player)
+        self.state.events = list(checkpoint.events)
+        self.state.round = checkpoint.round
+        self.state.phase = checkpoint.state_phase
+        self.rng.setstate(checkpoint.rng_state)
+        self._phase_index = checkpoint.phase_index
+        self._pending_victim_id = checkpoint.pending_victim_id
+        for pid, memory in checkpoint.memories.items():
+            self.agents[pid].memory = memory
+
+    def fork(self, checkpoint, **overrides) -> "GameEngine":
+        """Start a counterfactual child game from one of this game's phase
+        checkpoints (a PhaseCheckpoint or its index).
+
+        The child shares the parent's prefix (events, LLM-call rows, agent
+        memories, RNG state) and runs only the suffix. Any constructor
+        argument may be overridden, typically role_models; overriding
+        role_models drops the parent's injected role_providers."""
+        if isinstance(checkpoint, int):
+            checkpoint = self.checkpoints[checkpoint]
+        if checkpoint.game_id != self.state.game_id:
+            raise ValueError("Checkpoint belongs to a different game")
+        settings = dict(self._settings)
+        settings.update(
+            generation_config=self.requested_generation_config,
+            reasoning_override=self.reasoning_override,
+        )
+        if "role_models" in overrides and "role_providers" not in overrides:
+            settings["role_providers"] = None
+        settings.update(overrides)
+        self.bus.flush()
+        self.logger.flush()
+        return GameEngine(**settings, checkpoint=checkpoint)
+
+    def _hedged(self, provider):
+        if provider is None or self.hedging is None:
+            return provider
+        return HedgingProvider(provider, self.hedging, self.hedge_tracker)
+
+    def _install_scripted_agents(
+        self, scripted_classes: dict, run_context: dict,
+    ) -> None:
+        """Replace the agents of scripted roles; they make no LLM calls,
+        so their role_models entry names the policy instead of a model.
+        They share the ledger only to record fallbacks for invalid moves."""
+        wolf_roster = [p.id for p in self.players.values()
+                       if p.role == "werewolf"]
+        for pid, player in self.players.items():
+            agent_cls = scripted_classes.get(player.role)
+            if agent_cls is None:
+                continue
+            self.agents[pid] = agent_cls(
+                player_id=pid,
+                role=player.role,
+                team=player.team,
+                wolf_roster=wolf_roster if player.role == "werewolf" else None,
+                ledger=self.ledger,
+                run_context=run_context,
+            )
+        for role, agent_cls in scripted_classes.items():
+            self.preflight_resolved.pop(role, None)
+            self.role_models_resolved[role] = {
+                "requested": f"scripted:{agent_cls.policy}",
+                "model": None,
+                "alias": None,
+                "provider": "scripted",
+                "scripted_policy": agent_cls.policy,
+                "active": role != "seer" or self.n_seers > 0,
+            }
+
     def _create_role_agents(
         self, role_models: dict, role_providers: dict,
         show_prompts: bool, run_context: dict,
@@ -317,6 +672,19 @@ class GameEngine:
                 "active": role != "seer" or self.n_seers > 0,
             }
 
+        preflights = {
+            role: preflight_for(specs[role], providers[role], self.token_calibration)
+            for role in providers
+        }
+        self.preflight_resolved = {
+            role: preflight.to_json_dict() for role, preflight in preflights.items()
+        }
+        hedged = {}
+        for role, selected in providers.items():
+            if id(selected) not in hedged:
+                hedged[id(selected)] = self._hedged(selected)
+            providers[role] = hedged[id(selected)]
+
         wolf_roster = [p.id for p in self.players.values()
                        if p.role == "werewolf"]
         agents = {}
@@ -338,6 +706,18 @@ class GameEngine:
                     spec,
                     self.reasoning_override,
                 ),
+                timings=self.timings,
+                tracer=self.tracer,
+                prompt_layout=self.prompt_layout,
+                render_cache=self.render_cache,
+                prompt_render=self.prompt_render,
+                response_protocol=self.response_protocol,
+                streaming=self.streaming,
+                retry_policy=self.retry_policy,
+                retry_budget=self.retry_budget,
+                output_caps=self.output_caps,
+                preflight=preflights[player.role],
+                rate_limiter=self.rate_limiter,
             )
         # There is no single effective configuration in a heterogeneous game.
         self.generation_config = self.requested_generation_config
@@ -346,21 +726,22 @@ class GameEngine:
     def run(self) -> str:
         self.transcript.print_role_reveal(self.players)
 
-        while self.state.winner is None:
-            self.state.round += 1
-            self._run_night()
-
-            winner = self.state.check_win_condition()
-            if winner:
-                self._end_game(winner)
-                break
-
-            self._run_day()
-
-            winner = self.state.check_win_condition()
-            if winner:
-                self._end_game(winner)
-                break
+        with self.tracer.span(
+            "game", game_id=self.state.game_id, seed=self.seed,
+            trial_index=self._settings["trial_index"],
+        ) as span:
+            try:
+                while self.state.winner is None:
+                    phase_name = self.PHASE_ORDER[self._phase_index]
+                    self._begin_phase(phase_name)
+                    self._run_phase(phase_name)
+                    self._end_phase_timing()
+                    self._phase_index = (self._phase_index + 1) % len(self.PHASE_ORDER)
+            except BaseException as exc:
+                self._end_phase_span(exc)
+                self._flush_logs()
+                raise
+            span.set(winner=self.state.winner, rounds=self.state.round)
 
         self.close()
         return self.state.winner
@@ -370,15 +751,23 @@ class GameEngine:
         if self.state.winner is not None:
             self.close()
             return {"done": True, "winner": self.state.winner}
+        try:
+            return self._step_phase()
+        except BaseException as exc:
+            self._end_phase_span(exc)
+            self._flush_logs()
+            raise
+
+    def _step_phase(self) -> dict:
         while True:
             event_start_idx = len(self.state.events)
             phase_name = self.PHASE_ORDER[self._phase_index]
+            self._begin_phase(phase_name)
             should_return_phase = True
 
             if phase_name == "night_wolf_chat":
                 self.state.round += 1
                 self._set_phase("night_wolf_chat")
-                self.transcript.print_phase_header(self.state.round, self.state.phase)
                 self._wolf_chat()
 
             elif phase_name == "night_wolf_kill":
@@ -398,7 +787,6 @@ class GameEngine:
 
             elif phase_name == "day_announce":
                 self._set_phase("day_announce")
-                self.transcript.print_phase_header(self.state.round, self.state.phase)
                 self._log_game_status()
                 winner = self.state.check_win_condition()
                 if winner:
@@ -426,6 +814,7 @@ class GameEngine:
                 if winner:
                     self._end_game(winner)
 
+            self._end_phase_timing()
             self._phase_index = (self._phase_index + 1) % len(self.PHASE_ORDER)
             if not should_return_phase:
                 continue
@@ -468,7 +857,7 @@ class GameEngine:
         observed: dict[str, set[str]] = {
             "werewolf": set(), "villager": set(), "seer": set(),
         }
-        for record in self.ledger.records:
+        for record in self.ledger.inherited_records + self.ledger.records:
             if record.resolved_model and record.context.player_role in observed:
                 observed[record.context.player_role].add(record.resolved_model)
         return {role: sorted(models) for role, models in observed.items()}
@@ -477,51 +866,121 @@ class GameEngine:
         """Release game resources. Safe to call more than once."""
         if self._closed:
             return
+        self.bus.close()
         self.logger.close()
+        if self._memory is not None:
+            self._memory.close()
         self._closed = True
 
-    def _run_night(self):
-        self._set_phase("night_wolf_chat")
-        self.transcript.print_phase_header(self.state.round, self.state.phase)
-        self._wolf_chat()
-
-        self._set_phase("night_wolf_kill")
-        victim_id = self._wolf_kill_vote()
-
-        seer = self.state.get_seer()
-        if seer and seer.alive:
-            self._set_phase("night_seer")
-            self._seer_divine(seer.id)
+    def _flush_logs(self) -> None:
+        """Commit buffered log rows after a failure so a crashed game's log
+        is as complete as the chosen durability level promises."""
+        if self._closed:
+            return
+        self.bus.flush()
+        self.logger.flush()
 
-        if victim_id is not None:
-            self._kill_player(victim_id, "wolf_kill")
+    def _publish_event(self, event: dict) -> None:
+        self.bus.publish("event", event)
 
-    def _run_day(self):
-        self._set_phase("day_announce")
-        self.transcript.print_phase_header(self.state.round, self.state.phase)
-        self._log_game_status()
+    def _publish_llm_call(self, record: dict) -> None:
+        self.bus.publish("llm_call", record)
 
-        if self.belief_snapshots:
-            # No _set_phase(): that would log a PUBLIC phase_change event,
-            # making instrumented games observably different to players.
-            self.state.phase = "day_assess"
-            self._collect_belief_snapshots(CHECKPOINT_PRE)
+    def _begin_phase(self, phase_name: str) -> None:
+        self._end_phase_timing()
+        self._phase_timer = PhaseTimer(
+            phase_name, self.timings, self.bus.inline_handler_ns(),
+            self._queue_wait_ns(), len(self.ledger.records),
+        )
+        self._phase_span = self.tracer.span(
+            "phase", game_id=self.state.game_id, phase=phase_name,
+        ).__enter__()
+        checkpoint = capture_checkpoint(self, phase_name)
+        self.checkpoints.append(checkpoint)
+        self.bus.publish("phase_boundary", {
+            "game_id": self.state.game_id,
+            "round": self.state.round,
+            "phase": phase_name,
+            "checkpoint_index": checkpoint.index,
+        })
 
-        self._set_phase("day_discuss")
-        self._day_discussion()
+    def _queue_wait_ns(self) -> int:
+        return self.bus.queue_wait_ns() + self.logger.queue_wait_ns
 
-        self._set_phase("day_vote")
-        eliminated_id = self._day_vote()
+    def _end_phase_timing(self) -> None:
+        """Log the open phase's timing row (werewolf/engine/timing.py)."""
+        timer, self._phase_timer = self._phase_timer, None
+        if timer is None:
+            return
+        self.bus.publish("timing", timer.row(
+            self.state.round, self.timings, self.bus.inline_handler_ns(),
+            self._queue_wait_ns(), self.ledger.records[timer.first_record:],
+        ))
+        if self._memory is not None:
+            self._memory.phase_end(self.state.round, timer.phase)
+        self._end_phase_span()
+
+    def _end_phase_span(self, exc: BaseException = None) -> None:
+        span, self._phase_span = self._phase_span, None
+        if span is None:
+            return
+        span.set(round=self.state.round)
+        span.__exit__(type(exc) if exc else None, exc, None)
+
+    def _run_phase(self, phase_name: str):
+        """Batch-mode phase step used by run(). The wolf victim dies after
+        the seer acts and the win check follows the night, before any day
+        event is logged; run_next_phase() keeps the web UI's own ordering."""
+        if phase_name == "night_wolf_chat":
+            self.state.round += 1
+            self._set_phase("night_wolf_chat")
+            self._wolf_chat()
+
+        elif phase_name == "night_wolf_kill":
+            self._set_phase("night_wolf_kill")
+            self._pending_victim_id = self._wolf_kill_vote()
+
+        elif phase_name == "night_seer":
+            seer = self.state.get_seer()
+            if seer and seer.alive:
+                self._set_phase("night_seer")
+                self._seer_divine(seer.id)
+            if self._pending_victim_id is not None:
+                self._kill_player(self._pending_victim_id, "wolf_kill")
+                self._pending_victim_id = None
+            winner = self.state.check_win_condition()
+            if winner:
+                self._end_game(winner)
 
-        if eliminated_id is not None:
-            self._kill_player(eliminated_id, "vote_elimination")
+        elif phase_name == "day_announce":
+            self._set_phase("day_announce")
+            self._log_game_status()
 
-        self._log_game_status()
+        elif phase_name == "day_assess":
+            if self.belief_snapshots:
+                # No _set_phase(): that would log a PUBLIC phase_change event,
+                # making instrumented games observably different to players.
+                self.state.phase = "day_assess"
+                self._collect_belief_snapshots(CHECKPOINT_PRE)
+
+        elif phase_name == "day_discuss":
+            self._set_phase("day_discuss")
+            self._day_discussion()
+
+        elif phase_name == "day_vote":
+            self._set_phase("day_vote")
+            eliminated_id = self._day_vote()
+            if eliminated_id is not None:
+                self._kill_player(eliminated_id, "vote_elimination")
+            self._log_game_status()
+            winner = self.state.check_win_condition()
+            if winner:
+                self._end_game(winner)
 
     def _set_phase(self, phase: str):
         self.state.phase = phase
         event = create_phase_event(self.state, phase)
-        self.logger.log_event(event)
+        self._publish_event(event)
 
     def _wolf_chat(self):
         alive_wolves = self.state.get_alive_wolves()
@@ -535,8 +994,7 @@ class GameEngine:
                     self.state, wolf.id, response["thought"],
                     source_call_id=source_call_id,
                 )
-                self.logger.log_event(event)
-                self.transcript.print_event(event, self.players)
+                self._publish_event(event)
 
             if response.get("say") and response["say"].get("werewolf"):
                 text, truncated_from = truncate_text(
@@ -547,8 +1005,7 @@ class GameEngine:
                     truncated_from=truncated_from,
                     source_call_id=source_call_id,
                 )
-                self.logger.log_event(event)
-                self.transcript.print_event(event, self.players)
+                self._publish_event(event)
 
             update_player_seen_index(self.state, wolf.id)
 
@@ -566,8 +1023,7 @@ class GameEngine:
                     self.state, wolf.id, response["thought"],
                     source_call_id=source_call_id,
                 )
-                self.logger.log_event(event)
-                self.transcript.print_event(event, self.players)
+                self._publish_event(event)
 
             action = response.get("action", {})
             target = self._coerce_player_id(action.get("kill_target"))
@@ -590,7 +1046,7 @@ class GameEngine:
             self.state, victim_id, kill_votes,
             vote_source_call_ids=vote_source_call_ids,
         )
-        self.logger.log_event(event)
+        self._publish_event(event)
 
         return victim_id
 
@@ -604,8 +1060,7 @@ class GameEngine:
                 self.state, seer_id, response["thought"],
                 source_call_id=source_call_id,
             )
-            self.logger.log_event(event)
-            self.transcript.print_event(event, self.players)
+            self._publish_event(event)
 
         action = response.get("action", {})
         target_id = self._coerce_player_id(action.get("divine_target"))
@@ -617,8 +1072,7 @@ class GameEngine:
                 self.state, seer_id, target_id, is_werewolf,
                 source_call_id=source_call_id,
             )
-            self.logger.log_event(event)
-            self.transcript.print_event(event, self.players)
+            self._publish_event(event)
 
         update_player_seen_index(self.state, seer_id)
 
@@ -661,8 +1115,7 @@ class GameEngine:
                         source_call_id=source_call_id,
                         discussion_cycle=cycle,
                     )
-                    self.logger.log_event(event)
-                    self.transcript.print_event(event, self.players)
+                    self._publish_event(event)
 
                 if response.get("say") and response["say"].get("public"):
                     text, truncated_from = truncate_text(
@@ -678,8 +1131,7 @@ class GameEngine:
                         source_call_id=source_call_id,
                         discussion_cycle=cycle,
                     )
-                    self.logger.log_event(event)
-                    self.transcript.print_event(event, self.players)
+                    self._publish_event(event)
 
                 update_player_seen_index(self.state, player_id)
                 spoken.append(player_id)
@@ -691,8 +1143,19 @@ class GameEngine:
         no observation-cursor advance (players re-see the same events in
         their real turn), and no player-visible events. The public trace
         of an instrumented game must be identical to an uninstrumented
-        one (enforced by regression test)."""
-        for player in self.state.get_alive_players():
+        one (enforced by regression test).
+
+        Under a belief_sampling policy only the round's sampled observers
+        are asked; the design goes first, as a moderator-only event."""
+        players = self.state.get_alive_players()
+        if self.belief_sampling is not None:
+            design = self.belief_sampling.design_payload(
+                self.seed, self.state.round, [p.id for p in players],
+            )
+            self._publish_event(create_belief_sample_event(self.state, design))
+            sampled = set(design["sampled_ids"])
+            players = [p for p in players if p.id in sampled]
+        for player in players:
             observation = build_observation(self.state, player.id, "assess_beliefs")
             response = self._get_agent_action(
                 player.id, observation, update_memory=False
@@ -704,8 +1167,7 @@ class GameEngine:
                     self.state, player.id, response["thought"],
                     source_call_id=source_call_id,
                 )
-                self.logger.log_event(event)
-                self.transcript.print_event(event, self.players)
+                self._publish_event(event)
 
             self._emit_belief_snapshot(
                 player.id, response.get("beliefs"), checkpoint,
@@ -729,7 +1191,7 @@ class GameEngine:
             self.state, player_id, snapshot.to_payload(),
             source_call_id=source_call_id,
         )
-        self.logger.log_event(event)
+        self._publish_event(event)
 
     def _day_vote(self) -> Optional[int]:
         alive_players = self.state.get_alive_players()
@@ -745,8 +1207,7 @@ class GameEngine:
                     self.state, player.id, response["thought"],
                     source_call_id=source_call_id,
                 )
-                self.logger.log_event(event)
-                self.transcript.print_event(event, self.players)
+                self._publish_event(event)
 
             if self.belief_snapshots:
                 # Post-discussion snapshot rides inside the vote response;
@@ -765,8 +1226,7 @@ class GameEngine:
                     source_call_id=source_call_id,
                     vote_stage="main",
                 )
-                self.logger.log_event(event)
-                self.transcript.print_event(event, self.players)
+                self._publish_event(event)
 
             update_player_seen_index(self.state, player.id)
 
@@ -781,8 +1241,7 @@ class GameEngine:
             event = create_runoff_announcement_event(
                 self.state, candidates, dict(vote_counts)
             )
-            self.logger.log_event(event)
-            self.transcript.print_event(event, self.players)
+            self._publish_event(event)
 
             eliminated_id, final_vote_counts = self._runoff_vote(candidates)
             if eliminated_id is None:
@@ -795,8 +1254,7 @@ class GameEngine:
         event = create_elimination_event(
             self.state, eliminated_id, eliminated_role, final_vote_counts
         )
-        self.logger.log_event(event)
-        self.transcript.print_event(event, self.players)
+        self._publish_event(event)
 
         return eliminated_id
 
@@ -817,8 +1275,7 @@ class GameEngine:
                     self.state, player.id, response["thought"],
                     source_call_id=source_call_id,
                 )
-                self.logger.log_event(event)
-                self.transcript.print_event(event, self.players)
+                self._publish_event(event)
 
             action = response.get("action", {})
             target = self._coerce_player_id(action.get("vote_target"))
@@ -829,15 +1286,13 @@ class GameEngine:
                     source_call_id=source_call_id,
                     vote_stage="runoff",
                 )
-                self.logger.log_event(event)
-                self.transcript.print_event(event, self.players)
+                self._publish_event(event)
 
             update_player_seen_index(self.state, player.id)
 
         if not votes:
             event = create_no_elimination_event(self.state, candidates)
-            self.logger.log_event(event)
-            self.transcript.print_event(event, self.players)
+            self._publish_event(event)
             return None, {}
 
         vote_counts = Counter(votes.values())
@@ -848,8 +1303,7 @@ class GameEngine:
             return runoff_winners[0], dict(vote_counts)
 
         event = create_no_elimination_event(self.state, runoff_winners)
-        self.logger.log_event(event)
-        self.transcript.print_event(event, self.players)
+        self._publish_event(event)
         return None, {}
 
     def _kill_player(self, player_id: int, cause: str):
@@ -862,8 +1316,7 @@ class GameEngine:
         event = create_death_announcement_event(
             self.state, player_id, player.role, cause
         )
-        self.logger.log_event(event)
-        self.transcript.print_event(event, self.players)
+        self._publish_event(event)
 
     def _get_agent_action(
         self, player_id: int, observation: dict, update_memory: bool = True
@@ -893,16 +1346,28 @@ class GameEngine:
         alive_wolves = len(self.state.get_alive_wolves())
         alive_villagers = len(self.state.get_alive_villagers())
         event = create_game_status_event(self.state, alive_wolves, alive_villagers)
-        self.logger.log_event(event)
-        self.transcript.print_event(event, self.players)
+        self._publish_event(event)
 
     def _end_game(self, winner: str):
         self.state.winner = winner
         remaining = [p.id for p in self.state.get_alive_players()]
 
         event = create_win_event(self.state, winner, remaining)
-        self.logger.log_event(event)
-        self.transcript.print_event(event, self.players)
-
-        self.logger.log_usage_summary(self.ledger.game_summary())
-        self.logger.log_outcome(winner, self.state.round, remaining)
+        self._publish_event(event)
+        # The final phase's timing row goes before the terminal rows.
+        self._end_phase_timing()
+        if self.hedging is not None:
+            # Losing hedge attempts still running are waited for so the
+            # summary includes what they cost.
+            for agent in self.agents.values():
+                record_hedges = getattr(agent, "record_hedges", None)
+                if record_hedges is not None:
+                    record_hedges()
+        if self._memory is not None:
+            self.memory_report = self._memory.row()
+            self.bus.publish("memory", self.memory_report)
+
+        self.bus.publish("usage_summary", self.ledger.game_summary())
+        self.bus.publish("outcome", {
+            "winner": winner, "rounds": self.state.round, "remaining": remaining,
+        })
@@ -10,17 +10,41 @@ original length is recorded on the event); memory is truncated at
 render time only (stored memory stays intact). Structured belief fields
 are exempt - they are instrumentation, not gameplay bandwidth.
 
+Prompt context is bounded by an input budget per required_action, in
+estimated tokens (werewolf/llm/tokens.py) for the whole request: system
+prompt plus user message. Events fill whatever the rest of the prompt
+leaves, newest first, so ten long speeches and forty short votes cost
+the same and a long game can never outgrow the context window.
+
 An unconstrained-language condition can be run later by raising these in
 a dedicated, clearly-labeled commit (limits are logged per game).
 """
 from typing import Optional
 
-LIMITS_VERSION = 1
+from werewolf.llm.tokens import TOKEN_ESTIMATOR
+
+LIMITS_VERSION = 2
 
 PUBLIC_MESSAGE_MAX_CHARS = 800
 WOLF_MESSAGE_MAX_CHARS = 800
 MEMORY_MAX_CHARS = 2500
 
+# Night actions need less history than discussion and voting.
+DEFAULT_INPUT_TOKEN_BUDGET = 3000
+INPUT_TOKEN_BUDGETS = {
+    "wolf_chat": 3000,
+    "choose_wolf_kill": 3000,
+    "seer_divine": 3000,
+    "speak_public": 4000,
+    "assess_beliefs": 4000,
+    "vote": 4000,
+    "runoff_vote": 4000,
+}
+
+
+def input_token_budget(required_action: str) -> int:
+    return INPUT_TOKEN_BUDGETS.get(required_action, DEFAULT_INPUT_TOKEN_BUDGET)
+
 
 def truncate_text(text: str, limit: int) -> tuple[str, Optional[int]]:
     """Returns (possibly-truncated text, original length if truncated)."""
@@ -35,4 +59,7 @@ def limits_dict() -> dict:
         "public_message_max_chars": PUBLIC_MESSAGE_MAX_CHARS,
         "wolf_message_max_chars": WOLF_MESSAGE_MAX_CHARS,
         "memory_max_chars": MEMORY_MAX_CHARS,
+        "input_token_budgets": dict(INPUT_TOKEN_BUDGETS),
+        "default_input_token_budget": DEFAULT_INPUT_TOKEN_BUDGET,
+        "token_estimator": TOKEN_ESTIMATOR,
     }
@@ -0,0 +1,167 @@
+"""Background JSONL writer shared by concurrent games.
+
+A JSONLLogger built with ``writer=AsyncLogWriter(...)`` hands rows to a
+dedicated writer thread instead of serializing and writing them on the
+game thread. One writer serves any number of loggers (e.g. every game of
+a batch).
+
+Rules:
+- Ordering: one FIFO queue, so a game's rows reach its file in the order
+  they were logged.
+- Backpressure: the queue is bounded; a full queue blocks the logging
+  thread, it never drops rows or grows without limit.
+- Durability: the logger's level (see werewolf/engine/logging.py) is
+  applied on the writer thread. A logger's flush() and close() block
+  until its rows are written at that level.
+- Errors: a failed write is kept on its logger and re-raised on the
+  logging thread at that logger's next call; it is never silent.
+- Rows are handed over by reference and must not be mutated once logged
+  (events and usage records are immutable after creation).
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger("werewolf.log_writer")
+
+DEFAULT_QUEUE_SIZE = 4096
+
+_WRITE = "write"
+_COMMIT = "commit"
+_CLOSE = "close"
+_BARRIER = "barrier"
+_STOP = "stop"
+
+
+class AsyncLogWriter:
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1")
+        self.queue_size = queue_size
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self.records = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.put_wait_ns = 0
+        self.write_ns = 0
+        self.write_ns_max = 0
+        self.latency_ns = 0
+        self.latency_ns_max = 0
+        self._thread = threading.Thread(
+            target=self._run, name="jsonl-writer", daemon=True,
+        )
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Logging-thread side (called by JSONLLogger)
+    # ------------------------------------------------------------------
+
+    def write(self, log, row: dict) -> int:
+        """Queue a row; returns the nanoseconds spent blocked on a full queue."""
+        return self._put((_WRITE, log, row, time.perf_counter_ns()))
+
+    def commit(self, log) -> int:
+        return self._put((_COMMIT, log, None, time.perf_counter_ns()))
+
+    def close_log(self, log) -> None:
+        """Commit and close the logger's file; blocks until done."""
+        self._put((_CLOSE, log, None, time.perf_counter_ns()))
+        self.drain()
+
+    def drain(self) -> None:
+        """Block until everything queued so far has been processed."""
+        done = threading.Event()
+        self._put((_BARRIER, None, done, time.perf_counter_ns()))
+        done.wait()
+
+    def close(self) -> None:
+        """Drain the queue and stop the writer thread. Idempotent."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._put((_STOP, None, None, time.perf_counter_ns()))
+            self._closed = True
+        self._thread.join()
+
+    def _put(self, item: tuple) -> int:
+        if self._closed:
+            raise RuntimeError("AsyncLogWriter is closed")
+        started = time.perf_counter_ns()
+        self._queue.put(item)
+        waited = time.perf_counter_ns() - started
+        self.put_wait_ns += waited
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return waited
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            kind, log, payload, submitted_ns = self._queue.get()
+            try:
+                if kind == _STOP:
+                    return
+                if kind == _BARRIER:
+                    payload.set()
+                    continue
+                self._apply(kind, log, payload, submitted_ns)
+            finally:
+                self._queue.task_done()
+
+    def _apply(self, kind: str, log, payload, submitted_ns: int) -> None:
+        started = time.perf_counter_ns()
+        try:
+            if kind == _WRITE:
+                if log.writer_error is None:
+                    log._write_now(payload)
+            elif kind == _COMMIT:
+                if log.writer_error is None:
+                    log._commit_now()
+            elif kind == _CLOSE:
+                log._close_now()
+        except Exception as exc:
+            self.errors += 1
+            if log.writer_error is None:
+                log.writer_error = exc
+            logger.exception("Log write failed for %s", log.filepath)
+        finally:
+            finished = time.perf_counter_ns()
+            elapsed = finished - started
+            self.write_ns += elapsed
+            self.write_ns_max = max(self.write_ns_max, elapsed)
+            if kind == _WRITE:
+                latency = finished - submitted_ns
+                self.records += 1
+                self.latency_ns += latency
+                self.latency_ns_max = max(self.latency_ns_max, latency)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        records = self.records
+        return {
+            "queue_size": self.queue_size,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "records": records,
+            "errors": self.errors,
+            "put_wait_ms": self.put_wait_ns / 1e6,
+            "write_ms_total": self.write_ns / 1e6,
+            "write_ms_max": self.write_ns_max / 1e6,
+            "latency_ms_mean": (
+                self.latency_ns / records / 1e6 if records else None
+            ),
+            "latency_ms_max": self.latency_ns_max / 1e6,
+        }
+
+
+__all__ = ["AsyncLogWriter", "DEFAULT_QUEUE_SIZE"]
@@ -1,19 +1,102 @@
 import json
 import os
-from typing import TextIO
+
+from werewolf.log_files import (
+    COMPRESSION_NONE,
+    LogFileWriter,
+    check_compression,
+    log_filename,
+)
 
 
 LOG_SCHEMA_VERSION = 2
 
+# Durability levels, recorded in every config row (log_durability):
+# - record: flush every row to the OS as it is written (historical default)
+# - phase: buffer rows and group-commit them at phase boundaries
+# - phase_fsync: like phase, and fsync the file at each commit
+# Buffered levels also commit after the config row, on close, and whenever
+# the buffer reaches max_buffered_records, so a crash loses at most one
+# phase of rows and never more than max_buffered_records rows.
+DURABILITY_RECORD = "record"
+DURABILITY_PHASE = "phase"
+DURABILITY_PHASE_FSYNC = "phase_fsync"
+DURABILITY_LEVELS = (DURABILITY_RECORD, DURABILITY_PHASE, DURABILITY_PHASE_FSYNC)
+MAX_BUFFERED_RECORDS = 512
+
 
 class JSONLLogger:
-    def __init__(self, output_dir: str, game_id: str):
+    def __init__(
+        self, output_dir: str, game_id: str,
+        durability: str = DURABILITY_RECORD,
+        max_buffered_records: int = MAX_BUFFERED_RECORDS,
+        writer=None,
+        compression: str = COMPRESSION_NONE,
+    ):
+        """writer: optional werewolf.engine.log_writer.AsyncLogWriter;
+        rows are then serialized and written on its thread.
+
+        compression: none, gzip or zstd (see werewolf/log_files.py); each
+        commit ends a compressed block, so committed rows stay readable."""
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(
+                f"Unknown log durability {durability!r}; "
+                f"expected one of {DURABILITY_LEVELS}"
+            )
+        if max_buffered_records < 1:
+            raise ValueError("max_buffered_records must be >= 1")
+        check_compression(compression)
+        self.durability = durability
+        self.max_buffered_records = max_buffered_records
+        self.compression = compression
         os.makedirs(output_dir, exist_ok=True)
-        self.filepath = os.path.join(output_dir, f"{game_id}.jsonl")
-        self.file: TextIO = open(self.filepath, "w")
+        self.filepath = os.path.join(output_dir, log_filename(game_id, compression))
+        self.file = LogFileWriter(self.filepath, compression)
+        self.records_written = 0
+        self.commits = 0
+        self._buffer: list[str] = []
+        self.writer = writer
+        self.writer_error = None
+        # Time this logger's callers blocked on the async writer's queue.
+        self.queue_wait_ns = 0
+        self._closing = False
+
+    def durability_dict(self) -> dict:
+        return {
+            "level": self.durability,
+            "max_buffered_records": (
+                None if self.durability == DURABILITY_RECORD
+                else self.max_buffered_records
+            ),
+            "writer": "async" if self.writer is not None else "inline",
+            "compression": self.compression,
+        }
+
+    def handle(self, topic: str, payload: dict):
+        """Event-bus entry point (see werewolf/engine/bus.py)."""
+        if topic == "event":
+            self.log_event(payload)
+        elif topic == "llm_call":
+            self.log_llm_call(payload)
+        elif topic == "config":
+            self.log_config(payload)
+        elif topic == "usage_summary":
+            self.log_usage_summary(payload)
+        elif topic == "outcome":
+            self.log_outcome(**payload)
+        elif topic == "inherited":
+            self.log_inherited(payload["row"], payload["parent_game_id"])
+        elif topic == "timing":
+            self.log_timing(payload)
+        elif topic == "memory":
+            self.log_memory(payload)
+        elif topic == "phase_boundary":
+            self.commit()
 
     def log_config(self, config: dict):
         self._write({"type": "config", **config})
+        # A log without its config row is unusable; never leave it buffered.
+        self.commit()
 
     def log_event(self, event: dict):
         self._write({"type": "event", "event": event})
@@ -22,6 +105,20 @@ class JSONLLogger:
         """One line per LLM call attempt (schema in werewolf/llm/records.py)."""
         self._write({"type": "llm_call", **record})
 
+    def log_inherited(self, row: dict, parent_game_id: str):
+        """Copy a parent game's event/llm_call row into a forked child's
+        log. An existing inherited_from (a fork of a fork) is kept so the
+        link always points at the game that actually produced the row."""
+        self._write({**row, "inherited_from": row.get("inherited_from") or parent_game_id})
+
+    def log_timing(self, timing: dict):
+        """Wall-time breakdown of one phase (werewolf/engine/timing.py)."""
+        self._write({"type": "timing", **timing})
+
+    def log_memory(self, memory: dict):
+        """Per-game memory accounting (werewolf/engine/memory.py)."""
+        self._write({"type": "memory", **memory})
+
     def log_usage_summary(self, summary: dict):
         self._write({"type": "usage_summary", "usage": summary})
 
@@ -34,20 +131,100 @@ class JSONLLogger:
         })
 
     def _write(self, obj: dict):
-        if self.file.closed:
+        if self._closing:
             return
-        self.file.write(json.dumps(obj) + "\n")
-        self.file.flush()
+        self.records_written += 1
+        if self.writer is None:
+            self._write_now(obj)
+            return
+        self._raise_writer_error()
+        self.queue_wait_ns += self.writer.write(self, obj)
+
+    def commit(self):
+        """Group-commit buffered rows (one write + flush, and an fsync
+        under phase_fsync). A no-op at the per-record level."""
+        if self._closing:
+            return
+        if self.writer is None:
+            self._commit_now()
+            return
+        self._raise_writer_error()
+        self.queue_wait_ns += self.writer.commit(self)
+
+    def flush(self):
+        """Commit and, with a writer, block until this log is written."""
+        if self._closing:
+            return
+        self.commit()
+        if self.writer is not None:
+            self.writer.drain()
+            self._raise_writer_error()
+        else:
+            self.file.flush()
 
     def close(self):
-        if not self.file.closed:
+        if self._closing:
+            return
+        self._closing = True
+        if self.writer is None:
+            self._close_now()
+            return
+        self.writer.close_log(self)
+        self._raise_writer_error()
+
+    def _raise_writer_error(self):
+        if self.writer_error is not None:
+            error, self.writer_error = self.writer_error, None
+            raise error
+
+    # File operations; run inline or on the writer thread.
+
+    def _write_now(self, obj: dict):
+        if self.durability == DURABILITY_RECORD:
+            self.file.write(json.dumps(obj) + "\n")
+            self.file.flush()
+            return
+        self._buffer.append(json.dumps(obj))
+        if len(self._buffer) >= self.max_buffered_records:
+            self._commit_now()
+
+    def _commit_now(self):
+        if self.file.closed or not self._buffer:
+            return
+        self._buffer.append("")
+        self.file.write("\n".join(self._buffer))
+        self._buffer = []
+        self.file.flush()
+        if self.durability == DURABILITY_PHASE_FSYNC:
+            os.fsync(self.file.fileno())
+        self.commits += 1
+
+    def _close_now(self):
+        if self.file.closed:
+            return
+        try:
+            self._commit_now()
+        finally:
             self.file.close()
 
 
 class ConsoleTranscript:
-    def __init__(self, show_all: bool = True, enabled: bool = True):
+    def __init__(
+        self, show_all: bool = True, enabled: bool = True, players: dict = None,
+    ):
         self.show_all = show_all
         self.enabled = enabled
+        self.players = players if players is not None else {}
+
+    def handle(self, topic: str, event: dict):
+        """Event-bus entry point: day/night headers on the phase changes
+        that open them, then the event itself."""
+        if event.get("type") == "phase_change":
+            new_phase = (event.get("payload") or {}).get("new_phase")
+            if new_phase in ("night_wolf_chat", "day_announce"):
+                self.print_phase_header(event.get("round"), new_phase)
+            return
+        self.print_event(event, self.players)
 
     def print_phase_header(self, round_num: int, phase: str):
         if not self.enabled:
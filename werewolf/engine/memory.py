@@ -0,0 +1,157 @@
+"""Opt-in per-game memory accounting with tracemalloc, logged as one
+``memory`` row.
+
+    GameEngine(..., memory_tracking=True)
+
+    {"type": "memory", "memory_schema_version": 1, "peak_kb": 812.4,
+     "retained_kb": 301.2, "phases": [{"round": 1, "phase":
+     "night_wolf_chat", "current_kb": 120.5, "peak_kb": 160.0}, ...],
+     "top_sites": [{"site": "werewolf/engine/game.py:812", "size_kb": 80.1,
+     "count": 412}, ...]}
+
+Rules:
+- Sizes are Python heap bytes traced by tracemalloc, relative to the
+  moment the engine was constructed: current_kb / retained_kb is what the
+  game holds that it did not hold then, peak_kb the high-water mark
+  above that baseline. Resident memory (RSS) is a process property and is
+  measured by benchmarks/memory.py, not per game.
+- Phase boundaries only read tracemalloc's counters, which is cheap. The
+  two full snapshots (construction and game end) are diffed to find the
+  top allocation sites still alive, by retained size.
+- tracemalloc slows allocation-heavy code severalfold, so this is off by
+  default. A tracker starts tracing if nobody else has, and stops it when
+  the last tracker it started is closed; an outer tracemalloc user (a
+  benchmark, a test) is left alone. Peaks are reset at each phase
+  boundary, which also resets an outer user's peak.
+- The row is moderator-only bookkeeping, like timing rows: never an
+  event, never inherited by forks, written before usage_summary.
+"""
+from __future__ import annotations
+
+import threading
+import tracemalloc
+
+from werewolf.profiling import relative_path
+
+MEMORY_SCHEMA_VERSION = 1
+DEFAULT_TOP_SITES = 10
+
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_lock = threading.Lock()
+_owned_trackers = 0
+
+
+def _kb(n_bytes: int) -> float:
+    return round(n_bytes / 1024, 1)
+
+
+def _site(frame) -> str:
+    return f"{relative_path(frame.filename)}:{frame.lineno}"
+
+
+class MemoryTracker:
+    """tracemalloc accounting for one game; see row()."""
+
+    def __init__(self, top_sites: int = DEFAULT_TOP_SITES):
+        global _owned_trackers
+        self.top_sites = top_sites
+        with _lock:
+            self._owns_tracing = _owned_trackers > 0 or not tracemalloc.is_tracing()
+            if self._owns_tracing:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                _owned_trackers += 1
+        self._closed = False
+        self.phases: list[dict] = []
+        self._baseline = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        self._base_bytes = tracemalloc.get_traced_memory()[0]
+        self._peak_bytes = 0
+        tracemalloc.reset_peak()
+
+    def phase_end(self, round_number: int, phase: str) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        peak = max(peak - self._base_bytes, 0)
+        self._peak_bytes = max(self._peak_bytes, peak)
+        self.phases.append({
+            "round": round_number,
+            "phase": phase,
+            "current_kb": _kb(current - self._base_bytes),
+            "peak_kb": _kb(peak),
+        })
+
+    def row(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        self._peak_bytes = max(self._peak_bytes, peak - self._base_bytes)
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        diff = snapshot.compare_to(self._baseline, "lineno")
+        grown = sorted(
+            (stat for stat in diff if stat.size_diff > 0),
+            key=lambda stat: stat.size_diff, reverse=True,
+        )
+        return {
+            "memory_schema_version": MEMORY_SCHEMA_VERSION,
+            "peak_kb": _kb(self._peak_bytes),
+            "retained_kb": _kb(current - self._base_bytes),
+            "phases": self.phases,
+            "top_sites": [
+                {
+                    "site": _site(stat.traceback[0]),
+                    "size_kb": _kb(stat.size_diff),
+                    "count": stat.count_diff,
+                }
+                for stat in grown[:self.top_sites]
+            ],
+        }
+
+    def close(self) -> None:
+        global _owned_trackers
+        if self._closed:
+            return
+        self._closed = True
+        self._baseline = None
+        with _lock:
+            if not self._owns_tracing:
+                return
+            _owned_trackers -= 1
+            if _owned_trackers == 0:
+                tracemalloc.stop()
+
+
+def aggregate_memory(rows: list[dict], top_sites: int = DEFAULT_TOP_SITES) -> dict:
+    """Batch view of per-game memory rows: peak and retained KB (mean and
+    max) and the sites that retained the most across all games."""
+    rows = [row for row in rows if row]
+    if not rows:
+        return {"games": 0}
+    sites: dict[str, dict] = {}
+    for row in rows:
+        for site in row.get("top_sites", ()):
+            bucket = sites.setdefault(site["site"], {
+                "site": site["site"], "size_kb": 0.0, "count": 0, "games": 0,
+            })
+            bucket["size_kb"] = round(bucket["size_kb"] + site["size_kb"], 1)
+            bucket["count"] += site["count"]
+            bucket["games"] += 1
+    summary = {"games": len(rows)}
+    for field in ("peak_kb", "retained_kb"):
+        values = [row[field] for row in rows]
+        summary[field] = {
+            "mean": round(sum(values) / len(values), 1), "max": max(values),
+        }
+    summary["top_sites"] = sorted(
+        sites.values(), key=lambda site: site["size_kb"], reverse=True,
+    )[:top_sites]
+    return summary
+
+
+__all__ = [
+    "DEFAULT_TOP_SITES", "MEMORY_SCHEMA_VERSION", "MemoryTracker",
+    "aggregate_memory",
+]
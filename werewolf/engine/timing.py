@@ -0,0 +1,106 @@
+"""Per-phase wall-time breakdown, logged as ``timing`` rows.
+
+When a phase finishes, the engine logs one row for it:
+
+    {"type": "timing", "timing_schema_version": 3, "round": 2,
+     "phase": "day_vote", "wall_ms": 812.4, "calls": 9, "retries": 1,
+     "fallbacks": 0, "provider_latency_ms": 790, "provider_wall_ms": 795.1,
+     "prompt_build_ms": 3.2, "validation_ms": 0.4, "backoff_ms": 0.0,
+     "rate_limit_ms": 0.0, "log_ms": 6.0, "queue_wait_ms": 0.0, "engine_ms": 7.7}
+
+Rules:
+- Timing rows are moderator-only bookkeeping. They are never part of an
+  observation or of state.events, so event IDs, traces and seeded
+  replays are identical whether or not anyone reads them. Forks do not
+  inherit them; a child times only the phases it runs.
+- calls, retries, fallbacks and provider_latency_ms come from the
+  phase's llm_call records. provider_latency_ms sums what providers
+  reported; provider_wall_ms is the time agents spent inside
+  Provider.complete(). The two differ by client/SDK overhead.
+- backoff_ms is time agents slept before retries (werewolf/llm/retry.py).
+  rate_limit_ms is time they waited on the tokens-per-minute limiter
+  (werewolf/llm/preflight.py). retries leave out hedge losers, which
+  share their winner's attempt number.
+- log_ms is time spent in synchronous bus subscribers (the JSONL log
+  and anything else subscribed inline). queue_wait_ms is time blocked
+  on full queues (background subscribers, the async log writer); the
+  writer's share is also inside log_ms.
+- engine_ms is the remainder: wall time not spent in the provider,
+  prompt building, validation or logging (observation building, rule
+  checks, checkpoints, parsing, scripted agents).
+
+v2: added backoff_ms.
+v3: added rate_limit_ms; retries no longer count hedge losers.
+"""
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import Optional
+
+TIMING_SCHEMA_VERSION = 3
+
+# Counter keys agents add nanoseconds to (see AIAgent.timings).
+PROMPT_BUILD = "prompt_build"
+PROVIDER = "provider"
+VALIDATION = "validation"
+BACKOFF = "backoff"
+RATE_LIMIT = "rate_limit"
+
+
+def _ms(ns: int) -> float:
+    return round(ns / 1e6, 3)
+
+
+class PhaseTimer:
+    """Open timing window for one phase; see timing_row()."""
+
+    def __init__(self, phase: str, counters: Counter, log_ns: int,
+                 queue_wait_ns: int, first_record: int):
+        self.phase = phase
+        self.started_ns = time.perf_counter_ns()
+        self.counters = Counter(counters)
+        self.log_ns = log_ns
+        self.queue_wait_ns = queue_wait_ns
+        self.first_record = first_record
+
+    def row(self, round_number: int, counters: Counter, log_ns: int,
+            queue_wait_ns: int, records: list) -> dict:
+        wall_ns = time.perf_counter_ns() - self.started_ns
+        spent = {key: counters[key] - self.counters[key] for key in (
+            PROMPT_BUILD, PROVIDER, VALIDATION, BACKOFF, RATE_LIMIT,
+        )}
+        log_ns -= self.log_ns
+        api = [r for r in records if r.api_attempted]
+        latency: Optional[int] = None
+        if any(r.latency_ms is not None for r in api):
+            latency = sum(r.latency_ms or 0 for r in api)
+        engine_ns = wall_ns - sum(spent.values()) - log_ns
+        return {
+            "timing_schema_version": TIMING_SCHEMA_VERSION,
+            "round": round_number,
+            "phase": self.phase,
+            "wall_ms": _ms(wall_ns),
+            "calls": len(api),
+            "retries": sum(
+                1 for r in api if r.attempt > 1 and r.error_category != "hedge_lost"
+            ),
+            "fallbacks": sum(
+                1 for r in records if r.error_category == "fallback_used"
+            ),
+            "provider_latency_ms": latency,
+            "provider_wall_ms": _ms(spent[PROVIDER]),
+            "prompt_build_ms": _ms(spent[PROMPT_BUILD]),
+            "validation_ms": _ms(spent[VALIDATION]),
+            "backoff_ms": _ms(spent[BACKOFF]),
+            "rate_limit_ms": _ms(spent[RATE_LIMIT]),
+            "log_ms": _ms(log_ns),
+            "queue_wait_ms": _ms(queue_wait_ns - self.queue_wait_ns),
+            "engine_ms": _ms(max(engine_ns, 0)),
+        }
+
+
+__all__ = [
+    "BACKOFF", "PROMPT_BUILD", "PROVIDER", "PhaseTimer", "RATE_LIMIT",
+    "TIMING_SCHEMA_VERSION", "VALIDATION",
+]
@@ -42,6 +42,45 @@ def _to_int(value) -> int:
     return int(f)
 
 
+def expand_lean_response(observation: dict, response: dict) -> dict:
+    """Rewrite a lean-protocol response (werewolf/agents/prompts.py) in
+    place into the full shape validate_action and the engine read:
+    "target" becomes the action's target key, a string "say" goes to the
+    action's channel, "memory" becomes updated_memory and beliefs get
+    their schema field names. The thought is cut to the action's cap and
+    dropped where none is allowed. Full-shape keys already present win."""
+    from werewolf.agents.prompts import LEAN_THOUGHT_MAX_CHARS
+    from werewolf.engine.action_schemas import SAY_CHANNELS, TARGET_KEYS
+    from werewolf.engine.beliefs import expand_lean_beliefs
+    from werewolf.engine.limits import truncate_text
+
+    required_action = observation["required_action"]
+    target_key = TARGET_KEYS.get(required_action)
+    if "target" in response:
+        target = response.pop("target")
+        if target_key and not response.get("action"):
+            response["action"] = {target_key: target}
+    say = response.get("say")
+    if isinstance(say, str):
+        channel = SAY_CHANNELS.get(required_action)
+        response["say"] = {channel: say} if channel else None
+    if "memory" in response:
+        memory = response.pop("memory")
+        if memory is not None:
+            response.setdefault("updated_memory", memory)
+    if "beliefs" in response:
+        response["beliefs"] = expand_lean_beliefs(response["beliefs"])
+    cap = LEAN_THOUGHT_MAX_CHARS.get(required_action, 0)
+    thought = response.get("thought")
+    if not cap or not isinstance(thought, str):
+        response.pop("thought", None)
+    else:
+        response["thought"] = truncate_text(thought, cap)[0]
+    response.setdefault("say", None)
+    response.setdefault("action", None)
+    return response
+
+
 def validate_action(
     observation: dict,
     response: dict,
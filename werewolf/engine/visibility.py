@@ -17,15 +17,17 @@ def filter_events_for_player(
     events: list[dict],
     player_role: str,
     since_idx: int = 0,
-    max_events: int = 50
+    max_events: Optional[int] = None
 ) -> list[dict]:
+    """Every event the role may see. Observations are uncapped: prompts
+    choose their own window by token budget (werewolf/engine/limits.py)."""
     visible = []
     for event in events[since_idx:]:
         channel = event.get("channel", "public")
         if can_see_channel(player_role, channel):
             visible.append(event)
 
-    if len(visible) > max_events:
+    if max_events is not None and len(visible) > max_events:
         visible = visible[-max_events:]
 
     return visible
@@ -0,0 +1,139 @@
+"""Input-token savings of the compact prompt rendering over a corpus of games.
+
+    report = render_savings([load_rows(path) for path in game_paths])
+    report["measured"]["saved_share"]   # reported input tokens, matched
+    report["events"]["saved_share"]     # every logged event, both ways
+
+The compact rendering (--prompt-render compact, werewolf/agents/prompts.py)
+is a separate condition, so its savings are measured across games, not
+within one. Pure computation over existing logs - never makes API calls.
+
+Rules:
+- A game's rendering is its config row's prompt_render (logs from before
+  the option existed are verbose); its layout is prompt_layout.
+- measured compares reported input_tokens per API call, grouped by
+  (model, layout, required_action): a cell's savings need calls in both
+  renderings. The overall share prices every compact call at its cell's
+  verbose mean, so a corpus with more late-game compact calls is not
+  credited with savings it did not make. Inherited, failed and cut-stream
+  calls are skipped: their usage is not this prompt's.
+- events re-renders every event a player could see both ways and sums
+  estimate_tokens() per line: the per-line saving of the event format
+  alone, whatever rendering the game was played in. Each event is
+  counted once, not once per prompt that showed it.
+- Prompts are not logged, so memory and rule savings show up only in
+  the measured numbers.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from werewolf.agents.prompts import (
+    PROMPT_LAYOUT_LEGACY,
+    PROMPT_RENDER_COMPACT,
+    PROMPT_RENDER_VERBOSE,
+)
+from werewolf.agents.rendering import render_event
+from werewolf.engine.visibility import CHANNEL_VISIBILITY
+from werewolf.llm.tokens import estimate_tokens
+
+SAVINGS_REPORT_VERSION = 1
+
+
+def game_rendering(rows: list[dict]) -> tuple[str, str]:
+    """(prompt_render, prompt_layout) names from a game's config row."""
+    config = next((row for row in rows if row.get("type") == "config"), {})
+    render = (config.get("prompt_render") or {}).get("name", PROMPT_RENDER_VERBOSE)
+    layout = (config.get("prompt_layout") or {}).get("name", PROMPT_LAYOUT_LEGACY)
+    return render, layout
+
+
+def _reported_input(row: dict) -> Optional[int]:
+    if (row.get("inherited_from") or not row.get("api_attempted")
+            or not row.get("api_ok")):
+        return None
+    stream = (row.get("provider_metadata") or {}).get("stream") or {}
+    if stream.get("stopped_early") or stream.get("cancelled"):
+        return None
+    tokens = (row.get("usage") or {}).get("input_tokens")
+    return tokens if isinstance(tokens, int) else None
+
+
+def _share(saved: float, base: float) -> Optional[float]:
+    return round(saved / base, 4) if base else None
+
+
+def _measured(cells: dict) -> dict:
+    by_cell = []
+    priced_verbose = compact_total = 0.0
+    for (model, layout, action), modes in sorted(cells.items()):
+        verbose = modes.get(PROMPT_RENDER_VERBOSE, [])
+        compact = modes.get(PROMPT_RENDER_COMPACT, [])
+        verbose_mean = sum(verbose) / len(verbose) if verbose else None
+        compact_mean = sum(compact) / len(compact) if compact else None
+        saved_share = None
+        if verbose and compact:
+            priced_verbose += verbose_mean * len(compact)
+            compact_total += sum(compact)
+            saved_share = _share(verbose_mean - compact_mean, verbose_mean)
+        by_cell.append({
+            "model": model, "prompt_layout": layout, "required_action": action,
+            "verbose_calls": len(verbose), "compact_calls": len(compact),
+            "verbose_mean_input_tokens": (
+                round(verbose_mean, 1) if verbose_mean is not None else None
+            ),
+            "compact_mean_input_tokens": (
+                round(compact_mean, 1) if compact_mean is not None else None
+            ),
+            "saved_share": saved_share,
+        })
+    return {
+        "matched_compact_calls": sum(
+            cell["compact_calls"] for cell in by_cell
+            if cell["saved_share"] is not None
+        ),
+        "saved_share": _share(priced_verbose - compact_total, priced_verbose),
+        "by_cell": by_cell,
+    }
+
+
+def render_savings(games: Iterable[list[dict]]) -> dict:
+    """Savings report over games, each a list of its log rows."""
+    cells: dict = defaultdict(lambda: defaultdict(list))
+    games_by_render: dict = defaultdict(int)
+    events = verbose_tokens = compact_tokens = 0
+    for rows in games:
+        render, layout = game_rendering(rows)
+        games_by_render[render] += 1
+        for row in rows:
+            rtype = row.get("type")
+            if rtype == "event":
+                event = row.get("event") or {}
+                if not CHANNEL_VISIBILITY.get(event.get("channel", "public")):
+                    continue  # moderator-only: never in a prompt
+                events += 1
+                verbose_tokens += estimate_tokens(render_event(event))
+                compact_tokens += estimate_tokens(
+                    render_event(event, PROMPT_RENDER_COMPACT)
+                )
+            elif rtype == "llm_call":
+                tokens = _reported_input(row)
+                if tokens is not None:
+                    key = (row.get("requested_model"), layout,
+                           row.get("required_action"))
+                    cells[key][render].append(tokens)
+    return {
+        "savings_report_version": SAVINGS_REPORT_VERSION,
+        "games": dict(games_by_render),
+        "measured": _measured(cells),
+        "events": {
+            "events": events,
+            "verbose_tokens": verbose_tokens,
+            "compact_tokens": compact_tokens,
+            "saved_share": _share(verbose_tokens - compact_tokens, verbose_tokens),
+        },
+    }
+
+
+__all__ = ["SAVINGS_REPORT_VERSION", "game_rendering", "render_savings"]
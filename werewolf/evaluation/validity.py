@@ -17,6 +17,10 @@ Policy v1 violations:
   than requested (e.g. silent redirect of a retired slug)
 - low_snapshot_coverage: < MIN_SNAPSHOT_COVERAGE of emitted belief
   snapshots were valid (only when instrumentation was on)
+
+The response protocol (full, or lean with optional capped thoughts) is
+not a violation but a condition: each classification carries it, and
+rollups count games per protocol so a mixed set is visible.
 """
 from __future__ import annotations
 
@@ -26,6 +30,7 @@ from collections import Counter
 from werewolf.engine.beliefs import recorded_belief_payload_valid
 from werewolf.json_safety import as_mapping
 from werewolf.llm.registry import MODEL_REGISTRY, resolved_model_matches
+from werewolf.log_files import iter_log_lines
 
 VALIDITY_POLICY_VERSION = 4
 MIN_SNAPSHOT_COVERAGE = 0.95
@@ -53,9 +58,16 @@ def _model_identity_match(call: dict) -> bool:
     return requested == resolved
 
 
+def response_protocol(config: dict) -> str:
+    """The game's response protocol name; logs from before the option
+    existed are "full"."""
+    protocol = as_mapping(config.get("response_protocol")).get("name")
+    return protocol if isinstance(protocol, str) else "full"
+
+
 def classify_game(rows: list[dict]) -> dict:
     """Returns {"clean": bool, "violations": {name: count},
-    "policy_version": int}."""
+    "policy_version": int, "response_protocol": str}."""
     violations: Counter = Counter()
     config = next((r for r in rows if r.get("type") == "config"), {})
 
@@ -100,27 +112,30 @@ def classify_game(rows: list[dict]) -> dict:
         "clean": not violations,
         "violations": dict(violations),
         "policy_version": VALIDITY_POLICY_VERSION,
+        "response_protocol": response_protocol(config),
     }
 
 
 def classify_game_from_file(log_path: str) -> dict:
-    with open(log_path, encoding="utf-8") as f:
-        rows = [json.loads(line) for line in f if line.strip()]
+    rows = [json.loads(line) for line in iter_log_lines(log_path) if line.strip()]
     return classify_game(rows)
 
 
 def summarize_validity(per_game: list[dict]) -> dict:
     """Rollup: clean/dirty counts and violation totals across games."""
     totals: Counter = Counter()
+    protocols: Counter = Counter()
     dirty = 0
     for v in per_game:
         if not v["clean"]:
             dirty += 1
         totals.update(v["violations"])
+        protocols[v.get("response_protocol", "full")] += 1
     return {
         "policy_version": VALIDITY_POLICY_VERSION,
         "games": len(per_game),
         "clean_games": len(per_game) - dirty,
         "dirty_games": dirty,
         "violations_by_type": dict(totals),
+        "response_protocols": dict(protocols),
     }
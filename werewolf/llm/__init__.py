@@ -1,11 +1,18 @@
 """Provider-neutral LLM invocation and cost-accounting layer.
 
 Modules:
-    records   -- normalized usage/cost record types (schema_version 1)
+    records   -- normalized usage/cost record types (schema_version 6)
     provider  -- Provider protocol and typed request/result objects
     fake_provider -- deterministic scripted provider for tests
     ledger    -- in-memory usage ledger with JSONL sink + aggregation
     registry  -- model alias registry and API-key env-var resolution
+    tokens    -- fast local token estimates for prompt budgets
+    streaming -- streamed completions with early stop at the JSON object
+    retry     -- retry policy: backoff with jitter, Retry-After, game budget
+    hedging   -- hedged requests for tail latency (first answer wins)
+    output_caps -- pinned max_output_tokens per (model, required_action)
+    preflight -- pre-flight token/cost estimates, context-window check,
+                 tokens-per-minute limiter
 
 No module in this package may log, store, or expose API key material.
 """
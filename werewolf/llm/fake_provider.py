@@ -1,11 +1,20 @@
 """Deterministic scripted provider for tests. Never touches the network."""
 from __future__ import annotations
 
+import dataclasses
 import json
+import time
 from typing import Optional
 
 from werewolf.llm.provider import ModelRequest, Provider, ProviderResult
 from werewolf.llm.records import CostInfo, CostSource, ErrorCategory, TokenUsage
+from werewolf.llm.streaming import (
+    STREAM_EARLY_STOP,
+    STREAM_OFF,
+    early_stop_result,
+    read_stream,
+    with_stream_timings,
+)
 
 
 class FakeProviderExhausted(AssertionError):
@@ -21,11 +30,15 @@ class FakeProvider:
         self,
         results: Optional[list[ProviderResult]] = None,
         default: Optional[ProviderResult] = None,
+        stream_chunk_chars: int = 16,
     ):
         """`default` (if given) is returned once the scripted queue is
-        exhausted, enabling full-game tests of unknown call counts."""
+        exhausted, enabling full-game tests of unknown call counts.
+        Streamed requests replay a successful result's text in chunks of
+        `stream_chunk_chars` through werewolf.llm.streaming."""
         self._results: list[ProviderResult] = list(results or [])
         self._default = default
+        self._stream_chunk_chars = stream_chunk_chars
         self.requests: list[ModelRequest] = []
 
     def enqueue(self, result: ProviderResult) -> None:
@@ -34,13 +47,35 @@ class FakeProvider:
     def complete(self, request: ModelRequest) -> ProviderResult:
         self.requests.append(request)
         if not self._results:
-            if self._default is not None:
-                return self._default
-            raise FakeProviderExhausted(
-                f"FakeProvider received call #{len(self.requests)} but only "
-                f"{len(self.requests) - 1} result(s) were scripted"
+            if self._default is None:
+                raise FakeProviderExhausted(
+                    f"FakeProvider received call #{len(self.requests)} but only "
+                    f"{len(self.requests) - 1} result(s) were scripted"
+                )
+            result = self._default
+        else:
+            result = self._results.pop(0)
+        if request.stream == STREAM_OFF or not result.ok or not result.text:
+            return result
+        return self._stream(request, result)
+
+    def _stream(self, request: ModelRequest, result: ProviderResult) -> ProviderResult:
+        size = self._stream_chunk_chars
+        chunks = iter([
+            result.text[i:i + size] for i in range(0, len(result.text), size)
+        ])
+        outcome = read_stream(
+            chunks, time.monotonic(), request.stream == STREAM_EARLY_STOP,
+            request.cancel,
+        )
+        if outcome.cut:
+            return early_stop_result(
+                request, outcome, result.latency_ms,
+                resolved_model=result.resolved_model,
+                provider_request_id=result.provider_request_id,
             )
-        return self._results.pop(0)
+        copy = dataclasses.replace(result, provider_metadata=dict(result.provider_metadata))
+        return with_stream_timings(copy, request, outcome)
 
     @property
     def calls_made(self) -> int:
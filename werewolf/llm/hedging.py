@@ -0,0 +1,157 @@
+"""Hedged requests: resend a slow call and take whichever answer lands first.
+
+    provider = HedgingProvider(inner, HedgePolicy(percentile=0.95))
+    result = provider.complete(request)   # result.hedge_loser: Future | None
+
+One straggler stalls a sequential discussion, so a call still running
+after the recent p-th percentile latency of its (model, required_action)
+is sent a second time.
+
+Rules:
+- Opt-in. A key is not hedged until it has min_samples latencies; the
+  delay is the nearest-rank percentile of its last `window` successful,
+  uncancelled calls, and never less than min_delay_ms.
+- At most one hedge per call. The first successful result wins; if the
+  first to finish failed, the other is awaited. When both fail the
+  primary's failure is returned.
+- The loser is cancelled through ModelRequest.cancel. Streamed calls
+  stop reading and close the stream (billed like an early stop, see
+  werewolf/llm/streaming.py); blocking calls cannot be cancelled and run,
+  and bill, to the end.
+- Both attempts are paid for and both are recorded: the winner is
+  returned with provider_metadata["hedge"] and the loser as
+  ProviderResult.hedge_loser, which the agent logs as a HEDGE_LOST
+  record once it finishes (usage summary: hedging).
+- Attempts run on daemon threads; the wrapped provider must be safe to
+  call concurrently.
+"""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from werewolf.llm.provider import ModelRequest, Provider, ProviderResult
+
+HEDGE_POLICY_VERSION = 1
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    percentile: float = 0.95
+    window: int = 50
+    min_samples: int = 10
+    min_delay_ms: int = 250
+
+    def __post_init__(self):
+        if not 0 < self.percentile < 1:
+            raise ValueError("percentile must be in (0, 1)")
+        if self.window < 1 or not 1 <= self.min_samples <= self.window:
+            raise ValueError("need 1 <= min_samples <= window")
+        if self.min_delay_ms < 0:
+            raise ValueError("min_delay_ms must be >= 0")
+
+    def to_json_dict(self) -> dict:
+        return {
+            "hedge_policy_version": HEDGE_POLICY_VERSION,
+            "percentile": self.percentile,
+            "window": self.window,
+            "min_samples": self.min_samples,
+            "min_delay_ms": self.min_delay_ms,
+        }
+
+
+class LatencyTracker:
+    """Recent latencies per (model, required_action) (thread-safe)."""
+
+    def __init__(self, policy: HedgePolicy):
+        self.policy = policy
+        self._latencies: dict = defaultdict(lambda: deque(maxlen=policy.window))
+        self._lock = threading.Lock()
+
+    def observe(self, key: tuple, latency_ms: Optional[int]) -> None:
+        if latency_ms is None:
+            return
+        with self._lock:
+            self._latencies[key].append(latency_ms)
+
+    def delay_ms(self, key: tuple) -> Optional[int]:
+        """How long to wait before hedging a call, or None (too few
+        samples)."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < self.policy.min_samples:
+            return None
+        rank = max(1, -(-len(latencies) * self.policy.percentile // 1))  # ceil
+        return max(latencies[int(rank) - 1], self.policy.min_delay_ms)
+
+
+class HedgingProvider:
+    """Wraps a Provider; see the module docstring."""
+
+    def __init__(self, provider: Provider, policy: Optional[HedgePolicy] = None,
+                 tracker: Optional[LatencyTracker] = None):
+        self.provider = provider
+        self.policy = policy or HedgePolicy()
+        self.tracker = tracker or LatencyTracker(self.policy)
+        self.name = provider.name
+
+    def complete(self, request: ModelRequest) -> ProviderResult:
+        key = (request.model, request.required_action)
+        delay_ms = self.tracker.delay_ms(key)
+        if delay_ms is None:
+            result = self.provider.complete(request)
+            if result.ok:
+                self.tracker.observe(key, result.latency_ms)
+            return result
+
+        primary = self._start(key, request, "primary", delay_ms)
+        if wait([primary], timeout=delay_ms / 1000).done:
+            result = primary.result()
+            del result.provider_metadata["hedge"]  # finished in time: not hedged
+            return result
+        hedge = self._start(key, request, "hedge", delay_ms)
+
+        winner = None
+        pending = {primary, hedge}
+        while pending and winner is None:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (primary, hedge):  # primary first on a tie
+                if future in done and future in pending:
+                    pending.discard(future)
+                    if winner is None and future.result().ok:
+                        winner = future
+        winner = winner or primary
+        loser = hedge if winner is primary else primary
+        loser.request.cancel.set()
+        result = winner.result()
+        result.provider_metadata["hedge"]["won"] = True
+        result.hedge_loser = loser
+        return result
+
+    def _start(self, key: tuple, request: ModelRequest, role: str,
+               delay_ms: int) -> Future:
+        attempt = replace(request, cancel=threading.Event())
+        future: Future = Future()
+        future.request = attempt
+
+        def run():
+            try:
+                result = self.provider.complete(attempt)
+            except BaseException as exc:
+                future.set_exception(exc)
+                return
+            if result.ok and not attempt.cancel.is_set():
+                self.tracker.observe(key, result.latency_ms)
+            result.provider_metadata["hedge"] = {
+                "role": role, "delay_ms": delay_ms, "won": False,
+            }
+            future.set_result(result)
+
+        threading.Thread(target=run, name=f"hedge-{role}", daemon=True).start()
+        return future
+
+
+__all__ = ["HEDGE_POLICY_VERSION", "HedgePolicy", "HedgingProvider", "LatencyTracker"]
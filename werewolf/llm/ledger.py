@@ -5,7 +5,37 @@ Accounting rules:
 - Unavailable cost is surfaced as counts + cost_complete=False; it is
   never silently treated as zero. cost_usd_total is None when calls were
   made but no cost is known at all.
-- Thread-safe: record() may be called from concurrent games later.
+- Thread-safe: record() may be called from concurrent games later. The
+  sink runs outside the lock, so it sees one thread's records in order
+  but gives no ordering across threads sharing a ledger.
+- Records inherited by a forked game (see werewolf/engine/checkpoint.py)
+  are kept apart: they were paid for by the parent and never count
+  toward this game's totals.
+- Prompt-cache hit rate is cached_input_tokens / input_tokens over the
+  calls that report both; calls from providers that say nothing about
+  caching are left out rather than counted as misses.
+- backoff sums the time agents waited before retries (backoff_ms on
+  each record; werewolf/llm/retry.py) and counts the attempts that
+  waited.
+- hedging counts hedged calls (werewolf/llm/hedging.py), how many the
+  hedge won, and the losing attempts with what they cost: the price of
+  the latency. Losers (HEDGE_LOST) count as calls and toward cost, but
+  not as retries or as reliability attempts.
+- preflight compares each API call's pre-flight input-token estimate
+  (werewolf/llm/preflight.py) with the input_tokens it reported, per
+  model family: bias is estimated / reported - 1, error_rate is the
+  summed absolute error / reported. Calls without reported input
+  tokens, and streams cut short (their usage is itself an estimate),
+  are left out. refused counts calls never sent because the estimate
+  did not fit the context window.
+- output_cap_hits counts, per required_action, API calls whose response
+  ran out of output tokens (werewolf/llm/output_caps.py hit_output_cap):
+  the cost of a cap set too low.
+- Reliability per required_action counts turns (one act() call, however
+  many attempts), the MALFORMED_JSON and INVALID_GAME_ACTION attempts
+  that forced a retry, parses that needed repair or regex salvage, and
+  fallbacks. retry_rate is retried attempts per turn; repair_rate is
+  repaired parses per successful parse.
 """
 from __future__ import annotations
 
@@ -13,6 +43,7 @@ import threading
 from collections import defaultdict
 from typing import Callable, Optional
 
+from werewolf.llm.output_caps import hit_output_cap
 from werewolf.llm.records import CostSource, ErrorCategory, UsageRecord
 
 Sink = Callable[[dict], None]
@@ -22,19 +53,37 @@ class UsageLedger:
     def __init__(self, sink: Optional[Sink] = None):
         self._sink = sink
         self._records: list[UsageRecord] = []
+        self._inherited: list[UsageRecord] = []
         self._lock = threading.Lock()
 
     def record(self, record: UsageRecord) -> None:
         with self._lock:
             self._records.append(record)
-            if self._sink is not None:
-                self._sink(record.to_json_dict())
+        # Serialization and the sink (log I/O) stay outside the lock so
+        # concurrent recorders only contend for the append.
+        if self._sink is not None:
+            self._sink(record.to_json_dict())
+
+    def inherit(self, records: list[UsageRecord]) -> None:
+        """Attach a parent game's prefix records without re-emitting them
+        to the sink (the child logger copies the parent rows verbatim)."""
+        with self._lock:
+            self._inherited.extend(records)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._records)
 
     @property
     def records(self) -> list[UsageRecord]:
         with self._lock:
             return list(self._records)
 
+    @property
+    def inherited_records(self) -> list[UsageRecord]:
+        with self._lock:
+            return list(self._inherited)
+
     # ------------------------------------------------------------------
     # Aggregation
     # ------------------------------------------------------------------
@@ -49,7 +98,10 @@ class UsageLedger:
         validation_failures = sum(
             1 for r in api_records if r.validation_ok is False
         )
-        retries = sum(1 for r in api_records if r.attempt > 1)
+        retries = sum(
+            1 for r in api_records
+            if r.attempt > 1 and r.error_category != ErrorCategory.HEDGE_LOST
+        )
         fallbacks = sum(
             1
             for r in records
@@ -67,6 +119,7 @@ class UsageLedger:
             "total_tokens": 0,
         }
         calls_missing_usage = 0
+        prompt_cache = {"calls_reporting": 0, "input_tokens": 0, "cached_input_tokens": 0}
         for r in api_records:
             u = r.usage
             if u.total_tokens is None and u.input_tokens is None:
@@ -75,6 +128,18 @@ class UsageLedger:
                 value = getattr(u, key)
                 if value is not None:
                     tokens[key] += value
+            if u.input_tokens is not None and u.cached_input_tokens is not None:
+                prompt_cache["calls_reporting"] += 1
+                prompt_cache["input_tokens"] += u.input_tokens
+                prompt_cache["cached_input_tokens"] += u.cached_input_tokens
+        prompt_cache["hit_rate"] = _hit_rate(prompt_cache)
+        streaming = _streaming_summary(api_records)
+        reliability = _reliability_by_action(records)
+        waits = [r.backoff_ms for r in api_records if r.backoff_ms]
+        backoff = {"attempts": len(waits), "backoff_ms": sum(waits)}
+        hedging = _hedging_summary(api_records)
+        output_cap_hits = _output_cap_hits(api_records)
+        preflight = _preflight_summary(records)
 
         cost_ticks_total = 0
         has_ticks = False
@@ -112,7 +177,7 @@ class UsageLedger:
             else None
         )
 
-        return {
+        summary = {
             "calls": calls,
             "api_failures": api_failures,
             "parse_failures": parse_failures,
@@ -122,6 +187,13 @@ class UsageLedger:
             "recovered_parses": recovered_parses,
             "calls_missing_usage": calls_missing_usage,
             "tokens": tokens,
+            "prompt_cache": prompt_cache,
+            "streaming": streaming,
+            "reliability_by_action": reliability,
+            "backoff": backoff,
+            "hedging": hedging,
+            "output_cap_hits": output_cap_hits,
+            "preflight": preflight,
             "cost_ticks_total": cost_ticks_total if has_ticks else None,
             "cost_usd_total": cost_usd_total,
             "cost_complete": calls_with_unavailable_cost == 0,
@@ -136,6 +208,10 @@ class UsageLedger:
             "avg_cost_per_round": avg_cost_per_round,
             "errors_by_category": self._error_counts(records),
         }
+        inherited = self.inherited_records
+        if inherited:
+            summary["inherited_calls"] = sum(1 for r in inherited if r.api_attempted)
+        return summary
 
     @staticmethod
     def _breakdown(records: list[UsageRecord], key_fn) -> dict:
@@ -180,6 +256,169 @@ class UsageLedger:
         return dict(counts)
 
 
+def _hit_rate(prompt_cache: dict) -> Optional[float]:
+    if not prompt_cache["input_tokens"]:
+        return None
+    return round(prompt_cache["cached_input_tokens"] / prompt_cache["input_tokens"], 4)
+
+
+def _mean_ms(values: list[int]) -> Optional[dict]:
+    if not values:
+        return None
+    return {"calls": len(values), "mean": round(sum(values) / len(values), 1)}
+
+
+def _streaming_summary(records: list[UsageRecord]) -> dict:
+    """Streamed calls (werewolf/llm/streaming.py). Calls stopped early
+    report no usage; their local estimates are summed here instead of
+    into tokens, and received_output_tokens is a lower bound on what was
+    billed."""
+    streamed = [r for r in records if "stream" in r.provider_metadata]
+    stopped = [
+        r.provider_metadata["stream"] for r in streamed
+        if r.provider_metadata["stream"].get("stopped_early")
+    ]
+    return {
+        "calls": len(streamed),
+        "stopped_early": len(stopped),
+        "estimated_input_tokens": sum(m["estimated_input_tokens"] for m in stopped),
+        "received_output_tokens": sum(m["received_output_tokens"] for m in stopped),
+        "ttft_ms": _mean_ms([r.ttft_ms for r in streamed if r.ttft_ms is not None]),
+        "object_complete_ms": _mean_ms([
+            r.object_complete_ms for r in streamed if r.object_complete_ms is not None
+        ]),
+    }
+
+
+_HEDGING_COUNTS = (
+    "hedged_calls", "hedge_wins", "losers", "cancelled",
+    "losers_without_cost", "loser_total_tokens",
+)
+
+
+def _hedging_summary(records: list[UsageRecord]) -> dict:
+    counts = dict.fromkeys(_HEDGING_COUNTS, 0)
+    counts["loser_cost_usd"] = 0.0
+    for r in records:
+        if not r.hedged:
+            continue
+        if r.error_category != ErrorCategory.HEDGE_LOST:
+            counts["hedged_calls"] += 1
+            if r.provider_metadata.get("hedge", {}).get("role") == "hedge":
+                counts["hedge_wins"] += 1
+            continue
+        counts["losers"] += 1
+        if r.provider_metadata.get("stream", {}).get("cancelled"):
+            counts["cancelled"] += 1
+        if r.cost.usd is None:
+            counts["losers_without_cost"] += 1
+        else:
+            counts["loser_cost_usd"] += r.cost.usd
+        counts["loser_total_tokens"] += r.usage.total_tokens or 0
+    return counts
+
+
+def _with_hit_rate(counts: dict) -> dict:
+    counts["hit_rate"] = (
+        round(counts["hits"] / counts["calls"], 4) if counts["calls"] else None
+    )
+    return counts
+
+
+def _output_cap_hits(records: list[UsageRecord]) -> dict:
+    groups: dict[str, dict] = defaultdict(lambda: {"calls": 0, "hits": 0})
+    for r in records:
+        g = groups[r.context.required_action]
+        g["calls"] += 1
+        g["hits"] += hit_output_cap(r.finish_reason)
+    return {action: _with_hit_rate(g) for action, g in sorted(groups.items())}
+
+
+_PREFLIGHT_COUNTS = (
+    "calls", "estimated_input_tokens", "reported_input_tokens", "abs_error_tokens",
+)
+
+
+def _with_estimate_error(counts: dict) -> dict:
+    reported = counts["reported_input_tokens"]
+    counts["bias"] = (
+        round(counts["estimated_input_tokens"] / reported - 1, 4) if reported else None
+    )
+    counts["error_rate"] = (
+        round(counts["abs_error_tokens"] / reported, 4) if reported else None
+    )
+    return counts
+
+
+def _preflight_summary(records: list[UsageRecord]) -> dict:
+    refused = 0
+    families: dict[str, dict] = defaultdict(lambda: dict.fromkeys(_PREFLIGHT_COUNTS, 0))
+    for r in records:
+        if r.preflight is None:
+            continue
+        if not r.api_attempted:
+            refused += r.error_category == ErrorCategory.CONTEXT_WINDOW_EXCEEDED
+            continue
+        reported = r.usage.input_tokens
+        stream = r.provider_metadata.get("stream") or {}
+        if reported is None or stream.get("stopped_early") or stream.get("cancelled"):
+            continue
+        estimated = r.preflight["input_tokens"]
+        g = families[r.preflight["family"]]
+        g["calls"] += 1
+        g["estimated_input_tokens"] += estimated
+        g["reported_input_tokens"] += reported
+        g["abs_error_tokens"] += abs(estimated - reported)
+    return {
+        "refused": refused,
+        "by_family": {
+            family: _with_estimate_error(g) for family, g in sorted(families.items())
+        },
+    }
+
+
+_RELIABILITY_COUNTS = (
+    "turns", "attempts", "malformed_json", "invalid_game_action",
+    "parsed", "repaired_parses", "fallbacks",
+)
+
+
+def _with_rates(counts: dict) -> dict:
+    turns, parsed = counts["turns"], counts["parsed"]
+    counts["retry_rate"] = (
+        round((counts["attempts"] - turns) / turns, 4) if turns else None
+    )
+    counts["repair_rate"] = (
+        round(counts["repaired_parses"] / parsed, 4) if parsed else None
+    )
+    return counts
+
+
+def _reliability_by_action(records: list[UsageRecord]) -> dict:
+    groups: dict[str, dict] = defaultdict(lambda: dict.fromkeys(_RELIABILITY_COUNTS, 0))
+    turns: dict[str, set] = defaultdict(set)
+    for r in records:
+        action = r.context.required_action
+        g = groups[action]
+        if r.error_category == ErrorCategory.FALLBACK_USED:
+            g["fallbacks"] += 1
+        if not r.api_attempted or r.error_category == ErrorCategory.HEDGE_LOST:
+            continue
+        turns[action].add(r.call_id)
+        g["attempts"] += 1
+        if r.error_category == ErrorCategory.MALFORMED_JSON:
+            g["malformed_json"] += 1
+        elif r.error_category == ErrorCategory.INVALID_GAME_ACTION:
+            g["invalid_game_action"] += 1
+        if r.parse_ok:
+            g["parsed"] += 1
+            if r.parse_method in ("repaired", "regex"):
+                g["repaired_parses"] += 1
+    for action, g in groups.items():
+        g["turns"] = len(turns[action])
+    return {action: _with_rates(g) for action, g in sorted(groups.items())}
+
+
 def _percentile(sorted_values: list[float], fraction: float) -> float:
     """Nearest-rank percentile on a pre-sorted list."""
     if not sorted_values:
@@ -215,6 +454,89 @@ def aggregate_game_summaries(summaries: list[dict]) -> dict:
             tokens[key] += (s.get("tokens") or {}).get(key, 0) or 0
     out["tokens"] = tokens
 
+    prompt_cache = {"calls_reporting": 0, "input_tokens": 0, "cached_input_tokens": 0}
+    game_rates = []
+    for s in summaries:
+        game_cache = s.get("prompt_cache") or {}
+        for key in prompt_cache:
+            prompt_cache[key] += game_cache.get(key, 0)
+        if game_cache.get("hit_rate") is not None:
+            game_rates.append(game_cache["hit_rate"])
+    prompt_cache["hit_rate"] = _hit_rate(prompt_cache)
+    prompt_cache["per_game"] = {
+        "games_counted": len(game_rates),
+        "mean": round(sum(game_rates) / len(game_rates), 4),
+        "min": min(game_rates),
+        "max": max(game_rates),
+    } if game_rates else None
+    out["prompt_cache"] = prompt_cache
+
+    streaming = {
+        "calls": 0, "stopped_early": 0,
+        "estimated_input_tokens": 0, "received_output_tokens": 0,
+    }
+    for s in summaries:
+        game_streaming = s.get("streaming") or {}
+        for key in streaming:
+            streaming[key] += game_streaming.get(key, 0)
+    for key in ("ttft_ms", "object_complete_ms"):
+        stats = [
+            (s.get("streaming") or {}).get(key) for s in summaries
+        ]
+        stats = [stat for stat in stats if stat]
+        calls = sum(stat["calls"] for stat in stats)
+        streaming[key] = {
+            "calls": calls,
+            "mean": round(sum(stat["mean"] * stat["calls"] for stat in stats) / calls, 1),
+        } if calls else None
+    out["streaming"] = streaming
+
+    out["backoff"] = {
+        key: sum((s.get("backoff") or {}).get(key, 0) for s in summaries)
+        for key in ("attempts", "backoff_ms")
+    }
+
+    hedging = {key: 0 for key in _HEDGING_COUNTS}
+    hedging["loser_cost_usd"] = 0.0
+    for s in summaries:
+        for key in hedging:
+            hedging[key] += (s.get("hedging") or {}).get(key, 0)
+    out["hedging"] = hedging
+
+    cap_hits: dict[str, dict] = {}
+    for s in summaries:
+        for action, counts in (s.get("output_cap_hits") or {}).items():
+            agg = cap_hits.setdefault(action, {"calls": 0, "hits": 0})
+            agg["calls"] += counts.get("calls", 0)
+            agg["hits"] += counts.get("hits", 0)
+    out["output_cap_hits"] = {
+        action: _with_hit_rate(counts) for action, counts in sorted(cap_hits.items())
+    }
+
+    preflight_families: dict[str, dict] = {}
+    for s in summaries:
+        for family, counts in ((s.get("preflight") or {}).get("by_family") or {}).items():
+            agg = preflight_families.setdefault(family, dict.fromkeys(_PREFLIGHT_COUNTS, 0))
+            for key in _PREFLIGHT_COUNTS:
+                agg[key] += counts.get(key, 0)
+    out["preflight"] = {
+        "refused": sum((s.get("preflight") or {}).get("refused", 0) for s in summaries),
+        "by_family": {
+            family: _with_estimate_error(counts)
+            for family, counts in sorted(preflight_families.items())
+        },
+    }
+
+    reliability: dict[str, dict] = {}
+    for s in summaries:
+        for action, counts in (s.get("reliability_by_action") or {}).items():
+            agg = reliability.setdefault(action, dict.fromkeys(_RELIABILITY_COUNTS, 0))
+            for key in _RELIABILITY_COUNTS:
+                agg[key] += counts.get(key, 0)
+    out["reliability_by_action"] = {
+        action: _with_rates(counts) for action, counts in sorted(reliability.items())
+    }
+
     ticks_values = [
         s["cost_ticks_total"] for s in summaries
         if s.get("cost_ticks_total") is not None
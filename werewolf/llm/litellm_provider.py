@@ -14,6 +14,14 @@ from typing import Optional
 
 from werewolf.llm.provider import ModelRequest, ProviderResult
 from werewolf.llm.records import CostInfo, CostSource, ErrorCategory, TokenUsage
+from werewolf.llm.retry import parse_retry_after
+from werewolf.llm.streaming import (
+    STREAM_EARLY_STOP,
+    STREAM_OFF,
+    early_stop_result,
+    read_stream,
+    with_stream_timings,
+)
 
 logger = logging.getLogger("werewolf.llm.litellm")
 
@@ -79,16 +87,76 @@ def _sanitize_error_message(exc: Exception, limit: int = 300) -> str:
     return " ".join(redacted)[:limit]
 
 
-def build_completion_kwargs(request: ModelRequest, api_key: str, timeout: int) -> dict:
+# Model prefixes whose LiteLLM integration honors Anthropic-style
+# cache_control content blocks. OpenAI, Gemini and xAI cache long shared
+# prefixes automatically and get plain string messages.
+CACHE_CONTROL_PREFIXES = ("anthropic/", "bedrock/", "vertex_ai/claude")
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def supports_cache_control(model: str) -> bool:
+    return model.startswith(CACHE_CONTROL_PREFIXES)
+
+
+def build_messages(request: ModelRequest) -> list[dict]:
+    """System message, chat history, then the user prompt. With a cache
+    hint on a model that takes explicit cache control, the system prompt,
+    the last history turn and the user prompt's shared prefix end in
+    cache breakpoints."""
+    history = [dict(message) for message in request.history]
+    if request.cache_prefix_chars is None or not supports_cache_control(request.model):
+        return [
+            {"role": "system", "content": request.system_prompt},
+            *history,
+            {"role": "user", "content": request.user_prompt},
+        ]
+    if history:
+        history[-1]["content"] = [
+            {"type": "text", "text": history[-1]["content"], "cache_control": _EPHEMERAL},
+        ]
+    split = request.cache_prefix_chars
+    user_blocks = []
+    if request.user_prompt[:split]:
+        user_blocks.append(
+            {"type": "text", "text": request.user_prompt[:split], "cache_control": _EPHEMERAL},
+        )
+    if request.user_prompt[split:]:
+        user_blocks.append({"type": "text", "text": request.user_prompt[split:]})
+    return [
+        {"role": "system", "content": [
+            {"type": "text", "text": request.system_prompt, "cache_control": _EPHEMERAL},
+        ]},
+        *history,
+        {"role": "user", "content": user_blocks},
+    ]
+
+
+def retry_after_ms(exc: Exception) -> Optional[int]:
+    """The Retry-After hint on a litellm exception's HTTP response."""
+    headers = getattr(exc, "litellm_response_headers", None)
+    if not headers:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    return parse_retry_after(headers)
+
+
+def supports_response_schema(model: str) -> bool:
+    """Whether litellm knows the model to take a strict json_schema
+    response_format; unknown models are assumed not to."""
+    try:
+        return bool(litellm.supports_response_schema(model=model))
+    except Exception:
+        return False
+
+
+def build_completion_kwargs(request: ModelRequest, api_key: str, timeout: int,
+                            schema_supported: bool = True) -> dict:
     """Map GenerationConfig onto litellm.completion kwargs (only fields
-    that were explicitly requested)."""
+    that were explicitly requested). A response schema the model cannot
+    take (schema_supported=False) falls back to JSON mode."""
     g = request.generation
     kwargs = dict(
         model=request.model,
-        messages=[
-            {"role": "system", "content": request.system_prompt},
-            {"role": "user", "content": request.user_prompt},
-        ],
+        messages=build_messages(request),
         api_key=api_key,
         timeout=timeout,
     )
@@ -102,7 +170,16 @@ def build_completion_kwargs(request: ModelRequest, api_key: str, timeout: int) -
         kwargs["max_tokens"] = g.max_output_tokens
     if g.provider_seed is not None:
         kwargs["seed"] = g.provider_seed
-    if g.structured_output:
+    if request.response_schema is not None and schema_supported:
+        kwargs["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": request.response_schema["title"],
+                "schema": request.response_schema,
+                "strict": True,
+            },
+        }
+    elif g.structured_output or request.response_schema is not None:
         kwargs["response_format"] = {"type": "json_object"}
     return kwargs
 
@@ -127,15 +204,39 @@ class LiteLLMProvider:
         logging.getLogger("LiteLLM").setLevel(logging.ERROR)
         litellm.suppress_debug_info = True
 
+    def model_info(self, model: str) -> dict:
+        """Context window and input price from litellm's price map, for
+        pre-flight estimates (werewolf/llm/preflight.py); {} if unknown."""
+        try:
+            info = litellm.get_model_info(model=model)
+        except Exception:
+            return {}
+        price = info.get("input_cost_per_token")
+        return {
+            "context_window": info.get("max_input_tokens"),
+            "input_usd_per_mtok": price * 1e6 if price is not None else None,
+        }
+
     def complete(self, request: ModelRequest) -> ProviderResult:
         started = time.monotonic()
         try:
+            schema_supported = (
+                request.response_schema is None
+                or supports_response_schema(request.model)
+            )
             kwargs = build_completion_kwargs(
                 request, api_key=self._api_key, timeout=self._timeout,
+                schema_supported=schema_supported,
             )
-            response = litellm.completion(**kwargs)
-            latency_ms = int((time.monotonic() - started) * 1000)
-            return self._result_from_response(response, latency_ms)
+            if request.stream != STREAM_OFF:
+                result = self._complete_streamed(request, kwargs, started)
+            else:
+                response = litellm.completion(**kwargs)
+                latency_ms = int((time.monotonic() - started) * 1000)
+                result = self._result_from_response(response, latency_ms)
+            if not schema_supported:
+                result.provider_metadata["generation_dropped"] = ["response_schema"]
+            return result
         except Exception as exc:
             latency_ms = int((time.monotonic() - started) * 1000)
             category = classify_exception(exc)
@@ -146,9 +247,63 @@ class LiteLLMProvider:
                 error_category=category,
                 error_message=_sanitize_error_message(exc),
                 retryable=category in _RETRYABLE,
+                retry_after_ms=retry_after_ms(exc),
                 latency_ms=latency_ms,
             )
 
+    def _complete_streamed(self, request: ModelRequest, kwargs: dict,
+                           started: float) -> ProviderResult:
+        """Stream the completion. Read to the end, the chunks are rebuilt
+        into one response whose usage is the provider's final usage chunk
+        (include_usage); stopped early, cost is a price-map estimate of
+        the prompt and the received text, a lower bound."""
+        stream = litellm.completion(
+            **kwargs, stream=True, stream_options={"include_usage": True},
+        )
+        chunks = []
+
+        def deltas():
+            try:
+                for chunk in stream:
+                    chunks.append(chunk)
+                    choices = getattr(chunk, "choices", None)
+                    if choices:
+                        delta = getattr(choices[0], "delta", None)
+                        yield getattr(delta, "content", None) or ""
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+
+        outcome = read_stream(
+            deltas(), started, request.stream == STREAM_EARLY_STOP, request.cancel,
+        )
+        latency_ms = int((time.monotonic() - started) * 1000)
+        if not outcome.cut:
+            response = litellm.stream_chunk_builder(chunks, messages=kwargs["messages"])
+            return with_stream_timings(
+                self._result_from_response(response, latency_ms), request, outcome,
+            )
+        first = chunks[0] if chunks else None
+        result = early_stop_result(
+            request, outcome, latency_ms,
+            resolved_model=getattr(first, "model", None),
+            provider_request_id=getattr(first, "id", None),
+        )
+        estimate = result.provider_metadata["stream"]
+        try:
+            prompt_usd, completion_usd = litellm.cost_per_token(
+                model=request.model,
+                prompt_tokens=estimate["estimated_input_tokens"],
+                completion_tokens=estimate["received_output_tokens"],
+            )
+            result.cost = CostInfo.estimated(
+                float(prompt_usd + completion_usd), CostSource.TOKENIZER_ESTIMATE,
+            )
+        except Exception:
+            logger.debug("cost_per_token unavailable for this model")
+        return result
+
     @staticmethod
     def _result_from_response(response, latency_ms: int) -> ProviderResult:
         usage_obj = getattr(response, "usage", None)
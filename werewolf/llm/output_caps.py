@@ -0,0 +1,214 @@
+"""Per-(model, required_action) max_output_tokens caps from past calls.
+
+    table = build_cap_table(rows, percentile=0.95)  # llm_call rows
+    table.save("output_caps.json")
+    GameEngine(output_caps=OutputCapTable.load("output_caps.json"))
+
+A vote needs far fewer tokens than a speech, and an unbounded response
+costs latency and money; one global max_output_tokens fits neither.
+
+Rules:
+- Samples are successful API calls with reported output tokens, counted
+  as output_tokens + reasoning_tokens (most providers bill reasoning
+  against the same cap). Responses cut off by a cap or a stream stop
+  are censored: counted, never sampled. Inherited rows (forks) are
+  skipped; they repeat the parent's calls.
+- cap = nearest-rank percentile * headroom, rounded up to a multiple of
+  round_to. Cells with fewer than min_samples samples get no cap.
+- The table is pinned: its hash covers the caps and the rules that made
+  them, is logged in the config row, and every usage record carries the
+  cap its call was sent with in requested_generation.
+- A table never raises a global max_output_tokens: the lower cap wins.
+- A hit is a response whose finish_reason says it ran out of tokens
+  (hit_output_cap); hit rates by action are in usage summaries
+  (output_cap_hits) and game reports.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Optional
+
+from werewolf.llm.provider import GenerationConfig
+
+OUTPUT_CAPS_VERSION = 1
+
+DEFAULT_PERCENTILE = 0.95
+DEFAULT_HEADROOM = 1.2
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_ROUND_TO = 16
+
+
+def hit_output_cap(finish_reason: Optional[str]) -> bool:
+    """True for finish reasons meaning the output-token cap was reached
+    (OpenAI-style "length", Anthropic "max_tokens", xAI "REASON_MAX_LEN")."""
+    if not finish_reason:
+        return False
+    reason = str(finish_reason).lower()
+    return "length" in reason or "max_tokens" in reason or "max_len" in reason
+
+
+def _nearest_rank(sorted_values: list[int], fraction: float) -> int:
+    rank = max(1, math.ceil(len(sorted_values) * fraction))
+    return sorted_values[rank - 1]
+
+
+@dataclass(frozen=True)
+class OutputCapTable:
+    caps: dict  # {model: {required_action: max_output_tokens}}
+    percentile: float = DEFAULT_PERCENTILE
+    headroom: float = DEFAULT_HEADROOM
+    min_samples: int = DEFAULT_MIN_SAMPLES
+    round_to: int = DEFAULT_ROUND_TO
+    # Per-cell distributions the caps came from; informational, unhashed.
+    stats: dict = field(default_factory=dict, compare=False)
+
+    def cap_for(self, model: str, required_action: str) -> Optional[int]:
+        return (self.caps.get(model) or {}).get(required_action)
+
+    def apply(self, generation: GenerationConfig, model: str,
+              required_action: str) -> GenerationConfig:
+        cap = self.cap_for(model, required_action)
+        if cap is None:
+            return generation
+        if generation.max_output_tokens is not None:
+            cap = min(cap, generation.max_output_tokens)
+        return replace(generation, max_output_tokens=cap)
+
+    @property
+    def table_hash(self) -> str:
+        pinned = {
+            "output_caps_version": OUTPUT_CAPS_VERSION,
+            "percentile": self.percentile,
+            "headroom": self.headroom,
+            "min_samples": self.min_samples,
+            "round_to": self.round_to,
+            "caps": self.caps,
+        }
+        canonical = json.dumps(pinned, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+    def config_dict(self) -> dict:
+        """What the config row records."""
+        return {
+            "output_caps_version": OUTPUT_CAPS_VERSION,
+            "hash": self.table_hash,
+            "percentile": self.percentile,
+            "headroom": self.headroom,
+            "caps": self.caps,
+        }
+
+    def to_json_dict(self) -> dict:
+        return {
+            "output_caps_version": OUTPUT_CAPS_VERSION,
+            "hash": self.table_hash,
+            "percentile": self.percentile,
+            "headroom": self.headroom,
+            "min_samples": self.min_samples,
+            "round_to": self.round_to,
+            "caps": self.caps,
+            "stats": self.stats,
+        }
+
+    @classmethod
+    def from_json_dict(cls, data: dict) -> "OutputCapTable":
+        if data.get("output_caps_version") != OUTPUT_CAPS_VERSION:
+            raise ValueError(
+                f"Unsupported output cap table version: "
+                f"{data.get('output_caps_version')!r}"
+            )
+        table = cls(
+            caps={
+                str(model): {str(action): int(cap) for action, cap in caps.items()}
+                for model, caps in data["caps"].items()
+            },
+            percentile=data["percentile"],
+            headroom=data["headroom"],
+            min_samples=data["min_samples"],
+            round_to=data["round_to"],
+            stats=data.get("stats") or {},
+        )
+        if data.get("hash") not in (None, table.table_hash):
+            raise ValueError("Output cap table hash does not match its caps")
+        return table
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json_dict(), f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "OutputCapTable":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_json_dict(json.load(f))
+
+
+def _sample(row: dict) -> Optional[int]:
+    usage = row.get("usage") or {}
+    output = usage.get("output_tokens")
+    if not isinstance(output, int) or isinstance(output, bool):
+        return None
+    reasoning = usage.get("reasoning_tokens")
+    return output + (reasoning if isinstance(reasoning, int) else 0)
+
+
+def build_cap_table(
+    rows: Iterable[dict],
+    percentile: float = DEFAULT_PERCENTILE,
+    headroom: float = DEFAULT_HEADROOM,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    round_to: int = DEFAULT_ROUND_TO,
+) -> OutputCapTable:
+    """Cap table from log rows; rows other than llm_call are ignored."""
+    if not 0 < percentile <= 1:
+        raise ValueError("percentile must be in (0, 1]")
+    if headroom < 1 or min_samples < 1 or round_to < 1:
+        raise ValueError("need headroom >= 1, min_samples >= 1, round_to >= 1")
+    samples: dict = defaultdict(list)
+    censored: dict = defaultdict(int)
+    for row in rows:
+        if (row.get("type", "llm_call") != "llm_call" or row.get("inherited_from")
+                or not row.get("api_attempted") or not row.get("api_ok")):
+            continue
+        key = (row.get("requested_model"), row.get("required_action"))
+        if not all(isinstance(part, str) and part for part in key):
+            continue
+        stream = (row.get("provider_metadata") or {}).get("stream") or {}
+        if (hit_output_cap(row.get("finish_reason"))
+                or stream.get("stopped_early") or stream.get("cancelled")):
+            censored[key] += 1
+            continue
+        tokens = _sample(row)
+        if tokens is not None:
+            samples[key].append(tokens)
+
+    caps: dict = defaultdict(dict)
+    stats: dict = defaultdict(dict)
+    for key in sorted(set(samples) | set(censored)):
+        model, action = key
+        values = sorted(samples.get(key, ()))
+        cell = {"samples": len(values), "censored": censored.get(key, 0), "cap": None}
+        if values:
+            cell.update({
+                "p50": _nearest_rank(values, 0.5),
+                "p90": _nearest_rank(values, 0.9),
+                "p99": _nearest_rank(values, 0.99),
+                "max": values[-1],
+            })
+        if len(values) >= min_samples:
+            raw = _nearest_rank(values, percentile) * headroom
+            cell["cap"] = round_to * max(1, math.ceil(raw / round_to))
+            caps[model][action] = cell["cap"]
+        stats[model][action] = cell
+    return OutputCapTable(
+        caps=dict(caps), percentile=percentile, headroom=headroom,
+        min_samples=min_samples, round_to=round_to, stats=dict(stats),
+    )
+
+
+__all__ = [
+    "OUTPUT_CAPS_VERSION", "OutputCapTable", "build_cap_table", "hit_output_cap",
+]
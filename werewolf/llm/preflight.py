@@ -0,0 +1,352 @@
+"""Pre-flight input-token and cost estimates, before a request is sent.
+
+    preflight = Preflight(family="Gemini", context_window=1_000_000,
+                          input_usd_per_mtok=0.25)
+    estimate = preflight.estimate(request)   # before provider.complete()
+    preflight.fits(estimate, generation)     # else shrink or refuse
+
+We only learn what a call costs after it returns; a prompt that cannot
+fit the model's context window is still a paid round trip that ends in
+CONTEXT_WINDOW_EXCEEDED. The estimate is local and costs microseconds.
+
+Rules:
+- The estimator counts UTF-8 bytes per character class (ASCII letters,
+  digits, whitespace, other ASCII punctuation, non-ASCII bytes) and
+  weighs each class by its typical tokens per byte, plus a fixed
+  overhead per chat message. Byte-translate counting keeps it C-speed.
+- Tokenizers differ by model family, so raw estimates are scaled per
+  family (registry family, else read off the model slug) by a
+  TokenCalibration fitted from logged calls: scale = sum of
+  reported input_tokens / sum of raw estimates (calibrate(), or
+  python -m werewolf.cli.calibrate_tokens). Uncalibrated families use
+  scale 1.0.
+- Every API attempt's record carries its estimate in ``preflight``
+  (family, raw and scaled input tokens, input-side USD when the model
+  has a price), so estimate error is measured against reported usage:
+  the ledger's ``preflight`` block has bias and error rate per family.
+- fits() compares the estimate plus the request's max_output_tokens
+  with the model's context window; models without a known window
+  always fit. The agent shrinks a chat-layout session to fit, and
+  otherwise refuses the call (a non-API CONTEXT_WINDOW_EXCEEDED record)
+  and falls back without paying for the failure.
+- TokenRateLimiter is a tokens-per-minute bucket shared by every game
+  of a batch. A call reserves its estimate plus max_output_tokens,
+  waits while the bucket is in debt, and settles against reported
+  total_tokens afterwards. A losing hedge attempt reserved nothing and
+  is charged its reported total_tokens when it is recorded. The wait is
+  the timing rows' rate_limit_ms.
+- There are deliberately two estimators. estimate_tokens()
+  (werewolf/llm/tokens.py, bytes/4) sizes prompt budgets: event
+  windows and chat-history eviction. It is an experimental condition,
+  so it must be the same for every model and is logged in limits_dict().
+  This module predicts what one model will actually bill, so it is
+  per-family and calibrated. Budgets shape the prompt first, and
+  fits() is always the last check before sending. A prompt that is
+  within its budget but over the window is shrunk further or refused;
+  it is never sent.
+- Uncalibrated (scale 1.0), the two agree on game prompts to within
+  ESTIMATOR_AGREEMENT_TOLERANCE of each other, and a test checks this
+  over every layout and rendering. Budgets sit far below any context
+  window, so that gap cannot make a prompt trimmed to its budget fail
+  fits().
+"""
+from __future__ import annotations
+
+import json
+import math
+import string
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from werewolf.llm.provider import GenerationConfig, ModelRequest
+
+PREFLIGHT_VERSION = 1
+ESTIMATOR = "char_class_v1"
+
+# Tokens per UTF-8 byte of each class for BPE tokenizers of the
+# cl100k/o200k kind: ~4.5 letters per word piece, digits in groups of
+# 1-3, spaces mostly merged into the next word, JSON punctuation often
+# a token of its own, CJK about one token per 3-byte character.
+CLASS_WEIGHTS = {
+    "letters": 0.22,
+    "digits": 0.4,
+    "whitespace": 0.1,
+    "punctuation": 0.6,
+    "non_ascii": 0.35,
+}
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Largest relative gap between raw_estimate() and estimate_tokens() on
+# the game's own prompts (short chat turns pay MESSAGE_OVERHEAD_TOKENS).
+ESTIMATOR_AGREEMENT_TOLERANCE = 0.2
+
+DEFAULT_MIN_CALLS = 20
+
+_LETTERS = string.ascii_letters.encode("ascii")
+_DIGITS = string.digits.encode("ascii")
+_WHITESPACE = string.whitespace.encode("ascii")
+_ASCII = bytes(range(128))
+
+
+def class_counts(text: str) -> dict:
+    """UTF-8 byte counts per character class."""
+    data = text.encode("utf-8")
+    total = len(data)
+    letters = total - len(data.translate(None, _LETTERS))
+    digits = total - len(data.translate(None, _DIGITS))
+    whitespace = total - len(data.translate(None, _WHITESPACE))
+    non_ascii = len(data.translate(None, _ASCII))
+    return {
+        "letters": letters,
+        "digits": digits,
+        "whitespace": whitespace,
+        "punctuation": total - non_ascii - letters - digits - whitespace,
+        "non_ascii": non_ascii,
+    }
+
+
+def raw_estimate(messages: Iterable[str]) -> float:
+    """Uncalibrated input tokens for a list of message texts."""
+    tokens = 0.0
+    for text in messages:
+        counts = class_counts(text)
+        tokens += MESSAGE_OVERHEAD_TOKENS + sum(
+            CLASS_WEIGHTS[key] * n for key, n in counts.items()
+        )
+    return tokens
+
+
+def request_messages(request: ModelRequest) -> list[str]:
+    return [
+        request.system_prompt,
+        *(str(message.get("content", "")) for message in request.history),
+        request.user_prompt,
+    ]
+
+
+@dataclass(frozen=True)
+class Preflight:
+    """One model's estimator: family scale, context window and price."""
+
+    family: str = "Custom"
+    scale: float = 1.0
+    context_window: Optional[int] = None
+    input_usd_per_mtok: Optional[float] = None
+
+    def estimate(self, request: ModelRequest) -> dict:
+        raw = raw_estimate(request_messages(request))
+        tokens = math.ceil(raw * self.scale)
+        return {
+            "family": self.family,
+            "raw_input_tokens": round(raw),
+            "input_tokens": tokens,
+            "input_usd": (
+                round(tokens * self.input_usd_per_mtok / 1e6, 8)
+                if self.input_usd_per_mtok is not None else None
+            ),
+        }
+
+    def fits(self, estimate: dict, generation: GenerationConfig) -> bool:
+        if self.context_window is None:
+            return True
+        needed = estimate["input_tokens"] + (generation.max_output_tokens or 0)
+        return needed <= self.context_window
+
+    def to_json_dict(self) -> dict:
+        return {
+            "estimator": ESTIMATOR,
+            "family": self.family,
+            "scale": self.scale,
+            "context_window": self.context_window,
+            "input_usd_per_mtok": self.input_usd_per_mtok,
+        }
+
+
+@dataclass(frozen=True)
+class TokenCalibration:
+    scales: dict  # {family: reported input_tokens per raw estimated token}
+    calls: dict = field(default_factory=dict, compare=False)  # {family: n}
+
+    def scale_for(self, family: str) -> float:
+        return self.scales.get(family, 1.0)
+
+    def to_json_dict(self) -> dict:
+        return {
+            "preflight_version": PREFLIGHT_VERSION,
+            "estimator": ESTIMATOR,
+            "scales": self.scales,
+            "calls": self.calls,
+        }
+
+    @classmethod
+    def from_json_dict(cls, data: dict) -> "TokenCalibration":
+        if data.get("preflight_version") != PREFLIGHT_VERSION:
+            raise ValueError(
+                f"Unsupported token calibration version: "
+                f"{data.get('preflight_version')!r}"
+            )
+        if data.get("estimator") != ESTIMATOR:
+            raise ValueError(
+                f"Calibration is for estimator {data.get('estimator')!r}, "
+                f"not {ESTIMATOR!r}"
+            )
+        return cls(
+            scales={str(k): float(v) for k, v in data["scales"].items()},
+            calls={str(k): int(v) for k, v in (data.get("calls") or {}).items()},
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json_dict(), f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "TokenCalibration":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_json_dict(json.load(f))
+
+
+def _comparable(row: dict) -> Optional[tuple[str, int, int]]:
+    """(family, raw estimate, reported input tokens) of an llm_call row
+    whose estimate can be checked, else None."""
+    if (row.get("type", "llm_call") != "llm_call" or row.get("inherited_from")
+            or not row.get("api_attempted") or not row.get("api_ok")):
+        return None
+    stream = (row.get("provider_metadata") or {}).get("stream") or {}
+    if stream.get("stopped_early") or stream.get("cancelled"):
+        return None  # usage of a cut stream is itself an estimate
+    preflight = row.get("preflight") or {}
+    actual = (row.get("usage") or {}).get("input_tokens")
+    raw = preflight.get("raw_input_tokens")
+    if not isinstance(actual, int) or not isinstance(raw, int) or raw <= 0:
+        return None
+    return preflight.get("family") or "Custom", raw, actual
+
+
+def calibrate(rows: Iterable[dict], min_calls: int = DEFAULT_MIN_CALLS) -> TokenCalibration:
+    """Per-family scales from log rows; rows other than llm_call are
+    ignored. Families with fewer than min_calls comparable calls keep
+    scale 1.0 and are left out."""
+    if min_calls < 1:
+        raise ValueError("min_calls must be >= 1")
+    sums: dict = defaultdict(lambda: [0, 0, 0])  # raw, actual, calls
+    for row in rows:
+        found = _comparable(row)
+        if found is None:
+            continue
+        family, raw, actual = found
+        bucket = sums[family]
+        bucket[0] += raw
+        bucket[1] += actual
+        bucket[2] += 1
+    scales, calls = {}, {}
+    for family, (raw, actual, n) in sorted(sums.items()):
+        if n >= min_calls:
+            scales[family] = round(actual / raw, 4)
+            calls[family] = n
+    return TokenCalibration(scales=scales, calls=calls)
+
+
+# Passthrough model IDs resolve to family "Custom"; their tokenizer
+# family is read off the slug.
+_SLUG_FAMILIES = (
+    ("grok", "Grok"), ("xai/", "Grok"), ("gemini", "Gemini"),
+    ("anthropic/", "Claude"), ("claude", "Claude"), ("openai/", "GPT"),
+    ("gpt", "GPT"),
+)
+
+
+def tokenizer_family(spec) -> str:
+    if spec.family != "Custom":
+        return spec.family
+    slug = spec.model.lower()
+    for prefix, family in _SLUG_FAMILIES:
+        if slug.startswith(prefix):
+            return family
+    return "Custom"
+
+
+def preflight_for(spec, provider=None,
+                  calibration: Optional[TokenCalibration] = None) -> Preflight:
+    """Preflight for a registry ModelSpec. The registry's context window
+    and price win; gaps are filled from provider.model_info(model) when
+    the (unwrapped) provider has one."""
+    window = spec.context_window
+    price = spec.input_usd_per_mtok
+    model_info = getattr(provider, "model_info", None)
+    if model_info is not None and (window is None or price is None):
+        info = model_info(spec.model) or {}
+        window = window if window is not None else info.get("context_window")
+        price = price if price is not None else info.get("input_usd_per_mtok")
+    family = tokenizer_family(spec)
+    return Preflight(
+        family=family,
+        scale=calibration.scale_for(family) if calibration else 1.0,
+        context_window=window,
+        input_usd_per_mtok=price,
+    )
+
+
+class TokenRateLimiter:
+    """Tokens-per-minute bucket; thread-safe, shared across games.
+
+    The bucket holds at most one minute of tokens. acquire() reserves
+    first and then sleeps off any debt, so concurrent callers queue
+    behind each other's reservations; a reservation bigger than the
+    bucket waits for a full bucket and leaves it in debt."""
+
+    def __init__(self, tokens_per_minute: int,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if tokens_per_minute < 1:
+            raise ValueError("tokens_per_minute must be >= 1")
+        self.tokens_per_minute = tokens_per_minute
+        self._rate = tokens_per_minute / 60.0
+        self._clock = clock
+        self._sleep = sleep
+        self._available = float(tokens_per_minute)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._available = min(
+            float(self.tokens_per_minute),
+            self._available + (now - self._updated) * self._rate,
+        )
+        self._updated = now
+
+    def acquire(self, tokens: int) -> float:
+        """Reserve tokens; returns the seconds slept."""
+        with self._lock:
+            self._refill()
+            needed = min(tokens, self.tokens_per_minute)
+            wait = max(0.0, (needed - self._available) / self._rate)
+            self._available -= tokens
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def settle(self, reserved: int, actual: Optional[int]) -> None:
+        """Return (or charge) the difference once usage is known."""
+        if actual is None:
+            return
+        with self._lock:
+            self._refill()
+            self._available = min(
+                float(self.tokens_per_minute), self._available + reserved - actual,
+            )
+
+    def to_json_dict(self) -> dict:
+        return {"tokens_per_minute": self.tokens_per_minute}
+
+
+__all__ = [
+    "CLASS_WEIGHTS", "ESTIMATOR", "ESTIMATOR_AGREEMENT_TOLERANCE",
+    "PREFLIGHT_VERSION", "Preflight",
+    "TokenCalibration", "TokenRateLimiter", "calibrate", "class_counts",
+    "preflight_for", "raw_estimate", "tokenizer_family",
+]
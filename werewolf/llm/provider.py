@@ -6,6 +6,8 @@ can record the attempt uniformly. Only programming errors raise.
 """
 from __future__ import annotations
 
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from typing import Optional, Protocol, runtime_checkable
 
@@ -26,6 +28,9 @@ class GenerationConfig:
     reasoning_effort: Optional[str] = None  # xAI/Gemini effort or budget
     provider_seed: Optional[int] = None
     structured_output: bool = False  # request JSON-mode where supported
+    # Strict per-action JSON Schema (werewolf/engine/action_schemas.py)
+    # where supported, JSON mode elsewhere.
+    response_schema: bool = False
 
     def to_json_dict(self) -> dict:
         return {
@@ -35,6 +40,7 @@ class GenerationConfig:
             "reasoning_effort": self.reasoning_effort,
             "provider_seed": self.provider_seed,
             "structured_output": self.structured_output,
+            "response_schema": self.response_schema,
         }
 
 
@@ -44,6 +50,25 @@ class ModelRequest:
     system_prompt: str
     user_prompt: str
     generation: GenerationConfig = field(default_factory=GenerationConfig)
+    # Chat layout: earlier turns, [{"role": "user"|"assistant",
+    # "content": str}, ...] alternating and starting with "user", sent
+    # between the system prompt and user_prompt.
+    history: list[dict] = field(default_factory=list)
+    # Cache hint: user_prompt[:cache_prefix_chars] (and any history) is
+    # shared with the previous request. Providers with explicit cache
+    # control mark it and the system prompt as cacheable; None sends no
+    # hints.
+    cache_prefix_chars: Optional[int] = None
+    # werewolf.llm.streaming.STREAM_MODES: "off" | "full" | "early_stop".
+    stream: str = "off"
+    # Strict JSON Schema for the response; its "title" names it. Sent
+    # only when generation.response_schema is set.
+    response_schema: Optional[dict] = None
+    # Latency bucket for hedging (werewolf/llm/hedging.py).
+    required_action: Optional[str] = None
+    # Set to abandon the call. Streamed calls stop reading and close the
+    # stream; blocking calls cannot be cancelled and run to the end.
+    cancel: Optional[threading.Event] = None
 
 
 @dataclass
@@ -60,8 +85,16 @@ class ProviderResult:
     error_category: Optional[ErrorCategory] = None
     error_message: Optional[str] = None  # sanitized; never auth material
     retryable: Optional[bool] = None
+    # Provider retry hint (Retry-After), in milliseconds, on failures.
+    retry_after_ms: Optional[int] = None
     latency_ms: Optional[int] = None
+    # Streamed calls only (werewolf/llm/streaming.py), from the same start
+    # as latency_ms.
+    ttft_ms: Optional[int] = None
+    object_complete_ms: Optional[int] = None
     provider_metadata: dict = field(default_factory=dict)
+    # Hedged calls only: the losing attempt, which may still be running.
+    hedge_loser: Optional[Future] = None
 
 
 @runtime_checkable
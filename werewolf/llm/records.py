@@ -16,7 +16,11 @@ from enum import Enum
 from typing import Any, Optional
 
 # v2: added requested_generation (GenerationConfig snapshot per attempt)
-SCHEMA_VERSION = 2
+# v3: added ttft_ms, object_complete_ms (streamed calls)
+# v4: added backoff_ms (retry wait before this attempt)
+# v5: added hedged (one of two concurrent attempts; werewolf/llm/hedging.py)
+# v6: added preflight (input-token estimate; werewolf/llm/preflight.py)
+SCHEMA_VERSION = 6
 
 # xAI: 1 USD == 10^10 ticks (https://docs.x.ai/developers/cost-tracking)
 TICKS_PER_USD = 10_000_000_000
@@ -48,6 +52,8 @@ class ErrorCategory(str, Enum):
     UNKNOWN_MODEL = "unknown_model"
     MISSING_API_KEY = "missing_api_key"
     FALLBACK_USED = "fallback_used"
+    RETRY_BUDGET_EXHAUSTED = "retry_budget_exhausted"
+    HEDGE_LOST = "hedge_lost"
     GAME_TURN_LIMIT = "game_turn_limit"
     COMPLETED = "completed"
 
@@ -176,6 +182,11 @@ class UsageRecord:
     usage: TokenUsage = field(default_factory=TokenUsage)
     cost: CostInfo = field(default_factory=CostInfo.unavailable)
     latency_ms: Optional[int] = None
+    ttft_ms: Optional[int] = None
+    object_complete_ms: Optional[int] = None
+    backoff_ms: Optional[int] = None  # waited before this attempt
+    hedged: bool = False  # a hedge was sent; the loser is logged as HEDGE_LOST
+    preflight: Optional[dict] = None  # estimate made before the call
     provider_request_id: Optional[str] = None
     finish_reason: Optional[str] = None
     api_attempted: bool = True
@@ -201,6 +212,11 @@ class UsageRecord:
             "usage": self.usage.to_json_dict(),
             "cost": self.cost.to_json_dict(),
             "latency_ms": self.latency_ms,
+            "ttft_ms": self.ttft_ms,
+            "object_complete_ms": self.object_complete_ms,
+            "backoff_ms": self.backoff_ms,
+            "hedged": self.hedged,
+            "preflight": self.preflight,
             "provider_request_id": self.provider_request_id,
             "finish_reason": self.finish_reason,
             "api_attempted": self.api_attempted,
@@ -34,6 +34,10 @@ class ModelSpec:
     experimental: bool = True
     acceptable_resolved_models: tuple[str, ...] = ()
     resolved_model_prefixes: tuple[str, ...] = ()
+    # Pre-flight estimates (werewolf/llm/preflight.py); None = unknown,
+    # filled from the provider's model info where it has one.
+    context_window: Optional[int] = None
+    input_usd_per_mtok: Optional[float] = None
 
 
 class ProviderBuildStatus(str, Enum):
@@ -117,6 +121,7 @@ MODEL_REGISTRY: dict[str, ModelSpec] = {
         sort_order=30,
         selectable=True,
         experimental=False,
+        input_usd_per_mtok=0.25,
         acceptable_resolved_models=(
             "gemini/gemini-3.1-flash-lite", "gemini-3.1-flash-lite",
         ),
@@ -139,6 +144,7 @@ MODEL_REGISTRY: dict[str, ModelSpec] = {
         sort_order=40,
         selectable=True,
         experimental=False,
+        input_usd_per_mtok=1.50,
         acceptable_resolved_models=(
             "gemini/gemini-3.5-flash", "gemini-3.5-flash",
         ),
@@ -158,6 +164,7 @@ MODEL_REGISTRY: dict[str, ModelSpec] = {
         sort_order=50,
         selectable=True,
         experimental=False,
+        input_usd_per_mtok=1.00,
         acceptable_resolved_models=(
             "anthropic/claude-haiku-4-5-20251001", "claude-haiku-4-5-20251001",
         ),
@@ -176,6 +183,7 @@ MODEL_REGISTRY: dict[str, ModelSpec] = {
         sort_order=60,
         selectable=True,
         experimental=False,
+        input_usd_per_mtok=2.00,
         acceptable_resolved_models=(
             "anthropic/claude-sonnet-5", "claude-sonnet-5",
         ),
@@ -195,6 +203,7 @@ MODEL_REGISTRY: dict[str, ModelSpec] = {
         sort_order=70,
         selectable=True,
         experimental=False,
+        input_usd_per_mtok=0.20,
         acceptable_resolved_models=(
             "openai/gpt-5.4-nano-2026-03-17", "gpt-5.4-nano-2026-03-17",
         ),
@@ -214,6 +223,7 @@ MODEL_REGISTRY: dict[str, ModelSpec] = {
         sort_order=80,
         selectable=True,
         experimental=True,
+        input_usd_per_mtok=1.00,
         acceptable_resolved_models=("openai/gpt-5.6-luna", "gpt-5.6-luna"),
     ),
 }
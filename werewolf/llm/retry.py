@@ -0,0 +1,200 @@
+"""Retry policy: per-category retry counts, backoff with full jitter,
+provider retry hints and a per-game retry budget.
+
+    policy = RetryPolicy()                     # baseline: 3 attempts, no budget
+    policy = RetryPolicy.for_profile("resilient", base_ms=250)
+    budget = RetryBudget(policy.game_budget)   # one per game, shared
+    delay_ms = policy.backoff_ms(category, retry, retry_after_ms, rng)
+
+Rules:
+- Content errors (MALFORMED_JSON, INVALID_GAME_ACTION) are retried at
+  once: the model gets the error back and nothing is gained by waiting.
+  Transport errors (RATE_LIMITED, PROVIDER_ERROR, TIMEOUT, ...) wait
+  first, since an immediate retry almost always meets the same
+  condition.
+- Backoff is full jitter: uniform(0, min(max_backoff_ms, base_ms *
+  2**(n-1))) before the n-th retry of a turn. A provider's retry hint
+  (Retry-After) is a floor on the wait; a hint longer than
+  max_retry_after_ms is not waited for and the turn stops retrying.
+- Each category has its own retry count per turn (retries), and a turn
+  makes at most max_attempts attempts in all. Results the provider
+  marks non-retryable (auth, context window) are never retried.
+- The defaults keep the behaviour from before retry policies existed:
+  at most 3 attempts per turn in every retryable category, and no game
+  budget. The "resilient" profile opts in to more rate-limit retries,
+  5 attempts per turn and a game budget of 40 retries.
+- The game budget caps retries across all of a game's agents, so one
+  bad stretch of rate limits cannot multiply a game's cost or stall
+  it: once it is spent, turns fall back after their first failure.
+- Jitter uses its own RNG, never the game's: waits change only timing,
+  and seeded games replay identically.
+- RETRY_POLICY_VERSION is bumped whenever defaults or rules change; the
+  policy is logged in the config row.
+"""
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+from werewolf.llm.records import ErrorCategory
+
+RETRY_POLICY_VERSION = 2
+
+CONTENT_ERRORS = frozenset({
+    ErrorCategory.MALFORMED_JSON, ErrorCategory.INVALID_GAME_ACTION,
+})
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_CATEGORY_RETRIES = DEFAULT_MAX_ATTEMPTS - 1  # categories not listed
+DEFAULT_RETRIES: Mapping[str, int] = {
+    category.value: DEFAULT_CATEGORY_RETRIES for category in (
+        ErrorCategory.RATE_LIMITED, ErrorCategory.PROVIDER_ERROR,
+        ErrorCategory.NETWORK_ERROR, ErrorCategory.TIMEOUT,
+        ErrorCategory.EMPTY_RESPONSE, ErrorCategory.MALFORMED_JSON,
+        ErrorCategory.INVALID_GAME_ACTION,
+    )
+}
+
+RESILIENT_RETRIES: Mapping[str, int] = {
+    ErrorCategory.RATE_LIMITED.value: 4,
+    ErrorCategory.PROVIDER_ERROR.value: 2,
+    ErrorCategory.NETWORK_ERROR.value: 2,
+    ErrorCategory.TIMEOUT.value: 1,
+    ErrorCategory.EMPTY_RESPONSE.value: 2,
+    ErrorCategory.MALFORMED_JSON.value: 2,
+    ErrorCategory.INVALID_GAME_ACTION.value: 2,
+}
+
+RETRY_PROFILE_BASELINE = "baseline"
+RETRY_PROFILE_RESILIENT = "resilient"
+RETRY_PROFILES: Mapping[str, dict] = {
+    RETRY_PROFILE_BASELINE: {},
+    RETRY_PROFILE_RESILIENT: {
+        "retries": RESILIENT_RETRIES, "max_attempts": 5, "game_budget": 40,
+    },
+}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    retries: Mapping[str, int] = field(default_factory=lambda: dict(DEFAULT_RETRIES))
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    base_ms: int = 500
+    max_backoff_ms: int = 20_000
+    max_retry_after_ms: int = 60_000
+    game_budget: Optional[int] = None  # retries per game; None = unlimited
+    profile: str = RETRY_PROFILE_BASELINE
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        if min(self.base_ms, self.max_backoff_ms, self.max_retry_after_ms) < 0:
+            raise ValueError("backoff limits must be >= 0")
+        if self.game_budget is not None and self.game_budget < 0:
+            raise ValueError("game_budget must be >= 0 or None")
+        if self.profile not in RETRY_PROFILES:
+            raise ValueError(f"Unknown retry profile: {self.profile!r}")
+
+    @classmethod
+    def for_profile(cls, profile: str, **overrides) -> "RetryPolicy":
+        """A named profile's policy; overrides win over its settings."""
+        if profile not in RETRY_PROFILES:
+            raise ValueError(f"Unknown retry profile: {profile!r}")
+        settings = dict(RETRY_PROFILES[profile])
+        if "retries" in settings:
+            settings["retries"] = dict(settings["retries"])
+        settings.update(overrides)
+        return cls(profile=profile, **settings)
+
+    def retries_for(self, category: ErrorCategory) -> int:
+        return self.retries.get(category.value, DEFAULT_CATEGORY_RETRIES)
+
+    def backoff_ms(self, category: ErrorCategory, retry: int,
+                   retry_after_ms: Optional[int], rng: random.Random) -> Optional[int]:
+        """Milliseconds to wait before the retry-th retry of a turn after
+        a failure of category, or None when the provider's hint is too
+        long to wait for."""
+        if retry_after_ms is not None and retry_after_ms > self.max_retry_after_ms:
+            return None
+        if category in CONTENT_ERRORS:
+            return 0
+        ceiling = min(self.max_backoff_ms, self.base_ms * 2 ** (retry - 1))
+        return max(int(rng.uniform(0, ceiling)), retry_after_ms or 0)
+
+    def to_json_dict(self) -> dict:
+        return {
+            "retry_policy_version": RETRY_POLICY_VERSION,
+            "profile": self.profile,
+            "retries": dict(sorted(self.retries.items())),
+            "default_category_retries": DEFAULT_CATEGORY_RETRIES,
+            "max_attempts": self.max_attempts,
+            "base_ms": self.base_ms,
+            "max_backoff_ms": self.max_backoff_ms,
+            "max_retry_after_ms": self.max_retry_after_ms,
+            "game_budget": self.game_budget,
+        }
+
+
+class RetryBudget:
+    """Retries left for one game, shared by its agents (thread-safe)."""
+
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self.used = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.limit is not None and self.used >= self.limit:
+                self.denied += 1
+                return False
+            self.used += 1
+            return True
+
+    def to_json_dict(self) -> dict:
+        with self._lock:
+            return {"limit": self.limit, "used": self.used, "denied": self.denied}
+
+
+def parse_retry_after(headers) -> Optional[int]:
+    """Milliseconds from retry-after-ms / Retry-After (seconds or an
+    HTTP date) in a mapping of response headers, or None."""
+    if not headers:
+        return None
+    try:
+        lowered = {str(k).lower(): v for k, v in dict(headers).items()}
+    except (TypeError, ValueError):
+        return None
+    value = lowered.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0, int(float(value)))
+        except (TypeError, ValueError, OverflowError):
+            pass
+    value = lowered.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0, int(float(value) * 1000))
+    except (TypeError, ValueError, OverflowError):
+        pass
+    try:
+        when = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0, int((when - datetime.now(timezone.utc)).total_seconds() * 1000))
+
+
+__all__ = [
+    "CONTENT_ERRORS", "DEFAULT_MAX_ATTEMPTS", "DEFAULT_RETRIES",
+    "RESILIENT_RETRIES", "RETRY_POLICY_VERSION", "RETRY_PROFILES",
+    "RETRY_PROFILE_BASELINE", "RETRY_PROFILE_RESILIENT", "RetryBudget",
+    "RetryPolicy", "parse_retry_after",
+]
@@ -0,0 +1,239 @@
+"""Streaming completions that can stop once the JSON object is complete.
+
+    outcome = read_stream(deltas, started, stop_early=True)
+    # outcome.text, .ttft_ms, .object_complete_ms, .stopped_early
+
+Models often keep writing prose after the JSON object an agent needs.
+Streamed, the object's closing brace can be seen as it arrives, and the
+rest of the response need not be waited for.
+
+Rules:
+- STREAM_MODES: "off" (one blocking call; the default), "full" (stream to
+  the end: adds time-to-first-token and time-to-object and keeps
+  provider-reported usage and cost) and "early_stop" (cancel the stream
+  as soon as the first top-level JSON object is complete).
+- Stop early only on an object parse_response would take directly: the
+  first "{" in the text opens it and it decodes to a dict. Anything else
+  (prose braces before it, unescaped quotes, truncation) reads to the
+  end, so stopping never changes what the agent parses.
+- A cancelled stream loses its final usage chunk, and the provider bills
+  whatever it generated before the cancel lands, which is at least what
+  arrived. Such results never invent counts: TokenUsage stays empty
+  (the call counts in calls_missing_usage), local estimates of the
+  prompt and of the received text go to provider_metadata["stream"],
+  and cost is a tokenizer_estimate (a lower bound) or unavailable. Use
+  "full" where exact billing matters more than latency.
+- ttft_ms and object_complete_ms count from the same start as
+  latency_ms.
+- A request whose cancel event is set (a losing hedge,
+  werewolf/llm/hedging.py) stops reading at the next delta and is
+  billed like an early stop; its metadata says cancelled rather than
+  stopped_early.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from werewolf.llm.provider import ModelRequest, ProviderResult
+from werewolf.llm.records import CostInfo, TokenUsage
+from werewolf.llm.tokens import estimate_tokens
+
+STREAM_OFF = "off"
+STREAM_FULL = "full"
+STREAM_EARLY_STOP = "early_stop"
+STREAM_MODES = (STREAM_OFF, STREAM_FULL, STREAM_EARLY_STOP)
+
+_DECODER = json.JSONDecoder()
+_STRING_STOP = re.compile(r'["\\]')
+_STRUCTURE = re.compile(r'["{}]')
+
+
+class ObjectWatcher:
+    """Finds where the first top-level JSON object of a growing text ends.
+
+    Deltas are scanned once each; only the string/escape state and the
+    brace depth carry across them."""
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None  # just past the closing brace
+        self.abandoned = False  # the object cannot be cut out; read to the end
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None
+
+    def feed(self, delta: str) -> bool:
+        """Append delta; True once the object is complete."""
+        self._chunks.append(delta)
+        if self.complete or self.abandoned:
+            return self.complete
+        offset = self._offset
+        self._offset += len(delta)
+        i = 0
+        if self.start is None:
+            i = delta.find("{")
+            if i == -1:
+                return False
+            self.start = offset + i
+        n = len(delta)
+        while i < n:
+            if self._escape:
+                self._escape = False
+                i += 1
+            elif self._in_string:
+                stop = _STRING_STOP.search(delta, i)
+                if stop is None:
+                    break
+                i = stop.end()
+                if stop.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+            else:
+                stop = _STRUCTURE.search(delta, i)
+                if stop is None:
+                    break
+                i = stop.end()
+                c = stop.group()
+                if c == '"':
+                    self._in_string = True
+                elif c == "{":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._check(offset + i)
+                        break
+        return self.complete
+
+    def _check(self, end: int) -> None:
+        try:
+            obj, decoded_end = _DECODER.raw_decode(self.text, self.start)
+        except json.JSONDecodeError:
+            obj, decoded_end = None, None
+        if isinstance(obj, dict) and decoded_end == end:
+            self.end = end
+        else:
+            self.abandoned = True
+
+
+@dataclass
+class StreamOutcome:
+    text: str
+    ttft_ms: Optional[int]
+    object_complete_ms: Optional[int]
+    stopped_early: bool
+    chunks: int
+    cancelled: bool = False
+
+    @property
+    def cut(self) -> bool:
+        """The stream was closed before the end: usage is unreported."""
+        return self.stopped_early or self.cancelled
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
+
+
+def read_stream(deltas: Iterator[str], started: float, stop_early: bool,
+                cancel: Optional[threading.Event] = None) -> StreamOutcome:
+    """Consume text deltas (started = time.monotonic() at request start).
+    On an early stop or a cancel the iterator is closed, which must
+    cancel the underlying request."""
+    watcher = ObjectWatcher()
+    ttft_ms = object_complete_ms = None
+    chunks = 0
+    stopped_early = cancelled = False
+    try:
+        for delta in deltas:
+            if cancel is not None and cancel.is_set():
+                cancelled = True
+                break
+            if not delta:
+                continue
+            chunks += 1
+            if ttft_ms is None:
+                ttft_ms = _elapsed_ms(started)
+            if watcher.feed(delta) and object_complete_ms is None:
+                object_complete_ms = _elapsed_ms(started)
+                if stop_early:
+                    stopped_early = True
+                    break
+    finally:
+        if (stopped_early or cancelled) and hasattr(deltas, "close"):
+            deltas.close()
+    return StreamOutcome(
+        watcher.text, ttft_ms, object_complete_ms, stopped_early, chunks, cancelled,
+    )
+
+
+def stream_metadata(request: ModelRequest, outcome: StreamOutcome) -> dict:
+    metadata = {
+        "mode": request.stream,
+        "stopped_early": outcome.stopped_early,
+        "chunks": outcome.chunks,
+    }
+    if outcome.cancelled:
+        metadata["cancelled"] = True
+    if outcome.cut:
+        metadata["estimated_input_tokens"] = estimate_tokens("".join([
+            request.system_prompt,
+            *(message["content"] for message in request.history),
+            request.user_prompt,
+        ]))
+        metadata["received_output_tokens"] = estimate_tokens(outcome.text)
+    return metadata
+
+
+def with_stream_timings(
+    result: ProviderResult, request: ModelRequest, outcome: StreamOutcome,
+) -> ProviderResult:
+    """A result read to the end: provider usage and cost stand as reported."""
+    result.ttft_ms = outcome.ttft_ms
+    result.object_complete_ms = outcome.object_complete_ms
+    result.provider_metadata["stream"] = stream_metadata(request, outcome)
+    return result
+
+
+def early_stop_result(
+    request: ModelRequest, outcome: StreamOutcome, latency_ms: int,
+    resolved_model: Optional[str] = None, provider_request_id: Optional[str] = None,
+) -> ProviderResult:
+    """A stream cut short: the received text, no reported usage and
+    unavailable cost. Providers with a price table may replace the cost
+    with a tokenizer_estimate from provider_metadata["stream"]."""
+    return ProviderResult(
+        ok=True,
+        text=outcome.text,
+        usage=TokenUsage(),
+        cost=CostInfo.unavailable(),
+        resolved_model=resolved_model,
+        provider_request_id=provider_request_id,
+        latency_ms=latency_ms,
+        ttft_ms=outcome.ttft_ms,
+        object_complete_ms=outcome.object_complete_ms,
+        provider_metadata={"stream": stream_metadata(request, outcome)},
+    )
+
+
+__all__ = [
+    "ObjectWatcher", "STREAM_EARLY_STOP", "STREAM_FULL", "STREAM_MODES",
+    "STREAM_OFF", "StreamOutcome", "early_stop_result", "read_stream",
+    "stream_metadata", "with_stream_timings",
+]
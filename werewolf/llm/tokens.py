@@ -0,0 +1,30 @@
+"""Fast local token estimates for prompt budgets.
+
+    estimate_tokens("[VOTE] P1 voted for P5")   # -> 6
+
+Rules:
+- No tokenizer dependency and no per-provider tables: the estimate is
+  ceil(UTF-8 bytes / BYTES_PER_TOKEN). English prose runs close to four
+  bytes per token on the tokenizers we use. Non-ASCII text costs more
+  bytes per character, which keeps the estimate high exactly where
+  tokenizers split finer.
+- Estimates drive budgets only (observation windows, chat-session
+  eviction). Cost and usage accounting always use provider-reported
+  token counts.
+- The estimator is named in limits_dict() (TOKEN_ESTIMATOR), so a change
+  here is a change of experimental condition: rename it when the
+  formula changes.
+"""
+from __future__ import annotations
+
+TOKEN_ESTIMATOR = "utf8_bytes_div_4"
+BYTES_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    if text.isascii():
+        return -(-len(text) // BYTES_PER_TOKEN)
+    return -(-len(text.encode("utf-8")) // BYTES_PER_TOKEN)
+
+
+__all__ = ["BYTES_PER_TOKEN", "TOKEN_ESTIMATOR", "estimate_tokens"]
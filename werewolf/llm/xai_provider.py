@@ -6,22 +6,37 @@ normalized ErrorCategory. Never logs or attaches the API key to anything.
 """
 from __future__ import annotations
 
+import json
 import logging
 import time
 from typing import Optional
 
 from werewolf.llm.provider import ModelRequest, ProviderResult
 from werewolf.llm.records import CostInfo, ErrorCategory, TokenUsage
+from werewolf.llm.retry import parse_retry_after
+from werewolf.llm.streaming import (
+    STREAM_EARLY_STOP,
+    STREAM_OFF,
+    early_stop_result,
+    read_stream,
+    with_stream_timings,
+)
 
 logger = logging.getLogger("werewolf.llm.xai")
 
 try:
     from xai_sdk import Client
-    from xai_sdk.chat import system, user
+    from xai_sdk.chat import assistant, system, user
     HAS_XAI = True
 except ImportError:
     HAS_XAI = False
 
+try:
+    from xai_sdk.proto import chat_pb2
+    HAS_XAI_SCHEMA = True
+except ImportError:
+    HAS_XAI_SCHEMA = False
+
 
 # Exception classification: xai-sdk is gRPC-based; we match defensively on
 # class names, gRPC status names, and message substrings so a pinned SDK
@@ -67,6 +82,17 @@ def classify_exception(exc: Exception) -> ErrorCategory:
     return ErrorCategory.PROVIDER_ERROR
 
 
+def retry_after_ms(exc: Exception) -> Optional[int]:
+    """A retry-after hint in a gRPC error's trailing metadata, if any."""
+    trailing = getattr(exc, "trailing_metadata", None)
+    if not callable(trailing):
+        return None
+    try:
+        return parse_retry_after(trailing())
+    except Exception:
+        return None
+
+
 def build_chat_kwargs(request: ModelRequest) -> dict:
     """Map GenerationConfig onto xai-sdk chat.create kwargs (only the
     fields that were explicitly requested)."""
@@ -82,9 +108,22 @@ def build_chat_kwargs(request: ModelRequest) -> dict:
         kwargs["max_tokens"] = g.max_output_tokens
     if g.provider_seed is not None:
         kwargs["seed"] = g.provider_seed
+    if request.response_schema is not None:
+        kwargs["response_format"] = _schema_format(request.response_schema)
     return kwargs
 
 
+def _schema_format(schema: dict):
+    """A strict JSON Schema response format, or JSON mode if the installed
+    xai-sdk has no schema format type (xAI enforces schemas strictly)."""
+    if not HAS_XAI_SCHEMA:
+        return "json_object"
+    return chat_pb2.ResponseFormat(
+        format_type=chat_pb2.FormatType.FORMAT_TYPE_JSON_SCHEMA,
+        schema=json.dumps(schema),
+    )
+
+
 def _unexpected_kwarg_name(exc: Exception, kwargs: dict):
     """Extract the offending kwarg from a TypeError/ValueError, if
     identifiable (matches quoted names, raw names, or names with spaces:
@@ -126,10 +165,16 @@ class XAIProvider:
         try:
             chat, dropped = self._create_chat(request)
             chat.append(system(request.system_prompt))
+            for message in request.history:
+                turn = user if message["role"] == "user" else assistant
+                chat.append(turn(message["content"]))
             chat.append(user(request.user_prompt))
-            response = chat.sample()
-            latency_ms = int((time.monotonic() - started) * 1000)
-            result = self._result_from_response(response, latency_ms)
+            if request.stream != STREAM_OFF:
+                result = self._stream(chat, request, started)
+            else:
+                response = chat.sample()
+                latency_ms = int((time.monotonic() - started) * 1000)
+                result = self._result_from_response(response, latency_ms)
             if dropped:
                 result.provider_metadata["generation_dropped"] = dropped
             return result
@@ -143,9 +188,42 @@ class XAIProvider:
                 error_category=category,
                 error_message=_sanitize_error_message(exc),
                 retryable=category in _RETRYABLE,
+                retry_after_ms=retry_after_ms(exc),
                 latency_ms=latency_ms,
             )
 
+    def _stream(self, chat, request: ModelRequest, started: float) -> ProviderResult:
+        """chat.stream(). Read to the end, the accumulated response carries
+        the exact usage and ticks; stopped early, cost is unavailable (the
+        ticks only arrive with the final chunk)."""
+        stream = chat.stream()
+        latest = []
+
+        def deltas():
+            try:
+                for response, chunk in stream:
+                    latest[:] = [response]
+                    yield getattr(chunk, "content", None) or ""
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+
+        outcome = read_stream(
+            deltas(), started, request.stream == STREAM_EARLY_STOP, request.cancel,
+        )
+        latency_ms = int((time.monotonic() - started) * 1000)
+        response = latest[0] if latest else None
+        if outcome.cut:
+            return early_stop_result(
+                request, outcome, latency_ms,
+                resolved_model=getattr(response, "model", None),
+                provider_request_id=getattr(response, "id", None),
+            )
+        return with_stream_timings(
+            self._result_from_response(response, latency_ms), request, outcome,
+        )
+
     def _create_chat(self, request: ModelRequest):
         """chat.create with the requested GenerationConfig. Params (or
         param VALUES) the installed xai-sdk rejects are dropped one at a
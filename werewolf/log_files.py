@@ -0,0 +1,208 @@
+"""Plain and compressed game-log files.
+
+A game log is ``<game_id>.jsonl``, ``<game_id>.jsonl.gz`` or
+``<game_id>.jsonl.zst``. Every reader goes through this module, so the
+compression is invisible past the file boundary.
+
+Rules:
+- The canonical log is the decompressed JSONL byte stream; provenance
+  hashes (report ``source.sha256``) are defined over those bytes, so a
+  log hashes the same whether stored plain or compressed.
+- flush() on a compressed writer ends a deflate sync point (gzip) or a
+  whole frame (zstd): everything written so far is readable even if the
+  process dies before close(). Flushing costs compression ratio, so
+  compressed logs pair best with phase-level durability.
+- Readers tolerate a truncated final block (a game still running or one
+  that crashed) and return every complete byte before it.
+- zstd is optional (``pip install zstandard``); gzip is always available.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD)
+
+# Lookup order when a game's log is resolved by ID.
+LOG_SUFFIXES = {
+    COMPRESSION_NONE: ".jsonl",
+    COMPRESSION_GZIP: ".jsonl.gz",
+    COMPRESSION_ZSTD: ".jsonl.zst",
+}
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+_CHUNK = 1 << 16
+
+
+def log_filename(game_id: str, compression: str = COMPRESSION_NONE) -> str:
+    return f"{game_id}{LOG_SUFFIXES[compression]}"
+
+
+def compression_for_path(path: str | Path) -> str:
+    name = Path(path).name
+    for compression in (COMPRESSION_GZIP, COMPRESSION_ZSTD):
+        if name.endswith(LOG_SUFFIXES[compression]):
+            return compression
+    return COMPRESSION_NONE
+
+
+def game_id_from_log_name(name: str) -> str | None:
+    """``game_x.jsonl.gz`` -> ``game_x``; None if not a log file name."""
+    for suffix in sorted(LOG_SUFFIXES.values(), key=len, reverse=True):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return None
+
+
+def find_log(root: str | Path, game_id: str) -> Path | None:
+    root = Path(root)
+    for compression in COMPRESSIONS:
+        path = root / log_filename(game_id, compression)
+        if path.exists():
+            return path
+    return None
+
+
+def check_compression(compression: str) -> None:
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unknown log compression {compression!r}; expected one of {COMPRESSIONS}"
+        )
+    if compression == COMPRESSION_ZSTD and not HAS_ZSTD:
+        raise RuntimeError(
+            "zstd log compression requires the zstandard package "
+            "(pip install zstandard)"
+        )
+
+
+class LogFileWriter:
+    """Append-only text writer over a plain, gzip or zstd file."""
+
+    def __init__(self, path: str | Path, compression: str = COMPRESSION_NONE):
+        check_compression(compression)
+        self.compression = compression
+        self._raw = open(path, "wb")
+        if compression == COMPRESSION_GZIP:
+            self._stream = gzip.GzipFile(
+                fileobj=self._raw, mode="wb", compresslevel=GZIP_LEVEL,
+            )
+        elif compression == COMPRESSION_ZSTD:
+            self._stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(
+                self._raw, closefd=False,
+            )
+        else:
+            self._stream = self._raw
+        self.closed = False
+
+    def write(self, text: str) -> None:
+        self._stream.write(text.encode("utf-8"))
+
+    def flush(self) -> None:
+        if self.compression == COMPRESSION_ZSTD:
+            self._stream.flush(zstandard.FLUSH_FRAME)
+        elif self.compression == COMPRESSION_GZIP:
+            self._stream.flush(zlib.Z_SYNC_FLUSH)
+        self._raw.flush()
+
+    def fileno(self) -> int:
+        return self._raw.fileno()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if self._stream is not self._raw:
+                self._stream.close()
+        finally:
+            self._raw.close()
+
+
+def _gunzip_tolerant(data: bytes) -> bytes:
+    """Decompress (possibly concatenated) gzip members; a truncated tail
+    yields what was decompressible."""
+    out = []
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)
+        try:
+            out.append(decompressor.decompress(data))
+        except zlib.error:
+            break
+        if not decompressor.eof:
+            break
+        data = decompressor.unused_data
+    return b"".join(out)
+
+
+def _unzstd_tolerant(data: bytes) -> bytes:
+    if not HAS_ZSTD:
+        raise RuntimeError(
+            "Reading a .jsonl.zst log requires the zstandard package "
+            "(pip install zstandard)"
+        )
+    out = []
+    while data:
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        try:
+            out.append(decompressor.decompress(data))
+        except zstandard.ZstdError:
+            break
+        if not decompressor.eof:
+            break
+        data = decompressor.unused_data
+    return b"".join(out)
+
+
+def read_log_bytes(path: str | Path) -> bytes:
+    """Canonical (decompressed) JSONL bytes of a plain or compressed log."""
+    data = Path(path).read_bytes()
+    compression = compression_for_path(path)
+    if compression == COMPRESSION_GZIP:
+        return _gunzip_tolerant(data)
+    if compression == COMPRESSION_ZSTD:
+        return _unzstd_tolerant(data)
+    return data
+
+
+def iter_log_lines(path: str | Path) -> Iterator[str]:
+    """Decoded lines of a plain or compressed log (keeps line endings)."""
+    if compression_for_path(path) == COMPRESSION_NONE:
+        with open(path, encoding="utf-8") as handle:
+            yield from handle
+        return
+    yield from io.StringIO(read_log_bytes(path).decode("utf-8"))
+
+
+def iter_log_chunks(path: str | Path) -> Iterator[bytes]:
+    """Canonical bytes in chunks, e.g. for streaming a download."""
+    if compression_for_path(path) == COMPRESSION_NONE:
+        with open(path, "rb") as handle:
+            while chunk := handle.read(_CHUNK):
+                yield chunk
+        return
+    data = read_log_bytes(path)
+    for start in range(0, len(data), _CHUNK):
+        yield data[start:start + _CHUNK]
+
+
+__all__ = [
+    "COMPRESSIONS", "COMPRESSION_GZIP", "COMPRESSION_NONE", "COMPRESSION_ZSTD",
+    "HAS_ZSTD", "LOG_SUFFIXES", "LogFileWriter", "check_compression",
+    "compression_for_path", "find_log", "game_id_from_log_name",
+    "iter_log_chunks", "iter_log_lines", "log_filename", "read_log_bytes",
+]
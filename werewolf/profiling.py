@@ -0,0 +1,189 @@
+"""Per-game cProfile files and an aggregated hot-function table.
+
+    python -m werewolf.cli.run_trials --scripted --trials 50 --quiet --profile
+    python -m werewolf.profiling outputs/games/*.prof --top 20
+
+With ``--profile`` each game's run() executes under cProfile and its
+stats are written as ``<game_id>.prof`` next to the game's JSONL log
+(open with ``python -m pstats`` or snakeviz). The batch summary gets a
+``profile`` block aggregating every trial's stats, plus the summary's
+own log analysis (``trials_summary_<run_id>.prof``): time per bucket
+and the top-N functions by own (exclusive) time.
+
+Rules:
+- Deterministic profiling (stdlib cProfile), so call counts are exact and
+  runs on one machine are comparable across commits. It slows Python-heavy
+  code noticeably; compare profiled runs only with profiled runs. For
+  low-overhead sampling of a live process attach an external sampler
+  (e.g. py-spy) instead.
+- Only the thread that runs the game is profiled. Background subscribers
+  and the async log writer thread do not appear.
+- File paths are reported relative to the checkout (``werewolf/...``),
+  ``<stdlib>/`` or ``<site-packages>/``, so tables from different
+  machines and commits line up.
+- Buckets come from the file a function lives in; see BUCKET_RULES.
+  Standard-library and built-in functions (json encoding, I/O) are
+  "other", not charged to their caller.
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import os
+import pstats
+import sysconfig
+from pathlib import Path
+from typing import Callable, Optional
+
+PROFILE_SCHEMA_VERSION = 1
+DEFAULT_TOP_N = 25
+
+BUCKET_ENGINE = "engine"
+BUCKET_AGENT = "agent"
+BUCKET_LEDGER_LOGGING = "ledger_logging"
+BUCKET_REPORTING = "reporting"
+BUCKET_OTHER = "other"
+BUCKETS = (
+    BUCKET_ENGINE, BUCKET_AGENT, BUCKET_LEDGER_LOGGING, BUCKET_REPORTING,
+    BUCKET_OTHER,
+)
+
+# First matching prefix wins; paths are relative to the checkout.
+BUCKET_RULES = (
+    ("werewolf/engine/logging.py", BUCKET_LEDGER_LOGGING),
+    ("werewolf/engine/log_writer.py", BUCKET_LEDGER_LOGGING),
+    ("werewolf/engine/bus.py", BUCKET_LEDGER_LOGGING),
+    ("werewolf/log_files.py", BUCKET_LEDGER_LOGGING),
+    ("werewolf/llm/ledger.py", BUCKET_LEDGER_LOGGING),
+    ("werewolf/llm/records.py", BUCKET_LEDGER_LOGGING),
+    ("werewolf/agents/", BUCKET_AGENT),
+    ("werewolf/llm/", BUCKET_AGENT),
+    ("werewolf/reporting/", BUCKET_REPORTING),
+    ("werewolf/evaluation/", BUCKET_REPORTING),
+    ("werewolf/", BUCKET_ENGINE),
+)
+
+_ROOT = Path(__file__).resolve().parents[1]
+_PREFIXES = (
+    (_ROOT, ""),
+    (Path(sysconfig.get_paths()["purelib"]).resolve(), "<site-packages>/"),
+    (Path(sysconfig.get_paths()["stdlib"]).resolve(), "<stdlib>/"),
+)
+
+
+def profile_path_for(log_path: str, game_id: str) -> str:
+    return os.path.join(os.path.dirname(log_path), f"{game_id}.prof")
+
+
+def run_profiled(fn: Callable, path: str):
+    """Call fn() under cProfile and write its stats to path, also when
+    fn raises."""
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn)
+    finally:
+        profiler.dump_stats(path)
+
+
+def relative_path(filename: str) -> str:
+    path = Path(filename).resolve()
+    for root, label in _PREFIXES:
+        try:
+            return label + path.relative_to(root).as_posix()
+        except ValueError:
+            continue
+    return filename
+
+
+def bucket_for(path: str) -> str:
+    for prefix, bucket in BUCKET_RULES:
+        if path.startswith(prefix):
+            return bucket
+    return BUCKET_OTHER
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def aggregate_profiles(paths: list[str], top_n: int = DEFAULT_TOP_N) -> dict:
+    """Merge .prof files into per-bucket totals and a top-N table sorted
+    by own time. Missing files are skipped and counted."""
+    existing = [p for p in paths if os.path.exists(p)]
+    result = {
+        "profile_schema_version": PROFILE_SCHEMA_VERSION,
+        "profiler": "cProfile",
+        "files": len(existing),
+        "missing": len(paths) - len(existing),
+        "top_n": top_n,
+    }
+    if not existing:
+        return {**result, "total_ms": 0.0, "buckets": {}, "functions": []}
+    stats = pstats.Stats(*existing).stats
+    total = sum(tt for _, _, tt, _, _ in stats.values())
+    buckets = {bucket: 0.0 for bucket in BUCKETS}
+    functions = []
+    for (filename, line, name), (cc, nc, tt, ct, _) in stats.items():
+        path = relative_path(filename) if filename != "~" else "~"
+        bucket = bucket_for(path)
+        buckets[bucket] += tt
+        functions.append({
+            "function": name if path == "~" else f"{path}:{line}({name})",
+            "bucket": bucket,
+            "calls": nc,
+            "primitive_calls": cc,
+            "tottime_ms": _ms(tt),
+            "cumtime_ms": _ms(ct),
+        })
+    functions.sort(key=lambda f: (-f["tottime_ms"], f["function"]))
+    return {
+        **result,
+        "total_ms": _ms(total),
+        "buckets": {
+            bucket: {
+                "tottime_ms": _ms(seconds),
+                "share": round(seconds / total, 4) if total else None,
+            }
+            for bucket, seconds in buckets.items()
+        },
+        "functions": functions[:top_n],
+    }
+
+
+def format_profile(profile: dict, limit: Optional[int] = None) -> str:
+    lines = [
+        f"Profile: {profile['files']} file(s), {profile['total_ms']:.1f} ms own time",
+        "  " + "  ".join(
+            f"{bucket} {row['share']:.0%}"
+            for bucket, row in profile["buckets"].items()
+            if row["share"] is not None
+        ),
+        f"  {'own ms':>10} {'cum ms':>10} {'calls':>9}  {'bucket':<15} function",
+    ]
+    for row in profile["functions"][:limit]:
+        lines.append(
+            f"  {row['tottime_ms']:>10.1f} {row['cumtime_ms']:>10.1f} "
+            f"{row['calls']:>9}  {row['bucket']:<15} {row['function']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Aggregate per-game .prof files into a hot-function table",
+    )
+    parser.add_argument("paths", nargs="+", help=".prof files written by --profile")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_N)
+    args = parser.parse_args(argv)
+    print(format_profile(aggregate_profiles(args.paths, args.top)))
+
+
+__all__ = [
+    "BUCKETS", "BUCKET_RULES", "DEFAULT_TOP_N", "PROFILE_SCHEMA_VERSION",
+    "aggregate_profiles", "bucket_for", "format_profile", "profile_path_for",
+    "run_profiled",
+]
+
+
+if __name__ == "__main__":
+    main()
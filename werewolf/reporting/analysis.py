@@ -4,6 +4,7 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import Optional
 
+from werewolf.engine.belief_sampling import SamplingDesign
 from werewolf.engine.beliefs import (
     BELIEF_SCHEMA_VERSION,
     CHECKPOINT_POST,
@@ -42,7 +43,19 @@ def _top(probabilities: dict[int, float]) -> set[int]:
     return {pid for pid, value in probabilities.items() if value == maximum}
 
 
+def _weighted_rate(revisions: list[dict], hit: str, given: bool) -> Optional[float]:
+    pool = [r for r in revisions if r["pre_correct"] is given]
+    total = sum(r["design_weight"] for r in pool)
+    hits = sum(r["design_weight"] for r in pool if r["revision"] == hit)
+    return hits / total if total else None
+
+
 def build_belief_analysis(config: dict, timeline: list[dict]) -> dict:
+    """Snapshot coverage, trajectories and revisions. Under a
+    belief_sampling policy, pre-discussion snapshots the design skipped
+    are "not_sampled" (not "missing"), pre-dependent rows carry their
+    design weight, and the summary's weighted block estimates what a
+    census of the game would have shown."""
     wolves, village, _ = _role_sets(config)
     snapshot_events = [
         event for event in timeline if event.get("type") == "belief_snapshot"
@@ -58,6 +71,7 @@ def build_belief_analysis(config: dict, timeline: list[dict]) -> dict:
             "revisions": [],
         }
 
+    design = SamplingDesign.from_events(config, timeline)
     snapshots = {}
     coverage = defaultdict(lambda: {"emitted": 0, "valid": 0})
     trajectories = []
@@ -108,12 +122,19 @@ def build_belief_analysis(config: dict, timeline: list[dict]) -> dict:
     for round_, observer in rounds_observers:
         for checkpoint in (CHECKPOINT_PRE, CHECKPOINT_POST):
             event = snapshots.get((round_, observer, checkpoint))
+            weight = (
+                design.pre_weight(round_) if checkpoint == CHECKPOINT_PRE else 1.0
+            )
             if event is None:
+                skipped = (checkpoint == CHECKPOINT_PRE
+                           and design.not_sampled(round_, observer))
                 checkpoints.append({
                     "round": round_, "observer_id": observer,
-                    "checkpoint": checkpoint, "status": "missing",
+                    "checkpoint": checkpoint,
+                    "status": "not_sampled" if skipped else "missing",
                     "event_id": None, "source_line": None,
                     "usable_probability_count": 0,
+                    "design_weight": None,
                 })
                 continue
             payload = as_mapping(event.get("payload"))
@@ -130,6 +151,7 @@ def build_belief_analysis(config: dict, timeline: list[dict]) -> dict:
                 "event_id": event.get("event_id"),
                 "source_line": event.get("source_line"),
                 "usable_probability_count": usable_count,
+                "design_weight": weight,
             })
 
     changes = []
@@ -144,6 +166,7 @@ def build_belief_analysis(config: dict, timeline: list[dict]) -> dict:
         pre_valid = recorded_belief_payload_valid(pre_payload)
         post_valid = recorded_belief_payload_valid(post_payload)
         evidence_quality = "valid" if pre_valid and post_valid else "partial"
+        weight = design.pre_weight(round_)
         pre = _probabilities(pre_payload)
         post = _probabilities(post_payload)
         for target in sorted(set(pre) & set(post)):
@@ -161,6 +184,7 @@ def build_belief_analysis(config: dict, timeline: list[dict]) -> dict:
                 "pre_snapshot_valid": pre_valid,
                 "post_snapshot_valid": post_valid,
                 "evidence_quality": evidence_quality,
+                "design_weight": weight,
                 "most_influential_recent_speaker": post_payload.get(
                     "most_influential_recent_speaker"
                 ),
@@ -188,6 +212,7 @@ def build_belief_analysis(config: dict, timeline: list[dict]) -> dict:
             "post_top_suspects": sorted(post_top),
             "pre_correct": pre_correct, "post_correct": post_correct,
             "revision": revision,
+            "design_weight": weight,
             "intended_vote": post_payload.get("intended_vote"),
             "vote_confidence_pre": pre_payload.get("vote_confidence"),
             "vote_confidence_post": post_payload.get("vote_confidence"),
@@ -215,9 +240,18 @@ def build_belief_analysis(config: dict, timeline: list[dict]) -> dict:
             vote in wolves if vote is not None and wolves else None
         )
 
+    if design.sampled:
+        coverage[CHECKPOINT_PRE]["not_sampled"] = design.summary()["not_sampled"]
+
+    def weighted(kind: str) -> float:
+        return round(sum(
+            r["design_weight"] for r in revisions if r["revision"] == kind
+        ), 6)
+
     return {
         "available": True,
         "belief_schema_version": config.get("belief_schema_version"),
+        "sampling": design.summary() if design.sampled else None,
         "coverage": dict(coverage),
         "checkpoints": checkpoints,
         "trajectories": trajectories,
@@ -240,6 +274,18 @@ def build_belief_analysis(config: dict, timeline: list[dict]) -> dict:
             "partial_changes": sum(
                 item["evidence_quality"] == "partial" for item in changes
             ),
+            "weighted": {
+                "revision_pairs": round(
+                    sum(r["design_weight"] for r in revisions), 6
+                ),
+                "harmful_revisions": weighted("harmful"),
+                "beneficial_revisions": weighted("beneficial"),
+                "correct_belief_retentions": weighted("correct_belief_retained"),
+                "harmful_revision_rate": _weighted_rate(revisions, "harmful", True),
+                "beneficial_revision_rate": _weighted_rate(
+                    revisions, "beneficial", False
+                ),
+            },
         },
     }
 
@@ -14,11 +14,12 @@ from werewolf.reporting.analysis import (
     expected_actions_for_event,
 )
 from werewolf.reporting.parser import ParsedGameLog, parse_game_log
+from werewolf.reporting.timing import build_timing_waterfall
 from werewolf.reporting.usage import compare_terminal_summary, compute_usage
 
 
 REPORT_SCHEMA_VERSION = 1
-REPORT_BUILD_VERSION = 12
+REPORT_BUILD_VERSION = 19
 ANALYSIS_ELIGIBILITY_POLICY_VERSION = 1
 _AGENT_EVENT_TYPES = {
     "thought", "message", "vote", "belief_snapshot", "divine_result",
@@ -168,6 +169,25 @@ def _timeline(parsed: ParsedGameLog, calls_by_id: dict[str, list[dict]]) -> list
     return timeline
 
 
+def _lineage(config: dict, timeline: list[dict], calls: list[dict]) -> Optional[dict]:
+    """Parent link for a forked game, with counts recomputed from the rows
+    actually present rather than trusted from the config block."""
+    lineage = config.get("lineage")
+    if not isinstance(lineage, dict) or not lineage.get("parent_game_id"):
+        return None
+    return {
+        "parent_game_id": lineage.get("parent_game_id"),
+        "checkpoint": as_mapping(lineage.get("checkpoint")),
+        "lineage_schema_version": lineage.get("lineage_schema_version"),
+        "inherited_events": sum(1 for e in timeline if e.get("inherited_from")),
+        "inherited_llm_calls": sum(1 for c in calls if c.get("inherited_from")),
+        "fork_event_id": next(
+            (e.get("event_id") for e in timeline if not e.get("inherited_from")),
+            None,
+        ),
+    }
+
+
 def build_full_report(
     parsed: ParsedGameLog,
     *,
@@ -179,7 +199,7 @@ def build_full_report(
     outcome = parsed.outcome
     # The validated filename/route ID is canonical. A conflicting config ID is
     # preserved as a parser warning but must never redirect report links.
-    game_id = metadata.get("game_id") or parsed.path.stem
+    game_id = metadata.get("game_id") or parsed.game_id
     completion = "completed" if outcome else "incomplete"
     display_status = "active" if active_game_id == game_id else completion
 
@@ -206,6 +226,15 @@ def build_full_report(
         if isinstance(call.get("call_id"), str) and call.get("call_id"):
             calls_by_id[call["call_id"]].append(call)
     timeline = _timeline(parsed, calls_by_id)
+    lineage = _lineage(config, timeline, parsed.llm_calls)
+    if lineage and lineage["inherited_events"] != as_mapping(
+        config.get("lineage")
+    ).get("inherited_events"):
+        warnings.append({
+            "code": "lineage_prefix_mismatch",
+            "message": "Inherited event rows differ from the recorded fork prefix",
+            "source_line": None,
+        })
 
     event_schema = config.get("event_schema_version")
     missing_strategic_evidence = []
@@ -277,6 +306,12 @@ def build_full_report(
         "role": player["role"], "team": player["team"],
     } for player in players}
     configured_role_models = as_mapping(config.get("role_models"))
+    links = {
+        "raw": f"/api/games/{game_id}/raw",
+        "report": f"/games/{game_id}",
+    }
+    if lineage:
+        links["parent_report"] = f"/games/{lineage['parent_game_id']}"
     overview = {
         "game_id": game_id,
         "completion_status": completion,
@@ -307,7 +342,9 @@ def build_full_report(
         },
         "discussion_cycles": config.get("discussion_cycles"),
         "belief_snapshots": config.get("belief_snapshots"),
+        "belief_sampling": config.get("belief_sampling"),
         "limits": config.get("limits"),
+        "lineage": lineage,
         "validity": validity,
         "usage": computed_usage,
     }
@@ -322,6 +359,8 @@ def build_full_report(
             "sha256": parsed.sha256,
             "size_bytes": parsed.source_size,
             "mtime_ns": parsed.source_mtime_ns,
+            "compression": parsed.compression,
+            "canonical_size_bytes": parsed.canonical_size,
             "created_at": metadata.get("created_at") or config.get("created_at"),
             "created_at_source": metadata.get("created_at_source"),
             "record_counts": parsed.record_counts,
@@ -341,6 +380,7 @@ def build_full_report(
             "terminal_consistency": terminal_check,
             "reliability": usage_reliability,
         },
+        "timing": build_timing_waterfall(parsed.timings),
         "reproducibility": {
             "code_commit": config.get("code_commit"),
             "prompt_version": config.get("prompt_version"),
@@ -348,6 +388,7 @@ def build_full_report(
             "event_schema_version": config.get("event_schema_version"),
             "belief_schema_version": config.get("belief_schema_version"),
             "validity_policy_version": validity.get("policy_version"),
+            "response_protocol": validity.get("response_protocol"),
             "runtime": config.get("runtime"),
             "report_schema_version": REPORT_SCHEMA_VERSION,
             "report_build_version": REPORT_BUILD_VERSION,
@@ -355,10 +396,7 @@ def build_full_report(
                 ANALYSIS_ELIGIBILITY_POLICY_VERSION
             ),
         },
-        "links": {
-            "raw": f"/api/games/{game_id}/raw",
-            "report": f"/games/{game_id}",
-        },
+        "links": links,
     }
 
 
@@ -389,6 +427,7 @@ def build_history_summary(report: dict) -> dict:
         "rounds": overview.get("rounds"),
         "seed": overview.get("seed"),
         "n_players": overview.get("n_players"),
+        "parent_game_id": (overview.get("lineage") or {}).get("parent_game_id"),
         "models": models,
         "known_cost_usd": usage.get("known_cost_usd"),
         "cost_completeness": usage.get("cost_completeness"),
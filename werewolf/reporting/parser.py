@@ -1,4 +1,10 @@
-"""Tolerant, provenance-preserving JSONL game-log parser."""
+"""Tolerant, provenance-preserving JSONL game-log parser.
+
+Plain and compressed logs parse identically (werewolf/log_files.py).
+``sha256`` covers the decompressed canonical JSONL bytes; ``source_size``
+and ``source_mtime_ns`` describe the file on disk and drive sidecar
+freshness.
+"""
 from __future__ import annotations
 
 import hashlib
@@ -13,6 +19,12 @@ from werewolf.json_safety import (
     nonnegative_finite_number,
     nonnegative_int,
 )
+from werewolf.log_files import (
+    COMPRESSION_NONE,
+    compression_for_path,
+    game_id_from_log_name,
+    read_log_bytes,
+)
 
 
 _TOKEN_FIELDS = (
@@ -41,25 +53,34 @@ class ParsedGameLog:
     sha256: str
     source_size: int
     source_mtime_ns: int
+    compression: str = COMPRESSION_NONE
+    canonical_size: Optional[int] = None
     rows: list[dict] = field(default_factory=list)
     config: Optional[dict] = None
     events: list[dict] = field(default_factory=list)
     llm_calls: list[dict] = field(default_factory=list)
+    timings: list[dict] = field(default_factory=list)
     usage_summary: Optional[dict] = None
     outcome: Optional[dict] = None
     warnings: list[ParseWarning] = field(default_factory=list)
     record_counts: dict[str, int] = field(default_factory=dict)
 
+    @property
+    def game_id(self) -> str:
+        return game_id_from_log_name(self.path.name) or self.path.stem
+
 
 def parse_game_log(path: str | Path) -> ParsedGameLog:
     path = Path(path)
-    data = path.read_bytes()
     stat = path.stat()
+    data = read_log_bytes(path)
     parsed = ParsedGameLog(
         path=path,
         sha256=hashlib.sha256(data).hexdigest(),
-        source_size=len(data),
+        source_size=stat.st_size,
         source_mtime_ns=stat.st_mtime_ns,
+        compression=compression_for_path(path),
+        canonical_size=len(data),
     )
     counts: dict[str, int] = {}
     for source_line, raw in enumerate(data.splitlines(), 1):
@@ -107,7 +128,10 @@ def parse_game_log(path: str | Path) -> ParsedGameLog:
         elif row_type == "event":
             event = row.get("event")
             if isinstance(event, dict):
-                parsed.events.append({**event, "source_line": source_line})
+                item = {**event, "source_line": source_line}
+                if row.get("inherited_from"):
+                    item["inherited_from"] = row["inherited_from"]
+                parsed.events.append(item)
                 if "payload" in event and not isinstance(event.get("payload"), dict):
                     parsed.warnings.append(ParseWarning(
                         "malformed_event_payload",
@@ -184,6 +208,12 @@ def parse_game_log(path: str | Path) -> ParsedGameLog:
                         + ", ".join(invalid_cost),
                         source_line,
                     ))
+        elif row_type == "timing":
+            parsed.timings.append({**row, "source_line": source_line})
+            if nonnegative_finite_number(row.get("wall_ms")) is None:
+                parsed.warnings.append(ParseWarning(
+                    "invalid_timing", "Timing row has no valid wall_ms", source_line,
+                ))
         elif row_type == "usage_summary":
             usage = row.get("usage")
             if isinstance(usage, dict):
@@ -237,12 +267,12 @@ def parse_game_log(path: str | Path) -> ParsedGameLog:
         ))
     else:
         configured_id = parsed.config.get("game_id")
-        if configured_id and configured_id != path.stem:
+        if configured_id and configured_id != parsed.game_id:
             parsed.warnings.append(ParseWarning(
                 "game_id_mismatch",
                 (
                     f"Config game_id {configured_id!r} does not match "
-                    f"canonical filename game_id {path.stem!r}"
+                    f"canonical filename game_id {parsed.game_id!r}"
                 ),
             ))
     return parsed
@@ -10,7 +10,7 @@ _OVERVIEW_FIELDS = (
     "analysis_eligibility", "analysis_exclusion_reasons", "usage_reliability",
     "winner", "rounds", "remaining", "seed", "n_players", "n_wolves",
     "n_seers", "requested_models", "generation", "discussion_cycles",
-    "belief_snapshots", "limits", "validity",
+    "belief_snapshots", "belief_sampling", "limits", "lineage", "validity",
 )
 _USAGE_FIELDS = (
     "attempts", "decision_groups", "api_failures", "parse_failures",
@@ -18,16 +18,18 @@ _USAGE_FIELDS = (
     "errors_by_category", "tokens", "token_fields_missing", "known_cost_usd",
     "calls_with_known_cost", "calls_without_known_cost", "cost_completeness",
     "cost_sources", "by_cost_source", "by_phase", "by_required_action",
-    "terminal_consistency", "reliability",
+    "output_cap_hits", "preflight", "inherited", "terminal_consistency",
+    "reliability",
 )
 _EVENT_FIELDS = (
     "id", "event_id", "event_id_source", "t", "round", "phase", "type",
     "channel", "speaker_id", "discussion_cycle", "source_line", "payload",
+    "inherited_from",
 )
 _REPRO_FIELDS = (
     "code_commit", "prompt_version", "log_schema_version",
     "event_schema_version", "belief_schema_version", "validity_policy_version",
-    "runtime", "report_schema_version", "report_build_version",
+    "response_protocol", "runtime", "report_schema_version", "report_build_version",
     "analysis_eligibility_policy_version",
 )
 
@@ -63,7 +65,8 @@ def build_public_report(full_report: dict) -> dict:
             "spoiler_protection_only": True,
         },
         "source": _allow(source, (
-            "log_name", "sha256", "size_bytes", "mtime_ns", "created_at",
+            "log_name", "sha256", "size_bytes", "mtime_ns", "compression",
+            "canonical_size_bytes", "created_at",
             "created_at_source", "record_counts", "warnings",
         )),
         "overview": overview,
@@ -83,10 +86,14 @@ def build_public_report(full_report: dict) -> dict:
             "available": False, "reason": "private_data_not_requested",
         },
         "usage": usage,
+        # Phase timings reveal no roles or private content.
+        "timing": full_report.get("timing"),
         "reproducibility": _allow(
             full_report.get("reproducibility") or {}, _REPRO_FIELDS,
         ),
-        "links": _allow(full_report.get("links") or {}, ("raw", "report")),
+        "links": _allow(
+            full_report.get("links") or {}, ("raw", "report", "parent_report"),
+        ),
     }
 
 
@@ -2,6 +2,8 @@
 
 JSONL logs are canonical. Metadata sidecars and ``index.json`` are caches
 that may be deleted and reconstructed without losing game information.
+A log may be stored plain or compressed (``.jsonl.gz`` / ``.jsonl.zst``);
+if several exist for one game the plain file wins.
 The lock here protects threads in one process only; multi-process writers
 are deliberately outside the PR 2 storage contract.
 """
@@ -23,6 +25,7 @@ from werewolf.reporting.builder import (
     build_full_report,
     build_history_summary,
 )
+from werewolf.log_files import find_log, game_id_from_log_name, log_filename
 from werewolf.reporting.parser import ParsedGameLog, parse_game_log
 
 
@@ -136,7 +139,10 @@ class GameRepository:
         self._reconciled = False
 
     def log_path(self, game_id: str) -> Path:
-        return self.root / f"{validate_game_id(game_id)}.jsonl"
+        """The game's existing log, plain or compressed; the plain name
+        when none exists yet."""
+        game_id = validate_game_id(game_id)
+        return find_log(self.root, game_id) or self.root / log_filename(game_id)
 
     def meta_path(self, game_id: str) -> Path:
         return self.root / f"{validate_game_id(game_id)}.meta.json"
@@ -155,10 +161,15 @@ class GameRepository:
             self.root.mkdir(parents=True, exist_ok=True)
             entries: dict[str, dict] = {}
             live_logs = set()
-            for log_path in sorted(self.root.glob("game_*.jsonl")):
-                if not _GAME_ID.fullmatch(log_path.stem):
+            for log_path in sorted(self.root.glob("game_*.jsonl*")):
+                game_id = game_id_from_log_name(log_path.name)
+                if (
+                    game_id is None or game_id in live_logs
+                    or not _GAME_ID.fullmatch(game_id)
+                ):
                     continue
-                live_logs.add(log_path.stem)
+                live_logs.add(game_id)
+                log_path = self.log_path(game_id)
                 entry = self._refresh_path(log_path)
                 if entry is not None:
                     entries[entry["game_id"]] = entry
@@ -254,7 +265,7 @@ class GameRepository:
 
     def _refresh_path(self, log_path: Path) -> Optional[dict]:
         stat = log_path.stat()
-        game_id = log_path.stem
+        game_id = game_id_from_log_name(log_path.name)
         old = _read_json(self.meta_path(game_id)) or {}
         if (
             old.get("meta_schema_version") == META_SCHEMA_VERSION
@@ -0,0 +1,64 @@
+"""Per-phase latency waterfall from a game's ``timing`` rows.
+
+Phases are laid end to end in log order: ``start_ms`` is the sum of the
+earlier phases' wall time, i.e. time the engine was busy. Idle time
+between web-UI steps is not in the log and not in the waterfall.
+"""
+from __future__ import annotations
+
+from werewolf.json_safety import nonnegative_finite_number, nonnegative_int
+
+
+SEGMENT_FIELDS = (
+    "provider_wall_ms", "prompt_build_ms", "validation_ms", "backoff_ms",
+    "rate_limit_ms", "log_ms", "engine_ms",
+)
+_MS_FIELDS = ("wall_ms", "provider_latency_ms", "queue_wait_ms", *SEGMENT_FIELDS)
+_COUNT_FIELDS = ("calls", "retries", "fallbacks")
+
+
+def build_timing_waterfall(timings: list[dict]) -> dict:
+    if not timings:
+        return {"available": False, "reason": "no_timing_rows"}
+    phases = []
+    offset = 0.0
+    totals = {field: 0.0 for field in _MS_FIELDS if field != "provider_latency_ms"}
+    totals.update({field: 0 for field in _COUNT_FIELDS})
+    for row in timings:
+        phase = {
+            "round": nonnegative_int(row.get("round")),
+            "phase": row.get("phase") if isinstance(row.get("phase"), str) else None,
+            "start_ms": round(offset, 3),
+            "source_line": row.get("source_line"),
+        }
+        for field in _MS_FIELDS:
+            phase[field] = nonnegative_finite_number(row.get(field))
+        for field in _COUNT_FIELDS:
+            phase[field] = nonnegative_int(row.get(field))
+        for field in totals:
+            totals[field] += phase[field] or 0
+        offset += phase["wall_ms"] or 0.0
+        phases.append(phase)
+    by_phase: dict[str, dict] = {}
+    for phase in phases:
+        bucket = by_phase.setdefault(phase["phase"] or "unknown", {
+            "count": 0, "wall_ms": 0.0, "provider_wall_ms": 0.0, "calls": 0,
+        })
+        bucket["count"] += 1
+        bucket["wall_ms"] += phase["wall_ms"] or 0.0
+        bucket["provider_wall_ms"] += phase["provider_wall_ms"] or 0.0
+        bucket["calls"] += phase["calls"] or 0
+    return {
+        "available": True,
+        "timing_schema_version": timings[0].get("timing_schema_version"),
+        "segments": list(SEGMENT_FIELDS),
+        "phases": phases,
+        "by_phase": by_phase,
+        "totals": {
+            field: round(value, 3) if isinstance(value, float) else value
+            for field, value in totals.items()
+        },
+    }
+
+
+__all__ = ["SEGMENT_FIELDS", "build_timing_waterfall"]
@@ -9,6 +9,7 @@ from werewolf.json_safety import (
     nonnegative_finite_number,
     nonnegative_int,
 )
+from werewolf.llm.output_caps import hit_output_cap
 
 
 TOKEN_FIELDS = (
@@ -42,7 +43,58 @@ def _breakdown(calls: list[dict], key_fn: Callable[[dict], object]) -> dict:
     return dict(buckets)
 
 
+def _output_cap_hits(calls: list[dict]) -> dict:
+    """Responses that ran out of output tokens, per required_action."""
+    buckets = defaultdict(lambda: {"attempts": 0, "hits": 0})
+    for call in calls:
+        action = call.get("required_action")
+        bucket = buckets[str(action) if action is not None else "unknown"]
+        bucket["attempts"] += 1
+        finish_reason = call.get("finish_reason")
+        if isinstance(finish_reason, str) and hit_output_cap(finish_reason):
+            bucket["hits"] += 1
+    for bucket in buckets.values():
+        bucket["hit_rate"] = bucket["hits"] / bucket["attempts"]
+    return dict(sorted(buckets.items()))
+
+
+def _preflight(llm_calls: list[dict]) -> dict:
+    """Pre-flight input-token estimates against reported input tokens,
+    per model family; same rules as the ledger's preflight block."""
+    refused = 0
+    buckets = defaultdict(lambda: {
+        "calls": 0, "estimated_input_tokens": 0, "reported_input_tokens": 0,
+        "abs_error_tokens": 0,
+    })
+    for call in llm_calls:
+        preflight = as_mapping(call.get("preflight"))
+        estimated = nonnegative_int(preflight.get("input_tokens"))
+        if estimated is None:
+            continue
+        if call.get("api_attempted") is not True:
+            refused += call.get("error_category") == "context_window_exceeded"
+            continue
+        reported = nonnegative_int(as_mapping(call.get("usage")).get("input_tokens"))
+        stream = as_mapping(as_mapping(call.get("provider_metadata")).get("stream"))
+        if reported is None or stream.get("stopped_early") or stream.get("cancelled"):
+            continue
+        family = preflight.get("family")
+        bucket = buckets[str(family) if family is not None else "unknown"]
+        bucket["calls"] += 1
+        bucket["estimated_input_tokens"] += estimated
+        bucket["reported_input_tokens"] += reported
+        bucket["abs_error_tokens"] += abs(estimated - reported)
+    for bucket in buckets.values():
+        reported = bucket["reported_input_tokens"]
+        bucket["bias"] = bucket["estimated_input_tokens"] / reported - 1 if reported else None
+        bucket["error_rate"] = bucket["abs_error_tokens"] / reported if reported else None
+    return {"refused": refused, "by_family": dict(sorted(buckets.items()))}
+
+
 def compute_usage(llm_calls: list[dict]) -> dict:
+    # Rows inherited by a forked game were paid for by the parent game.
+    inherited = [call for call in llm_calls if call.get("inherited_from")]
+    llm_calls = [call for call in llm_calls if not call.get("inherited_from")]
     api_calls = [call for call in llm_calls if call.get("api_attempted") is True]
     known_cost = 0.0
     calls_with_cost = calls_without_cost = 0
@@ -103,8 +155,10 @@ def compute_usage(llm_calls: list[dict]) -> dict:
         "validation_failures": sum(
             call.get("validation_ok") is False for call in api_calls
         ),
+        # A losing hedge shares its winner's attempt; it is not a retry.
         "retries": sum(
             isinstance(call.get("attempt"), int) and call["attempt"] > 1
+            and call.get("error_category") != "hedge_lost"
             for call in api_calls
         ),
         "fallbacks": errors.get("fallback_used", 0),
@@ -132,7 +186,23 @@ def compute_usage(llm_calls: list[dict]) -> dict:
         "by_required_action": _breakdown(
             api_calls, lambda call: call.get("required_action")
         ),
+        "output_cap_hits": _output_cap_hits(api_calls),
+        "preflight": _preflight(llm_calls),
     }
+    if inherited:
+        inherited_api = [
+            call for call in inherited if call.get("api_attempted") is True
+        ]
+        inherited_costs = [
+            nonnegative_finite_number(as_mapping(call.get("cost")).get("usd"))
+            for call in inherited_api
+        ]
+        result["inherited"] = {
+            "attempts": len(inherited_api),
+            "known_cost_usd": sum(c for c in inherited_costs if c is not None),
+            "calls_without_known_cost": sum(c is None for c in inherited_costs),
+            "parent_game_ids": sorted({call["inherited_from"] for call in inherited}),
+        }
     return result
 
 
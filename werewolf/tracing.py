@@ -0,0 +1,265 @@
+"""Hierarchical spans for games and batches, exported for offline viewing.
+
+    tracer = Tracer()
+    engine = GameEngine(..., tracer=tracer)
+    engine.run()
+    tracer.export("outputs/traces/game.trace.json")   # open in Perfetto
+
+Span tree: batch -> game -> phase -> act -> attempt -> provider.complete,
+parse, validate. Spans carry game_id, player_id and required_action
+where they apply.
+
+Rules:
+- Tracing is injected, never global: components take a tracer and
+  default to NULL_TRACER, whose span() returns one shared no-op object,
+  so a disabled tracer costs a method call per span and allocates
+  nothing.
+- Parents come from a context variable, so nesting follows the call
+  stack per thread. A span opened with no current span hangs off the
+  tracer's root (e.g. the batch span), which keeps concurrent games on
+  worker threads inside their batch.
+- One tracer may be shared by concurrent games; finished spans are
+  appended under a lock.
+- Formats: Chrome trace-event JSON (``*.json``, the default; Perfetto and
+  chrome://tracing) and OTLP/JSON (``*.otlp.json``, as written by the
+  OpenTelemetry file exporter). Spans still open at export time (a
+  crashed game) are closed at the export instant and marked unfinished.
+"""
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+TRACE_FORMAT_CHROME = "chrome"
+TRACE_FORMAT_OTLP = "otlp"
+TRACE_FORMATS = (TRACE_FORMAT_CHROME, TRACE_FORMAT_OTLP)
+
+SERVICE_NAME = "werewolf"
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "werewolf_span", default=None,
+)
+
+
+class Span:
+    __slots__ = (
+        "tracer", "name", "span_id", "parent_id", "attributes", "start_ns",
+        "end_ns", "thread_id", "thread_name", "error", "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"],
+                 attributes: dict):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = next(tracer._ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes
+        self.start_ns = None
+        self.end_ns = None
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.error = None
+        self._token = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.perf_counter_ns()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current.reset(self._token)
+        self._token = None
+        self.tracer._finish(self)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """Disabled tracing: every span is the same no-op object."""
+
+    enabled = False
+
+    def span(self, name: str, **attributes) -> _NullSpan:
+        return _NULL_SPAN
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    enabled = True
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.root: Optional[Span] = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+        self._open: dict[int, Span] = {}
+        # perf_counter for durations, anchored to the wall clock once.
+        self._epoch_ns = time.time_ns() - time.perf_counter_ns()
+
+    def span(self, name: str, **attributes) -> Span:
+        parent = _current.get() or self.root
+        span = Span(self, name, parent, attributes)
+        with self._lock:
+            self._open[span.span_id] = span
+        return span
+
+    def root_span(self, name: str, **attributes) -> Span:
+        """A span that parents every otherwise-parentless span (a batch)."""
+        span = self.span(name, **attributes)
+        self.root = span
+        return span
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._open.pop(span.span_id, None)
+            self._spans.append(span)
+            if span is self.root:
+                self.root = None
+
+    def spans(self) -> list[dict]:
+        """Finished and still-open spans as plain dicts, in start order."""
+        now = time.perf_counter_ns()
+        with self._lock:
+            spans = self._spans + [s for s in self._open.values() if s.start_ns]
+        rows = []
+        for span in sorted(spans, key=lambda s: (s.start_ns, s.span_id)):
+            rows.append({
+                "name": span.name,
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                "start_ns": span.start_ns + self._epoch_ns,
+                "end_ns": (span.end_ns or now) + self._epoch_ns,
+                "thread_id": span.thread_id,
+                "thread_name": span.thread_name,
+                "attributes": dict(span.attributes),
+                "error": span.error,
+                "unfinished": span.end_ns is None,
+            })
+        return rows
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_chrome(self) -> dict:
+        spans = self.spans()
+        events = []
+        threads = {}
+        for span in spans:
+            threads.setdefault(span["thread_id"], span["thread_name"])
+            args = dict(span["attributes"])
+            if span["error"]:
+                args["error"] = span["error"]
+            if span["unfinished"]:
+                args["unfinished"] = True
+            events.append({
+                "name": span["name"],
+                "cat": span["name"].split(".", 1)[0],
+                "ph": "X",
+                "ts": span["start_ns"] / 1000,
+                "dur": (span["end_ns"] - span["start_ns"]) / 1000,
+                "pid": os.getpid(),
+                "tid": span["thread_id"],
+                "args": args,
+            })
+        for tid, name in threads.items():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": os.getpid(),
+                "tid": tid, "args": {"name": name},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otlp(self) -> dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{
+                "scope": {"name": SERVICE_NAME},
+                "spans": [self._otlp_span(span) for span in self.spans()],
+            }],
+        }]}
+
+    def _otlp_span(self, span: dict) -> dict:
+        attributes = {**span["attributes"], "thread.name": span["thread_name"]}
+        if span["unfinished"]:
+            attributes["unfinished"] = True
+        row = {
+            "traceId": self.trace_id,
+            "spanId": f"{span['span_id']:016x}",
+            "name": span["name"],
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span["start_ns"]),
+            "endTimeUnixNano": str(span["end_ns"]),
+            "attributes": [
+                _otlp_attribute(key, value) for key, value in attributes.items()
+                if value is not None
+            ],
+        }
+        if span["parent_id"] is not None:
+            row["parentSpanId"] = f"{span['parent_id']:016x}"
+        if span["error"]:
+            row["status"] = {"code": 2, "message": span["error"]}  # ERROR
+        return row
+
+    def export(self, path: str, fmt: Optional[str] = None) -> str:
+        """Write the trace; the format defaults from the file name."""
+        fmt = fmt or trace_format_for_path(path)
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format {fmt!r}; expected one of {TRACE_FORMATS}")
+        document = self.to_otlp() if fmt == TRACE_FORMAT_OTLP else self.to_chrome()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+        return fmt
+
+
+def trace_format_for_path(path: str) -> str:
+    return TRACE_FORMAT_OTLP if str(path).endswith(".otlp.json") else TRACE_FORMAT_CHROME
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+__all__ = [
+    "NULL_TRACER", "NullTracer", "Span", "TRACE_FORMATS", "TRACE_FORMAT_CHROME",
+    "TRACE_FORMAT_OTLP", "Tracer", "trace_format_for_path",
+]
@@ -1,12 +1,20 @@
+import math
 from pathlib import Path
 import threading
 
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request, render_template, send_file
+from flask import Flask, Response, jsonify, request, render_template, send_file
 from werkzeug.exceptions import BadRequest, UnsupportedMediaType
 
+from werewolf.engine.bus import EventFeed
 from werewolf.engine.game import GameEngine
 from werewolf.llm.registry import get_api_key, selectable_models
+from werewolf.log_files import (
+    COMPRESSION_NONE,
+    compression_for_path,
+    iter_log_chunks,
+    log_filename,
+)
 from werewolf.reporting.privacy import build_public_report
 from werewolf.reporting.repository import (
     GameRepository,
@@ -25,6 +33,9 @@ load_dotenv(Path(__file__).resolve().parents[2] / ".env")
 app = Flask(__name__)
 
 game_engine: GameEngine | None = None
+# Live event stream for the active game. Read without _game_lock so the UI
+# can follow a phase while /api/advance is still running it.
+game_feed: EventFeed | None = None
 _game_lock = threading.RLock()
 game_repository = GameRepository(Path("outputs/games"))
 
@@ -112,9 +123,29 @@ def check_model(alias: str):
     return jsonify(body), status_code
 
 
+@app.route("/api/events")
+def stream_events():
+    """Long-poll for events of the active game newer than ?after=<id>."""
+    try:
+        after = int(request.args.get("after", -1))
+        wait = float(request.args.get("wait", 0))
+    except ValueError:
+        return jsonify({"error": "after and wait must be numbers"}), 400
+    if not math.isfinite(wait):
+        return jsonify({"error": "wait must be a finite number"}), 400
+    wait = min(max(wait, 0.0), 25.0)
+    feed, engine = game_feed, game_engine
+    if feed is None or engine is None:
+        return jsonify({"error": "No game in progress", "events": []})
+    return jsonify({
+        "game_id": engine.state.game_id,
+        "events": feed.wait_for(after, wait) if wait else feed.since(after),
+    })
+
+
 @app.route("/api/new", methods=["POST"])
 def new_game():
-    global game_engine
+    global game_engine, game_feed
     data, error_response = _request_json_object()
     if error_response is not None:
         return error_response
@@ -148,9 +179,12 @@ def new_game():
             }},
         }), 500
 
+    feed = EventFeed()
+    new_engine.bus.subscribe(feed, topics={"event"}, background=True, name="web")
     with _game_lock:
         old_engine = game_engine
         game_engine = new_engine
+        game_feed = feed
     if old_engine is not None:
         try:
             old_engine.close()
@@ -259,10 +293,20 @@ def download_game_log(game_id: str):
         return jsonify({"error": "Game not found"}), 404
     if not path.exists():
         return jsonify({"error": "Game not found"}), 404
-    response = send_file(
-        path.resolve(), mimetype="application/x-ndjson", as_attachment=True,
-        download_name=path.name,
-    )
+    if compression_for_path(path) == COMPRESSION_NONE:
+        response = send_file(
+            path.resolve(), mimetype="application/x-ndjson", as_attachment=True,
+            download_name=path.name,
+        )
+    else:
+        # Compressed logs are served as their canonical JSONL bytes.
+        response = Response(
+            iter_log_chunks(path), mimetype="application/x-ndjson",
+            headers={
+                "Content-Disposition":
+                    f'attachment; filename="{log_filename(game_id)}"',
+            },
+        )
     response.headers["Cache-Control"] = "no-store"
     return response
 
@@ -41,7 +41,7 @@ class ParsedGameRequest:
 
 _GENERATION_FIELDS = {
     "temperature", "top_p", "max_output_tokens", "provider_seed",
-    "structured_output",
+    "structured_output", "response_schema",
 }
 _REASONING_VALUES = {"none", "low", "medium", "high"}
 
@@ -99,12 +99,14 @@ def parse_generation_settings(data: dict) -> tuple[GenerationConfig, Optional[st
             return None
         return value
 
-    structured = raw.get("structured_output", False)
-    if not isinstance(structured, bool):
-        errors["generation_config.structured_output"] = _error(
-            "invalid_type", "structured_output must be a boolean",
-        )
-        structured = False
+    def flag(key: str) -> bool:
+        value = raw.get(key, False)
+        if not isinstance(value, bool):
+            errors[f"generation_config.{key}"] = _error(
+                "invalid_type", f"{key} must be a boolean",
+            )
+            return False
+        return value
 
     override = data.get("reasoning_override")
     if override is not None and (
@@ -124,7 +126,8 @@ def parse_generation_settings(data: dict) -> tuple[GenerationConfig, Optional[st
         provider_seed=optional_number(
             "provider_seed", minimum=-(2**31), maximum=2**31 - 1, integer=True,
         ),
-        structured_output=structured,
+        structured_output=flag("structured_output"),
+        response_schema=flag("response_schema"),
     )
     if errors:
         raise RequestValidationError(errors)
@@ -41,6 +41,7 @@ function renderKeyValues(targetId, values) {
     const target = document.getElementById(targetId);
     target.replaceChildren();
     for (const [label, value] of Object.entries(values)) {
+        if (value === undefined) continue;
         target.append(el('dt', label), el('dd', fmt.value(value)));
     }
 }
@@ -88,8 +89,15 @@ function renderOverview(report) {
         Seers: overview.n_seers,
         'Discussion cycles': overview.discussion_cycles,
         'Belief snapshots': overview.belief_snapshots,
+        'Belief sampling': overview.belief_sampling
+            ? `every ${overview.belief_sampling.every_k_rounds} day(s), ${fmt.percent(overview.belief_sampling.observer_fraction)} of players${overview.belief_sampling.max_rounds ? `, first ${overview.belief_sampling.max_rounds} day(s)` : ''}`
+            : undefined,
         'Cost completeness': usage.cost_completeness,
         'Cost sources': (usage.cost_sources || []).join(', ') || 'Unavailable',
+        'Forked from': overview.lineage
+            ? `${overview.lineage.parent_game_id} @ round ${overview.lineage.checkpoint?.round ?? '?'} ${overview.lineage.checkpoint?.phase || ''}`
+            : undefined,
+        'Inherited attempts': usage.inherited ? usage.inherited.attempts : undefined,
     });
     const models = document.getElementById('overview-models');
     models.replaceChildren();
@@ -295,7 +303,7 @@ function renderBeliefs(report) {
         checkpointRows.replaceChildren();
         for (const item of (beliefs.checkpoints || []).filter(row => row.observer_id === observer)) {
             const row = el('tr');
-            [item.round, playerLabel(item.observer_id), item.checkpoint, item.status, item.usable_probability_count, item.event_id || 'Not emitted'].forEach(value => row.append(el('td', fmt.value(value))));
+            [item.round, playerLabel(item.observer_id), item.checkpoint, item.status, item.usable_probability_count, item.event_id || (item.status === 'not_sampled' ? 'Not sampled' : 'Not emitted')].forEach(value => row.append(el('td', fmt.value(value))));
             checkpointRows.append(row);
         }
         const changes = document.getElementById('belief-change-rows'); changes.replaceChildren();
@@ -377,6 +385,27 @@ function breakdownPanel(title, data) {
     table.append(body); panel.append(table); return panel;
 }
 
+function outputCapPanel(data) {
+    const panel = el('article', null, 'panel'); panel.append(el('h3', 'Output-token cap hits'));
+    const table = el('table'); const body = el('tbody');
+    for (const [name, values] of Object.entries(data || {})) {
+        const row = el('tr'); row.append(el('td', name), el('td', `${values.hits ?? 0}/${values.attempts ?? 0} hit the cap`), el('td', fmt.percent(values.hit_rate)));
+        body.append(row);
+    }
+    table.append(body); panel.append(table); return panel;
+}
+
+function preflightPanel(data) {
+    const panel = el('article', null, 'panel'); panel.append(el('h3', 'Pre-flight token estimates'));
+    const table = el('table'); const body = el('tbody');
+    for (const [name, values] of Object.entries(data.by_family || {})) {
+        const row = el('tr'); row.append(el('td', name), el('td', `${values.calls ?? 0} calls`), el('td', `bias ${fmt.percent(values.bias)}`), el('td', `error ${fmt.percent(values.error_rate)}`));
+        body.append(row);
+    }
+    if (data.refused) { const row = el('tr'); row.append(el('td', 'Refused (context window)'), el('td', `${data.refused} calls`)); body.append(row); }
+    table.append(body); panel.append(table); return panel;
+}
+
 function renderUsage(report) {
     const usage = report.usage || {};
     document.getElementById('usage-cards').replaceChildren(
@@ -389,6 +418,73 @@ function renderUsage(report) {
     if (usage.by_player) target.append(breakdownPanel('By player', usage.by_player));
     if (usage.by_requested_model) target.append(breakdownPanel('By requested model', usage.by_requested_model));
     target.append(breakdownPanel('By action', usage.by_required_action || {}), breakdownPanel('By phase', usage.by_phase || {}));
+    if (usage.output_cap_hits) target.append(outputCapPanel(usage.output_cap_hits));
+    if (usage.preflight) target.append(preflightPanel(usage.preflight));
+}
+
+const timingSegments = {
+    provider_wall_ms: ['Provider', '#60a5fa'], prompt_build_ms: ['Prompt build', '#c084fc'],
+    validation_ms: ['Validation', '#fbbf24'], backoff_ms: ['Retry backoff', '#f87171'], rate_limit_ms: ['Rate limit', '#fb923c'], log_ms: ['Logging', '#34d399'], engine_ms: ['Engine', '#91a4be'],
+};
+
+function fmtMs(value) {
+    return value === null || value === undefined ? '—' : `${Number(value).toFixed(1)} ms`;
+}
+
+function renderTimingChart(phases) {
+    const container = document.getElementById('timing-chart');
+    container.replaceChildren();
+    const total = phases.reduce((sum, item) => Math.max(sum, (item.start_ms || 0) + (item.wall_ms || 0)), 0);
+    const rowHeight = 16, left = 150, right = 20, top = 10, legendHeight = 30, width = 900;
+    const height = top + phases.length * rowHeight + legendHeight;
+    const scale = total > 0 ? (width - left - right) / total : 0;
+    const svg = svgNode('svg', { viewBox: `0 0 ${width} ${height}`, role: 'img', 'aria-label': 'Phase latency waterfall' });
+    phases.forEach((phase, index) => {
+        const y = top + index * rowHeight;
+        const label = svgNode('text', { x: left - 8, y: y + 11, 'text-anchor': 'end', class: 'chart-label' });
+        label.textContent = `R${phase.round ?? '?'} ${phase.phase || 'unknown'}`; svg.append(label);
+        let x = left + (phase.start_ms || 0) * scale;
+        for (const [field, [name, color]] of Object.entries(timingSegments)) {
+            const segmentWidth = (phase[field] || 0) * scale;
+            if (segmentWidth <= 0) continue;
+            const rect = svgNode('rect', { x, y: y + 2, width: Math.max(segmentWidth, 0.5), height: rowHeight - 4, fill: color });
+            const title = svgNode('title'); title.textContent = `${name}: ${fmtMs(phase[field])}`;
+            rect.append(title); svg.append(rect);
+            x += segmentWidth;
+        }
+    });
+    Object.values(timingSegments).forEach(([name, color], index) => {
+        const x = left + index * 130, y = height - 12;
+        svg.append(svgNode('rect', { x, y: y - 9, width: 10, height: 10, fill: color }));
+        const legend = svgNode('text', { x: x + 15, y, class: 'chart-legend' }); legend.textContent = name; svg.append(legend);
+    });
+    container.append(svg);
+}
+
+function renderTiming(report) {
+    const timing = report.timing || {};
+    const unavailable = document.getElementById('timing-unavailable');
+    const content = document.getElementById('timing-content');
+    unavailable.classList.toggle('hidden', !!timing.available);
+    content.classList.toggle('hidden', !timing.available);
+    if (!timing.available) { unavailable.textContent = 'This log has no timing rows (recorded by newer engines only).'; return; }
+    const totals = timing.totals || {};
+    document.getElementById('timing-cards').replaceChildren(
+        metric('Busy wall time', fmtMs(totals.wall_ms)), metric('Provider', fmtMs(totals.provider_wall_ms)),
+        metric('Prompt build', fmtMs(totals.prompt_build_ms)), metric('Validation', fmtMs(totals.validation_ms)),
+        metric('Retry backoff', fmtMs(totals.backoff_ms)), metric('Rate limit', fmtMs(totals.rate_limit_ms)), metric('Logging', fmtMs(totals.log_ms)), metric('Queue wait', fmtMs(totals.queue_wait_ms)),
+        metric('Engine', fmtMs(totals.engine_ms)), metric('API calls', totals.calls ?? 0),
+    );
+    renderTimingChart(timing.phases || []);
+    const body = document.getElementById('timing-rows'); body.replaceChildren();
+    for (const phase of timing.phases || []) {
+        const row = el('tr');
+        row.append(el('td', fmt.value(phase.round)), el('td', fmt.value(phase.phase)));
+        for (const field of ['wall_ms', 'calls', 'retries', 'provider_wall_ms', 'provider_latency_ms', 'prompt_build_ms', 'validation_ms', 'backoff_ms', 'rate_limit_ms', 'log_ms', 'queue_wait_ms', 'engine_ms']) {
+            row.append(el('td', field.endsWith('_ms') ? fmtMs(phase[field]) : fmt.value(phase[field]), 'numeric'));
+        }
+        body.append(row);
+    }
 }
 
 function renderReproducibility(report) {
@@ -400,6 +496,7 @@ function renderReproducibility(report) {
         'Event schema': repro.event_schema_version,
         'Belief schema': repro.belief_schema_version,
         'Validity policy': repro.validity_policy_version,
+        'Response protocol': repro.response_protocol,
         'Report schema': repro.report_schema_version,
         'Report build': repro.report_build_version,
         'Eligibility policy': repro.analysis_eligibility_policy_version,
@@ -429,7 +526,7 @@ function renderReproducibility(report) {
 function renderReport(report) {
     reportState.report = report;
     document.getElementById('raw-log-link').href = report.links?.raw || `/api/games/${encodeURIComponent(gameId)}/raw`;
-    renderOverview(report); renderTimeline(report); renderBeliefs(report); renderDecisions(report); renderManipulation(report); renderUsage(report); renderReproducibility(report);
+    renderOverview(report); renderTimeline(report); renderBeliefs(report); renderDecisions(report); renderManipulation(report); renderUsage(report); renderTiming(report); renderReproducibility(report);
     document.getElementById('report-loading').classList.add('hidden');
     document.getElementById('report-content').classList.remove('hidden');
     document.getElementById('report-nav').classList.remove('hidden');